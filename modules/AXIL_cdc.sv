@@ -0,0 +1,28 @@
+`timescale 1ns / 1ps
+
+/*
+  AXI-Lite clock-domain crossing
+  Test module for the AXI-Lite CDC bridge: a manager clocked by AXIL_CDC_cdc_s_clk_i reaches a
+  subordinate clocked by AXIL_CDC_cdc_m_clk_i. The requests that reach the subordinate are counted
+  on m_requests_o (one per AW or AR handshake of the m port, in the m clock domain).
+*/
+module AXIL_cdc #(
+    `include "AXI_parameters_cdc.vs"  // VS_NO_GENERATE
+    parameter integer COUNT_WIDTH = 16
+) (
+    `include "AXI_ios_cdc.vs"  // AXI-Lite CDC cdc depth=4
+    output logic [COUNT_WIDTH-1:0] m_requests_o
+);
+
+  `include "AXI_signals_cdc.vs"  // VS_NO_GENERATE
+
+  always_ff @(posedge AXIL_CDC_cdc_m_clk_i) begin
+    if (AXIL_CDC_cdc_m_rst_i) m_requests_o <= '0;
+    else
+      m_requests_o <= m_requests_o + {{(COUNT_WIDTH - 1) {1'b0}}, AXIL_CDC_cdc_m_awvalid_o & AXIL_CDC_cdc_m_awready_i} +
+                      {{(COUNT_WIDTH - 1) {1'b0}}, AXIL_CDC_cdc_m_arvalid_o & AXIL_CDC_cdc_m_arready_i};
+  end
+
+  `include "AXI_logic_cdc.vs"  // VS_NO_GENERATE
+
+endmodule
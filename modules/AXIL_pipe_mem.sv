@@ -0,0 +1,40 @@
+`timescale 1ns / 1ps
+
+/*
+  Pipelined AXI-Lite memory
+  Test module for the AXI-Lite Subordinate with outstanding > 1: AW/W/AR are queued and one
+  write and one read are served per cycle. It is also the memory behind the crossbar and
+  bridge testbenches.
+*/
+module AXIL_pipe_mem #(
+    `include "AXI_parameters_pm.vs"  // VS_NO_GENERATE
+    parameter integer MEM_ADDR_WIDTH = 10
+) (
+    `include "AXI_ios_pm.vs"  // AXI-Lite Subordinate pm outstanding=4
+    // Generic IOs
+    input logic clk_i,
+    input logic arst_i
+);
+
+  localparam integer BYTE_SHIFT = $clog2(AXIL_pm_DATA_WIDTH / 8);
+
+  `include "AXI_signals_pm.vs"  // VS_NO_GENERATE
+  logic [AXIL_pm_DATA_WIDTH-1:0] memory[2**(MEM_ADDR_WIDTH-BYTE_SHIFT)];
+  logic sync_reset;
+
+  `include "synchronize_reset_AXIL_pipe_mem.vs" // arst_i (active-high), sync_reset (active-high), clock = clk_i
+
+  // Write: AXIL_pm_wstrb is zero in the cycles without a write
+  always_ff @(posedge clk_i) begin
+    for (int b = 0; b < AXIL_pm_DATA_WIDTH / 8; b++) begin
+      if (AXIL_pm_wstrb[b]) begin
+        memory[AXIL_pm_awaddr_n[MEM_ADDR_WIDTH-1:BYTE_SHIFT]][8*b+:8] <= AXIL_pm_wdata[8*b+:8];
+      end
+    end
+  end
+  // Read: data of AXIL_pm_araddr_n in the same cycle
+  assign AXIL_pm_rdata = memory[AXIL_pm_araddr_n[MEM_ADDR_WIDTH-1:BYTE_SHIFT]];
+
+  `include "AXI_logic_pm.vs"  // VS_NO_GENERATE
+
+endmodule
@@ -0,0 +1,41 @@
+`timescale 1ns / 1ps
+
+/*
+  AXI-Lite crossbar
+  Test module for the AXI-Lite Crossbar: managers cpu and dma reach ram0 at 0x0000 and ram1 at
+  0x1000 (1KB each), every other address is answered by the error subordinate of the crossbar and
+  counted on unmapped_o (one per address handshake).
+*/
+module AXIL_xbar #(
+    `include "AXI_parameters_xbar.vs"  // VS_NO_GENERATE
+    parameter integer COUNT_WIDTH = 16
+) (
+    `include "AXI_ios_xbar.vs"  /*
+      AXI-Lite Crossbar xbar
+      AXI-Lite Manager cpu
+      AXI-Lite Manager dma
+      AXI-Lite Subordinate ram0 base=0x0000 size=0x400
+      AXI-Lite Subordinate ram1 base=0x1000 size=0x400
+      */
+    output logic [COUNT_WIDTH-1:0] unmapped_o,
+    // Generic IOs
+    input logic clk_i,
+    input logic arst_i
+);
+
+  `include "AXI_signals_xbar.vs"  // VS_NO_GENERATE
+  logic sync_reset;
+
+  `include "synchronize_reset_AXIL_xbar.vs" // arst_i (active-high), sync_reset (active-high), clock = clk_i
+
+  // Slot 2 is the error subordinate, after ram0 and ram1
+  always_ff @(posedge clk_i) begin
+    if (sync_reset) unmapped_o <= '0;
+    else
+      unmapped_o <= unmapped_o + {{(COUNT_WIDTH - 1) {1'b0}}, AXIL_X_xbar_s2_awvalid & AXIL_X_xbar_s2_awready} +
+                    {{(COUNT_WIDTH - 1) {1'b0}}, AXIL_X_xbar_s2_arvalid & AXIL_X_xbar_s2_arready};
+  end
+
+  `include "AXI_logic_xbar.vs"  // VS_NO_GENERATE
+
+endmodule
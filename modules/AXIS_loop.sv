@@ -0,0 +1,40 @@
+`timescale 1ns / 1ps
+
+/*
+  AXI-Stream loopback
+  Test module for the AXI-Stream Subordinate and Manager: the beats received on rx are sent
+  unchanged on tx, through the register slices of both ends, and the forwarded packets are counted.
+*/
+module AXIS_loop #(
+    `include "AXI_parameters_loop.vs"  // VS_NO_GENERATE
+    parameter integer COUNT_WIDTH = 16
+) (
+    `include "AXI_ios_loop.vs"  /*
+      AXI-Stream Subordinate rx keep=1 slices=2
+      AXI-Stream Manager tx keep=1 slices=2
+      */
+    output logic [COUNT_WIDTH-1:0] packets_o,
+    // Generic IOs
+    input logic clk_i,
+    input logic arst_i
+);
+
+  `include "AXI_signals_loop.vs"  // VS_NO_GENERATE
+  logic sync_reset;
+
+  `include "synchronize_reset_AXIS_loop.vs" // arst_i (active-high), sync_reset (active-high), clock = clk_i
+
+  assign AXIS_M_tx_usr_tVALID = AXIS_S_rx_usr_tVALID;
+  assign AXIS_S_rx_usr_tREADY = AXIS_M_tx_usr_tREADY;
+  assign AXIS_M_tx_usr_tDATA  = AXIS_S_rx_usr_tDATA;
+  assign AXIS_M_tx_usr_tKEEP  = AXIS_S_rx_usr_tKEEP;
+  assign AXIS_M_tx_usr_tLAST  = AXIS_S_rx_usr_tLAST;
+
+  always_ff @(posedge clk_i) begin
+    if (sync_reset) packets_o <= '0;
+    else if (AXIS_M_tx_usr_tVALID & AXIS_M_tx_usr_tREADY & AXIS_M_tx_usr_tLAST) packets_o <= packets_o + 1'b1;
+  end
+
+  `include "AXI_logic_loop.vs"  // VS_NO_GENERATE
+
+endmodule
@@ -0,0 +1,59 @@
+`timescale 1ns / 1ps
+
+/*
+  AXI-Full copy engine
+  Test module for the AXI-Full Manager with outstanding bursts and the transfer splitter: a copy
+  reads bytes_i bytes from src_i and writes them to dst_i (both bus-aligned, bytes_i a multiple of
+  the bus width). Read data is delivered in request order and written back as it arrives, so the
+  destination only matches the source if the reorder buffer restores the order of the R beats.
+*/
+module AXI_dma #(
+    `include "AXI_parameters_dma.vs"  // VS_NO_GENERATE
+    parameter integer LEN_WIDTH = 16
+) (
+    `include "AXI_ios_dma.vs"  // AXI-Full Manager dma outstanding=4 split=1
+    // Copy request, taken while busy_o is low
+    input logic start_i,
+    input logic [AXI_M_dma_ADDR_WIDTH-1:0] src_i,
+    input logic [AXI_M_dma_ADDR_WIDTH-1:0] dst_i,
+    input logic [LEN_WIDTH-1:0] bytes_i,
+    output logic busy_o,
+    // An error response was received since the last start_i
+    output logic error_o,
+    // Generic IOs
+    input logic clk_i,
+    input logic arst_i
+);
+
+  `include "AXI_signals_dma.vs"  // VS_NO_GENERATE
+  logic sync_reset;
+  logic start;
+
+  `include "synchronize_reset_AXI_dma.vs" // arst_i (active-high), sync_reset (active-high), clock = clk_i
+
+  // Busy from the start of the transfers until the last beat is delivered and the last B is back
+  assign busy_o = ~AXI_M_dma_usr_rXFER_READY | ~AXI_M_dma_usr_wXFER_READY | (AXI_M_dma_r_busy != '0) |
+                  (AXI_M_dma_w_busy != '0);
+  assign start = start_i & ~busy_o;
+
+  assign AXI_M_dma_usr_rXFER = start;
+  assign AXI_M_dma_usr_rXFER_ADDR = src_i;
+  assign AXI_M_dma_usr_rXFER_BYTES = AXI_M_dma_ADDR_WIDTH'(bytes_i);
+  assign AXI_M_dma_usr_wXFER = start;
+  assign AXI_M_dma_usr_wXFER_ADDR = dst_i;
+  assign AXI_M_dma_usr_wXFER_BYTES = AXI_M_dma_ADDR_WIDTH'(bytes_i);
+
+  // Read data goes straight to the write data channel
+  assign AXI_M_dma_usr_w_en = AXI_M_dma_usr_r_valid;
+  assign AXI_M_dma_usr_r_ready = AXI_M_dma_usr_w_ready;
+  assign AXI_M_dma_usr_wDATA = AXI_M_dma_usr_rDATA;
+  assign AXI_M_dma_usr_wSTRB = '1;
+
+  always_ff @(posedge clk_i) begin
+    if (sync_reset | start) error_o <= 1'b0;
+    else if ((AXI_M_dma_usr_r_valid & AXI_M_dma_usr_r_ready & AXI_M_dma_usr_r_error) | AXI_M_dma_w_error) error_o <= 1'b1;
+  end
+
+  `include "AXI_logic_dma.vs"  // VS_NO_GENERATE
+
+endmodule
@@ -0,0 +1,34 @@
+`timescale 1ns / 1ps
+
+/*
+  AXI-Full downsizer
+  Test module for the AXI-Full Downsizer: a manager on the wide s port reaches a subordinate on the
+  narrow m port. Every wide beat is sent as narrow beats, which are counted on narrow_beats_o (one per
+  W or R handshake of the m port).
+*/
+module AXI_downsizer #(
+    `include "AXI_parameters_dn.vs"  // VS_NO_GENERATE
+    parameter integer COUNT_WIDTH = 16
+) (
+    `include "AXI_ios_dn.vs"  // AXI-Full Downsizer dn outstanding=4
+    output logic [COUNT_WIDTH-1:0] narrow_beats_o,
+    // Generic IOs
+    input logic clk_i,
+    input logic arst_i
+);
+
+  `include "AXI_signals_dn.vs"  // VS_NO_GENERATE
+  logic sync_reset;
+
+  `include "synchronize_reset_AXI_downsizer.vs" // arst_i (active-high), sync_reset (active-high), clock = clk_i
+
+  always_ff @(posedge clk_i) begin
+    if (sync_reset) narrow_beats_o <= '0;
+    else
+      narrow_beats_o <= narrow_beats_o + {{(COUNT_WIDTH - 1) {1'b0}}, AXI_DN_dn_m_wVALID_o & AXI_DN_dn_m_wREADY_i} +
+                        {{(COUNT_WIDTH - 1) {1'b0}}, AXI_DN_dn_m_rVALID_i & AXI_DN_dn_m_rREADY_o};
+  end
+
+  `include "AXI_logic_dn.vs"  // VS_NO_GENERATE
+
+endmodule
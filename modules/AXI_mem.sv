@@ -0,0 +1,40 @@
+`timescale 1ns / 1ps
+
+/*
+  AXI-Full memory
+  Test module for the AXI-Full Subordinate: the script walks FIXED, INCR and WRAP bursts and
+  drives one beat per cycle on a registered write port and a read port of latency 1. It is
+  also the memory behind the AXI-Full bridge testbenches.
+*/
+module AXI_mem #(
+    `include "AXI_parameters_mem.vs"  // VS_NO_GENERATE
+    parameter integer MEM_ADDR_WIDTH = 12
+) (
+    `include "AXI_ios_mem.vs"  // AXI-Full Subordinate mem outstanding=4
+    // Generic IOs
+    input logic clk_i,
+    input logic arst_i
+);
+
+  localparam integer BYTE_SHIFT = $clog2(AXI_S_mem_DATA_WIDTH / 8);
+
+  `include "AXI_signals_mem.vs"  // VS_NO_GENERATE
+  logic [AXI_S_mem_DATA_WIDTH-1:0] memory[2**(MEM_ADDR_WIDTH-BYTE_SHIFT)];
+  logic sync_reset;
+
+  `include "synchronize_reset_AXI_mem.vs" // arst_i (active-high), sync_reset (active-high), clock = clk_i
+
+  // Write: AXI_S_mem_usr_wSTRB is zero in the cycles without a write
+  // Read: AXI_S_mem_usr_rDATA follows AXI_S_mem_usr_r_en by AXI_S_mem_USR_READ_LATENCY = 1 cycle
+  always_ff @(posedge clk_i) begin
+    for (int b = 0; b < AXI_S_mem_DATA_WIDTH / 8; b++) begin
+      if (AXI_S_mem_usr_wSTRB[b]) begin
+        memory[AXI_S_mem_usr_wADDR[MEM_ADDR_WIDTH-1:BYTE_SHIFT]][8*b+:8] <= AXI_S_mem_usr_wDATA[8*b+:8];
+      end
+    end
+    if (AXI_S_mem_usr_r_en) AXI_S_mem_usr_rDATA <= memory[AXI_S_mem_usr_rADDR[MEM_ADDR_WIDTH-1:BYTE_SHIFT]];
+  end
+
+  `include "AXI_logic_mem.vs"  // VS_NO_GENERATE
+
+endmodule
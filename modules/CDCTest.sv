@@ -0,0 +1,44 @@
+`timescale 1ns / 1ps
+
+/*
+  Test module for the data crossings (mux and handshake) of the CDC VeriSnip script.
+*/
+module CDCTest (
+    input  logic       clk_a,
+    input  logic       rst_a,
+    input  logic       clk_b,
+    input  logic       rst_b,
+    // mux crossing, clk_a -> clk_b
+    input  logic       mux_valid_i,
+    input  logic [7:0] mux_data_i,
+    output logic       mux_valid_o,
+    output logic [7:0] mux_data_o,
+    // handshake crossing, clk_a -> clk_b
+    input  logic       hs_valid_i,
+    input  logic [7:0] hs_data_i,
+    output logic       hs_ready_o,
+    output logic       hs_valid_o,
+    output logic [7:0] hs_data_o
+);
+
+  `include "CDC_mux_signals.vs"  // VS_NO_GENERATE
+  `include "CDC_hs_signals.vs"  // VS_NO_GENERATE
+
+  assign mux_src_valid = mux_valid_i;
+  assign mux_src_data = mux_data_i;
+  assign mux_valid_o = mux_dst_valid;
+  assign mux_data_o = mux_dst_data;
+
+  assign hs_src_valid = hs_valid_i;
+  assign hs_src_data = hs_data_i;
+  assign hs_ready_o = hs_src_ready;
+  assign hs_valid_o = hs_dst_valid;
+  assign hs_data_o = hs_dst_data;
+
+  // 1. mux
+  `include "CDC_mux.vs"  // mux, 8, src_clock=clk_a, dst_clock=clk_b, src_rst=rst_a, dst_rst=rst_b
+
+  // 2. handshake
+  `include "CDC_hs.vs"  // handshake, 8, src_clock=clk_a, dst_clock=clk_b, src_rst=rst_a, dst_rst=rst_b
+
+endmodule
@@ -0,0 +1,470 @@
+`timescale 1ns / 1ps
+
+// ============================================================================
+// Testbench for AXIL_cdc (AXI-Lite clock-domain crossing, 4-entry FIFOs).
+// The testbench drives the s port from a 100 MHz clock and places an
+// AXIL_pipe_mem on the m port, whose clock is first slower (14 ns) and then
+// faster (6 ns) than the s clock. The B and R monitors check every response
+// against queues of expected IDs and data, filled at the address handshakes.
+// The directed tests stream writes and reads in both clock ratios, fill the
+// FIFOs while bready/rready are low and check the m_requests_o count.
+// ============================================================================
+
+module AXIL_cdc_tb ();
+
+  // Local parameters
+  localparam integer ADDR_WIDTH = 32;
+  localparam integer DATA_WIDTH = 32;
+  localparam integer ID_WIDTH = 2;
+  localparam integer MEM_ADDR_WIDTH = 10;
+  localparam integer COUNT_WIDTH = 16;
+  localparam integer STRB_WIDTH = DATA_WIDTH / 8;
+  localparam integer WORDS = 1 << (MEM_ADDR_WIDTH - 2);
+  localparam integer DEPTH = 4;
+  // Entries of the expected-response queues (indexes wrap around)
+  localparam integer QUEUE = 64;
+
+  // Clocks and resets (synchronous to their clock)
+  logic clk = 1'b0;
+  logic rst = 1'b1;
+  logic m_clk = 1'b0;
+  logic m_rst = 1'b1;
+  // Half period of the m clock, changed between the tests
+  integer m_half = 7;
+
+  // Clock generation: 10 ns period (100 MHz) for the s port
+  always #5 clk = ~clk;
+  always #(m_half) m_clk = ~m_clk;
+
+  // --------------------------------------------------------------------------
+  // s port (driven by the testbench) and m port (memory)
+  // --------------------------------------------------------------------------
+  logic                   awvalid;
+  logic                   awready;
+  logic [   ID_WIDTH-1:0] awid;
+  logic [ ADDR_WIDTH-1:0] awaddr;
+  logic                   wvalid;
+  logic                   wready;
+  logic [ DATA_WIDTH-1:0] wdata;
+  logic [ STRB_WIDTH-1:0] wstrb;
+  logic                   bvalid;
+  logic                   bready;
+  logic [   ID_WIDTH-1:0] bid;
+  logic                   arvalid;
+  logic                   arready;
+  logic [   ID_WIDTH-1:0] arid;
+  logic [ ADDR_WIDTH-1:0] araddr;
+  logic                   rvalid;
+  logic                   rready;
+  logic [   ID_WIDTH-1:0] rid;
+  logic [ DATA_WIDTH-1:0] rdata;
+  logic                   m_awvalid;
+  logic                   m_awready;
+  logic [   ID_WIDTH-1:0] m_awid;
+  logic [ ADDR_WIDTH-1:0] m_awaddr;
+  logic                   m_wvalid;
+  logic                   m_wready;
+  logic [ DATA_WIDTH-1:0] m_wdata;
+  logic [ STRB_WIDTH-1:0] m_wstrb;
+  logic                   m_bvalid;
+  logic                   m_bready;
+  logic [   ID_WIDTH-1:0] m_bid;
+  logic                   m_arvalid;
+  logic                   m_arready;
+  logic [   ID_WIDTH-1:0] m_arid;
+  logic [ ADDR_WIDTH-1:0] m_araddr;
+  logic                   m_rvalid;
+  logic                   m_rready;
+  logic [   ID_WIDTH-1:0] m_rid;
+  logic [ DATA_WIDTH-1:0] m_rdata;
+  logic [COUNT_WIDTH-1:0] m_requests;
+
+  // --------------------------------------------------------------------------
+  // Scoreboard
+  // --------------------------------------------------------------------------
+  integer                 errors = 0;
+  integer                 checks = 0;
+  integer                 requests = 0;
+  logic [ DATA_WIDTH-1:0] ref_mem   [WORDS];
+  // Expected responses in order, pushed at the AW and AR handshakes
+  logic [   ID_WIDTH-1:0] exp_bid   [QUEUE];
+  logic [   ID_WIDTH-1:0] exp_rid   [QUEUE];
+  logic [ DATA_WIDTH-1:0] exp_rdata [QUEUE];
+  integer                 b_head = 0;
+  integer                 b_tail = 0;
+  integer                 r_head = 0;
+  integer                 r_tail = 0;
+
+  AXIL_cdc #(
+      .AXIL_CDC_cdc_ID_W_WIDTH(ID_WIDTH),
+      .AXIL_CDC_cdc_ADDR_WIDTH(ADDR_WIDTH),
+      .AXIL_CDC_cdc_DATA_WIDTH(DATA_WIDTH),
+      .AXIL_CDC_cdc_ID_R_WIDTH(ID_WIDTH),
+      .COUNT_WIDTH            (COUNT_WIDTH)
+  ) DUT (
+      .AXIL_CDC_cdc_s_clk_i    (clk),
+      .AXIL_CDC_cdc_s_rst_i    (rst),
+      .AXIL_CDC_cdc_m_clk_i    (m_clk),
+      .AXIL_CDC_cdc_m_rst_i    (m_rst),
+      .AXIL_CDC_cdc_s_awvalid_i(awvalid),
+      .AXIL_CDC_cdc_s_awready_o(awready),
+      .AXIL_CDC_cdc_s_awid_i   (awid),
+      .AXIL_CDC_cdc_s_awaddr_i (awaddr),
+      .AXIL_CDC_cdc_s_wvalid_i (wvalid),
+      .AXIL_CDC_cdc_s_wready_o (wready),
+      .AXIL_CDC_cdc_s_wdata_i  (wdata),
+      .AXIL_CDC_cdc_s_wstrb_i  (wstrb),
+      .AXIL_CDC_cdc_s_bvalid_o (bvalid),
+      .AXIL_CDC_cdc_s_bready_i (bready),
+      .AXIL_CDC_cdc_s_bid_o    (bid),
+      .AXIL_CDC_cdc_s_arvalid_i(arvalid),
+      .AXIL_CDC_cdc_s_arready_o(arready),
+      .AXIL_CDC_cdc_s_arid_i   (arid),
+      .AXIL_CDC_cdc_s_araddr_i (araddr),
+      .AXIL_CDC_cdc_s_rvalid_o (rvalid),
+      .AXIL_CDC_cdc_s_rready_i (rready),
+      .AXIL_CDC_cdc_s_rid_o    (rid),
+      .AXIL_CDC_cdc_s_rdata_o  (rdata),
+      .AXIL_CDC_cdc_m_awvalid_o(m_awvalid),
+      .AXIL_CDC_cdc_m_awready_i(m_awready),
+      .AXIL_CDC_cdc_m_awid_o   (m_awid),
+      .AXIL_CDC_cdc_m_awaddr_o (m_awaddr),
+      .AXIL_CDC_cdc_m_wvalid_o (m_wvalid),
+      .AXIL_CDC_cdc_m_wready_i (m_wready),
+      .AXIL_CDC_cdc_m_wdata_o  (m_wdata),
+      .AXIL_CDC_cdc_m_wstrb_o  (m_wstrb),
+      .AXIL_CDC_cdc_m_bvalid_i (m_bvalid),
+      .AXIL_CDC_cdc_m_bready_o (m_bready),
+      .AXIL_CDC_cdc_m_bid_i    (m_bid),
+      .AXIL_CDC_cdc_m_arvalid_o(m_arvalid),
+      .AXIL_CDC_cdc_m_arready_i(m_arready),
+      .AXIL_CDC_cdc_m_arid_o   (m_arid),
+      .AXIL_CDC_cdc_m_araddr_o (m_araddr),
+      .AXIL_CDC_cdc_m_rvalid_i (m_rvalid),
+      .AXIL_CDC_cdc_m_rready_o (m_rready),
+      .AXIL_CDC_cdc_m_rid_i    (m_rid),
+      .AXIL_CDC_cdc_m_rdata_i  (m_rdata),
+      .m_requests_o            (m_requests)
+  );
+
+  AXIL_pipe_mem #(
+      .AXIL_pm_ADDR_WIDTH(ADDR_WIDTH),
+      .AXIL_pm_DATA_WIDTH(DATA_WIDTH),
+      .AXIL_pm_ID_W_WIDTH(ID_WIDTH),
+      .AXIL_pm_ID_R_WIDTH(ID_WIDTH),
+      .MEM_ADDR_WIDTH    (MEM_ADDR_WIDTH)
+  ) MEM (
+      .AXIL_pm_awvalid_i(m_awvalid),
+      .AXIL_pm_awready_o(m_awready),
+      .AXIL_pm_awid_i   (m_awid),
+      .AXIL_pm_awaddr_i (m_awaddr),
+      .AXIL_pm_wvalid_i (m_wvalid),
+      .AXIL_pm_wready_o (m_wready),
+      .AXIL_pm_wdata_i  (m_wdata),
+      .AXIL_pm_wstrb_i  (m_wstrb),
+      .AXIL_pm_bvalid_o (m_bvalid),
+      .AXIL_pm_bready_i (m_bready),
+      .AXIL_pm_bid_o    (m_bid),
+      .AXIL_pm_arvalid_i(m_arvalid),
+      .AXIL_pm_arready_o(m_arready),
+      .AXIL_pm_arid_i   (m_arid),
+      .AXIL_pm_araddr_i (m_araddr),
+      .AXIL_pm_rvalid_o (m_rvalid),
+      .AXIL_pm_rready_i (m_rready),
+      .AXIL_pm_rid_o    (m_rid),
+      .AXIL_pm_rdata_o  (m_rdata),
+      // Generic IOs
+      .clk_i            (m_clk),
+      .arst_i           (m_rst)
+  );
+
+  // --------------------------------------------------------------------------
+  // Helpers
+  // --------------------------------------------------------------------------
+  task automatic expect_eq(input [255:0] name, input [63:0] got, input [63:0] exp);
+    begin
+      checks = checks + 1;
+      if (got !== exp) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL %0s: expected 0x%0h, got 0x%0h", $time, name, exp, got);
+      end
+    end
+  endtask
+
+  function automatic integer word_index(input [ADDR_WIDTH-1:0] addr);
+    word_index = addr[MEM_ADDR_WIDTH-1:2];
+  endfunction
+
+  // Both resets are held for some cycles of their own clock and released at its falling edge
+  task automatic do_reset;
+    begin
+      rst     = 1'b1;
+      m_rst   = 1'b1;
+      awvalid = 1'b0;
+      awid    = '0;
+      awaddr  = '0;
+      wvalid  = 1'b0;
+      wdata   = '0;
+      wstrb   = '0;
+      bready  = 1'b1;
+      arvalid = 1'b0;
+      arid    = '0;
+      araddr  = '0;
+      rready  = 1'b1;
+      fork
+        begin
+          repeat (4) @(posedge clk);
+          @(negedge clk);
+          rst = 1'b0;
+        end
+        begin
+          repeat (4) @(posedge m_clk);
+          @(negedge m_clk);
+          m_rst = 1'b0;
+        end
+      join
+      // Let the synchronous reset of the memory de-assert
+      repeat (4) @(negedge m_clk);
+      @(negedge clk);
+    end
+  endtask
+
+  // Channel drivers of the s port: called at a negedge of clk, they return at the negedge after the handshake.
+  task automatic send_aw(input [ADDR_WIDTH-1:0] addr, input [ID_WIDTH-1:0] id);
+    begin
+      awvalid = 1'b1;
+      awaddr  = addr;
+      awid    = id;
+      @(posedge clk);
+      while (!awready) @(posedge clk);
+      exp_bid[b_tail%QUEUE] = id;
+      b_tail   = b_tail + 1;
+      requests = requests + 1;
+      @(negedge clk);
+      awvalid = 1'b0;
+    end
+  endtask
+
+  task automatic send_w(input [DATA_WIDTH-1:0] data);
+    begin
+      wvalid = 1'b1;
+      wdata  = data;
+      wstrb  = '1;
+      @(posedge clk);
+      while (!wready) @(posedge clk);
+      @(negedge clk);
+      wvalid = 1'b0;
+    end
+  endtask
+
+  task automatic send_ar(input [ADDR_WIDTH-1:0] addr, input [ID_WIDTH-1:0] id);
+    begin
+      arvalid = 1'b1;
+      araddr  = addr;
+      arid    = id;
+      @(posedge clk);
+      while (!arready) @(posedge clk);
+      exp_rid[r_tail%QUEUE]   = id;
+      exp_rdata[r_tail%QUEUE] = ref_mem[word_index(addr)];
+      r_tail   = r_tail + 1;
+      requests = requests + 1;
+      @(negedge clk);
+      arvalid = 1'b0;
+    end
+  endtask
+
+  task automatic axil_write(input [ADDR_WIDTH-1:0] addr, input [ID_WIDTH-1:0] id, input [DATA_WIDTH-1:0] data);
+    begin
+      fork
+        send_aw(addr, id);
+        send_w(data);
+      join
+      ref_mem[word_index(addr)] = data;
+    end
+  endtask
+
+  task automatic wait_responses;
+    begin
+      while (b_head != b_tail || r_head != r_tail) @(negedge clk);
+    end
+  endtask
+
+  // --------------------------------------------------------------------------
+  // Response monitors
+  // --------------------------------------------------------------------------
+  logic                         b_stalled = 1'b0;
+  logic [         ID_WIDTH-1:0] b_stalled_id;
+  logic                         r_stalled = 1'b0;
+  logic [ID_WIDTH+DATA_WIDTH-1:0] r_stalled_beat;
+
+  always @(posedge clk) begin
+    if (!rst) begin
+      // A response that waited for ready must be presented again unchanged
+      if (b_stalled) begin
+        expect_eq("bvalid held", bvalid, 1'b1);
+        expect_eq("bid held", bid, b_stalled_id);
+      end
+      if (r_stalled) begin
+        expect_eq("rvalid held", rvalid, 1'b1);
+        expect_eq("R held", {rid, rdata}, r_stalled_beat);
+      end
+      b_stalled      = bvalid && !bready;
+      b_stalled_id   = bid;
+      r_stalled      = rvalid && !rready;
+      r_stalled_beat = {rid, rdata};
+
+      if (bvalid && bready) begin
+        if (b_head == b_tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL B response (ID %0d) without an outstanding write", $time, bid);
+        end else begin
+          expect_eq("bid", bid, exp_bid[b_head%QUEUE]);
+          b_head = b_head + 1;
+        end
+      end
+      if (rvalid && rready) begin
+        if (r_head == r_tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL R response (ID %0d) without an outstanding read", $time, rid);
+        end else begin
+          expect_eq("rid", rid, exp_rid[r_head%QUEUE]);
+          expect_eq("rdata", rdata, exp_rdata[r_head%QUEUE]);
+          r_head = r_head + 1;
+        end
+      end
+    end
+  end
+
+  // --------------------------------------------------------------------------
+  // Main stimulus
+  // --------------------------------------------------------------------------
+  integer i;
+  integer accepted;
+  time    start;
+
+  // Writes then reads of 32 words from base, back to back; returns the time of each stream
+  task automatic stream(input [ADDR_WIDTH-1:0] base, input [DATA_WIDTH-1:0] seed, output time writes,
+                        output time reads);
+    time t;
+    begin
+      t = $time;
+      for (int k = 0; k < 32; k++) axil_write(base + 4 * k, k[ID_WIDTH-1:0], seed + k);
+      wait_responses;
+      writes = $time - t;
+      t = $time;
+      for (int k = 0; k < 32; k++) send_ar(base + 4 * k, k[ID_WIDTH-1:0]);
+      wait_responses;
+      reads = $time - t;
+    end
+  endtask
+
+  time writes;
+  time reads;
+
+  initial begin
+    $display("==================================================");
+    $display(" AXIL_cdc testbench");
+    $display("==================================================");
+
+    do_reset;
+
+    // ---- Test 0: idle interface state after reset -------------------------
+    $display("\n--- Test 0: reset / idle state ---");
+    expect_eq("awready idle", awready, 1'b1);
+    expect_eq("wready idle", wready, 1'b1);
+    expect_eq("arready idle", arready, 1'b1);
+    expect_eq("bvalid idle", bvalid, 1'b0);
+    expect_eq("rvalid idle", rvalid, 1'b0);
+    expect_eq("m requests idle", m_requests, 0);
+
+    // ---- Test 1: single write followed by read-back -----------------------
+    $display("\n--- Test 1: single write + read-back ---");
+    axil_write(32'h0000_0000, 2'd1, 32'hDEAD_BEEF);
+    wait_responses;
+    send_ar(32'h0000_0000, 2'd2);
+    wait_responses;
+    expect_eq("word in memory", MEM.memory[0], 32'hDEAD_BEEF);
+
+    // ---- Test 2: streams towards a slower m clock -------------------------
+    // The m port sets the pace: at most 1.5 m cycles per transaction, latency included
+    $display("\n--- Test 2: slow m clock ---");
+    stream(32'h0000_0100, 32'h2000_0000, writes, reads);
+    expect_eq("32 writes at the m clock rate", writes <= 32 * 3 * m_half, 1'b1);
+    expect_eq("32 reads at the m clock rate", reads <= 32 * 3 * m_half, 1'b1);
+
+    // ---- Test 3: writes while bready is low -------------------------------
+    // The B FIFO fills, then the AW/W FIFOs: the s port stops accepting writes
+    $display("\n--- Test 3: FIFOs fill while bready is low ---");
+    bready = 1'b0;
+    fork
+      for (int k = 0; k < 40; k++) axil_write(32'h0000_0200 + 4 * k, k[ID_WIDTH-1:0], 32'h3000_0000 + k);
+      begin
+        repeat (80) @(negedge clk);
+        accepted = b_tail - b_head;
+        expect_eq("writes accepted while bready is low", accepted >= DEPTH && accepted < 40, 1'b1);
+        expect_eq("awready with full FIFOs", awready, 1'b0);
+        bready = 1'b1;
+      end
+    join
+    wait_responses;
+    for (i = 0; i < 40; i = i + 1) send_ar(32'h0000_0200 + (i << 2), i[ID_WIDTH-1:0]);
+    wait_responses;
+
+    // ---- Test 4: reads while rready is low --------------------------------
+    $display("\n--- Test 4: FIFOs fill while rready is low ---");
+    rready = 1'b0;
+    fork
+      for (int k = 0; k < 24; k++) send_ar(32'h0000_0100 + 4 * k, k[ID_WIDTH-1:0]);
+      begin
+        repeat (60) @(negedge clk);
+        expect_eq("arready with full FIFOs", arready, 1'b0);
+        rready = 1'b1;
+      end
+    join
+    wait_responses;
+
+    // ---- Test 5: streams towards a faster m clock -------------------------
+    // The s port sets the pace: at most 1.5 s cycles per transaction, latency included
+    $display("\n--- Test 5: fast m clock ---");
+    @(posedge m_clk);
+    m_half = 3;
+    @(negedge clk);
+    stream(32'h0000_0300, 32'h5000_0000, writes, reads);
+    expect_eq("32 writes at the s clock rate", writes <= 32 * 15, 1'b1);
+    expect_eq("32 reads at the s clock rate", reads <= 32 * 15, 1'b1);
+    fork
+      for (int k = 0; k < 32; k++) axil_write(32'h0000_0380 + 4 * k, k[ID_WIDTH-1:0], 32'h5500_0000 + k);
+      for (int k = 0; k < 32; k++) send_ar(32'h0000_0300 + 4 * k, k[ID_WIDTH-1:0]);
+    join
+    wait_responses;
+
+    // ---- Test 6: requests counted in the m clock domain -------------------
+    $display("\n--- Test 6: m request count ---");
+    repeat (2) @(negedge m_clk);
+    expect_eq("m requests", m_requests, requests);
+
+    // ---- Summary ----------------------------------------------------------
+    repeat (2) @(posedge clk);
+    $display("\n==================================================");
+    $display(" Checks run : %0d", checks);
+    $display(" Errors     : %0d", errors);
+    if (errors == 0) $display(" RESULT     : PASS");
+    else $display(" RESULT     : FAIL");
+    $display("==================================================");
+    $finish;
+  end
+
+  // Watchdog to avoid a hung simulation
+  initial begin
+    #100000;
+    $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
+    $finish;
+  end
+
+  // Dump waves
+  initial begin
+    $dumpfile("AXIL_cdc_tb.vcd");
+    $dumpvars(0, AXIL_cdc_tb);
+  end
+
+endmodule
@@ -21,6 +21,11 @@ module AXIL_mem_tb ();
   localparam integer STRB_WIDTH = AXIL_DATA_WIDTH / 8;
   // Number of addressable words (memory index is addr[MEM_ADDR_WIDTH-1:2]).
   localparam integer WORDS = 1 << (MEM_ADDR_WIDTH - 2);
+  // Largest number of golden vectors (+golden=N) the testbench can load.
+  localparam integer GOLDEN_MAX = 1 << 20;
+  // Golden vector fields: {is_write, id, wstrb, word, wdata} and {known_bytes, id, rdata}.
+  localparam integer GOLDEN_STIM_W = 1 + AXIL_ID_W_WIDTH + STRB_WIDTH + (MEM_ADDR_WIDTH - 2) + AXIL_DATA_WIDTH;
+  localparam integer GOLDEN_EXP_W = STRB_WIDTH + AXIL_ID_R_WIDTH + AXIL_DATA_WIDTH;
 
   // Clock and reset
   reg clk = 1'b0;
@@ -64,6 +69,11 @@ module AXIL_mem_tb ();
   integer                       checks = 0;
   reg     [AXIL_DATA_WIDTH-1:0] ref_mem        [WORDS];
 
+  // Golden vectors from scripts/tb_models.py, one AXI-Lite transaction each.
+  integer                       golden_vectors = 0;
+  reg     [  GOLDEN_STIM_W-1:0] golden_stimulus[0:GOLDEN_MAX-1];
+  reg     [   GOLDEN_EXP_W-1:0] golden_expected[0:GOLDEN_MAX-1];
+
   AXIL_mem #(
       .AXIL_ADDR_WIDTH(AXIL_ADDR_WIDTH),
       .AXIL_DATA_WIDTH(AXIL_DATA_WIDTH),
@@ -176,7 +186,14 @@ module AXIL_mem_tb ();
   // Checks the returned data against the reference model and the returned ID.
   // --------------------------------------------------------------------------
   task axil_read(input [AXIL_ADDR_WIDTH-1:0] addr, input [AXIL_ID_R_WIDTH-1:0] id);
-    reg [AXIL_DATA_WIDTH-1:0] exp;
+    begin
+      axil_read_expect(addr, id, ref_mem[word_index(addr)], {AXIL_DATA_WIDTH{1'b1}});
+    end
+  endtask
+
+  // Read transaction that only checks the data bits set in mask.
+  task axil_read_expect(input [AXIL_ADDR_WIDTH-1:0] addr, input [AXIL_ID_R_WIDTH-1:0] id,
+                        input [AXIL_DATA_WIDTH-1:0] exp, input [AXIL_DATA_WIDTH-1:0] mask);
     begin
       @(negedge clk);
       AXIL_arvalid_i = 1'b1;
@@ -188,12 +205,44 @@ module AXIL_mem_tb ();
       AXIL_arvalid_i = 1'b0;
 
       while (!AXIL_rvalid_o) @(negedge clk);
-      exp = ref_mem[word_index(addr)];
-      expect_eq("read RDATA", AXIL_rdata_o, exp);
+      expect_eq("read RDATA", AXIL_rdata_o & mask, exp & mask);
       expect_eq("read RID", AXIL_rid_o, id);
     end
   endtask
 
+  // --------------------------------------------------------------------------
+  // Golden vectors. Bytes not written since the memory came up are X in the
+  // DUT, so the model marks which bytes of every read are known.
+  // --------------------------------------------------------------------------
+  task axil_golden;
+    integer                      v;
+    integer                      b;
+    reg                          is_write;
+    reg  [  AXIL_ID_W_WIDTH-1:0] id;
+    reg  [       STRB_WIDTH-1:0] strb;
+    reg  [   MEM_ADDR_WIDTH-3:0] word;
+    reg  [  AXIL_DATA_WIDTH-1:0] data;
+    reg  [       STRB_WIDTH-1:0] known;
+    reg  [  AXIL_ID_R_WIDTH-1:0] exp_id;
+    reg  [  AXIL_DATA_WIDTH-1:0] exp_data;
+    reg  [  AXIL_DATA_WIDTH-1:0] mask;
+    begin
+      $display("\n--- Golden: %0d transactions ---", golden_vectors);
+      $readmemh("AXIL_mem_stimulus.hex", golden_stimulus, 0, golden_vectors - 1);
+      $readmemh("AXIL_mem_expected.hex", golden_expected, 0, golden_vectors - 1);
+      for (v = 0; v < golden_vectors; v = v + 1) begin
+        {is_write, id, strb, word, data} = golden_stimulus[v];
+        {known, exp_id, exp_data} = golden_expected[v];
+        if (is_write) begin
+          axil_write(word << $clog2(STRB_WIDTH), id, data, strb);
+        end else begin
+          for (b = 0; b < STRB_WIDTH; b = b + 1) mask[8*b+:8] = {8{known[b]}};
+          axil_read_expect(word << $clog2(STRB_WIDTH), exp_id, exp_data, mask);
+        end
+      end
+    end
+  endtask
+
   // --------------------------------------------------------------------------
   // Main stimulus
   // --------------------------------------------------------------------------
@@ -635,6 +684,15 @@ module AXIL_mem_tb ();
     ref_mem[word_index(32'h0000_0900)] = 32'h5566_7788;
     axil_read(32'h0000_0900, 2'd3);
 
+    // ---- Golden vectors (+golden=N) ---------------------------------------
+    if (golden_vectors > GOLDEN_MAX) begin
+      errors = errors + 1;
+      $display("FAIL +golden=%0d is larger than GOLDEN_MAX=%0d", golden_vectors, GOLDEN_MAX);
+    end else if (golden_vectors > 0) begin
+      do_reset;
+      axil_golden;
+    end
+
     // ---- Summary ----------------------------------------------------------
     repeat (2) @(posedge clk);
     $display("\n==================================================");
@@ -646,17 +704,20 @@ module AXIL_mem_tb ();
     $finish;
   end
 
-  // Watchdog to avoid a hung simulation.
+  // Watchdog to avoid a hung simulation, extended by ten clock periods per golden transaction.
   initial begin
-    #50000;
+    if (!$value$plusargs("golden=%d", golden_vectors)) golden_vectors = 0;
+    #(50000 + 100 * golden_vectors);
     $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
     $finish;
   end
 
-  // Dump waves
+  // Dump waves (not for golden runs, which can be millions of cycles long)
   initial begin
-    $dumpfile("AXIL_mem_tb.vcd");
-    $dumpvars(0, AXIL_mem_tb);
+    if (!$test$plusargs("golden")) begin
+      $dumpfile("AXIL_mem_tb.vcd");
+      $dumpvars(0, AXIL_mem_tb);
+    end
   end
 
 endmodule
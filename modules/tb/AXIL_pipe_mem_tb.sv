@@ -0,0 +1,404 @@
+`timescale 1ns / 1ps
+
+// ============================================================================
+// Testbench for AXIL_pipe_mem (pipelined AXI-Lite subordinate, 4 outstanding).
+// Transactions are issued back to back without waiting for their responses:
+// the B and R monitors check every response against queues of expected IDs
+// and data, filled at the address handshakes. The directed tests check one
+// write and one read per cycle, the AW/W and AR FIFOs filling up while
+// bready/rready are low, and W data arriving before its address.
+// ============================================================================
+
+module AXIL_pipe_mem_tb ();
+
+  // Local parameters
+  localparam integer ADDR_WIDTH = 32;
+  localparam integer DATA_WIDTH = 32;
+  localparam integer ID_WIDTH = 2;
+  localparam integer MEM_ADDR_WIDTH = 10;
+  localparam integer STRB_WIDTH = DATA_WIDTH / 8;
+  localparam integer WORDS = 1 << (MEM_ADDR_WIDTH - 2);
+  localparam integer OUTSTANDING = 4;
+  // Entries of the expected-response queues (indexes wrap around)
+  localparam integer QUEUE = 64;
+
+  // Clock and reset
+  logic clk = 1'b0;
+  logic arst = 1'b1;
+
+  // Clock generation: 10 ns period (100 MHz)
+  always #5 clk = ~clk;
+
+  // --------------------------------------------------------------------------
+  // DUT connections
+  // --------------------------------------------------------------------------
+  logic                  awvalid;
+  logic                  awready;
+  logic [  ID_WIDTH-1:0] awid;
+  logic [ADDR_WIDTH-1:0] awaddr;
+  logic                  wvalid;
+  logic                  wready;
+  logic [DATA_WIDTH-1:0] wdata;
+  logic [STRB_WIDTH-1:0] wstrb;
+  logic                  bvalid;
+  logic                  bready;
+  logic [  ID_WIDTH-1:0] bid;
+  logic                  arvalid;
+  logic                  arready;
+  logic [  ID_WIDTH-1:0] arid;
+  logic [ADDR_WIDTH-1:0] araddr;
+  logic                  rvalid;
+  logic                  rready;
+  logic [  ID_WIDTH-1:0] rid;
+  logic [DATA_WIDTH-1:0] rdata;
+
+  // --------------------------------------------------------------------------
+  // Scoreboard
+  // --------------------------------------------------------------------------
+  integer                errors = 0;
+  integer                checks = 0;
+  logic [DATA_WIDTH-1:0] ref_mem   [WORDS];
+  // Expected responses in order, pushed at the AW and AR handshakes
+  logic [  ID_WIDTH-1:0] exp_bid   [QUEUE];
+  logic [  ID_WIDTH-1:0] exp_rid   [QUEUE];
+  logic [DATA_WIDTH-1:0] exp_rdata [QUEUE];
+  integer                b_head = 0;
+  integer                b_tail = 0;
+  integer                r_head = 0;
+  integer                r_tail = 0;
+
+  AXIL_pipe_mem #(
+      .AXIL_pm_ADDR_WIDTH(ADDR_WIDTH),
+      .AXIL_pm_DATA_WIDTH(DATA_WIDTH),
+      .AXIL_pm_ID_W_WIDTH(ID_WIDTH),
+      .AXIL_pm_ID_R_WIDTH(ID_WIDTH),
+      .MEM_ADDR_WIDTH    (MEM_ADDR_WIDTH)
+  ) DUT (
+      .AXIL_pm_awvalid_i(awvalid),
+      .AXIL_pm_awready_o(awready),
+      .AXIL_pm_awid_i   (awid),
+      .AXIL_pm_awaddr_i (awaddr),
+      .AXIL_pm_wvalid_i (wvalid),
+      .AXIL_pm_wready_o (wready),
+      .AXIL_pm_wdata_i  (wdata),
+      .AXIL_pm_wstrb_i  (wstrb),
+      .AXIL_pm_bvalid_o (bvalid),
+      .AXIL_pm_bready_i (bready),
+      .AXIL_pm_bid_o    (bid),
+      .AXIL_pm_arvalid_i(arvalid),
+      .AXIL_pm_arready_o(arready),
+      .AXIL_pm_arid_i   (arid),
+      .AXIL_pm_araddr_i (araddr),
+      .AXIL_pm_rvalid_o (rvalid),
+      .AXIL_pm_rready_i (rready),
+      .AXIL_pm_rid_o    (rid),
+      .AXIL_pm_rdata_o  (rdata),
+      // Generic IOs
+      .clk_i            (clk),
+      .arst_i           (arst)
+  );
+
+  // --------------------------------------------------------------------------
+  // Helpers
+  // --------------------------------------------------------------------------
+  function automatic integer word_index(input [ADDR_WIDTH-1:0] addr);
+    word_index = (addr >> $clog2(STRB_WIDTH)) & (WORDS - 1);
+  endfunction
+
+  task automatic expect_eq(input [255:0] name, input [63:0] got, input [63:0] exp);
+    begin
+      checks = checks + 1;
+      if (got !== exp) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL %0s: expected 0x%0h, got 0x%0h", $time, name, exp, got);
+      end
+    end
+  endtask
+
+  task automatic do_reset;
+    begin
+      arst    = 1'b1;
+      awvalid = 1'b0;
+      awid    = '0;
+      awaddr  = '0;
+      wvalid  = 1'b0;
+      wdata   = '0;
+      wstrb   = '0;
+      bready  = 1'b1;
+      arvalid = 1'b0;
+      arid    = '0;
+      araddr  = '0;
+      rready  = 1'b1;
+      repeat (4) @(posedge clk);
+      @(negedge clk);
+      arst = 1'b0;
+      // Let the synchronous reset de-assert
+      repeat (3) @(negedge clk);
+    end
+  endtask
+
+  // Channel drivers: called at a negedge, they return at the negedge after the handshake, so
+  // consecutive calls present a new transfer every cycle.
+  task automatic send_aw(input [ADDR_WIDTH-1:0] addr, input [ID_WIDTH-1:0] id);
+    begin
+      awvalid = 1'b1;
+      awaddr  = addr;
+      awid    = id;
+      @(posedge clk);
+      while (!awready) @(posedge clk);
+      exp_bid[b_tail%QUEUE] = id;
+      b_tail = b_tail + 1;
+      @(negedge clk);
+      awvalid = 1'b0;
+    end
+  endtask
+
+  task automatic send_w(input [DATA_WIDTH-1:0] data, input [STRB_WIDTH-1:0] strb);
+    begin
+      wvalid = 1'b1;
+      wdata  = data;
+      wstrb  = strb;
+      @(posedge clk);
+      while (!wready) @(posedge clk);
+      @(negedge clk);
+      wvalid = 1'b0;
+    end
+  endtask
+
+  task automatic send_ar(input [ADDR_WIDTH-1:0] addr, input [ID_WIDTH-1:0] id);
+    begin
+      arvalid = 1'b1;
+      araddr  = addr;
+      arid    = id;
+      @(posedge clk);
+      while (!arready) @(posedge clk);
+      exp_rid[r_tail%QUEUE]   = id;
+      exp_rdata[r_tail%QUEUE] = ref_mem[word_index(addr)];
+      r_tail = r_tail + 1;
+      @(negedge clk);
+      arvalid = 1'b0;
+    end
+  endtask
+
+  task automatic update_ref(input [ADDR_WIDTH-1:0] addr, input [DATA_WIDTH-1:0] data,
+                            input [STRB_WIDTH-1:0] strb);
+    begin
+      for (int b = 0; b < STRB_WIDTH; b++) if (strb[b]) ref_mem[word_index(addr)][8*b+:8] = data[8*b+:8];
+    end
+  endtask
+
+  task automatic axil_write(input [ADDR_WIDTH-1:0] addr, input [ID_WIDTH-1:0] id,
+                            input [DATA_WIDTH-1:0] data, input [STRB_WIDTH-1:0] strb);
+    begin
+      fork
+        send_aw(addr, id);
+        send_w(data, strb);
+      join
+      update_ref(addr, data, strb);
+    end
+  endtask
+
+  task automatic wait_responses;
+    begin
+      while (b_head != b_tail || r_head != r_tail) @(negedge clk);
+    end
+  endtask
+
+  // --------------------------------------------------------------------------
+  // Response monitors
+  // --------------------------------------------------------------------------
+  always @(posedge clk) begin
+    if (!arst && bvalid && bready) begin
+      if (b_head == b_tail) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL B response (ID %0d) without an outstanding write", $time, bid);
+      end else begin
+        expect_eq("BID", bid, exp_bid[b_head%QUEUE]);
+        b_head = b_head + 1;
+      end
+    end
+    if (!arst && rvalid && rready) begin
+      if (r_head == r_tail) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL R response (ID %0d) without an outstanding read", $time, rid);
+      end else begin
+        expect_eq("RID", rid, exp_rid[r_head%QUEUE]);
+        expect_eq("RDATA", rdata, exp_rdata[r_head%QUEUE]);
+        r_head = r_head + 1;
+      end
+    end
+  end
+
+  // --------------------------------------------------------------------------
+  // Main stimulus
+  // --------------------------------------------------------------------------
+  integer i;
+  integer accepted;
+  time    start;
+
+  initial begin
+    $display("==================================================");
+    $display(" AXIL_pipe_mem testbench");
+    $display("==================================================");
+
+    do_reset;
+
+    // ---- Test 0: idle interface state after reset -------------------------
+    $display("\n--- Test 0: reset / idle state ---");
+    expect_eq("awready idle", awready, 1'b1);
+    expect_eq("wready idle", wready, 1'b1);
+    expect_eq("arready idle", arready, 1'b1);
+    expect_eq("bvalid idle", bvalid, 1'b0);
+    expect_eq("rvalid idle", rvalid, 1'b0);
+
+    // ---- Test 1: single write followed by read-back -----------------------
+    $display("\n--- Test 1: single write + read-back ---");
+    axil_write(32'h0000_0000, 2'd1, 32'hDEAD_BEEF, 4'hF);
+    wait_responses;
+    send_ar(32'h0000_0000, 2'd2);
+    wait_responses;
+
+    // ---- Test 2: one write per cycle, then one read per cycle -------------
+    $display("\n--- Test 2: back-to-back writes and reads ---");
+    start = $time;
+    for (i = 0; i < 16; i = i + 1) axil_write(32'h0000_0100 + (i << 2), i[ID_WIDTH-1:0], 32'h1000_0000 + i * 32'h0101_0101, 4'hF);
+    expect_eq("cycles for 16 writes", ($time - start) / 10, 16);
+    wait_responses;
+    start = $time;
+    for (i = 0; i < 16; i = i + 1) send_ar(32'h0000_0100 + (i << 2), i[ID_WIDTH-1:0]);
+    expect_eq("cycles for 16 reads", ($time - start) / 10, 16);
+    wait_responses;
+
+    // ---- Test 3: byte write strobes ---------------------------------------
+    $display("\n--- Test 3: byte write strobes ---");
+    axil_write(32'h0000_0200, 2'd0, 32'hFFFF_FFFF, 4'hF);
+    axil_write(32'h0000_0200, 2'd2, 32'h1122_3344, 4'b0101);
+    axil_write(32'h0000_0200, 2'd3, 32'hAABB_CCDD, 4'b1000);
+    wait_responses;
+    send_ar(32'h0000_0200, 2'd1);  // expect 0xAA22FF44
+    wait_responses;
+    expect_eq("strobed word", ref_mem[word_index(32'h0000_0200)], 32'hAA22_FF44);
+
+    // ---- Test 4: writes while bready is low -------------------------------
+    // The B register holds one response and the AW/W FIFOs queue OUTSTANDING more.
+    $display("\n--- Test 4: write FIFOs fill while bready is low ---");
+    bready   = 1'b0;
+    accepted = 0;
+    for (i = 0; i < 12; i = i + 1) begin
+      awvalid = 1'b1;
+      awaddr  = 32'h0000_0300 + (accepted << 2);
+      awid    = accepted[ID_WIDTH-1:0];
+      wvalid  = 1'b1;
+      wdata   = 32'h3000_0000 + accepted;
+      wstrb   = 4'hF;
+      @(posedge clk);
+      if (awready && wready) begin
+        exp_bid[b_tail%QUEUE] = awid;
+        b_tail = b_tail + 1;
+        update_ref(awaddr, wdata, wstrb);
+        accepted = accepted + 1;
+      end
+      @(negedge clk);
+    end
+    expect_eq("writes accepted with bready low", accepted, OUTSTANDING + 1);
+    expect_eq("awready while full", awready, 1'b0);
+    expect_eq("wready while full", wready, 1'b0);
+    expect_eq("bvalid held", bvalid, 1'b1);
+    expect_eq("bid held", bid, 2'd0);
+    // The pending write stays valid until it is accepted
+    bready = 1'b1;
+    @(posedge clk);
+    while (!(awready && wready)) @(posedge clk);
+    exp_bid[b_tail%QUEUE] = awid;
+    b_tail = b_tail + 1;
+    update_ref(awaddr, wdata, wstrb);
+    @(negedge clk);
+    awvalid = 1'b0;
+    wvalid  = 1'b0;
+    wait_responses;
+    for (i = 0; i < OUTSTANDING + 2; i = i + 1) send_ar(32'h0000_0300 + (i << 2), i[ID_WIDTH-1:0]);
+    wait_responses;
+
+    // ---- Test 5: reads while rready is low --------------------------------
+    $display("\n--- Test 5: read FIFO fills while rready is low ---");
+    rready   = 1'b0;
+    accepted = 0;
+    for (i = 0; i < 12; i = i + 1) begin
+      arvalid = 1'b1;
+      araddr  = 32'h0000_0100 + (accepted << 2);
+      arid    = accepted[ID_WIDTH-1:0];
+      @(posedge clk);
+      if (arready) begin
+        exp_rid[r_tail%QUEUE]   = arid;
+        exp_rdata[r_tail%QUEUE] = ref_mem[word_index(araddr)];
+        r_tail = r_tail + 1;
+        accepted = accepted + 1;
+      end
+      @(negedge clk);
+    end
+    expect_eq("reads accepted with rready low", accepted, OUTSTANDING + 1);
+    expect_eq("arready while full", arready, 1'b0);
+    expect_eq("rvalid held", rvalid, 1'b1);
+    expect_eq("rdata held", rdata, 32'h1000_0000);
+    rready = 1'b1;
+    @(posedge clk);
+    while (!arready) @(posedge clk);
+    exp_rid[r_tail%QUEUE]   = arid;
+    exp_rdata[r_tail%QUEUE] = ref_mem[word_index(araddr)];
+    r_tail = r_tail + 1;
+    @(negedge clk);
+    arvalid = 1'b0;
+    wait_responses;
+
+    // ---- Test 6: write data before its address ----------------------------
+    $display("\n--- Test 6: W before AW ---");
+    send_w(32'h600D_F00D, 4'hF);
+    repeat (3) @(negedge clk);
+    expect_eq("no B before AW", bvalid, 1'b0);
+    send_aw(32'h0000_0400, 2'd3);
+    update_ref(32'h0000_0400, 32'h600D_F00D, 4'hF);
+    wait_responses;
+    send_ar(32'h0000_0400, 2'd3);
+    wait_responses;
+
+    // ---- Test 7: one read and one write per cycle together ----------------
+    $display("\n--- Test 7: simultaneous back-to-back reads and writes ---");
+    start = $time;
+    fork
+      begin : write_thread
+        for (int w = 0; w < 16; w++) axil_write(32'h0000_0500 + (w << 2), 2'd1, 32'hC3C3_0000 + w, 4'hF);
+      end
+      begin : read_thread
+        for (int r = 0; r < 16; r++) send_ar(32'h0000_0100 + (r << 2), 2'd2);
+      end
+    join
+    expect_eq("cycles for 16 reads and 16 writes", ($time - start) / 10, 16);
+    wait_responses;
+    for (i = 0; i < 16; i = i + 1) send_ar(32'h0000_0500 + (i << 2), 2'd0);
+    wait_responses;
+
+    // ---- Summary ----------------------------------------------------------
+    repeat (2) @(posedge clk);
+    $display("\n==================================================");
+    $display(" Checks run : %0d", checks);
+    $display(" Errors     : %0d", errors);
+    if (errors == 0) $display(" RESULT     : PASS");
+    else $display(" RESULT     : FAIL");
+    $display("==================================================");
+    $finish;
+  end
+
+  // Watchdog to avoid a hung simulation
+  initial begin
+    #50000;
+    $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
+    $finish;
+  end
+
+  // Dump waves
+  initial begin
+    $dumpfile("AXIL_pipe_mem_tb.vcd");
+    $dumpvars(0, AXIL_pipe_mem_tb);
+  end
+
+endmodule
@@ -0,0 +1,484 @@
+`timescale 1ns / 1ps
+
+// ============================================================================
+// Testbench for AXIL_xbar (AXI-Lite crossbar, 2 managers, 2 subordinates).
+// The testbench drives both manager ports (index 0 = cpu, 1 = dma) and places
+// an AXIL_pipe_mem behind each subordinate port. A reference model of the
+// address map gives the expected read data (0 for unmapped addresses) and
+// the B/R monitors check the responses of each manager in order. The directed
+// tests check routing, that different manager/subordinate pairs transfer
+// concurrently, round-robin sharing of one subordinate, and the error
+// subordinate (ID echoed, read data 0, unmapped_o count).
+// ============================================================================
+
+module AXIL_xbar_tb ();
+
+  // Local parameters
+  localparam integer ADDR_WIDTH = 32;
+  localparam integer DATA_WIDTH = 32;
+  localparam integer ID_WIDTH = 2;
+  localparam integer MEM_ADDR_WIDTH = 10;
+  localparam integer COUNT_WIDTH = 16;
+  localparam integer STRB_WIDTH = DATA_WIDTH / 8;
+  localparam integer WORDS = 1 << (MEM_ADDR_WIDTH - 2);
+  localparam logic [ADDR_WIDTH-1:0] RAM1_BASE = 32'h0000_1000;
+  // Entries of the expected-response queues (indexes wrap around)
+  localparam integer QUEUE = 64;
+
+  // Clock and reset
+  logic clk = 1'b0;
+  logic arst = 1'b1;
+
+  // Clock generation: 10 ns period (100 MHz)
+  always #5 clk = ~clk;
+
+  // --------------------------------------------------------------------------
+  // Manager ports (driven by the testbench) and subordinate ports (memories)
+  // --------------------------------------------------------------------------
+  logic                   awvalid   [2];
+  logic                   awready   [2];
+  logic [   ID_WIDTH-1:0] awid      [2];
+  logic [ ADDR_WIDTH-1:0] awaddr    [2];
+  logic                   wvalid    [2];
+  logic                   wready    [2];
+  logic [ DATA_WIDTH-1:0] wdata     [2];
+  logic [ STRB_WIDTH-1:0] wstrb     [2];
+  logic                   bvalid    [2];
+  logic                   bready    [2];
+  logic [   ID_WIDTH-1:0] bid       [2];
+  logic                   arvalid   [2];
+  logic                   arready   [2];
+  logic [   ID_WIDTH-1:0] arid      [2];
+  logic [ ADDR_WIDTH-1:0] araddr    [2];
+  logic                   rvalid    [2];
+  logic                   rready    [2];
+  logic [   ID_WIDTH-1:0] rid       [2];
+  logic [ DATA_WIDTH-1:0] rdata     [2];
+  logic                   s_awvalid [2];
+  logic                   s_awready [2];
+  logic [   ID_WIDTH-1:0] s_awid    [2];
+  logic [ ADDR_WIDTH-1:0] s_awaddr  [2];
+  logic                   s_wvalid  [2];
+  logic                   s_wready  [2];
+  logic [ DATA_WIDTH-1:0] s_wdata   [2];
+  logic [ STRB_WIDTH-1:0] s_wstrb   [2];
+  logic                   s_bvalid  [2];
+  logic                   s_bready  [2];
+  logic [   ID_WIDTH-1:0] s_bid     [2];
+  logic                   s_arvalid [2];
+  logic                   s_arready [2];
+  logic [   ID_WIDTH-1:0] s_arid    [2];
+  logic [ ADDR_WIDTH-1:0] s_araddr  [2];
+  logic                   s_rvalid  [2];
+  logic                   s_rready  [2];
+  logic [   ID_WIDTH-1:0] s_rid     [2];
+  logic [ DATA_WIDTH-1:0] s_rdata   [2];
+  logic [COUNT_WIDTH-1:0] unmapped;
+
+  // --------------------------------------------------------------------------
+  // Scoreboard
+  // --------------------------------------------------------------------------
+  integer                 errors = 0;
+  integer                 checks = 0;
+  logic [ DATA_WIDTH-1:0] ref_mem   [2][WORDS];
+  // Expected responses of each manager in order, pushed at the AW and AR handshakes
+  logic [   ID_WIDTH-1:0] exp_bid   [2][QUEUE];
+  logic [   ID_WIDTH-1:0] exp_rid   [2][QUEUE];
+  logic [ DATA_WIDTH-1:0] exp_rdata [2][QUEUE];
+  integer                 b_head    [2];
+  integer                 b_tail    [2];
+  integer                 r_head    [2];
+  integer                 r_tail    [2];
+
+  AXIL_xbar #(
+      .AXIL_X_xbar_ID_W_WIDTH(ID_WIDTH),
+      .AXIL_X_xbar_ADDR_WIDTH(ADDR_WIDTH),
+      .AXIL_X_xbar_DATA_WIDTH(DATA_WIDTH),
+      .AXIL_X_xbar_ID_R_WIDTH(ID_WIDTH),
+      .COUNT_WIDTH           (COUNT_WIDTH)
+  ) DUT (
+      .AXIL_X_xbar_cpu_awvalid_i (awvalid[0]),
+      .AXIL_X_xbar_cpu_awready_o (awready[0]),
+      .AXIL_X_xbar_cpu_awid_i    (awid[0]),
+      .AXIL_X_xbar_cpu_awaddr_i  (awaddr[0]),
+      .AXIL_X_xbar_cpu_wvalid_i  (wvalid[0]),
+      .AXIL_X_xbar_cpu_wready_o  (wready[0]),
+      .AXIL_X_xbar_cpu_wdata_i   (wdata[0]),
+      .AXIL_X_xbar_cpu_wstrb_i   (wstrb[0]),
+      .AXIL_X_xbar_cpu_bvalid_o  (bvalid[0]),
+      .AXIL_X_xbar_cpu_bready_i  (bready[0]),
+      .AXIL_X_xbar_cpu_bid_o     (bid[0]),
+      .AXIL_X_xbar_cpu_arvalid_i (arvalid[0]),
+      .AXIL_X_xbar_cpu_arready_o (arready[0]),
+      .AXIL_X_xbar_cpu_arid_i    (arid[0]),
+      .AXIL_X_xbar_cpu_araddr_i  (araddr[0]),
+      .AXIL_X_xbar_cpu_rvalid_o  (rvalid[0]),
+      .AXIL_X_xbar_cpu_rready_i  (rready[0]),
+      .AXIL_X_xbar_cpu_rid_o     (rid[0]),
+      .AXIL_X_xbar_cpu_rdata_o   (rdata[0]),
+      .AXIL_X_xbar_dma_awvalid_i (awvalid[1]),
+      .AXIL_X_xbar_dma_awready_o (awready[1]),
+      .AXIL_X_xbar_dma_awid_i    (awid[1]),
+      .AXIL_X_xbar_dma_awaddr_i  (awaddr[1]),
+      .AXIL_X_xbar_dma_wvalid_i  (wvalid[1]),
+      .AXIL_X_xbar_dma_wready_o  (wready[1]),
+      .AXIL_X_xbar_dma_wdata_i   (wdata[1]),
+      .AXIL_X_xbar_dma_wstrb_i   (wstrb[1]),
+      .AXIL_X_xbar_dma_bvalid_o  (bvalid[1]),
+      .AXIL_X_xbar_dma_bready_i  (bready[1]),
+      .AXIL_X_xbar_dma_bid_o     (bid[1]),
+      .AXIL_X_xbar_dma_arvalid_i (arvalid[1]),
+      .AXIL_X_xbar_dma_arready_o (arready[1]),
+      .AXIL_X_xbar_dma_arid_i    (arid[1]),
+      .AXIL_X_xbar_dma_araddr_i  (araddr[1]),
+      .AXIL_X_xbar_dma_rvalid_o  (rvalid[1]),
+      .AXIL_X_xbar_dma_rready_i  (rready[1]),
+      .AXIL_X_xbar_dma_rid_o     (rid[1]),
+      .AXIL_X_xbar_dma_rdata_o   (rdata[1]),
+      .AXIL_X_xbar_ram0_awvalid_o(s_awvalid[0]),
+      .AXIL_X_xbar_ram0_awready_i(s_awready[0]),
+      .AXIL_X_xbar_ram0_awid_o   (s_awid[0]),
+      .AXIL_X_xbar_ram0_awaddr_o (s_awaddr[0]),
+      .AXIL_X_xbar_ram0_wvalid_o (s_wvalid[0]),
+      .AXIL_X_xbar_ram0_wready_i (s_wready[0]),
+      .AXIL_X_xbar_ram0_wdata_o  (s_wdata[0]),
+      .AXIL_X_xbar_ram0_wstrb_o  (s_wstrb[0]),
+      .AXIL_X_xbar_ram0_bvalid_i (s_bvalid[0]),
+      .AXIL_X_xbar_ram0_bready_o (s_bready[0]),
+      .AXIL_X_xbar_ram0_bid_i    (s_bid[0]),
+      .AXIL_X_xbar_ram0_arvalid_o(s_arvalid[0]),
+      .AXIL_X_xbar_ram0_arready_i(s_arready[0]),
+      .AXIL_X_xbar_ram0_arid_o   (s_arid[0]),
+      .AXIL_X_xbar_ram0_araddr_o (s_araddr[0]),
+      .AXIL_X_xbar_ram0_rvalid_i (s_rvalid[0]),
+      .AXIL_X_xbar_ram0_rready_o (s_rready[0]),
+      .AXIL_X_xbar_ram0_rid_i    (s_rid[0]),
+      .AXIL_X_xbar_ram0_rdata_i  (s_rdata[0]),
+      .AXIL_X_xbar_ram1_awvalid_o(s_awvalid[1]),
+      .AXIL_X_xbar_ram1_awready_i(s_awready[1]),
+      .AXIL_X_xbar_ram1_awid_o   (s_awid[1]),
+      .AXIL_X_xbar_ram1_awaddr_o (s_awaddr[1]),
+      .AXIL_X_xbar_ram1_wvalid_o (s_wvalid[1]),
+      .AXIL_X_xbar_ram1_wready_i (s_wready[1]),
+      .AXIL_X_xbar_ram1_wdata_o  (s_wdata[1]),
+      .AXIL_X_xbar_ram1_wstrb_o  (s_wstrb[1]),
+      .AXIL_X_xbar_ram1_bvalid_i (s_bvalid[1]),
+      .AXIL_X_xbar_ram1_bready_o (s_bready[1]),
+      .AXIL_X_xbar_ram1_bid_i    (s_bid[1]),
+      .AXIL_X_xbar_ram1_arvalid_o(s_arvalid[1]),
+      .AXIL_X_xbar_ram1_arready_i(s_arready[1]),
+      .AXIL_X_xbar_ram1_arid_o   (s_arid[1]),
+      .AXIL_X_xbar_ram1_araddr_o (s_araddr[1]),
+      .AXIL_X_xbar_ram1_rvalid_i (s_rvalid[1]),
+      .AXIL_X_xbar_ram1_rready_o (s_rready[1]),
+      .AXIL_X_xbar_ram1_rid_i    (s_rid[1]),
+      .AXIL_X_xbar_ram1_rdata_i  (s_rdata[1]),
+      .unmapped_o                (unmapped),
+      // Generic IOs
+      .clk_i                     (clk),
+      .arst_i                    (arst)
+  );
+
+  // One memory per subordinate port
+  for (genvar s = 0; s < 2; s++) begin : g_ram
+    AXIL_pipe_mem #(
+        .AXIL_pm_ADDR_WIDTH(ADDR_WIDTH),
+        .AXIL_pm_DATA_WIDTH(DATA_WIDTH),
+        .AXIL_pm_ID_W_WIDTH(ID_WIDTH),
+        .AXIL_pm_ID_R_WIDTH(ID_WIDTH),
+        .MEM_ADDR_WIDTH    (MEM_ADDR_WIDTH)
+    ) RAM (
+        .AXIL_pm_awvalid_i(s_awvalid[s]),
+        .AXIL_pm_awready_o(s_awready[s]),
+        .AXIL_pm_awid_i   (s_awid[s]),
+        .AXIL_pm_awaddr_i (s_awaddr[s]),
+        .AXIL_pm_wvalid_i (s_wvalid[s]),
+        .AXIL_pm_wready_o (s_wready[s]),
+        .AXIL_pm_wdata_i  (s_wdata[s]),
+        .AXIL_pm_wstrb_i  (s_wstrb[s]),
+        .AXIL_pm_bvalid_o (s_bvalid[s]),
+        .AXIL_pm_bready_i (s_bready[s]),
+        .AXIL_pm_bid_o    (s_bid[s]),
+        .AXIL_pm_arvalid_i(s_arvalid[s]),
+        .AXIL_pm_arready_o(s_arready[s]),
+        .AXIL_pm_arid_i   (s_arid[s]),
+        .AXIL_pm_araddr_i (s_araddr[s]),
+        .AXIL_pm_rvalid_o (s_rvalid[s]),
+        .AXIL_pm_rready_i (s_rready[s]),
+        .AXIL_pm_rid_o    (s_rid[s]),
+        .AXIL_pm_rdata_o  (s_rdata[s]),
+        // Generic IOs
+        .clk_i            (clk),
+        .arst_i           (arst)
+    );
+  end
+
+  // --------------------------------------------------------------------------
+  // Helpers
+  // --------------------------------------------------------------------------
+  task automatic expect_eq(input [255:0] name, input [63:0] got, input [63:0] exp);
+    begin
+      checks = checks + 1;
+      if (got !== exp) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL %0s: expected 0x%0h, got 0x%0h", $time, name, exp, got);
+      end
+    end
+  endtask
+
+  // Memory behind addr: 0 = ram0, 1 = ram1, -1 = unmapped
+  function automatic integer ram_of(input logic [ADDR_WIDTH-1:0] addr);
+    if (addr < 32'h0000_0400) ram_of = 0;
+    else if (addr >= RAM1_BASE && addr < RAM1_BASE + 32'h0000_0400) ram_of = 1;
+    else ram_of = -1;
+  endfunction
+
+  function automatic logic [DATA_WIDTH-1:0] ref_read(input logic [ADDR_WIDTH-1:0] addr);
+    ref_read = (ram_of(addr) < 0) ? '0 : ref_mem[ram_of(addr)][addr[MEM_ADDR_WIDTH-1:2]];
+  endfunction
+
+  task automatic do_reset;
+    begin
+      arst = 1'b1;
+      for (int m = 0; m < 2; m++) begin
+        awvalid[m] = 1'b0;
+        awid[m]    = '0;
+        awaddr[m]  = '0;
+        wvalid[m]  = 1'b0;
+        wdata[m]   = '0;
+        wstrb[m]   = '0;
+        bready[m]  = 1'b1;
+        arvalid[m] = 1'b0;
+        arid[m]    = '0;
+        araddr[m]  = '0;
+        rready[m]  = 1'b1;
+        b_head[m]  = 0;
+        b_tail[m]  = 0;
+        r_head[m]  = 0;
+        r_tail[m]  = 0;
+      end
+      repeat (4) @(posedge clk);
+      @(negedge clk);
+      arst = 1'b0;
+      // Let the synchronous reset de-assert
+      repeat (3) @(negedge clk);
+    end
+  endtask
+
+  // Channel drivers of manager m: called at a negedge, they return at the negedge after the handshake.
+  task automatic send_aw(input integer m, input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id);
+    begin
+      awvalid[m] = 1'b1;
+      awaddr[m]  = addr;
+      awid[m]    = id;
+      @(posedge clk);
+      while (!awready[m]) @(posedge clk);
+      exp_bid[m][b_tail[m]%QUEUE] = id;
+      b_tail[m] = b_tail[m] + 1;
+      @(negedge clk);
+      awvalid[m] = 1'b0;
+    end
+  endtask
+
+  task automatic send_w(input integer m, input logic [ADDR_WIDTH-1:0] addr, input logic [DATA_WIDTH-1:0] data);
+    begin
+      wvalid[m] = 1'b1;
+      wdata[m]  = data;
+      wstrb[m]  = '1;
+      @(posedge clk);
+      while (!wready[m]) @(posedge clk);
+      if (ram_of(addr) >= 0) ref_mem[ram_of(addr)][addr[MEM_ADDR_WIDTH-1:2]] = data;
+      @(negedge clk);
+      wvalid[m] = 1'b0;
+    end
+  endtask
+
+  task automatic axil_write(input integer m, input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id,
+                            input logic [DATA_WIDTH-1:0] data);
+    begin
+      fork
+        send_aw(m, addr, id);
+        send_w(m, addr, data);
+      join
+    end
+  endtask
+
+  task automatic send_ar(input integer m, input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id);
+    begin
+      arvalid[m] = 1'b1;
+      araddr[m]  = addr;
+      arid[m]    = id;
+      @(posedge clk);
+      while (!arready[m]) @(posedge clk);
+      exp_rid[m][r_tail[m]%QUEUE]   = id;
+      exp_rdata[m][r_tail[m]%QUEUE] = ref_read(addr);
+      r_tail[m] = r_tail[m] + 1;
+      @(negedge clk);
+      arvalid[m] = 1'b0;
+    end
+  endtask
+
+  task automatic wait_responses;
+    begin
+      while (b_head[0] != b_tail[0] || r_head[0] != r_tail[0] || b_head[1] != b_tail[1] || r_head[1] != r_tail[1])
+        @(negedge clk);
+    end
+  endtask
+
+  // Sixteen writes of manager m from base, ID m; returns the time of the last handshake
+  task automatic write_block(input integer m, input logic [ADDR_WIDTH-1:0] base, input logic [DATA_WIDTH-1:0] seed,
+                             output time finish);
+    begin
+      for (int k = 0; k < 16; k++) axil_write(m, base + 4 * k, ID_WIDTH'(m), seed + k);
+      finish = $time;
+    end
+  endtask
+
+  // --------------------------------------------------------------------------
+  // Response monitors
+  // --------------------------------------------------------------------------
+  always @(posedge clk) begin
+    if (!arst) begin
+      for (int m = 0; m < 2; m++) begin
+        if (bvalid[m] && bready[m]) begin
+          if (b_head[m] == b_tail[m]) begin
+            errors = errors + 1;
+            $display("[%0t] FAIL manager %0d: B response without an outstanding write", $time, m);
+          end else begin
+            expect_eq("bid", bid[m], exp_bid[m][b_head[m]%QUEUE]);
+            b_head[m] = b_head[m] + 1;
+          end
+        end
+        if (rvalid[m] && rready[m]) begin
+          if (r_head[m] == r_tail[m]) begin
+            errors = errors + 1;
+            $display("[%0t] FAIL manager %0d: R response without an outstanding read", $time, m);
+          end else begin
+            expect_eq("rid", rid[m], exp_rid[m][r_head[m]%QUEUE]);
+            expect_eq("rdata", rdata[m], exp_rdata[m][r_head[m]%QUEUE]);
+            r_head[m] = r_head[m] + 1;
+          end
+        end
+      end
+    end
+  end
+
+  // --------------------------------------------------------------------------
+  // Main stimulus
+  // --------------------------------------------------------------------------
+  integer i;
+  time    start;
+  time    alone;
+  time    finish[2];
+
+  initial begin
+    $display("==================================================");
+    $display(" AXIL_xbar testbench");
+    $display("==================================================");
+
+    do_reset;
+
+    // ---- Test 0: idle interface state after reset -------------------------
+    $display("\n--- Test 0: reset / idle state ---");
+    for (i = 0; i < 2; i = i + 1) begin
+      expect_eq("bvalid idle", bvalid[i], 1'b0);
+      expect_eq("rvalid idle", rvalid[i], 1'b0);
+      expect_eq("subordinate awvalid idle", s_awvalid[i], 1'b0);
+      expect_eq("subordinate arvalid idle", s_arvalid[i], 1'b0);
+    end
+    expect_eq("unmapped idle", unmapped, 0);
+
+    // ---- Test 1: routing --------------------------------------------------
+    $display("\n--- Test 1: routing ---");
+    axil_write(0, 32'h0000_0010, 2'd1, 32'hC0C0_0010);
+    axil_write(1, RAM1_BASE + 32'h10, 2'd2, 32'hD1D1_0010);
+    axil_write(0, RAM1_BASE + 32'h14, 2'd3, 32'hC1C1_0014);
+    axil_write(1, 32'h0000_0014, 2'd0, 32'hD0D0_0014);
+    wait_responses;
+    send_ar(0, 32'h0000_0010, 2'd1);
+    send_ar(0, RAM1_BASE + 32'h10, 2'd2);
+    send_ar(1, RAM1_BASE + 32'h14, 2'd3);
+    send_ar(1, 32'h0000_0014, 2'd0);
+    wait_responses;
+    expect_eq("ram0 word 4 in memory", g_ram[0].RAM.memory[4], 32'hC0C0_0010);
+    expect_eq("ram1 word 4 in memory", g_ram[1].RAM.memory[4], 32'hD1D1_0010);
+
+    // ---- Test 2: different subordinates transfer concurrently -------------
+    $display("\n--- Test 2: concurrent pairs ---");
+    start = $time;
+    write_block(0, 32'h0000_0100, 32'h2000_0000, finish[0]);
+    alone = finish[0] - start;
+    wait_responses;
+    start = $time;
+    fork
+      write_block(0, 32'h0000_0100, 32'h2100_0000, finish[0]);
+      write_block(1, RAM1_BASE + 32'h100, 32'h2200_0000, finish[1]);
+    join
+    expect_eq("cpu cycles next to dma", (finish[0] - start) / 10, alone / 10);
+    expect_eq("dma cycles next to cpu", (finish[1] - start) / 10, alone / 10);
+    wait_responses;
+
+    // ---- Test 3: both managers share one subordinate ----------------------
+    $display("\n--- Test 3: shared subordinate ---");
+    start = $time;
+    fork
+      write_block(0, 32'h0000_0200, 32'h3000_0000, finish[0]);
+      write_block(1, 32'h0000_0300, 32'h3100_0000, finish[1]);
+    join
+    wait_responses;
+    // Round-robin: both blocks end within two transactions of each other
+    expect_eq("round-robin finish", ((finish[0] > finish[1]) ? finish[0] - finish[1] : finish[1] - finish[0]) <= alone / 8,
+              1'b1);
+    // One write engine per subordinate: the 32 writes take longer than the 16 of one manager
+    expect_eq("shared block slower", ((finish[0] > finish[1]) ? finish[0] : finish[1]) - start > alone, 1'b1);
+    for (i = 0; i < 16; i = i + 1) begin
+      send_ar(0, 32'h0000_0300 + 4 * i, 2'd2);
+      send_ar(1, 32'h0000_0200 + 4 * i, 2'd3);
+    end
+    wait_responses;
+
+    // ---- Test 4: crossed reads --------------------------------------------
+    $display("\n--- Test 4: crossed reads ---");
+    fork
+      for (int k = 0; k < 16; k++) send_ar(0, RAM1_BASE + 32'h100 + 4 * k, 2'd1);
+      for (int k = 0; k < 16; k++) send_ar(1, 32'h0000_0100 + 4 * k, 2'd2);
+    join
+    wait_responses;
+
+    // ---- Test 5: unmapped addresses ---------------------------------------
+    // Writes are dropped (0x2000 would alias word 0 of ram0), reads return 0 with the request ID
+    $display("\n--- Test 5: error subordinate ---");
+    axil_write(0, 32'h0000_0000, 2'd0, 32'h5A5A_0000);
+    axil_write(0, 32'h0000_2000, 2'd3, 32'hBAD0_2000);
+    send_ar(0, 32'h0000_3000, 2'd2);
+    send_ar(1, 32'h0000_0800, 2'd1);
+    wait_responses;
+    send_ar(1, 32'h0000_0000, 2'd0);
+    wait_responses;
+    expect_eq("unmapped accesses", unmapped, 3);
+
+    // ---- Summary ----------------------------------------------------------
+    repeat (2) @(posedge clk);
+    $display("\n==================================================");
+    $display(" Checks run : %0d", checks);
+    $display(" Errors     : %0d", errors);
+    if (errors == 0) $display(" RESULT     : PASS");
+    else $display(" RESULT     : FAIL");
+    $display("==================================================");
+    $finish;
+  end
+
+  // Watchdog to avoid a hung simulation
+  initial begin
+    #50000;
+    $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
+    $finish;
+  end
+
+  // Dump waves
+  initial begin
+    $dumpfile("AXIL_xbar_tb.vcd");
+    $dumpvars(0, AXIL_xbar_tb);
+  end
+
+endmodule
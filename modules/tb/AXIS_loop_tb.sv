@@ -0,0 +1,287 @@
+`timescale 1ns / 1ps
+
+// ============================================================================
+// Testbench for AXIS_loop (AXI-Stream Subordinate -> Manager, 2 slices each).
+// Every beat accepted on rx is pushed to a queue of expected beats and the tx
+// monitor checks TDATA/TKEEP/TLAST against it in order, together with the AXI
+// rule that a beat waiting for tready is held stable. The directed tests
+// check the latency of the four register slices, one beat per cycle, gaps on
+// tvalid with back-pressure on tready, and that rx stalls once every slice
+// is full.
+// ============================================================================
+
+module AXIS_loop_tb ();
+
+  // Local parameters
+  localparam integer DATA_WIDTH = 32;
+  localparam integer KEEP_WIDTH = DATA_WIDTH / 8;
+  localparam integer COUNT_WIDTH = 16;
+  // Register slices on the way: 2 in the subordinate, 2 in the manager
+  localparam integer SLICES = 4;
+  // Entries of the expected-beat queue (indexes wrap around)
+  localparam integer QUEUE = 256;
+
+  // Clock and reset
+  logic clk = 1'b0;
+  logic arst = 1'b1;
+
+  // Clock generation: 10 ns period (100 MHz)
+  always #5 clk = ~clk;
+
+  // --------------------------------------------------------------------------
+  // DUT connections
+  // --------------------------------------------------------------------------
+  logic                   rx_tvalid;
+  logic                   rx_tready;
+  logic [ DATA_WIDTH-1:0] rx_tdata;
+  logic [ KEEP_WIDTH-1:0] rx_tkeep;
+  logic                   rx_tlast;
+  logic                   tx_tvalid;
+  logic                   tx_tready;
+  logic [ DATA_WIDTH-1:0] tx_tdata;
+  logic [ KEEP_WIDTH-1:0] tx_tkeep;
+  logic                   tx_tlast;
+  logic [COUNT_WIDTH-1:0] packets;
+
+  // --------------------------------------------------------------------------
+  // Scoreboard
+  // --------------------------------------------------------------------------
+  integer                 errors = 0;
+  integer                 checks = 0;
+  logic [ DATA_WIDTH-1:0] exp_data  [QUEUE];
+  logic [ KEEP_WIDTH-1:0] exp_keep  [QUEUE];
+  logic                   exp_last  [QUEUE];
+  integer                 head = 0;
+  integer                 tail = 0;
+  // Beats accepted on rx and time of the last accepted / delivered beat
+  integer                 accepted = 0;
+  time                    rx_time;
+  time                    tx_time;
+
+  AXIS_loop #(
+      .AXIS_S_rx_DATA_WIDTH(DATA_WIDTH),
+      .AXIS_M_tx_DATA_WIDTH(DATA_WIDTH),
+      .COUNT_WIDTH         (COUNT_WIDTH)
+  ) DUT (
+      .AXIS_S_rx_tVALID_i(rx_tvalid),
+      .AXIS_S_rx_tREADY_o(rx_tready),
+      .AXIS_S_rx_tDATA_i (rx_tdata),
+      .AXIS_S_rx_tKEEP_i (rx_tkeep),
+      .AXIS_S_rx_tLAST_i (rx_tlast),
+      .AXIS_M_tx_tVALID_o(tx_tvalid),
+      .AXIS_M_tx_tREADY_i(tx_tready),
+      .AXIS_M_tx_tDATA_o (tx_tdata),
+      .AXIS_M_tx_tKEEP_o (tx_tkeep),
+      .AXIS_M_tx_tLAST_o (tx_tlast),
+      .packets_o         (packets),
+      // Generic IOs
+      .clk_i             (clk),
+      .arst_i            (arst)
+  );
+
+  // --------------------------------------------------------------------------
+  // Helpers
+  // --------------------------------------------------------------------------
+  task automatic expect_eq(input [255:0] name, input [63:0] got, input [63:0] exp);
+    begin
+      checks = checks + 1;
+      if (got !== exp) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL %0s: expected 0x%0h, got 0x%0h", $time, name, exp, got);
+      end
+    end
+  endtask
+
+  task automatic do_reset;
+    begin
+      arst      = 1'b1;
+      rx_tvalid = 1'b0;
+      rx_tdata  = '0;
+      rx_tkeep  = '0;
+      rx_tlast  = 1'b0;
+      tx_tready = 1'b1;
+      repeat (4) @(posedge clk);
+      @(negedge clk);
+      arst = 1'b0;
+      // Let the synchronous reset de-assert
+      repeat (3) @(negedge clk);
+    end
+  endtask
+
+  // Called at a negedge, returns at the negedge after the handshake
+  task automatic send_beat(input logic [DATA_WIDTH-1:0] data, input logic [KEEP_WIDTH-1:0] keep, input logic last);
+    begin
+      rx_tvalid = 1'b1;
+      rx_tdata  = data;
+      rx_tkeep  = keep;
+      rx_tlast  = last;
+      @(posedge clk);
+      while (!rx_tready) @(posedge clk);
+      exp_data[tail%QUEUE] = data;
+      exp_keep[tail%QUEUE] = keep;
+      exp_last[tail%QUEUE] = last;
+      tail = tail + 1;
+      @(negedge clk);
+      rx_tvalid = 1'b0;
+    end
+  endtask
+
+  // Packet of beats data, data + 1, ...; the last beat keeps its low last_bytes bytes.
+  // gap > 0 leaves tvalid low for one cycle after every gap beats.
+  task automatic send_packet(input logic [DATA_WIDTH-1:0] data, input integer beats, input integer last_bytes,
+                             input integer gap);
+    begin
+      for (int k = 0; k < beats; k++) begin
+        if (k == beats - 1) send_beat(data + k, KEEP_WIDTH'((1 << last_bytes) - 1), 1'b1);
+        else send_beat(data + k, '1, 1'b0);
+        if (gap > 0 && k % gap == gap - 1) @(negedge clk);
+      end
+    end
+  endtask
+
+  task automatic wait_beats;
+    begin
+      while (head != tail) @(negedge clk);
+    end
+  endtask
+
+  // --------------------------------------------------------------------------
+  // Monitors
+  // --------------------------------------------------------------------------
+  logic                           stalled = 1'b0;
+  logic [DATA_WIDTH+KEEP_WIDTH:0] stalled_beat;
+
+  always @(posedge clk) begin
+    if (!arst) begin
+      if (rx_tvalid && rx_tready) begin
+        accepted = accepted + 1;
+        rx_time  = $time;
+      end
+      // A beat that waited for tready must be presented again unchanged
+      if (stalled) begin
+        expect_eq("tvalid held", tx_tvalid, 1'b1);
+        expect_eq("beat held", {tx_tdata, tx_tkeep, tx_tlast}, stalled_beat);
+      end
+      stalled      = tx_tvalid && !tx_tready;
+      stalled_beat = {tx_tdata, tx_tkeep, tx_tlast};
+
+      if (tx_tvalid && tx_tready) begin
+        tx_time = $time;
+        if (head == tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL tx beat 0x%0h that was never sent", $time, tx_tdata);
+        end else begin
+          expect_eq("tdata", tx_tdata, exp_data[head%QUEUE]);
+          expect_eq("tkeep", tx_tkeep, exp_keep[head%QUEUE]);
+          expect_eq("tlast", tx_tlast, exp_last[head%QUEUE]);
+          head = head + 1;
+        end
+      end
+    end
+  end
+
+  // --------------------------------------------------------------------------
+  // Main stimulus
+  // --------------------------------------------------------------------------
+  integer base;
+  time    start;
+  time    tx_start;
+
+  initial begin
+    $display("==================================================");
+    $display(" AXIS_loop testbench");
+    $display("==================================================");
+
+    do_reset;
+
+    // ---- Test 0: idle interface state after reset -------------------------
+    $display("\n--- Test 0: reset / idle state ---");
+    expect_eq("rx tready idle", rx_tready, 1'b1);
+    expect_eq("tx tvalid idle", tx_tvalid, 1'b0);
+    expect_eq("packets idle", packets, 0);
+
+    // ---- Test 1: one beat crosses the four slices -------------------------
+    $display("\n--- Test 1: single-beat packet ---");
+    send_beat(32'hCAFE_0001, 4'b0011, 1'b1);
+    wait_beats;
+    expect_eq("slice latency", (tx_time - rx_time) / 10, SLICES);
+    expect_eq("packets after one packet", packets, 1);
+
+    // ---- Test 2: one beat per cycle ---------------------------------------
+    $display("\n--- Test 2: full throughput ---");
+    fork
+      begin
+        start = $time;
+        send_packet(32'h1000_0000, 64, 4, 0);
+        expect_eq("cycles for 64 rx beats", ($time - start) / 10, 64);
+      end
+      begin
+        @(posedge clk);
+        while (!(tx_tvalid && tx_tready)) @(posedge clk);
+        tx_start = $time;
+      end
+    join
+    wait_beats;
+    expect_eq("cycles between the first and last tx beat", (tx_time - tx_start) / 10, 63);
+
+    // ---- Test 3: gaps on tvalid and back-pressure on tready ---------------
+    $display("\n--- Test 3: gaps and back-pressure ---");
+    fork
+      begin
+        for (int n = 0; n < 8; n++) send_packet(32'h2000_0000 + (n << 8), 3 + n, 1 + n % 4, 3);
+      end
+      begin
+        for (int c = 0; c < 200; c++) begin
+          tx_tready = (c % 5) < 3;
+          @(negedge clk);
+        end
+        tx_tready = 1'b1;
+      end
+    join
+    wait_beats;
+    expect_eq("packets after test 3", packets, 10);
+
+    // ---- Test 4: rx stalls when every slice is full -----------------------
+    $display("\n--- Test 4: full slices ---");
+    tx_tready = 1'b0;
+    base      = accepted;
+    fork
+      begin
+        send_packet(32'h3000_0000, 12, 4, 0);
+      end
+      begin
+        repeat (30) @(negedge clk);
+        // Each slice holds a registered beat and a skid beat
+        expect_eq("beats buffered", accepted - base, 2 * SLICES);
+        expect_eq("rx tready when full", rx_tready, 1'b0);
+        tx_tready = 1'b1;
+      end
+    join
+    wait_beats;
+    expect_eq("packets after test 4", packets, 11);
+
+    // ---- Summary ----------------------------------------------------------
+    repeat (2) @(posedge clk);
+    $display("\n==================================================");
+    $display(" Checks run : %0d", checks);
+    $display(" Errors     : %0d", errors);
+    if (errors == 0) $display(" RESULT     : PASS");
+    else $display(" RESULT     : FAIL");
+    $display("==================================================");
+    $finish;
+  end
+
+  // Watchdog to avoid a hung simulation
+  initial begin
+    #50000;
+    $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
+    $finish;
+  end
+
+  // Dump waves
+  initial begin
+    $dumpfile("AXIS_loop_tb.vcd");
+    $dumpvars(0, AXIS_loop_tb);
+  end
+
+endmodule
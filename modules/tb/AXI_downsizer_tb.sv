@@ -0,0 +1,607 @@
+`timescale 1ns / 1ps
+
+// ============================================================================
+// Testbench for AXI_downsizer (AXI-Full downsizer, 64-bit s port to 32-bit
+// m port). The testbench drives the wide s port and places an AXI_mem on the
+// narrow m port. A byte-wide reference model gives the expected data of every
+// R beat and the B and R monitors check the responses in order, including the
+// ID restored on every R beat. An m port monitor records the length and size
+// of the narrow bursts and checks that reads leave with ID 0. The directed
+// tests cover full-width INCR bursts (split into twice as many beats), narrow
+// INCR, WRAP and FIXED bursts (moved between lanes), outstanding bursts and
+// back-pressure.
+// ============================================================================
+
+module AXI_downsizer_tb ();
+
+  // Local parameters
+  localparam integer ADDR_WIDTH = 32;
+  localparam integer DATA_WIDTH = 64;
+  localparam integer M_DATA_WIDTH = 32;
+  localparam integer ID_WIDTH = 2;
+  localparam integer MEM_ADDR_WIDTH = 12;
+  localparam integer COUNT_WIDTH = 16;
+  localparam integer STRB_WIDTH = DATA_WIDTH / 8;
+  localparam integer M_STRB_WIDTH = M_DATA_WIDTH / 8;
+  localparam integer MEM_BYTES = 1 << MEM_ADDR_WIDTH;
+  localparam logic [2:0] FULL_SIZE = 3'($clog2(STRB_WIDTH));
+  localparam logic [2:0] NARROW_SIZE = 3'($clog2(M_STRB_WIDTH));
+  localparam logic [1:0] FIXED = 2'b00;
+  localparam logic [1:0] INCR = 2'b01;
+  localparam logic [1:0] WRAP = 2'b10;
+  // Entries of the expected-response queues (indexes wrap around)
+  localparam integer QUEUE = 256;
+
+  // Clock and reset
+  logic clk = 1'b0;
+  logic arst = 1'b1;
+
+  // Clock generation: 10 ns period (100 MHz)
+  always #5 clk = ~clk;
+
+  // --------------------------------------------------------------------------
+  // s port (driven by the testbench)
+  // --------------------------------------------------------------------------
+  logic                    awVALID;
+  logic                    awREADY;
+  logic [    ID_WIDTH-1:0] awID;
+  logic [  ADDR_WIDTH-1:0] awADDR;
+  logic [             7:0] awLEN;
+  logic [             2:0] awSIZE;
+  logic [             1:0] awBURST;
+  logic                    wVALID;
+  logic                    wREADY;
+  logic [  DATA_WIDTH-1:0] wDATA;
+  logic [  STRB_WIDTH-1:0] wSTRB;
+  logic                    wLAST;
+  logic                    bVALID;
+  logic                    bREADY;
+  logic [    ID_WIDTH-1:0] bID;
+  logic [             1:0] bRESP;
+  logic                    arVALID;
+  logic                    arREADY;
+  logic [    ID_WIDTH-1:0] arID;
+  logic [  ADDR_WIDTH-1:0] arADDR;
+  logic [             7:0] arLEN;
+  logic [             2:0] arSIZE;
+  logic [             1:0] arBURST;
+  logic                    rVALID;
+  logic                    rREADY;
+  logic [    ID_WIDTH-1:0] rID;
+  logic [  DATA_WIDTH-1:0] rDATA;
+  logic [             1:0] rRESP;
+  logic                    rLAST;
+  logic [ COUNT_WIDTH-1:0] narrow_beats;
+
+  // --------------------------------------------------------------------------
+  // m port (memory)
+  // --------------------------------------------------------------------------
+  logic                    m_awVALID;
+  logic                    m_awREADY;
+  logic [    ID_WIDTH-1:0] m_awID;
+  logic [  ADDR_WIDTH-1:0] m_awADDR;
+  logic [             7:0] m_awLEN;
+  logic [             2:0] m_awSIZE;
+  logic [             1:0] m_awBURST;
+  logic                    m_wVALID;
+  logic                    m_wREADY;
+  logic [M_DATA_WIDTH-1:0] m_wDATA;
+  logic [M_STRB_WIDTH-1:0] m_wSTRB;
+  logic                    m_wLAST;
+  logic                    m_bVALID;
+  logic                    m_bREADY;
+  logic [    ID_WIDTH-1:0] m_bID;
+  logic [             1:0] m_bRESP;
+  logic                    m_arVALID;
+  logic                    m_arREADY;
+  logic [    ID_WIDTH-1:0] m_arID;
+  logic [  ADDR_WIDTH-1:0] m_arADDR;
+  logic [             7:0] m_arLEN;
+  logic [             2:0] m_arSIZE;
+  logic [             1:0] m_arBURST;
+  logic                    m_rVALID;
+  logic                    m_rREADY;
+  logic [    ID_WIDTH-1:0] m_rID;
+  logic [M_DATA_WIDTH-1:0] m_rDATA;
+  logic [             1:0] m_rRESP;
+  logic                    m_rLAST;
+
+  // --------------------------------------------------------------------------
+  // Scoreboard
+  // --------------------------------------------------------------------------
+  integer                  errors = 0;
+  integer                  checks = 0;
+  logic [             7:0] ref_bytes [MEM_BYTES];
+  // Expected responses in order: one B per burst, one R entry per beat
+  logic [    ID_WIDTH-1:0] exp_bid   [QUEUE];
+  logic [    ID_WIDTH-1:0] exp_rid   [QUEUE];
+  logic [  DATA_WIDTH-1:0] exp_rdata [QUEUE];
+  logic [  DATA_WIDTH-1:0] exp_rmask [QUEUE];
+  logic                    exp_rlast [QUEUE];
+  integer                  b_head = 0;
+  integer                  b_tail = 0;
+  integer                  r_head = 0;
+  integer                  r_tail = 0;
+  // Length and size of the last narrow burst of each direction
+  logic [             7:0] m_aw_len;
+  logic [             2:0] m_aw_size;
+  logic [             7:0] m_ar_len;
+  logic [             2:0] m_ar_size;
+
+  AXI_downsizer #(
+      .AXI_DN_dn_ID_W_WIDTH  (ID_WIDTH),
+      .AXI_DN_dn_ADDR_WIDTH  (ADDR_WIDTH),
+      .AXI_DN_dn_S_DATA_WIDTH(DATA_WIDTH),
+      .AXI_DN_dn_M_DATA_WIDTH(M_DATA_WIDTH),
+      .AXI_DN_dn_ID_R_WIDTH  (ID_WIDTH),
+      .COUNT_WIDTH           (COUNT_WIDTH)
+  ) DUT (
+      .AXI_DN_dn_s_awVALID_i(awVALID),
+      .AXI_DN_dn_s_awREADY_o(awREADY),
+      .AXI_DN_dn_s_awID_i   (awID),
+      .AXI_DN_dn_s_awADDR_i (awADDR),
+      .AXI_DN_dn_s_awLEN_i  (awLEN),
+      .AXI_DN_dn_s_awSIZE_i (awSIZE),
+      .AXI_DN_dn_s_awBURST_i(awBURST),
+      .AXI_DN_dn_s_awLOCK_i (1'b0),
+      .AXI_DN_dn_s_awCACHE_i(4'b0011),
+      .AXI_DN_dn_s_awPROT_i (3'b000),
+      .AXI_DN_dn_s_awQOS_i  (4'b0000),
+      .AXI_DN_dn_s_wVALID_i (wVALID),
+      .AXI_DN_dn_s_wREADY_o (wREADY),
+      .AXI_DN_dn_s_wDATA_i  (wDATA),
+      .AXI_DN_dn_s_wSTRB_i  (wSTRB),
+      .AXI_DN_dn_s_wLAST_i  (wLAST),
+      .AXI_DN_dn_s_bVALID_o (bVALID),
+      .AXI_DN_dn_s_bREADY_i (bREADY),
+      .AXI_DN_dn_s_bID_o    (bID),
+      .AXI_DN_dn_s_bRESP_o  (bRESP),
+      .AXI_DN_dn_s_arVALID_i(arVALID),
+      .AXI_DN_dn_s_arREADY_o(arREADY),
+      .AXI_DN_dn_s_arID_i   (arID),
+      .AXI_DN_dn_s_arADDR_i (arADDR),
+      .AXI_DN_dn_s_arLEN_i  (arLEN),
+      .AXI_DN_dn_s_arSIZE_i (arSIZE),
+      .AXI_DN_dn_s_arBURST_i(arBURST),
+      .AXI_DN_dn_s_arLOCK_i (1'b0),
+      .AXI_DN_dn_s_arCACHE_i(4'b0011),
+      .AXI_DN_dn_s_arPROT_i (3'b000),
+      .AXI_DN_dn_s_arQOS_i  (4'b0000),
+      .AXI_DN_dn_s_rVALID_o (rVALID),
+      .AXI_DN_dn_s_rREADY_i (rREADY),
+      .AXI_DN_dn_s_rID_o    (rID),
+      .AXI_DN_dn_s_rDATA_o  (rDATA),
+      .AXI_DN_dn_s_rRESP_o  (rRESP),
+      .AXI_DN_dn_s_rLAST_o  (rLAST),
+      .AXI_DN_dn_m_awVALID_o(m_awVALID),
+      .AXI_DN_dn_m_awREADY_i(m_awREADY),
+      .AXI_DN_dn_m_awID_o   (m_awID),
+      .AXI_DN_dn_m_awADDR_o (m_awADDR),
+      .AXI_DN_dn_m_awLEN_o  (m_awLEN),
+      .AXI_DN_dn_m_awSIZE_o (m_awSIZE),
+      .AXI_DN_dn_m_awBURST_o(m_awBURST),
+      .AXI_DN_dn_m_awLOCK_o (),
+      .AXI_DN_dn_m_awCACHE_o(),
+      .AXI_DN_dn_m_awPROT_o (),
+      .AXI_DN_dn_m_awQOS_o  (),
+      .AXI_DN_dn_m_wVALID_o (m_wVALID),
+      .AXI_DN_dn_m_wREADY_i (m_wREADY),
+      .AXI_DN_dn_m_wDATA_o  (m_wDATA),
+      .AXI_DN_dn_m_wSTRB_o  (m_wSTRB),
+      .AXI_DN_dn_m_wLAST_o  (m_wLAST),
+      .AXI_DN_dn_m_bVALID_i (m_bVALID),
+      .AXI_DN_dn_m_bREADY_o (m_bREADY),
+      .AXI_DN_dn_m_bID_i    (m_bID),
+      .AXI_DN_dn_m_bRESP_i  (m_bRESP),
+      .AXI_DN_dn_m_arVALID_o(m_arVALID),
+      .AXI_DN_dn_m_arREADY_i(m_arREADY),
+      .AXI_DN_dn_m_arID_o   (m_arID),
+      .AXI_DN_dn_m_arADDR_o (m_arADDR),
+      .AXI_DN_dn_m_arLEN_o  (m_arLEN),
+      .AXI_DN_dn_m_arSIZE_o (m_arSIZE),
+      .AXI_DN_dn_m_arBURST_o(m_arBURST),
+      .AXI_DN_dn_m_arLOCK_o (),
+      .AXI_DN_dn_m_arCACHE_o(),
+      .AXI_DN_dn_m_arPROT_o (),
+      .AXI_DN_dn_m_arQOS_o  (),
+      .AXI_DN_dn_m_rVALID_i (m_rVALID),
+      .AXI_DN_dn_m_rREADY_o (m_rREADY),
+      .AXI_DN_dn_m_rID_i    (m_rID),
+      .AXI_DN_dn_m_rDATA_i  (m_rDATA),
+      .AXI_DN_dn_m_rRESP_i  (m_rRESP),
+      .AXI_DN_dn_m_rLAST_i  (m_rLAST),
+      .narrow_beats_o       (narrow_beats),
+      // Generic IOs
+      .clk_i                (clk),
+      .arst_i               (arst)
+  );
+
+  AXI_mem #(
+      .AXI_S_mem_ID_W_WIDTH(ID_WIDTH),
+      .AXI_S_mem_ADDR_WIDTH(ADDR_WIDTH),
+      .AXI_S_mem_DATA_WIDTH(M_DATA_WIDTH),
+      .AXI_S_mem_ID_R_WIDTH(ID_WIDTH),
+      .MEM_ADDR_WIDTH      (MEM_ADDR_WIDTH)
+  ) MEM (
+      .AXI_S_mem_awVALID_i(m_awVALID),
+      .AXI_S_mem_awREADY_o(m_awREADY),
+      .AXI_S_mem_awID_i   (m_awID),
+      .AXI_S_mem_awADDR_i (m_awADDR),
+      .AXI_S_mem_awLEN_i  (m_awLEN),
+      .AXI_S_mem_awSIZE_i (m_awSIZE),
+      .AXI_S_mem_awBURST_i(m_awBURST),
+      .AXI_S_mem_awLOCK_i (1'b0),
+      .AXI_S_mem_awCACHE_i(4'b0011),
+      .AXI_S_mem_awPROT_i (3'b000),
+      .AXI_S_mem_awQOS_i  (4'b0000),
+      .AXI_S_mem_wVALID_i (m_wVALID),
+      .AXI_S_mem_wREADY_o (m_wREADY),
+      .AXI_S_mem_wDATA_i  (m_wDATA),
+      .AXI_S_mem_wSTRB_i  (m_wSTRB),
+      .AXI_S_mem_wLAST_i  (m_wLAST),
+      .AXI_S_mem_bVALID_o (m_bVALID),
+      .AXI_S_mem_bREADY_i (m_bREADY),
+      .AXI_S_mem_bID_o    (m_bID),
+      .AXI_S_mem_bRESP_o  (m_bRESP),
+      .AXI_S_mem_arVALID_i(m_arVALID),
+      .AXI_S_mem_arREADY_o(m_arREADY),
+      .AXI_S_mem_arID_i   (m_arID),
+      .AXI_S_mem_arADDR_i (m_arADDR),
+      .AXI_S_mem_arLEN_i  (m_arLEN),
+      .AXI_S_mem_arSIZE_i (m_arSIZE),
+      .AXI_S_mem_arBURST_i(m_arBURST),
+      .AXI_S_mem_arLOCK_i (1'b0),
+      .AXI_S_mem_arCACHE_i(4'b0011),
+      .AXI_S_mem_arPROT_i (3'b000),
+      .AXI_S_mem_arQOS_i  (4'b0000),
+      .AXI_S_mem_rVALID_o (m_rVALID),
+      .AXI_S_mem_rREADY_i (m_rREADY),
+      .AXI_S_mem_rID_o    (m_rID),
+      .AXI_S_mem_rDATA_o  (m_rDATA),
+      .AXI_S_mem_rRESP_o  (m_rRESP),
+      .AXI_S_mem_rLAST_o  (m_rLAST),
+      // Generic IOs
+      .clk_i              (clk),
+      .arst_i             (arst)
+  );
+
+  // --------------------------------------------------------------------------
+  // Helpers
+  // --------------------------------------------------------------------------
+  task automatic expect_eq(input [255:0] name, input [63:0] got, input [63:0] exp);
+    begin
+      checks = checks + 1;
+      if (got !== exp) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL %0s: expected 0x%0h, got 0x%0h", $time, name, exp, got);
+      end
+    end
+  endtask
+
+  // Address of the beat after addr (AXI burst rules, aligned start addresses)
+  function automatic logic [ADDR_WIDTH-1:0] next_addr(input logic [ADDR_WIDTH-1:0] addr, input logic [7:0] len,
+                                                      input logic [2:0] size, input logic [1:0] burst);
+    logic [ADDR_WIDTH-1:0] incr, wrap_mask;
+    incr      = addr + (ADDR_WIDTH'(1) << size);
+    wrap_mask = ((ADDR_WIDTH'(len) + 1) << size) - 1;
+    case (burst)
+      FIXED:   next_addr = addr;
+      WRAP:    next_addr = (addr & ~wrap_mask) | (incr & wrap_mask);
+      default: next_addr = incr;
+    endcase
+  endfunction
+
+  // Byte lanes of a beat of 2**size bytes at addr
+  function automatic logic [STRB_WIDTH-1:0] lanes(input logic [ADDR_WIDTH-1:0] addr, input logic [2:0] size);
+    lanes = STRB_WIDTH'((1 << (1 << size)) - 1) << (addr % STRB_WIDTH);
+  endfunction
+
+  // Bus word of the reference model at addr
+  function automatic logic [DATA_WIDTH-1:0] ref_word(input logic [ADDR_WIDTH-1:0] addr);
+    for (int b = 0; b < STRB_WIDTH; b++) ref_word[8*b+:8] = ref_bytes[(addr & ~(STRB_WIDTH - 1)) + b];
+  endfunction
+
+  function automatic logic [DATA_WIDTH-1:0] beat_data(input logic [DATA_WIDTH-1:0] data, input integer beat);
+    beat_data = data + DATA_WIDTH'(beat) * {STRB_WIDTH{8'h01}};
+  endfunction
+
+  task automatic do_reset;
+    begin
+      arst    = 1'b1;
+      awVALID = 1'b0;
+      awID    = '0;
+      awADDR  = '0;
+      awLEN   = '0;
+      awSIZE  = FULL_SIZE;
+      awBURST = INCR;
+      wVALID  = 1'b0;
+      wDATA   = '0;
+      wSTRB   = '0;
+      wLAST   = 1'b0;
+      bREADY  = 1'b1;
+      arVALID = 1'b0;
+      arID    = '0;
+      arADDR  = '0;
+      arLEN   = '0;
+      arSIZE  = FULL_SIZE;
+      arBURST = INCR;
+      rREADY  = 1'b1;
+      repeat (4) @(posedge clk);
+      @(negedge clk);
+      arst = 1'b0;
+      // Let the synchronous reset de-assert
+      repeat (3) @(negedge clk);
+    end
+  endtask
+
+  // Channel drivers: called at a negedge, they return at the negedge after the (last) handshake.
+  task automatic send_aw(input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id, input logic [7:0] len,
+                         input logic [2:0] size, input logic [1:0] burst);
+    begin
+      awVALID = 1'b1;
+      awADDR  = addr;
+      awID    = id;
+      awLEN   = len;
+      awSIZE  = size;
+      awBURST = burst;
+      @(posedge clk);
+      while (!awREADY) @(posedge clk);
+      exp_bid[b_tail%QUEUE] = id;
+      b_tail = b_tail + 1;
+      @(negedge clk);
+      awVALID = 1'b0;
+    end
+  endtask
+
+  // W beats of a burst; beat k carries data + k in every byte lane
+  task automatic send_w(input logic [ADDR_WIDTH-1:0] addr, input logic [7:0] len, input logic [2:0] size,
+                        input logic [1:0] burst, input logic [DATA_WIDTH-1:0] data);
+    logic [ADDR_WIDTH-1:0] a;
+    begin
+      a = addr;
+      for (int k = 0; k <= len; k++) begin
+        wVALID = 1'b1;
+        wDATA  = beat_data(data, k);
+        wSTRB  = lanes(a, size);
+        wLAST  = (k == len);
+        @(posedge clk);
+        while (!wREADY) @(posedge clk);
+        for (int b = 0; b < STRB_WIDTH; b++) if (wSTRB[b]) ref_bytes[(a & ~(STRB_WIDTH - 1)) + b] = wDATA[8*b+:8];
+        @(negedge clk);
+        wVALID = 1'b0;
+        a = next_addr(a, len, size, burst);
+      end
+    end
+  endtask
+
+  task automatic axi_write(input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id, input logic [7:0] len,
+                           input logic [2:0] size, input logic [1:0] burst, input logic [DATA_WIDTH-1:0] data);
+    begin
+      fork
+        send_aw(addr, id, len, size, burst);
+        send_w(addr, len, size, burst, data);
+      join
+    end
+  endtask
+
+  // AR of a burst; its beats are expected from the reference model as it is at the handshake
+  task automatic send_ar(input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id, input logic [7:0] len,
+                         input logic [2:0] size, input logic [1:0] burst);
+    logic [ADDR_WIDTH-1:0] a;
+    logic [STRB_WIDTH-1:0] strb;
+    begin
+      arVALID = 1'b1;
+      arADDR  = addr;
+      arID    = id;
+      arLEN   = len;
+      arSIZE  = size;
+      arBURST = burst;
+      @(posedge clk);
+      while (!arREADY) @(posedge clk);
+      a = addr;
+      for (int k = 0; k <= len; k++) begin
+        exp_rid[r_tail%QUEUE] = id;
+        exp_rdata[r_tail%QUEUE] = ref_word(a);
+        strb = lanes(a, size);
+        for (int b = 0; b < STRB_WIDTH; b++) exp_rmask[r_tail%QUEUE][8*b+:8] = {8{strb[b]}};
+        exp_rlast[r_tail%QUEUE] = (k == len);
+        r_tail = r_tail + 1;
+        a = next_addr(a, len, size, burst);
+      end
+      @(negedge clk);
+      arVALID = 1'b0;
+    end
+  endtask
+
+  task automatic wait_responses;
+    begin
+      while (b_head != b_tail || r_head != r_tail) @(negedge clk);
+    end
+  endtask
+
+  // --------------------------------------------------------------------------
+  // Monitors
+  // --------------------------------------------------------------------------
+  logic                         b_stalled = 1'b0;
+  logic [         ID_WIDTH-1:0] b_stalled_id;
+  logic                         r_stalled = 1'b0;
+  logic [ID_WIDTH+DATA_WIDTH:0] r_stalled_beat;
+
+  always @(posedge clk) begin
+    if (!arst) begin
+      // A response that waited for ready must be presented again unchanged
+      if (b_stalled) begin
+        expect_eq("bVALID held", bVALID, 1'b1);
+        expect_eq("bID held", bID, b_stalled_id);
+      end
+      if (r_stalled) begin
+        expect_eq("rVALID held", rVALID, 1'b1);
+        expect_eq("R beat held", {rID, rDATA, rLAST}, r_stalled_beat);
+      end
+      b_stalled      = bVALID && !bREADY;
+      b_stalled_id   = bID;
+      r_stalled      = rVALID && !rREADY;
+      r_stalled_beat = {rID, rDATA, rLAST};
+
+      if (bVALID && bREADY) begin
+        if (b_head == b_tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL B response (ID %0d) without an outstanding write", $time, bID);
+        end else begin
+          expect_eq("bID", bID, exp_bid[b_head%QUEUE]);
+          expect_eq("bRESP", bRESP, 2'b00);
+          b_head = b_head + 1;
+        end
+      end
+      if (rVALID && rREADY) begin
+        if (r_head == r_tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL R beat (ID %0d) without an outstanding read", $time, rID);
+        end else begin
+          expect_eq("rID", rID, exp_rid[r_head%QUEUE]);
+          expect_eq("rDATA", rDATA & exp_rmask[r_head%QUEUE], exp_rdata[r_head%QUEUE] & exp_rmask[r_head%QUEUE]);
+          expect_eq("rLAST", rLAST, exp_rlast[r_head%QUEUE]);
+          expect_eq("rRESP", rRESP, 2'b00);
+          r_head = r_head + 1;
+        end
+      end
+
+      // Narrow bursts on the m port
+      if (m_awVALID && m_awREADY) begin
+        m_aw_len  = m_awLEN;
+        m_aw_size = m_awSIZE;
+      end
+      if (m_arVALID && m_arREADY) begin
+        expect_eq("m arID", m_arID, 0);
+        m_ar_len  = m_arLEN;
+        m_ar_size = m_arSIZE;
+      end
+    end
+  end
+
+  // --------------------------------------------------------------------------
+  // Main stimulus
+  // --------------------------------------------------------------------------
+  integer                 i;
+  logic   [COUNT_WIDTH-1:0] beats;
+
+  initial begin
+    $display("==================================================");
+    $display(" AXI_downsizer testbench");
+    $display("==================================================");
+
+    do_reset;
+
+    // ---- Test 0: idle interface state after reset -------------------------
+    $display("\n--- Test 0: reset / idle state ---");
+    expect_eq("bVALID idle", bVALID, 1'b0);
+    expect_eq("rVALID idle", rVALID, 1'b0);
+    expect_eq("m awVALID idle", m_awVALID, 1'b0);
+    expect_eq("m arVALID idle", m_arVALID, 1'b0);
+    expect_eq("narrow beats idle", narrow_beats, 0);
+
+    // ---- Test 1: single wide beat -----------------------------------------
+    $display("\n--- Test 1: single wide beat ---");
+    axi_write(32'h0000_0000, 2'd1, 8'd0, FULL_SIZE, INCR, 64'h0123_4567_89AB_CDEF);
+    wait_responses;
+    expect_eq("m awLEN of one wide beat", m_aw_len, 8'd1);
+    expect_eq("m awSIZE of one wide beat", m_aw_size, NARROW_SIZE);
+    send_ar(32'h0000_0000, 2'd2, 8'd0, FULL_SIZE, INCR);
+    wait_responses;
+    expect_eq("m arLEN of one wide beat", m_ar_len, 8'd1);
+    expect_eq("narrow beats of one wide beat", narrow_beats, 4);
+    expect_eq("low word in memory", MEM.memory[0], 32'h89AB_CDEF);
+    expect_eq("high word in memory", MEM.memory[1], 32'h0123_4567);
+
+    // ---- Test 2: 16-beat INCR burst ---------------------------------------
+    $display("\n--- Test 2: INCR burst ---");
+    beats = narrow_beats;
+    axi_write(32'h0000_0100, 2'd0, 8'd15, FULL_SIZE, INCR, 64'h1000_0000_2000_0000);
+    wait_responses;
+    expect_eq("m awLEN of 16 wide beats", m_aw_len, 8'd31);
+    send_ar(32'h0000_0100, 2'd3, 8'd15, FULL_SIZE, INCR);
+    wait_responses;
+    expect_eq("m arLEN of 16 wide beats", m_ar_len, 8'd31);
+    expect_eq("narrow beats of 16 wide beats", narrow_beats - beats, 64);
+
+    // ---- Test 3: narrow INCR burst ----------------------------------------
+    // 32-bit beats from 0x204 alternate between the upper and the lower half of the s bus
+    $display("\n--- Test 3: narrow INCR burst ---");
+    axi_write(32'h0000_0200, 2'd1, 8'd2, FULL_SIZE, INCR, 64'h3000_0000_3000_0000);
+    axi_write(32'h0000_0204, 2'd2, 8'd3, NARROW_SIZE, INCR, 64'h3333_3333_4444_4444);
+    wait_responses;
+    expect_eq("m awLEN of a narrow burst", m_aw_len, 8'd3);
+    expect_eq("m awSIZE of a narrow burst", m_aw_size, NARROW_SIZE);
+    send_ar(32'h0000_0200, 2'd1, 8'd2, FULL_SIZE, INCR);
+    send_ar(32'h0000_0204, 2'd2, 8'd3, NARROW_SIZE, INCR);
+    wait_responses;
+    expect_eq("m arLEN of a narrow burst", m_ar_len, 8'd3);
+
+    // ---- Test 4: WRAP and FIXED bursts ------------------------------------
+    // 4 beats of 32 bits from 0x308 wrap inside 0x300-0x30F, then 4 bytes to 0x313
+    $display("\n--- Test 4: WRAP and FIXED bursts ---");
+    axi_write(32'h0000_0308, 2'd3, 8'd3, NARROW_SIZE, WRAP, 64'hA0A0_A0A0_B0B0_B0B0);
+    axi_write(32'h0000_0313, 2'd0, 8'd3, 3'd0, FIXED, 64'hF0F0_F0F0_F0F0_F0F0);
+    wait_responses;
+    expect_eq("WRAP beat 0 at 0x308", MEM.memory[32'h308>>2], 32'hB0B0_B0B0);
+    expect_eq("WRAP beat 2 at 0x300", MEM.memory[32'h300>>2], 32'hB2B2_B2B2);
+    expect_eq("FIXED keeps the last beat", MEM.memory[32'h310>>2][31:24], 8'hF3);
+    send_ar(32'h0000_0300, 2'd1, 8'd1, FULL_SIZE, INCR);
+    send_ar(32'h0000_030C, 2'd2, 8'd3, NARROW_SIZE, WRAP);
+    send_ar(32'h0000_0313, 2'd3, 8'd1, 3'd0, FIXED);
+    wait_responses;
+
+    // ---- Test 5: outstanding bursts ---------------------------------------
+    // Reads leave with ID 0 and return in order, so every ID is restored from the info FIFO
+    $display("\n--- Test 5: outstanding bursts ---");
+    fork
+      for (int n = 0; n < 4; n++) send_aw(32'h0000_0400 + (n << 6), n[ID_WIDTH-1:0], 8'(n + 1), FULL_SIZE, INCR);
+      for (int n = 0; n < 4; n++) send_w(32'h0000_0400 + (n << 6), 8'(n + 1), FULL_SIZE, INCR, 64'h5000_0000_0000_0000 + (64'(n) << 32));
+    join
+    wait_responses;
+    for (i = 3; i >= 0; i = i - 1) send_ar(32'h0000_0400 + (i << 6), i[ID_WIDTH-1:0], 8'(i + 1), FULL_SIZE, INCR);
+    wait_responses;
+
+    // ---- Test 6: back-pressure on R and B ---------------------------------
+    $display("\n--- Test 6: back-pressure ---");
+    send_ar(32'h0000_0100, 2'd1, 8'd15, FULL_SIZE, INCR);
+    for (i = 0; i < 60; i = i + 1) begin
+      rREADY = (i % 3) == 2;
+      @(negedge clk);
+    end
+    rREADY = 1'b1;
+    wait_responses;
+    bREADY = 1'b0;
+    for (i = 0; i < 3; i = i + 1) axi_write(32'h0000_0600 + (i << 3), i[ID_WIDTH-1:0], 8'd0, FULL_SIZE, INCR, 64'h6000_0000 + i);
+    repeat (4) @(negedge clk);
+    expect_eq("bVALID while bREADY is low", bVALID, 1'b1);
+    bREADY = 1'b1;
+    wait_responses;
+    send_ar(32'h0000_0600, 2'd2, 8'd2, FULL_SIZE, INCR);
+    wait_responses;
+
+    // ---- Summary ----------------------------------------------------------
+    repeat (2) @(posedge clk);
+    $display("\n==================================================");
+    $display(" Checks run : %0d", checks);
+    $display(" Errors     : %0d", errors);
+    if (errors == 0) $display(" RESULT     : PASS");
+    else $display(" RESULT     : FAIL");
+    $display("==================================================");
+    $finish;
+  end
+
+  // Watchdog to avoid a hung simulation
+  initial begin
+    #100000;
+    $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
+    $finish;
+  end
+
+  // Dump waves
+  initial begin
+    $dumpfile("AXI_downsizer_tb.vcd");
+    $dumpvars(0, AXI_downsizer_tb);
+  end
+
+endmodule
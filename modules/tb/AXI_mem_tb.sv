@@ -0,0 +1,482 @@
+`timescale 1ns / 1ps
+
+// ============================================================================
+// Testbench for AXI_mem (AXI-Full subordinate memory).
+// A byte-wide reference model is updated at every W handshake and gives the
+// expected data of every R beat when its AR is accepted. Responses come back in
+// order, so the B and R monitors check them against ordered queues, together
+// with RLAST and the AXI rule that a response waiting for ready is held stable.
+// The directed tests cover INCR, WRAP and FIXED bursts, narrow transfers,
+// several outstanding bursts, back-pressure and W waiting for its AW.
+// ============================================================================
+
+module AXI_mem_tb ();
+
+  // Local parameters
+  localparam integer ADDR_WIDTH = 32;
+  localparam integer DATA_WIDTH = 32;
+  localparam integer ID_WIDTH = 2;
+  localparam integer MEM_ADDR_WIDTH = 12;
+  localparam integer STRB_WIDTH = DATA_WIDTH / 8;
+  localparam integer MEM_BYTES = 1 << MEM_ADDR_WIDTH;
+  localparam logic [2:0] FULL_SIZE = 3'($clog2(STRB_WIDTH));
+  localparam logic [1:0] FIXED = 2'b00;
+  localparam logic [1:0] INCR = 2'b01;
+  localparam logic [1:0] WRAP = 2'b10;
+  // Entries of the expected-response queues (indexes wrap around)
+  localparam integer QUEUE = 256;
+
+  // Clock and reset
+  logic clk = 1'b0;
+  logic arst = 1'b1;
+
+  // Clock generation: 10 ns period (100 MHz)
+  always #5 clk = ~clk;
+
+  // --------------------------------------------------------------------------
+  // DUT connections
+  // --------------------------------------------------------------------------
+  logic                  awVALID;
+  logic                  awREADY;
+  logic [  ID_WIDTH-1:0] awID;
+  logic [ADDR_WIDTH-1:0] awADDR;
+  logic [           7:0] awLEN;
+  logic [           2:0] awSIZE;
+  logic [           1:0] awBURST;
+  logic                  wVALID;
+  logic                  wREADY;
+  logic [DATA_WIDTH-1:0] wDATA;
+  logic [STRB_WIDTH-1:0] wSTRB;
+  logic                  wLAST;
+  logic                  bVALID;
+  logic                  bREADY;
+  logic [  ID_WIDTH-1:0] bID;
+  logic [           1:0] bRESP;
+  logic                  arVALID;
+  logic                  arREADY;
+  logic [  ID_WIDTH-1:0] arID;
+  logic [ADDR_WIDTH-1:0] arADDR;
+  logic [           7:0] arLEN;
+  logic [           2:0] arSIZE;
+  logic [           1:0] arBURST;
+  logic                  rVALID;
+  logic                  rREADY;
+  logic [  ID_WIDTH-1:0] rID;
+  logic [DATA_WIDTH-1:0] rDATA;
+  logic [           1:0] rRESP;
+  logic                  rLAST;
+
+  // --------------------------------------------------------------------------
+  // Scoreboard
+  // --------------------------------------------------------------------------
+  integer                errors = 0;
+  integer                checks = 0;
+  logic [           7:0] ref_bytes [MEM_BYTES];
+  // Expected responses in order: one B per burst, one R entry per beat
+  logic [  ID_WIDTH-1:0] exp_bid   [QUEUE];
+  logic [  ID_WIDTH-1:0] exp_rid   [QUEUE];
+  logic [DATA_WIDTH-1:0] exp_rdata [QUEUE];
+  logic [DATA_WIDTH-1:0] exp_rmask [QUEUE];
+  logic                  exp_rlast [QUEUE];
+  integer                b_head = 0;
+  integer                b_tail = 0;
+  integer                r_head = 0;
+  integer                r_tail = 0;
+
+  AXI_mem #(
+      .AXI_S_mem_ID_W_WIDTH(ID_WIDTH),
+      .AXI_S_mem_ADDR_WIDTH(ADDR_WIDTH),
+      .AXI_S_mem_DATA_WIDTH(DATA_WIDTH),
+      .AXI_S_mem_ID_R_WIDTH(ID_WIDTH),
+      .MEM_ADDR_WIDTH      (MEM_ADDR_WIDTH)
+  ) DUT (
+      .AXI_S_mem_awVALID_i(awVALID),
+      .AXI_S_mem_awREADY_o(awREADY),
+      .AXI_S_mem_awID_i   (awID),
+      .AXI_S_mem_awADDR_i (awADDR),
+      .AXI_S_mem_awLEN_i  (awLEN),
+      .AXI_S_mem_awSIZE_i (awSIZE),
+      .AXI_S_mem_awBURST_i(awBURST),
+      .AXI_S_mem_awLOCK_i (1'b0),
+      .AXI_S_mem_awCACHE_i(4'b0011),
+      .AXI_S_mem_awPROT_i (3'b000),
+      .AXI_S_mem_awQOS_i  (4'b0000),
+      .AXI_S_mem_wVALID_i (wVALID),
+      .AXI_S_mem_wREADY_o (wREADY),
+      .AXI_S_mem_wDATA_i  (wDATA),
+      .AXI_S_mem_wSTRB_i  (wSTRB),
+      .AXI_S_mem_wLAST_i  (wLAST),
+      .AXI_S_mem_bVALID_o (bVALID),
+      .AXI_S_mem_bREADY_i (bREADY),
+      .AXI_S_mem_bID_o    (bID),
+      .AXI_S_mem_bRESP_o  (bRESP),
+      .AXI_S_mem_arVALID_i(arVALID),
+      .AXI_S_mem_arREADY_o(arREADY),
+      .AXI_S_mem_arID_i   (arID),
+      .AXI_S_mem_arADDR_i (arADDR),
+      .AXI_S_mem_arLEN_i  (arLEN),
+      .AXI_S_mem_arSIZE_i (arSIZE),
+      .AXI_S_mem_arBURST_i(arBURST),
+      .AXI_S_mem_arLOCK_i (1'b0),
+      .AXI_S_mem_arCACHE_i(4'b0011),
+      .AXI_S_mem_arPROT_i (3'b000),
+      .AXI_S_mem_arQOS_i  (4'b0000),
+      .AXI_S_mem_rVALID_o (rVALID),
+      .AXI_S_mem_rREADY_i (rREADY),
+      .AXI_S_mem_rID_o    (rID),
+      .AXI_S_mem_rDATA_o  (rDATA),
+      .AXI_S_mem_rRESP_o  (rRESP),
+      .AXI_S_mem_rLAST_o  (rLAST),
+      // Generic IOs
+      .clk_i              (clk),
+      .arst_i             (arst)
+  );
+
+  // --------------------------------------------------------------------------
+  // Helpers
+  // --------------------------------------------------------------------------
+  task automatic expect_eq(input [255:0] name, input [63:0] got, input [63:0] exp);
+    begin
+      checks = checks + 1;
+      if (got !== exp) begin
+        errors = errors + 1;
+        $display("[%0t] FAIL %0s: expected 0x%0h, got 0x%0h", $time, name, exp, got);
+      end
+    end
+  endtask
+
+  // Address of the beat after addr (AXI burst rules, aligned start addresses)
+  function automatic logic [ADDR_WIDTH-1:0] next_addr(input logic [ADDR_WIDTH-1:0] addr, input logic [7:0] len,
+                                                      input logic [2:0] size, input logic [1:0] burst);
+    logic [ADDR_WIDTH-1:0] incr, wrap_mask;
+    incr      = addr + (ADDR_WIDTH'(1) << size);
+    wrap_mask = ((ADDR_WIDTH'(len) + 1) << size) - 1;
+    case (burst)
+      FIXED:   next_addr = addr;
+      WRAP:    next_addr = (addr & ~wrap_mask) | (incr & wrap_mask);
+      default: next_addr = incr;
+    endcase
+  endfunction
+
+  // Byte lanes of a beat of 2**size bytes at addr
+  function automatic logic [STRB_WIDTH-1:0] lanes(input logic [ADDR_WIDTH-1:0] addr, input logic [2:0] size);
+    lanes = STRB_WIDTH'((1 << (1 << size)) - 1) << (addr % STRB_WIDTH);
+  endfunction
+
+  // Bus word of the reference model at addr
+  function automatic logic [DATA_WIDTH-1:0] ref_word(input logic [ADDR_WIDTH-1:0] addr);
+    for (int b = 0; b < STRB_WIDTH; b++) ref_word[8*b+:8] = ref_bytes[(addr & ~(STRB_WIDTH - 1)) + b];
+  endfunction
+
+  function automatic logic [DATA_WIDTH-1:0] beat_data(input logic [DATA_WIDTH-1:0] data, input integer beat);
+    beat_data = data + DATA_WIDTH'(beat) * {STRB_WIDTH{8'h01}};
+  endfunction
+
+  task automatic do_reset;
+    begin
+      arst    = 1'b1;
+      awVALID = 1'b0;
+      awID    = '0;
+      awADDR  = '0;
+      awLEN   = '0;
+      awSIZE  = FULL_SIZE;
+      awBURST = INCR;
+      wVALID  = 1'b0;
+      wDATA   = '0;
+      wSTRB   = '0;
+      wLAST   = 1'b0;
+      bREADY  = 1'b1;
+      arVALID = 1'b0;
+      arID    = '0;
+      arADDR  = '0;
+      arLEN   = '0;
+      arSIZE  = FULL_SIZE;
+      arBURST = INCR;
+      rREADY  = 1'b1;
+      repeat (4) @(posedge clk);
+      @(negedge clk);
+      arst = 1'b0;
+      // Let the synchronous reset de-assert
+      repeat (3) @(negedge clk);
+    end
+  endtask
+
+  // Channel drivers: called at a negedge, they return at the negedge after the (last) handshake.
+  task automatic send_aw(input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id, input logic [7:0] len,
+                         input logic [2:0] size, input logic [1:0] burst);
+    begin
+      awVALID = 1'b1;
+      awADDR  = addr;
+      awID    = id;
+      awLEN   = len;
+      awSIZE  = size;
+      awBURST = burst;
+      @(posedge clk);
+      while (!awREADY) @(posedge clk);
+      exp_bid[b_tail%QUEUE] = id;
+      b_tail = b_tail + 1;
+      @(negedge clk);
+      awVALID = 1'b0;
+    end
+  endtask
+
+  // W beats of a burst; beat k carries data + k in every byte lane
+  task automatic send_w(input logic [ADDR_WIDTH-1:0] addr, input logic [7:0] len, input logic [2:0] size,
+                        input logic [1:0] burst, input logic [DATA_WIDTH-1:0] data);
+    logic [ADDR_WIDTH-1:0] a;
+    begin
+      a = addr;
+      for (int k = 0; k <= len; k++) begin
+        wVALID = 1'b1;
+        wDATA  = beat_data(data, k);
+        wSTRB  = lanes(a, size);
+        wLAST  = (k == len);
+        @(posedge clk);
+        while (!wREADY) @(posedge clk);
+        for (int b = 0; b < STRB_WIDTH; b++) if (wSTRB[b]) ref_bytes[(a & ~(STRB_WIDTH - 1)) + b] = wDATA[8*b+:8];
+        @(negedge clk);
+        wVALID = 1'b0;
+        a = next_addr(a, len, size, burst);
+      end
+    end
+  endtask
+
+  task automatic axi_write(input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id, input logic [7:0] len,
+                           input logic [2:0] size, input logic [1:0] burst, input logic [DATA_WIDTH-1:0] data);
+    begin
+      fork
+        send_aw(addr, id, len, size, burst);
+        send_w(addr, len, size, burst, data);
+      join
+    end
+  endtask
+
+  // AR of a burst; its beats are expected from the reference model as it is at the handshake
+  task automatic send_ar(input logic [ADDR_WIDTH-1:0] addr, input logic [ID_WIDTH-1:0] id, input logic [7:0] len,
+                         input logic [2:0] size, input logic [1:0] burst);
+    logic [ADDR_WIDTH-1:0] a;
+    logic [STRB_WIDTH-1:0] strb;
+    begin
+      arVALID = 1'b1;
+      arADDR  = addr;
+      arID    = id;
+      arLEN   = len;
+      arSIZE  = size;
+      arBURST = burst;
+      @(posedge clk);
+      while (!arREADY) @(posedge clk);
+      a = addr;
+      for (int k = 0; k <= len; k++) begin
+        exp_rid[r_tail%QUEUE] = id;
+        exp_rdata[r_tail%QUEUE] = ref_word(a);
+        strb = lanes(a, size);
+        for (int b = 0; b < STRB_WIDTH; b++) exp_rmask[r_tail%QUEUE][8*b+:8] = {8{strb[b]}};
+        exp_rlast[r_tail%QUEUE] = (k == len);
+        r_tail = r_tail + 1;
+        a = next_addr(a, len, size, burst);
+      end
+      @(negedge clk);
+      arVALID = 1'b0;
+    end
+  endtask
+
+  task automatic wait_responses;
+    begin
+      while (b_head != b_tail || r_head != r_tail) @(negedge clk);
+    end
+  endtask
+
+  // --------------------------------------------------------------------------
+  // Response monitors
+  // --------------------------------------------------------------------------
+  logic                         b_stalled = 1'b0;
+  logic [         ID_WIDTH-1:0] b_stalled_id;
+  logic                         r_stalled = 1'b0;
+  logic [ID_WIDTH+DATA_WIDTH:0] r_stalled_beat;
+
+  always @(posedge clk) begin
+    if (!arst) begin
+      // A response that waited for ready must be presented again unchanged
+      if (b_stalled) begin
+        expect_eq("bVALID held", bVALID, 1'b1);
+        expect_eq("bID held", bID, b_stalled_id);
+      end
+      if (r_stalled) begin
+        expect_eq("rVALID held", rVALID, 1'b1);
+        expect_eq("R beat held", {rID, rDATA, rLAST}, r_stalled_beat);
+      end
+      b_stalled      = bVALID && !bREADY;
+      b_stalled_id   = bID;
+      r_stalled      = rVALID && !rREADY;
+      r_stalled_beat = {rID, rDATA, rLAST};
+
+      if (bVALID && bREADY) begin
+        if (b_head == b_tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL B response (ID %0d) without an outstanding write", $time, bID);
+        end else begin
+          expect_eq("bID", bID, exp_bid[b_head%QUEUE]);
+          expect_eq("bRESP", bRESP, 2'b00);
+          b_head = b_head + 1;
+        end
+      end
+      if (rVALID && rREADY) begin
+        if (r_head == r_tail) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL R beat (ID %0d) without an outstanding read", $time, rID);
+        end else begin
+          expect_eq("rID", rID, exp_rid[r_head%QUEUE]);
+          expect_eq("rDATA", rDATA & exp_rmask[r_head%QUEUE], exp_rdata[r_head%QUEUE] & exp_rmask[r_head%QUEUE]);
+          expect_eq("rLAST", rLAST, exp_rlast[r_head%QUEUE]);
+          expect_eq("rRESP", rRESP, 2'b00);
+          r_head = r_head + 1;
+        end
+      end
+    end
+  end
+
+  // --------------------------------------------------------------------------
+  // Main stimulus
+  // --------------------------------------------------------------------------
+  integer i;
+  time    start;
+
+  initial begin
+    $display("==================================================");
+    $display(" AXI_mem testbench");
+    $display("==================================================");
+
+    do_reset;
+
+    // ---- Test 0: idle interface state after reset -------------------------
+    $display("\n--- Test 0: reset / idle state ---");
+    expect_eq("awREADY idle", awREADY, 1'b1);
+    expect_eq("wREADY without a burst", wREADY, 1'b0);
+    expect_eq("arREADY idle", arREADY, 1'b1);
+    expect_eq("bVALID idle", bVALID, 1'b0);
+    expect_eq("rVALID idle", rVALID, 1'b0);
+
+    // ---- Test 1: single-beat write and read -------------------------------
+    $display("\n--- Test 1: single beat ---");
+    axi_write(32'h0000_0000, 2'd1, 8'd0, FULL_SIZE, INCR, 32'hDEAD_BEEF);
+    wait_responses;
+    send_ar(32'h0000_0000, 2'd2, 8'd0, FULL_SIZE, INCR);
+    wait_responses;
+
+    // ---- Test 2: 16-beat INCR burst, read at one beat per cycle -----------
+    $display("\n--- Test 2: INCR burst ---");
+    axi_write(32'h0000_0100, 2'd0, 8'd15, FULL_SIZE, INCR, 32'h1000_0000);
+    wait_responses;
+    send_ar(32'h0000_0100, 2'd3, 8'd15, FULL_SIZE, INCR);
+    @(posedge clk);
+    while (!(rVALID && rREADY)) @(posedge clk);
+    start = $time;
+    wait_responses;
+    expect_eq("cycles for 16 R beats", ($time - start + 5) / 10, 16);
+
+    // ---- Test 3: WRAP burst -----------------------------------------------
+    // 4 beats from 0x208 wrap inside 0x200-0x20F: 0x208, 0x20C, 0x200, 0x204
+    $display("\n--- Test 3: WRAP burst ---");
+    axi_write(32'h0000_0208, 2'd1, 8'd3, FULL_SIZE, WRAP, 32'hA0A0_A0A0);
+    wait_responses;
+    expect_eq("WRAP beat 0 at 0x208", ref_word(32'h0000_0208), beat_data(32'hA0A0_A0A0, 0));
+    expect_eq("WRAP beat 2 at 0x200", ref_word(32'h0000_0200), beat_data(32'hA0A0_A0A0, 2));
+    expect_eq("WRAP beat 3 at 0x204", ref_word(32'h0000_0204), beat_data(32'hA0A0_A0A0, 3));
+    send_ar(32'h0000_0200, 2'd1, 8'd3, FULL_SIZE, INCR);
+    send_ar(32'h0000_0204, 2'd2, 8'd3, FULL_SIZE, WRAP);
+    wait_responses;
+
+    // ---- Test 4: FIXED burst ----------------------------------------------
+    $display("\n--- Test 4: FIXED burst ---");
+    axi_write(32'h0000_0300, 2'd2, 8'd3, FULL_SIZE, FIXED, 32'hF000_0000);
+    wait_responses;
+    expect_eq("FIXED keeps the last beat", ref_word(32'h0000_0300), beat_data(32'hF000_0000, 3));
+    send_ar(32'h0000_0300, 2'd0, 8'd3, FULL_SIZE, FIXED);
+    wait_responses;
+
+    // ---- Test 5: narrow INCR burst (one byte per beat) --------------------
+    $display("\n--- Test 5: narrow transfers ---");
+    axi_write(32'h0000_0400, 2'd3, 8'd7, 3'd0, INCR, 32'h4433_2211);
+    wait_responses;
+    // Byte k is lane k of beat k
+    expect_eq("narrow bytes 0-3", ref_word(32'h0000_0400), 32'h4735_2311);
+    send_ar(32'h0000_0400, 2'd3, 8'd1, FULL_SIZE, INCR);
+    send_ar(32'h0000_0401, 2'd3, 8'd2, 3'd0, INCR);
+    wait_responses;
+
+    // ---- Test 6: outstanding bursts ---------------------------------------
+    // Four AWs are accepted back to back while their W bursts follow one by one.
+    $display("\n--- Test 6: outstanding bursts ---");
+    fork
+      begin : aw_thread
+        start = $time;
+        for (int n = 0; n < 4; n++) send_aw(32'h0000_0500 + (n << 4), n[ID_WIDTH-1:0], 8'd3, FULL_SIZE, INCR);
+        expect_eq("cycles for 4 AWs", ($time - start) / 10, 4);
+      end
+      begin : w_thread
+        for (int n = 0; n < 4; n++) send_w(32'h0000_0500 + (n << 4), 8'd3, FULL_SIZE, INCR, 32'h5000_0000 + (n << 16));
+      end
+    join
+    wait_responses;
+    start = $time;
+    for (i = 0; i < 4; i = i + 1) send_ar(32'h0000_0500 + (i << 4), i[ID_WIDTH-1:0], 8'd3, FULL_SIZE, INCR);
+    expect_eq("cycles for 4 ARs", ($time - start) / 10, 4);
+    wait_responses;
+
+    // ---- Test 7: back-pressure on R and B ---------------------------------
+    $display("\n--- Test 7: back-pressure ---");
+    send_ar(32'h0000_0100, 2'd1, 8'd15, FULL_SIZE, INCR);
+    for (i = 0; i < 60; i = i + 1) begin
+      rREADY = (i % 3) == 2;
+      @(negedge clk);
+    end
+    rREADY = 1'b1;
+    wait_responses;
+    bREADY = 1'b0;
+    for (i = 0; i < 3; i = i + 1) axi_write(32'h0000_0600 + (i << 2), i[ID_WIDTH-1:0], 8'd0, FULL_SIZE, INCR, 32'h6000_0000 + i);
+    repeat (4) @(negedge clk);
+    expect_eq("bVALID while bREADY is low", bVALID, 1'b1);
+    bREADY = 1'b1;
+    wait_responses;
+    send_ar(32'h0000_0600, 2'd2, 8'd2, FULL_SIZE, INCR);
+    wait_responses;
+
+    // ---- Test 8: W waits for its AW ---------------------------------------
+    $display("\n--- Test 8: W before AW ---");
+    fork
+      send_w(32'h0000_0700, 8'd1, FULL_SIZE, INCR, 32'h7000_0000);
+      begin
+        repeat (3) @(negedge clk);
+        expect_eq("wREADY before AW", wREADY, 1'b0);
+        send_aw(32'h0000_0700, 2'd3, 8'd1, FULL_SIZE, INCR);
+      end
+    join
+    wait_responses;
+    send_ar(32'h0000_0700, 2'd0, 8'd1, FULL_SIZE, INCR);
+    wait_responses;
+
+    // ---- Summary ----------------------------------------------------------
+    repeat (2) @(posedge clk);
+    $display("\n==================================================");
+    $display(" Checks run : %0d", checks);
+    $display(" Errors     : %0d", errors);
+    if (errors == 0) $display(" RESULT     : PASS");
+    else $display(" RESULT     : FAIL");
+    $display("==================================================");
+    $finish;
+  end
+
+  // Watchdog to avoid a hung simulation
+  initial begin
+    #50000;
+    $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
+    $finish;
+  end
+
+  // Dump waves
+  initial begin
+    $dumpfile("AXI_mem_tb.vcd");
+    $dumpvars(0, AXI_mem_tb);
+  end
+
+endmodule
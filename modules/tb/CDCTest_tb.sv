@@ -0,0 +1,133 @@
+`timescale 1ns / 1ps
+
+module CDCTest_tb;
+
+    localparam integer WORDS = 16;
+
+    logic       clk_a;
+    logic       rst_a = 1;
+    logic       clk_b;
+    logic       rst_b = 1;
+    logic       mux_valid_i;
+    logic [7:0] mux_data_i;
+    logic       mux_valid_o;
+    logic [7:0] mux_data_o;
+    logic       hs_valid_i;
+    logic [7:0] hs_data_i;
+    logic       hs_ready_o;
+    logic       hs_valid_o;
+    logic [7:0] hs_data_o;
+
+    integer mux_sent = 0;
+    integer mux_received = 0;
+    integer hs_sent = 0;
+    integer hs_received = 0;
+    integer error_count = 0;
+
+    CDCTest dut (
+        .clk_a(clk_a),
+        .rst_a(rst_a),
+        .clk_b(clk_b),
+        .rst_b(rst_b),
+        .mux_valid_i(mux_valid_i),
+        .mux_data_i(mux_data_i),
+        .mux_valid_o(mux_valid_o),
+        .mux_data_o(mux_data_o),
+        .hs_valid_i(hs_valid_i),
+        .hs_data_i(hs_data_i),
+        .hs_ready_o(hs_ready_o),
+        .hs_valid_o(hs_valid_o),
+        .hs_data_o(hs_data_o)
+    );
+
+    // Clock generation: unrelated source and destination clocks
+    initial begin
+        clk_a = 0;
+        forever #5 clk_a = ~clk_a;
+    end
+
+    initial begin
+        clk_b = 0;
+        #3;
+        forever #7 clk_b = ~clk_b;
+    end
+
+    // Destination: every valid must come with the next expected word
+    always @(posedge clk_b) begin
+        if (!rst_b && mux_valid_o) begin
+            if (mux_data_o !== 8'h10 + mux_received[7:0]) begin
+                $error("mux: word %0d is %h, expected %h", mux_received, mux_data_o, 8'h10 + mux_received[7:0]);
+                error_count = error_count + 1;
+            end
+            mux_received = mux_received + 1;
+        end
+        if (!rst_b && hs_valid_o) begin
+            if (hs_data_o !== 8'h80 + hs_received[7:0]) begin
+                $error("handshake: word %0d is %h, expected %h", hs_received, hs_data_o, 8'h80 + hs_received[7:0]);
+                error_count = error_count + 1;
+            end
+            hs_received = hs_received + 1;
+        end
+    end
+
+    // mux source: one word every 10 source cycles (more than stages+2 destination cycles)
+    initial begin
+        mux_valid_i = 0;
+        mux_data_i = 0;
+        wait (!rst_a && !rst_b);
+        repeat (WORDS) begin
+            @(negedge clk_a);
+            mux_valid_i = 1;
+            mux_data_i = 8'h10 + mux_sent[7:0];
+            mux_sent = mux_sent + 1;
+            @(negedge clk_a);
+            mux_valid_i = 0;
+            repeat (8) @(negedge clk_a);
+        end
+    end
+
+    // handshake source: a new word as soon as the previous one is accepted
+    initial begin
+        hs_valid_i = 0;
+        hs_data_i = 0;
+        wait (!rst_a && !rst_b);
+        @(negedge clk_a);
+        while (hs_sent < WORDS) begin
+            hs_valid_i = 1;
+            hs_data_i = 8'h80 + hs_sent[7:0];
+            @(posedge clk_a);
+            if (hs_ready_o) hs_sent = hs_sent + 1;
+            @(negedge clk_a);
+        end
+        hs_valid_i = 0;
+    end
+
+    initial begin
+        // Reset both domains (asserted from time 0, before the sources wait for it)
+        repeat (4) @(negedge clk_b);
+        rst_a = 0;
+        rst_b = 0;
+
+        // Wait for every transfer to cross
+        repeat (WORDS * 12 + 20) @(negedge clk_a);
+
+        if (mux_received != WORDS) begin
+            $error("mux: %0d of %0d words received", mux_received, WORDS);
+            error_count = error_count + 1;
+        end
+        if (hs_received != WORDS) begin
+            $error("handshake: %0d of %0d words received", hs_received, WORDS);
+            error_count = error_count + 1;
+        end
+
+        if (error_count == 0) $display("All tests passed!");
+        $finish;
+    end
+
+    // Dump waves
+    initial begin
+        $dumpfile("CDCTest.vcd");
+        $dumpvars(0, CDCTest_tb);
+    end
+
+endmodule
@@ -4,6 +4,8 @@ module FIFO_tb;
 
   parameter int WIDTH = 8;
   parameter int DEPTH = 16;
+  // Largest number of golden vectors (+golden=N) the testbench can load.
+  parameter int GOLDEN_MAX = 1 << 20;
 
   logic               clk;
   logic               rst;
@@ -22,6 +24,12 @@ module FIFO_tb;
   integer             ref_tail = 0;
   integer             ref_size = 0;
 
+  // Golden vectors from scripts/tb_models.py: {wr_en, rd_en, wr_data} and
+  // {check_data, empty, full, rd_data}.
+  integer             golden_vectors = 0;
+  logic   [WIDTH+1:0] golden_stimulus [GOLDEN_MAX];
+  logic   [WIDTH+2:0] golden_expected [GOLDEN_MAX];
+
   FIFO #(
       .WIDTH(WIDTH),
       .DEPTH(DEPTH)
@@ -222,6 +230,39 @@ module FIFO_tb;
     end
   endtask
 
+  task automatic test_golden;
+    integer           i;
+    logic             check;
+    logic             exp_empty;
+    logic             exp_full;
+    logic [WIDTH-1:0] exp_data;
+    begin
+      $display("\n--- Test: %0d golden vectors ---", golden_vectors);
+      if (golden_vectors > GOLDEN_MAX) begin
+        $display("[FAIL] +golden=%0d is larger than GOLDEN_MAX=%0d", golden_vectors, GOLDEN_MAX);
+        error_count = error_count + 1;
+        return;
+      end
+      $readmemh("FIFO_stimulus.hex", golden_stimulus, 0, golden_vectors - 1);
+      $readmemh("FIFO_expected.hex", golden_expected, 0, golden_vectors - 1);
+      reset_dut();
+      // Only mismatches are printed, so long runs are not slowed down by the log.
+      for (i = 0; i < golden_vectors; i = i + 1) begin
+        {wr_en, rd_en, wr_data} = golden_stimulus[i];
+        @(negedge clk);
+        {check, exp_empty, exp_full, exp_data} = golden_expected[i];
+        test_count = test_count + 1;
+        if (empty !== exp_empty || full !== exp_full || (check && rd_data !== exp_data)) begin
+          error_count = error_count + 1;
+          $display("[FAIL] Golden vector %0d: empty %b full %b rd_data 0x%h, expected %b %b 0x%h", i,
+                   empty, full, rd_data, exp_empty, exp_full, exp_data);
+        end
+      end
+      wr_en = 1'b0;
+      rd_en = 1'b0;
+    end
+  endtask
+
   initial begin
     clk = 1'b0;
 
@@ -238,6 +279,7 @@ module FIFO_tb;
     test_read_when_empty();
     test_tunneling();
     test_normal_operations();
+    if ($value$plusargs("golden=%d", golden_vectors)) test_golden();
 
     $display("\n--- Test Summary ---");
     if (error_count == 0) begin
@@ -250,9 +292,12 @@ module FIFO_tb;
     #10 $finish;
   end
 
+  // Waves are not dumped for golden runs, which can be millions of cycles long.
   initial begin
-    $dumpfile("FIFO_tb.vcd");
-    $dumpvars(0, FIFO_tb);
+    if (!$test$plusargs("golden")) begin
+      $dumpfile("FIFO_tb.vcd");
+      $dumpvars(0, FIFO_tb);
+    end
   end
 
 endmodule
@@ -7,6 +7,8 @@
 module Reg_tb ();
 
   localparam integer DataWidth = 8;
+  // Largest number of golden vectors (+golden=N) the testbench can load.
+  localparam integer GoldenMax = 1 << 20;
 
   // Clock and reset
   reg                     clk = 1'b0;
@@ -31,6 +33,13 @@ module Reg_tb ();
   integer                 checks = 0;
   integer                 errors = 0;
 
+  // Golden vectors from scripts/tb_models.py:
+  // {data_e, data_r, data_n, count_en, count_r, count_n, valid_r, valid_n} and
+  // {data_q, count_q, valid_q, free_q toggled since the first vector}.
+  integer                 golden_vectors = 0;
+  reg [2*DataWidth+5:0]   golden_stimulus [0:GoldenMax-1];
+  reg [  DataWidth+9:0]   golden_expected [0:GoldenMax-1];
+
   always #5 clk = ~clk;
 
   Reg #(
@@ -91,6 +100,33 @@ module Reg_tb ();
     end
   endtask
 
+  // --------------------------------------------------------------------------
+  // Golden vectors (only mismatches are printed)
+  // --------------------------------------------------------------------------
+  task automatic run_golden;
+    integer               i;
+    reg                   free_start;
+    reg [DataWidth+9:0]   got;
+    begin
+      $display("\n--- Golden: %0d vectors ---", golden_vectors);
+      $readmemh("Reg_stimulus.hex", golden_stimulus, 0, golden_vectors - 1);
+      $readmemh("Reg_expected.hex", golden_expected, 0, golden_vectors - 1);
+      do_reset;
+      free_start = free_q;
+      for (i = 0; i < golden_vectors; i = i + 1) begin
+        {data_e, data_r, data_n, count_en, count_r, count_n, valid_r, valid_n} = golden_stimulus[i];
+        @(negedge clk);
+        got = {data_q, count_q, valid_q, free_q ^ free_start};
+        checks = checks + 1;
+        if (got !== golden_expected[i]) begin
+          errors = errors + 1;
+          $display("[%0t] FAIL golden vector %0d: expected 0x%0h, got 0x%0h", $time, i,
+                   golden_expected[i], got);
+        end
+      end
+    end
+  endtask
+
   // --------------------------------------------------------------------------
   // Main stimulus
   // --------------------------------------------------------------------------
@@ -171,6 +207,14 @@ module Reg_tb ();
       end
     end
 
+    // ---- Golden vectors (+golden=N) ---------------------------------------
+    if (golden_vectors > GoldenMax) begin
+      errors = errors + 1;
+      $display("FAIL +golden=%0d is larger than GoldenMax=%0d", golden_vectors, GoldenMax);
+    end else if (golden_vectors > 0) begin
+      run_golden;
+    end
+
     // ---- Summary ----------------------------------------------------------
     repeat (2) @(negedge clk);
     $display("\n==================================================");
@@ -182,17 +226,20 @@ module Reg_tb ();
     $finish;
   end
 
-  // Watchdog to avoid a hung simulation.
+  // Watchdog to avoid a hung simulation, extended by one clock period per golden vector.
   initial begin
-    #50000;
+    if (!$value$plusargs("golden=%d", golden_vectors)) golden_vectors = 0;
+    #(50000 + 10 * golden_vectors);
     $display("[%0t] TIMEOUT: simulation did not finish in time", $time);
     $finish;
   end
 
-  // Dump waves
+  // Dump waves (not for golden runs, which can be millions of cycles long)
   initial begin
-    $dumpfile("Reg_tb.vcd");
-    $dumpvars(0, Reg_tb);
+    if (!$test$plusargs("golden")) begin
+      $dumpfile("Reg_tb.vcd");
+      $dumpvars(0, Reg_tb);
+    end
   end
 
 endmodule
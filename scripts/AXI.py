@@ -1,35 +1,121 @@
 #!/usr/bin/env python
 
 # AXI.py script creates required AXI5 IOs and logic for Lite, Stream, and Full interfaces.
-# It generates two files:
+# It generates four files, AXI_[parameters,ios,signals,logic][_{interface_name}].vs, from one render of
+# the block, so the includes of the same interface that follow find their file already generated.
 # To call this script in a Verilog file it should follow one of the following patterns:
-#   `include "AXI_[ios,signals,logic][_{interface/bus_name}].vs" // AXI-[Lite,Full,Stream] [Manager,Subordinate] {bus_name}
+#   `include "AXI_[parameters,ios,signals,logic][_{interface/bus_name}].vs" // AXI-[Lite,Full,Stream] [Manager,Subordinate] {bus_name}
 # and
-#   `include "AXI_[ios,signals,logic][_{interface_name}].vs" /*
+#   `include "AXI_[parameters,ios,signals,logic][_{interface_name}].vs" /*
 #             AXI-[Lite,Full,Stream] [Manager,Subordinate] {bus_name}
 #             AXI-[Lite,Full,Stream] [Manager,Subordinate] {bus_name}
 #             AXI-[Lite,Full,Stream] [Manager,Subordinate] {bus_name}
 #             ...
 #             */
+# A block with an "AXI-[Lite,Full] Crossbar {name}" line generates a crossbar instead: its Manager lines
+# are the ports where managers connect and its Subordinate lines (with an address range) are the ports
+# where subordinates connect, all prefixed AXI[L]_X_{name}_{port_name}. Every subordinate has its own
+# round-robin arbiters, so different manager/subordinate pairs transfer concurrently. Unmapped
+# addresses are answered by an internal error subordinate (DECERR on AXI-Full).
+# "AXI-[Lite,Full] [Upsizer,Downsizer,CDC] {name}" lines generate bridges with a manager-facing port
+# {prefix}_s_* and a subordinate-facing port {prefix}_m_* (prefix AXI[L]_UP_/AXI[L]_DN_/AXI[L]_CDC_{name}):
+# - Upsizer/Downsizer: {prefix}_S_DATA_WIDTH to {prefix}_M_DATA_WIDTH (a power-of-two ratio). AXI-Full
+#   INCR bursts of full beats are packed into wider beats or split into narrower ones; every other burst
+#   keeps its length and moves between byte lanes. Bursts wider than the narrow bus must be INCR and
+#   must fit in 256 narrow beats. AXI-Lite transactions are split into one per lane (Downsizer) or
+#   placed on their lane (Upsizer). Reads leave with ID 0, so data returns in order and the ID is
+#   restored from a FIFO of outstanding=N entries (default 4).
+# - CDC: one asynchronous FIFO per channel with Gray-coded pointers, depth=N entries (power of two,
+#   default 8) and stages=S synchronizer flops (default 2); {prefix}_[s,m]_clk_i/_rst_i per side.
+# Options can be appended to a bus line as key=value:
+#   outstanding=N  AXI-Lite Subordinate: AW/W/AR FIFO depth (power of two). N > 1 generates a
+#                  pipelined subordinate serving one read and one write per cycle; N = 1 (default)
+#                  keeps the skid-buffer implementation.
+#                  AXI-Full Subordinate: AW/AR FIFO depth and B responses in flight (default 2).
+#                  AXI-Full Manager: N > 1 keeps up to N read and N write bursts in flight, each
+#                  with its own ID; read beats go through a reorder buffer keyed on rID and are
+#                  delivered in request order ({prefix}_usr_r_valid/_usr_r_ready). N = 1 (default)
+#                  keeps the single-burst FSM implementation.
+#   rob_beats=B    AXI-Full Manager with outstanding > 1: reorder buffer beats per burst (default 16);
+#                  read bursts must have {prefix}_usr_rLEN < B.
+#   split=1        AXI-Full Manager: add a transfer splitter in front of the manager. The user then
+#                  requests byte transfers on {prefix}_usr_[r,w]XFER/_XFER_ADDR/_XFER_BYTES (handshake
+#                  {prefix}_usr_[r,w]XFER_READY) and the splitter drives usr_[r,w]TRANSFER/ADDR/LEN with
+#                  maximal bursts that never cross a 4KB boundary.
+#   max_len=N      AXI-Full Manager: longest burst issued by the splitter in beats (implies split=1;
+#                  default 256, or rob_beats with outstanding > 1).
+#   base=A size=S  Crossbar subordinate port: decoded address range [A, A+S).
+#   mmio=FILE      Crossbar subordinate port: take the range from the first MMIO include block of FILE
+#                  (lowest register address to the end of the highest one, offset by base=A if given).
+#   read_latency=L AXI-Full Subordinate: cycles between {prefix}_usr_r_en/{prefix}_usr_rADDR and the
+#                  matching {prefix}_usr_rDATA (default 1). For a Mem.py memory use its {name}_READ_LATENCY.
+#   perf=1         AXI-Lite Subordinate, AXI-Full Manager and Subordinate: add performance counters in an
+#                  MMIO.py register block MMIO_{prefix}_perf (32-bit registers from perf_base=A, default 0):
+#                  cycles, beats and stall cycles (valid & ~ready) per channel, and per direction (w: AW to
+#                  B, r: AR to last R) the outstanding transactions, their per-cycle sum (occupancy), the
+#                  count/sum/min/max of latencies and perf_buckets=N (default 8) power-of-two latency buckets.
+#                  Requests are timestamped in a FIFO of perf_depth=D entries (default 8); writing a
+#                  counter clears it. Its register interface is {prefix}_perf_r_/w_address, data and enable
+#                  ({prefix}_PERF_WIDTH data and {prefix}_PERF_ADDR_WIDTH address bits).
+#   sva=1          AXI-Lite Subordinate, AXI-Full Manager/Subordinate, AXI-Stream: write a simulation-only
+#                  protocol checker module {prefix}_checker.sv and instantiate it in the logic under
+#                  `ifndef SYNTHESIS (clk_i, sync_reset). It checks for X on valid, a stable payload while
+#                  valid waits for ready, response IDs matching an outstanding request, WLAST/RLAST at
+#                  AxLEN (AXI-Full), and that no handshake or response waits sva_timeout=N cycles (default 1024).
+#   data/keep/last/user/id/dest=0|1  AXI-Stream: TDATA/TKEEP/TLAST/TUSER/TID/TDEST present
+#                  (defaults: data=1 last=1, others 0). Widths are the {prefix}_DATA_WIDTH,
+#                  {prefix}_USER_WIDTH, {prefix}_ID_WIDTH and {prefix}_DEST_WIDTH parameters.
+#   slices=N       AXI-Stream: number of full-throughput register slices (skid buffers) between the
+#                  user side ({prefix}_usr_tVALID/_usr_tREADY/_usr_tDATA/...) and the bus (default 1).
+# AXI-Full Subordinate user port (prefix AXI_S_{bus_name}): one write beat per cycle on the registered
+# {prefix}_usr_w_en/_usr_wADDR/_usr_wDATA/_usr_wSTRB and one read beat per cycle on {prefix}_usr_r_en/
+# _usr_rADDR; FIXED, INCR and WRAP bursts are expanded into beat addresses by the script.
 # Notes:
 # - {bus_name} is optional. If it is not provided, the script will use the interface name as the bus name.
 # - {interface_name} is optional. If it is not provided, the script will use the bus name as the interface name.
 # - We use the term "beat" to refer to a single data transfer.
 
-from logging import Manager
-import subprocess
 import sys
 import os
 import re
 from VeriSnip.vs_colours import *
+from vs_arguments import tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
+
+
+OUTPUT_KINDS = ("parameters", "ios", "signals", "logic")
+OPTIONS = (
+    "outstanding", "rob_beats", "split", "max_len", "base", "size", "mmio", "read_latency", "perf",
+    "perf_base", "perf_buckets", "perf_depth", "sva", "sva_timeout", "slices", "depth", "stages",
+    "data", "keep", "last", "user", "id", "dest",
+)
 
 
 class AXIConfiguration:
     def __init__(self, configuration):
-        configuration = configuration.split(" ")
+        tokens = configuration.split()
+        # key=value tokens are options, e.g. "AXI-Lite Subordinate bus outstanding=4"
+        self.options = dict(token.split("=", 1) for token in tokens if "=" in token)
+        configuration = [token for token in tokens if "=" not in token]
         self.type = configuration[0]
         self.node = configuration[1]
-        self.name = configuration[2]
+        self.name = configuration[2] if len(configuration) > 2 else ""
+        unknown = [key for key in self.options if key not in OPTIONS]
+        if unknown:
+            vs_print(ERROR, f"Unknown AXI option(s) for {' '.join(configuration[:3])}: {', '.join(unknown)}.")
+            exit(1)
+
+    def option(self, key, default=None):
+        return self.options.get(key, default)
+
+    def int_option(self, key, default):
+        value = self.option(key, str(default))
+        if not value.isdigit():
+            vs_print(ERROR, f"AXI option {key} must be a number, got {value}.")
+            exit(1)
+        return int(value)
 
 class AXIInterface:
     def __init__(self, vs_suffix, configurations):
@@ -37,57 +123,229 @@ class AXIInterface:
         self.conf_list = configurations.split("\n")
         self.buses = [AXIConfiguration(conf.strip() + " " + self.interface_name) for conf in self.conf_list]
 
-    def generate(self):
-        parameters_content = ""
-        ios_content = ""
-        logic_content = ""
-        signals_content = ""
-
-        for bus in self.buses:
-            if bus.type == "AXI-Lite" and bus.node == "Manager":
-                  vs_print(WARNING, "AXI-Lite Manager interface not implemented yet.")
-                  pass
-            elif bus.type == "AXI-Lite" and bus.node == "Subordinate":
-                vs_print(INFO, f"Generating AXI-Lite Subordinate {bus.name} interface.")
-                prefix = f"AXIL_{bus.name}" if bus.name else "AXIL"
-                parameters_content += get_lite_s_parameters(prefix)
-                ios_content += get_lite_s_ios(prefix)
-                logic_content += get_lite_s_logic(prefix, bus.name)
-                signals_content += get_lite_s_signals(prefix)
-            elif bus.type == "AXI-Stream" and bus.node == "Manager":
-                vs_print(WARNING, "AXI-Stream Manager interface not implemented yet.")
-                pass
-            elif bus.type == "AXI-Stream" and bus.node == "Subordinate":
-                vs_print(WARNING, "AXI-Stream Subordinate interface not implemented yet.")
-                pass
-            elif bus.type == "AXI-Full" and bus.node == "Manager":
-                prefix = f"AXI_M_{bus.name}" if bus.name else "AXI_M"
-                parameters_content += get_full_m_parameters(prefix)
-                ios_content += get_full_m_ios(prefix)
-                signals_content += get_full_m_signals(prefix)
-                logic_content += get_full_m_logic(prefix)
-                vs_print(INFO, f"Generating AXI-Full Manager {bus.name} interface.")
-            elif bus.type == "AXI-Full" and bus.node == "Subordinate":
-                vs_print(WARNING, "AXI-Full Subordinate interface not implemented yet.")
-                pass
-            else:
-                vs_print(ERROR, f"Unknown AXI type: {bus.type}")
-                exit(1)
+    def crossbar(self, crossbars):
+        # In crossbar mode the other bus lines of the block are the crossbar ports
+        if len(crossbars) > 1:
+            vs_print(ERROR, "Only one crossbar can be described per block.")
+            exit(1)
+        crossbar = crossbars[0]
+        if crossbar.type not in AXI_CHANNELS:
+            vs_print(ERROR, f"{crossbar.type} crossbars are not supported.")
+            exit(1)
+        ports = [bus for bus in self.buses if bus is not crossbar]
+        if any(bus.type != crossbar.type for bus in ports):
+            vs_print(ERROR, f"Every port of {crossbar.type} Crossbar {crossbar.name} must be {crossbar.type}.")
+            exit(1)
+        managers = [bus for bus in ports if bus.node == "Manager"]
+        subordinates = [bus for bus in ports if bus.node == "Subordinate"]
+        return AXICrossbar(crossbar, managers, subordinates)
+
+    def render(self):
+        """Render every bus once into {file kind: [chunks]} for the four output files."""
+        content = {kind: [] for kind in OUTPUT_KINDS + ("checkers",)}
+        buses = self.buses
+        crossbars = [bus for bus in buses if bus.node == "Crossbar"]
+        if crossbars:
+            crossbar = self.crossbar(crossbars)
+            vs_print(INFO, f"Generating {crossbar.type} Crossbar {crossbar.name}.")
+            content["parameters"].append(crossbar.parameters())
+            content["ios"].append(crossbar.ios())
+            content["signals"].append(crossbar.signals())
+            content["logic"].append(crossbar.logic())
+            buses = []
+        for bus in buses:
+            for kind, chunks in render_bus(bus).items():
+                content[kind].extend(chunks)
+        return content
 
+    def generate(self):
+        # The ios, signals, logic and parameters includes of an interface all name the same block:
+        # the first one renders the four files and the build only runs the script for missing files.
         name = "_" + self.interface_name if self.interface_name else ""
-        if parameters_content:
-            write_vs(parameters_content, f"AXI_parameters{name}.vs")
-        if ios_content:
-            write_vs(ios_content, f"AXI_ios{name}.vs")
-        if signals_content:
-            write_vs(signals_content, f"AXI_signals{name}.vs")
-        if logic_content:
-            write_vs(logic_content, f"AXI_logic{name}.vs")
-        
+        content = self.render()
+        for kind in OUTPUT_KINDS:
+            if content[kind]:
+                write_vs(content[kind], f"AXI_{kind}{name}.vs")
+        for file_name, module in content["checkers"]:
+            write_vs(module, file_name)
+
         name = " " + self.interface_name if self.interface_name else ""
         vs_print(OK, f"Generated AXI{name} interface.")
 
 
+# Endpoints with performance counters and the node of their bus port (see channel_port)
+PERF_ENDPOINTS = {
+    ("AXI-Lite", "Subordinate"): "m",
+    ("AXI-Full", "Manager"): "s",
+    ("AXI-Full", "Subordinate"): "m",
+}
+
+# Rendered buses, keyed on (bus type, node, prefix and options): a bus is rendered once and its
+# four parts are shared by every output file.
+_rendered = {}
+
+
+def render_bus(bus):
+    """{file kind: [chunks]} of one bus line."""
+    key = (bus.type, bus.node, bus.name, tuple(sorted(bus.options.items())))
+    if key in _rendered:
+        return _rendered[key]
+    parts = {kind: [] for kind in OUTPUT_KINDS + ("checkers",)}
+    if bus.node in ("Upsizer", "Downsizer", "CDC"):
+        if bus.type not in AXI_CHANNELS:
+            vs_print(ERROR, f"{bus.type} {bus.node} is not supported.")
+            exit(1)
+        vs_print(INFO, f"Generating {bus.type} {bus.node} {bus.name}.")
+        converter = AXIClockBridge(bus) if bus.node == "CDC" else AXIWidthConverter(bus)
+        parts["parameters"].append(converter.parameters())
+        parts["ios"].append(converter.ios())
+        parts["signals"].append(converter.signals())
+        parts["logic"].append(converter.logic())
+    elif bus.type == "AXI-Lite" and bus.node == "Manager":
+        vs_print(WARNING, "AXI-Lite Manager interface not implemented yet.")
+    elif bus.type == "AXI-Lite" and bus.node == "Subordinate":
+        vs_print(INFO, f"Generating AXI-Lite Subordinate {bus.name} interface.")
+        prefix = f"AXIL_{bus.name}" if bus.name else "AXIL"
+        outstanding = bus.int_option("outstanding", 1)
+        if outstanding < 1 or outstanding & (outstanding - 1):
+            vs_print(ERROR, f"AXI-Lite Subordinate {bus.name}: outstanding must be a power of two.")
+            exit(1)
+        parts["parameters"].append(get_lite_s_parameters(prefix))
+        parts["ios"].append(get_lite_s_ios(prefix))
+        if outstanding == 1:
+            parts["logic"].append(get_lite_s_logic(prefix, bus.name))
+            parts["signals"].append(get_lite_s_signals(prefix))
+        else:
+            parts["logic"].append(get_lite_s_pipelined_logic(prefix, bus.name))
+            parts["signals"].append(get_lite_s_pipelined_signals(prefix, outstanding))
+    elif bus.type == "AXI-Stream" and bus.node in ("Manager", "Subordinate"):
+        vs_print(INFO, f"Generating AXI-Stream {bus.node} {bus.name} interface.")
+        node = "M" if bus.node == "Manager" else "S"
+        prefix = f"AXIS_{node}_{bus.name}" if bus.name else f"AXIS_{node}"
+        fields = stream_fields(bus, prefix)
+        slices = bus.int_option("slices", 1)
+        if not fields:
+            vs_print(ERROR, f"AXI-Stream {bus.node} {bus.name} has no payload fields.")
+            exit(1)
+        parts["parameters"].append(get_stream_parameters(prefix, bus.node, fields))
+        parts["ios"].append(get_stream_ios(prefix, bus.node, fields))
+        parts["signals"].append(get_stream_signals(prefix, bus.node, fields, slices))
+        parts["logic"].append(get_stream_logic(prefix, bus.node, fields, slices, bus.name))
+    elif bus.type == "AXI-Full" and bus.node == "Manager":
+        prefix = f"AXI_M_{bus.name}" if bus.name else "AXI_M"
+        outstanding = bus.int_option("outstanding", 1)
+        rob_beats = bus.int_option("rob_beats", 16)
+        for key, value in (("outstanding", outstanding), ("rob_beats", rob_beats)):
+            if value < 1 or value & (value - 1):
+                vs_print(ERROR, f"AXI-Full Manager {bus.name}: {key} must be a power of two.")
+                exit(1)
+        parts["ios"].append(get_full_m_ios(prefix))
+        if outstanding == 1:
+            parts["parameters"].append(get_full_m_parameters(prefix))
+            parts["signals"].append(get_full_m_signals(prefix))
+            parts["logic"].append(get_full_m_logic(prefix))
+        else:
+            parts["parameters"].append(get_full_m_parameters(prefix, outstanding.bit_length() - 1))
+            parts["signals"].append(get_full_m_pipelined_signals(prefix, outstanding, rob_beats))
+            parts["logic"].append(get_full_m_pipelined_logic(prefix, bus.name))
+        if bus.int_option("split", 0) or bus.option("max_len"):
+            max_len = bus.int_option("max_len", 256 if outstanding == 1 else rob_beats)
+            if not 1 <= max_len <= 256 or (outstanding > 1 and max_len > rob_beats):
+                vs_print(ERROR, f"AXI-Full Manager {bus.name}: max_len must be 1..256 and at most rob_beats.")
+                exit(1)
+            parts["signals"].append(get_full_m_splitter_signals(prefix, max_len))
+            parts["logic"].append(get_full_m_splitter_logic(prefix, outstanding, bus.name))
+        vs_print(INFO, f"Generating AXI-Full Manager {bus.name} interface.")
+    elif bus.type == "AXI-Full" and bus.node == "Subordinate":
+        vs_print(INFO, f"Generating AXI-Full Subordinate {bus.name} interface.")
+        prefix = f"AXI_S_{bus.name}" if bus.name else "AXI_S"
+        outstanding = bus.int_option("outstanding", 2)
+        read_latency = bus.int_option("read_latency", 1)
+        if outstanding < 1 or outstanding & (outstanding - 1):
+            vs_print(ERROR, f"AXI-Full Subordinate {bus.name}: outstanding must be a power of two.")
+            exit(1)
+        parts["parameters"].append(get_full_s_parameters(prefix))
+        parts["ios"].append(get_full_s_ios(prefix))
+        parts["signals"].append(get_full_s_signals(prefix, outstanding, read_latency))
+        parts["logic"].append(get_full_s_logic(prefix, read_latency, bus.name))
+    else:
+        vs_print(ERROR, f"Unknown AXI type: {bus.type}")
+        exit(1)
+    if bus.int_option("sva", 0):
+        if (bus.type, bus.node) not in CHECKER_ENDPOINTS:
+            vs_print(ERROR, f"sva is not supported on {bus.type} {bus.node} {bus.name}.")
+            exit(1)
+        checker = AXIChecker(bus, prefix, "".join(parts["parameters"]))
+        parts["logic"].append(checker.instance())
+        parts["checkers"].append((f"{checker.module}.sv", checker.module_text()))
+    if bus.int_option("perf", 0):
+        if (bus.type, bus.node) not in PERF_ENDPOINTS:
+            vs_print(ERROR, f"perf is not supported on {bus.type} {bus.node} {bus.name}.")
+            exit(1)
+        node = PERF_ENDPOINTS[(bus.type, bus.node)]
+        buckets = bus.int_option("perf_buckets", 8)
+        depth = bus.int_option("perf_depth", 8)
+        if buckets < 2 or depth < 2 or depth & (depth - 1):
+            vs_print(ERROR, f"{bus.type} {bus.node} {bus.name}: perf_buckets must be >= 2 and perf_depth a power of two.")
+            exit(1)
+        perf_base = int(bus.option("perf_base", "0"), 0)
+        parts["signals"].append(get_perf_signals(bus.type, prefix, node, buckets, depth, perf_base))
+        parts["logic"].append(get_perf_logic(bus.type, prefix, node, buckets, perf_base))
+    _rendered[key] = parts
+    return parts
+
+
+# Per-channel template model shared by every endpoint and bridge: each channel is a request
+# (manager -> subordinate) or response, with its payload (field, width template).
+AXI_CHANNELS = {
+    "AXI-Lite": {
+        "aw": ("req", (("id", "{x}_ID_W_WIDTH"), ("addr", "{x}_ADDR_WIDTH"))),
+        "w": ("req", (("data", "{data}"), ("strb", "{data}/8"))),
+        "b": ("rsp", (("id", "{x}_ID_W_WIDTH"),)),
+        "ar": ("req", (("id", "{x}_ID_R_WIDTH"), ("addr", "{x}_ADDR_WIDTH"))),
+        "r": ("rsp", (("id", "{x}_ID_R_WIDTH"), ("data", "{data}"))),
+    },
+    "AXI-Full": {
+        "aw": ("req", (("ID", "{x}_ID_W_WIDTH"), ("ADDR", "{x}_ADDR_WIDTH"), ("LEN", "8"), ("SIZE", "3"),
+                       ("BURST", "2"), ("LOCK", "1"), ("CACHE", "4"), ("PROT", "3"), ("QOS", "4"))),
+        "w": ("req", (("DATA", "{data}"), ("STRB", "{data}/8"), ("LAST", "1"))),
+        "b": ("rsp", (("ID", "{x}_ID_W_WIDTH"), ("RESP", "{x}_BRESP_WIDTH"))),
+        "ar": ("req", (("ID", "{x}_ID_R_WIDTH"), ("ADDR", "{x}_ADDR_WIDTH"), ("LEN", "8"), ("SIZE", "3"),
+                       ("BURST", "2"), ("LOCK", "1"), ("CACHE", "4"), ("PROT", "3"), ("QOS", "4"))),
+        "r": ("rsp", (("ID", "{x}_ID_R_WIDTH"), ("DATA", "{data}"), ("RESP", "2"), ("LAST", "1"))),
+    },
+}
+
+
+HANDSHAKE = {"AXI-Lite": ("valid", "ready"), "AXI-Full": ("VALID", "READY")}
+
+
+def channel_fields(bus_type, prefix, data):
+    """{channel: (kind, [(field, width)])} for a port with data width parameter data."""
+    return {
+        channel: (kind, [(field, width.format(x=prefix, data=data)) for field, width in fields])
+        for channel, (kind, fields) in AXI_CHANNELS[bus_type].items()
+    }
+
+def channel_port(bus_type, prefix, channel, signal, node):
+    # node is "m" for manager-facing ports (the block is their subordinate) or "s"
+    kind = AXI_CHANNELS[bus_type][channel][0]
+    outgoing = (kind == "rsp") == (node == "m")
+    if signal == HANDSHAKE[bus_type][1]:
+        outgoing = not outgoing
+    return f"{prefix}_{channel}{signal}_{'o' if outgoing else 'i'}"
+
+def channel_ios(bus_type, prefix, node, data, params=None):
+    # params is the prefix of the width parameters when it differs from the port prefix
+    valid, ready = HANDSHAKE[bus_type]
+    code = ""
+    for channel, (_, fields) in channel_fields(bus_type, params or prefix, data).items():
+        for signal, width in [(valid, "1"), (ready, "1")] + fields:
+            port = channel_port(bus_type, prefix, channel, signal, node)
+            direction = "output" if port.endswith("_o") else "input "
+            code += f"    {direction} logic {vector_range(width)}{port},\n"
+    return code
+
 def get_lite_s_parameters(bus_prefix):
   return f"""    // Generated parameters for AXI-Lite Subordinate
     parameter integer {bus_prefix}_ADDR_WIDTH = 32,
@@ -97,27 +355,8 @@ def get_lite_s_parameters(bus_prefix):
 """
 
 def get_lite_s_ios(bus_prefix):
-    return f"""    // Generated IOs for AXI-Lite Subordinate
-    input  logic {bus_prefix}_awvalid_i,
-    output logic {bus_prefix}_awready_o,
-    input  logic [{bus_prefix}_ID_W_WIDTH-1:0] {bus_prefix}_awid_i,
-    input  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_awaddr_i,
-    input  logic {bus_prefix}_wvalid_i,
-    output logic {bus_prefix}_wready_o,
-    input  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_wdata_i,
-    input  logic [{bus_prefix}_DATA_WIDTH/8-1:0] {bus_prefix}_wstrb_i,
-    output logic {bus_prefix}_bvalid_o,
-    input  logic {bus_prefix}_bready_i,
-    output logic [{bus_prefix}_ID_W_WIDTH-1:0] {bus_prefix}_bid_o,
-    input  logic {bus_prefix}_arvalid_i,
-    output logic {bus_prefix}_arready_o,
-    input  logic [{bus_prefix}_ID_R_WIDTH-1:0] {bus_prefix}_arid_i,
-    input  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_araddr_i,
-    output logic {bus_prefix}_rvalid_o,
-    input  logic {bus_prefix}_rready_i,
-    output logic [{bus_prefix}_ID_R_WIDTH-1:0] {bus_prefix}_rid_o,
-    output logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_rdata_o,
-"""
+    return "    // Generated IOs for AXI-Lite Subordinate\n" + channel_ios(
+        "AXI-Lite", bus_prefix, "m", f"{bus_prefix}_DATA_WIDTH")
 
 def get_lite_s_signals(bus_prefix):
     return f"""  // Generated signals for AXI-Lite Subordinate
@@ -340,10 +579,136 @@ def get_lite_s_logic(bus_prefix, interface_name=None):
 """
 # I should add global resets to register lists
 
-def get_full_m_parameters(bus_prefix):
+def get_fifo_signals(bus_prefix, fifo, fields, depth=None, ptr_width=None):
+    depth = depth or f"{bus_prefix}_OUTSTANDING"
+    ptr_width = ptr_width or f"{bus_prefix}_PTR_WIDTH"
+    code = ""
+    for width, field, _ in fields:
+        code += f"  logic [{width}-1:0] {bus_prefix}_{fifo}_fifo_{field} [{depth}];\n"
+    code += f"  logic [{ptr_width}-1:0] {bus_prefix}_{fifo}_wptr, {bus_prefix}_{fifo}_wptr_n;\n"
+    code += f"  logic [{ptr_width}-1:0] {bus_prefix}_{fifo}_rptr, {bus_prefix}_{fifo}_rptr_n;\n"
+    code += f"  logic {bus_prefix}_{fifo}_empty, {bus_prefix}_{fifo}_full, {bus_prefix}_{fifo}_push, {bus_prefix}_{fifo}_pop;\n"
+    return code
+
+def get_fifo_logic(bus_prefix, fifo, fields, valid=None, ready=None, ptr_width=None):
+    # FIFO with registered pointers; the head is read straight from the storage array.
+    # valid/ready connect the push side to a channel handshake (ready = not full).
+    ptr_width = ptr_width or f"{bus_prefix}_PTR_WIDTH"
+    stores = "".join(
+        f"      {bus_prefix}_{fifo}_fifo_{field}[{bus_prefix}_{fifo}_wptr[{ptr_width}-2:0]] <= {source};\n"
+        for _, field, source in fields
+    )
+    handshake = ""
+    if ready is not None:
+        handshake = f"""  assign {ready} = ~{bus_prefix}_{fifo}_full;
+  assign {bus_prefix}_{fifo}_push = {valid} & {ready};
+"""
+    return f"""  // {fifo.upper()} FIFO
+  assign {bus_prefix}_{fifo}_empty = ({bus_prefix}_{fifo}_wptr == {bus_prefix}_{fifo}_rptr);
+  assign {bus_prefix}_{fifo}_full = ({bus_prefix}_{fifo}_wptr[{ptr_width}-1] != {bus_prefix}_{fifo}_rptr[{ptr_width}-1]) &
+                                    ({bus_prefix}_{fifo}_wptr[{ptr_width}-2:0] == {bus_prefix}_{fifo}_rptr[{ptr_width}-2:0]);
+{handshake}  assign {bus_prefix}_{fifo}_wptr_n = {bus_prefix}_{fifo}_wptr + {ptr_width}'({bus_prefix}_{fifo}_push);
+  assign {bus_prefix}_{fifo}_rptr_n = {bus_prefix}_{fifo}_rptr + {ptr_width}'({bus_prefix}_{fifo}_pop);
+  always_ff @(posedge clk_i) begin
+    if ({bus_prefix}_{fifo}_push) begin
+{stores}    end
+  end
+
+"""
+
+def fifo_head(bus_prefix, fifo, field, ptr_width=None):
+    ptr_width = ptr_width or f"{bus_prefix}_PTR_WIDTH"
+    return f"{bus_prefix}_{fifo}_fifo_{field}[{bus_prefix}_{fifo}_rptr[{ptr_width}-2:0]]"
+
+LITE_S_FIFOS = {
+    "aw": ("aw", (("{p}_ADDR_WIDTH", "addr"), ("{p}_ID_W_WIDTH", "id"))),
+    "w": ("w", (("{p}_DATA_WIDTH", "data"), ("{p}_DATA_WIDTH/8", "strb"))),
+    "ar": ("ar", (("{p}_ADDR_WIDTH", "addr"), ("{p}_ID_R_WIDTH", "id"))),
+}
+
+def lite_s_fifo_fields(bus_prefix, fifo):
+    channel, fields = LITE_S_FIFOS[fifo]
+    return channel, [
+        (width.format(p=bus_prefix), field, f"{bus_prefix}_{channel}{field}_i")
+        for width, field in fields
+    ]
+
+def get_lite_s_pipelined_signals(bus_prefix, outstanding):
+    code = f"""  // Generated signals for AXI-Lite Subordinate ({outstanding} outstanding transactions)
+  localparam integer {bus_prefix}_OUTSTANDING = {outstanding};
+  localparam integer {bus_prefix}_PTR_WIDTH = $clog2({outstanding}) + 1;
+  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_awaddr_n;
+  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_wdata;
+  logic [{bus_prefix}_DATA_WIDTH/8-1:0] {bus_prefix}_wstrb;
+  logic {bus_prefix}_w_fire;
+  logic {bus_prefix}_bvalid_n;
+  logic [{bus_prefix}_ID_W_WIDTH-1:0] {bus_prefix}_bid_n;
+  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_araddr_n;
+  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_rdata;
+  logic {bus_prefix}_r_fire;
+  logic {bus_prefix}_rvalid_n;
+  logic [{bus_prefix}_ID_R_WIDTH-1:0] {bus_prefix}_rid_n;
+  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_rdata_n;
+"""
+    for fifo in LITE_S_FIFOS:
+        _, fields = lite_s_fifo_fields(bus_prefix, fifo)
+        code += get_fifo_signals(bus_prefix, fifo, fields)
+    return code
+
+def get_lite_s_pipelined_logic(bus_prefix, interface_name=None):
+    code = f"""  // Generated logic for AXI-Lite Subordinate with {bus_prefix}_OUTSTANDING outstanding transactions
+  // AW/W/AR are queued in FIFOs, so the ready signals only depend on the FIFO occupancy.
+  // One write (AW and W heads) and one read (AR head) are served per cycle whenever the
+  // B/R output register is empty or being emptied.
+"""
+    for fifo in LITE_S_FIFOS:
+        channel, fields = lite_s_fifo_fields(bus_prefix, fifo)
+        code += get_fifo_logic(
+            bus_prefix,
+            fifo,
+            fields,
+            f"{bus_prefix}_{channel}valid_i",
+            f"{bus_prefix}_{channel}ready_o",
+        )
+    code += f"""  // Write: user side sees {bus_prefix}_awaddr_n, {bus_prefix}_wdata and {bus_prefix}_wstrb (zero when idle)
+  assign {bus_prefix}_w_fire = ~{bus_prefix}_aw_empty & ~{bus_prefix}_w_empty & (~{bus_prefix}_bvalid_o | {bus_prefix}_bready_i);
+  assign {bus_prefix}_aw_pop = {bus_prefix}_w_fire;
+  assign {bus_prefix}_w_pop = {bus_prefix}_w_fire;
+  assign {bus_prefix}_awaddr_n = {bus_prefix}_aw_fifo_addr[{bus_prefix}_aw_rptr[{bus_prefix}_PTR_WIDTH-2:0]];
+  assign {bus_prefix}_wdata = {bus_prefix}_w_fifo_data[{bus_prefix}_w_rptr[{bus_prefix}_PTR_WIDTH-2:0]];
+  assign {bus_prefix}_wstrb = {bus_prefix}_w_fire ? {bus_prefix}_w_fifo_strb[{bus_prefix}_w_rptr[{bus_prefix}_PTR_WIDTH-2:0]] : '0;
+  assign {bus_prefix}_bvalid_n = {bus_prefix}_w_fire | ({bus_prefix}_bvalid_o & ~{bus_prefix}_bready_i);
+  assign {bus_prefix}_bid_n = {bus_prefix}_w_fire ? {bus_prefix}_aw_fifo_id[{bus_prefix}_aw_rptr[{bus_prefix}_PTR_WIDTH-2:0]] : {bus_prefix}_bid_o;
+
+  // Read: user side returns {bus_prefix}_rdata for {bus_prefix}_araddr_n in the same cycle
+  assign {bus_prefix}_r_fire = ~{bus_prefix}_ar_empty & (~{bus_prefix}_rvalid_o | {bus_prefix}_rready_i);
+  assign {bus_prefix}_ar_pop = {bus_prefix}_r_fire;
+  assign {bus_prefix}_araddr_n = {bus_prefix}_ar_fifo_addr[{bus_prefix}_ar_rptr[{bus_prefix}_PTR_WIDTH-2:0]];
+  assign {bus_prefix}_rvalid_n = {bus_prefix}_r_fire | ({bus_prefix}_rvalid_o & ~{bus_prefix}_rready_i);
+  assign {bus_prefix}_rid_n = {bus_prefix}_r_fire ? {bus_prefix}_ar_fifo_id[{bus_prefix}_ar_rptr[{bus_prefix}_PTR_WIDTH-2:0]] : {bus_prefix}_rid_o;
+  assign {bus_prefix}_rdata_n = {bus_prefix}_r_fire ? {bus_prefix}_rdata : {bus_prefix}_rdata_o;
+
+  `include "reg_AXI_bus_prefix_{bus_prefix}_{interface_name}.vs"  /*
+    {bus_prefix}_aw_wptr   , {bus_prefix}_PTR_WIDTH   , 0, sync_reset, , _n
+    {bus_prefix}_aw_rptr   , {bus_prefix}_PTR_WIDTH   , 0, sync_reset, , _n
+    {bus_prefix}_w_wptr    , {bus_prefix}_PTR_WIDTH   , 0, sync_reset, , _n
+    {bus_prefix}_w_rptr    , {bus_prefix}_PTR_WIDTH   , 0, sync_reset, , _n
+    {bus_prefix}_ar_wptr   , {bus_prefix}_PTR_WIDTH   , 0, sync_reset, , _n
+    {bus_prefix}_ar_rptr   , {bus_prefix}_PTR_WIDTH   , 0, sync_reset, , _n
+    {bus_prefix}_bvalid_o  , 1                        , 0, sync_reset, , _n
+    {bus_prefix}_bid_o     , {bus_prefix}_ID_W_WIDTH  , 0, sync_reset, , _n
+    {bus_prefix}_rvalid_o  , 1                        , 0, sync_reset, , _n
+    {bus_prefix}_rdata_o   , {bus_prefix}_DATA_WIDTH  , 0, sync_reset, , _n
+    {bus_prefix}_rid_o     , {bus_prefix}_ID_R_WIDTH  , 0, sync_reset, , _n
+    */
+"""
+    return code
+
+
+def get_full_m_parameters(bus_prefix, id_width=1):
     return f"""    // Generated Parameters for AXI-Full Manager
     //parameter string {bus_prefix}_AXI_Transport = "Ready",
-    parameter integer {bus_prefix}_ID_W_WIDTH = 1,
+    parameter integer {bus_prefix}_ID_W_WIDTH = {id_width},
     parameter integer {bus_prefix}_ADDR_WIDTH = 32,
     //parameter logic {bus_prefix}_LEN_Present = 1,
     //parameter logic {bus_prefix}_SIZE_Present = 1,
@@ -354,49 +719,12 @@ def get_full_m_parameters(bus_prefix):
     parameter integer {bus_prefix}_DATA_WIDTH = 32,
     //parameter logic {bus_prefix}_WSTRB_Present = 1,
     parameter integer {bus_prefix}_BRESP_WIDTH = 2,
-    parameter integer {bus_prefix}_ID_R_WIDTH = 1,
+    parameter integer {bus_prefix}_ID_R_WIDTH = {id_width},
 """
 
 def get_full_m_ios(bus_prefix):
-    return f"""    // Generated IOs for AXI-Full Manager
-    output logic {bus_prefix}_awVALID_o,
-    input  logic {bus_prefix}_awREADY_i,
-    output logic [{bus_prefix}_ID_W_WIDTH-1 : 0] {bus_prefix}_awID_o,
-    output logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_awADDR_o,
-    output logic [7:0] {bus_prefix}_awLEN_o,
-    output logic [2:0] {bus_prefix}_awSIZE_o,
-    output logic [1:0] {bus_prefix}_awBURST_o,
-    output logic  {bus_prefix}_awLOCK_o,
-    output logic [3:0] {bus_prefix}_awCACHE_o,
-    output logic [2:0] {bus_prefix}_awPROT_o,
-    output logic [3:0] {bus_prefix}_awQOS_o,
-    output logic {bus_prefix}_wVALID_o,
-    input  logic {bus_prefix}_wREADY_i,
-    output logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_wDATA_o,
-    output logic [{bus_prefix}_DATA_WIDTH/8-1:0] {bus_prefix}_wSTRB_o,
-    output logic  {bus_prefix}_wLAST_o,
-    input  logic {bus_prefix}_bVALID_i,
-    output logic {bus_prefix}_bREADY_o,
-    input  logic [{bus_prefix}_ID_W_WIDTH-1:0] {bus_prefix}_bID_i,
-    input  logic [{bus_prefix}_BRESP_WIDTH-1:0] {bus_prefix}_bRESP_i,
-    output logic {bus_prefix}_arVALID_o,
-    input  logic {bus_prefix}_arREADY_i,
-    output logic [{bus_prefix}_ID_R_WIDTH-1 : 0] {bus_prefix}_arID_o,
-    output logic [{bus_prefix}_ADDR_WIDTH-1 : 0] {bus_prefix}_arADDR_o,
-    output logic [7:0] {bus_prefix}_arLEN_o,
-    output logic [2:0] {bus_prefix}_arSIZE_o,
-    output logic [1:0] {bus_prefix}_arBURST_o,
-    output logic  {bus_prefix}_arLOCK_o,
-    output logic [3:0] {bus_prefix}_arCACHE_o,
-    output logic [2:0] {bus_prefix}_arPROT_o,
-    output logic [3:0] {bus_prefix}_arQOS_o,
-    input  logic {bus_prefix}_rVALID_i,
-    output logic {bus_prefix}_rREADY_o,
-    input  logic [{bus_prefix}_ID_R_WIDTH-1:0] {bus_prefix}_rID_i,
-    input  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_rDATA_i,
-    input  logic [1:0] {bus_prefix}_rRESP_i,
-    input  logic {bus_prefix}_rLAST_i,
-"""
+    return "    // Generated IOs for AXI-Full Manager\n" + channel_ios(
+        "AXI-Full", bus_prefix, "s", f"{bus_prefix}_DATA_WIDTH")
 
 def get_full_m_signals(bus_prefix):
     return f"""  // Generated signals for AXI-Full Manager
@@ -617,9 +945,1736 @@ def get_full_m_logic(bus_prefix, interface_name=None):
     */
 """
 
-def write_vs(string, file_name):
-    with open(file_name, "w") as file:
-        file.write(string)
+def get_full_s_parameters(bus_prefix):
+    return f"""    // Generated Parameters for AXI-Full Subordinate
+    parameter integer {bus_prefix}_ID_W_WIDTH = 1,
+    parameter integer {bus_prefix}_ADDR_WIDTH = 32,
+    parameter integer {bus_prefix}_DATA_WIDTH = 32,
+    parameter integer {bus_prefix}_BRESP_WIDTH = 2,
+    parameter integer {bus_prefix}_ID_R_WIDTH = 1,
+"""
+
+def get_full_s_ios(bus_prefix):
+    return "    // Generated IOs for AXI-Full Subordinate\n" + channel_ios(
+        "AXI-Full", bus_prefix, "m", f"{bus_prefix}_DATA_WIDTH")
+
+def get_next_addr_function(bus_prefix):
+    return f"""  // Next beat address of a FIXED (00), INCR (01) or WRAP (10) burst
+  function automatic logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_next_addr(
+      input logic [{bus_prefix}_ADDR_WIDTH-1:0] addr, input logic [7:0] len,
+      input logic [2:0] size, input logic [1:0] burst);
+    logic [{bus_prefix}_ADDR_WIDTH-1:0] aligned, incr, wrap_mask;
+    aligned = addr & ~(({bus_prefix}_ADDR_WIDTH'(1) << size) - {bus_prefix}_ADDR_WIDTH'(1));
+    incr = aligned + ({bus_prefix}_ADDR_WIDTH'(1) << size);
+    wrap_mask = (({bus_prefix}_ADDR_WIDTH'(len) + {bus_prefix}_ADDR_WIDTH'(1)) << size) - {bus_prefix}_ADDR_WIDTH'(1);
+    case (burst)
+      2'b00:   return addr;
+      2'b10:   return (addr & ~wrap_mask) | (incr & wrap_mask);
+      default: return incr;
+    endcase
+  endfunction
+"""
+
+FULL_S_ADDRESS_FIELDS = (
+    ("{p}_ADDR_WIDTH", "addr", "ADDR"),
+    ("8", "len", "LEN"),
+    ("3", "size", "SIZE"),
+    ("2", "burst", "BURST"),
+)
+
+def full_s_fifo_fields(bus_prefix, fifo):
+    # AW/AR FIFO entries hold the whole address phase of a burst.
+    id_width = f"{bus_prefix}_ID_W_WIDTH" if fifo == "aw" else f"{bus_prefix}_ID_R_WIDTH"
+    fields = [
+        (width.format(p=bus_prefix), field, f"{bus_prefix}_{fifo}{port}_i")
+        for width, field, port in FULL_S_ADDRESS_FIELDS
+    ]
+    fields.append((id_width, "id", f"{bus_prefix}_{fifo}ID_i"))
+    return fields
+
+def full_s_r_fields(bus_prefix, read_latency):
+    last_stage = f"{bus_prefix}_r_pipe{read_latency}"
+    return [
+        (f"{bus_prefix}_DATA_WIDTH", "data", f"{bus_prefix}_usr_rDATA"),
+        (f"{bus_prefix}_ID_R_WIDTH", "id", f"{last_stage}_id"),
+        ("1", "last", f"{last_stage}_last"),
+    ]
+
+def full_s_r_depth(read_latency):
+    # Enough credits to keep one beat per cycle across the user read latency.
+    depth = 4
+    while depth < read_latency + 3:
+        depth *= 2
+    return depth
+
+def get_full_s_signals(bus_prefix, outstanding, read_latency):
+    r_depth = full_s_r_depth(read_latency)
+    code = f"""  // Generated signals for AXI-Full Subordinate
+  localparam integer {bus_prefix}_OUTSTANDING = {outstanding};
+  localparam integer {bus_prefix}_PTR_WIDTH = $clog2({outstanding}) + 1;
+  localparam integer {bus_prefix}_USR_READ_LATENCY = {read_latency};
+  localparam integer {bus_prefix}_R_DEPTH = {r_depth};
+  localparam integer {bus_prefix}_R_PTR_WIDTH = $clog2({r_depth}) + 1;
+
+{get_next_addr_function(bus_prefix)}
+  // Write burst
+  `include "FSM_{bus_prefix}_w_signals.vs" // VS_NO_GENERATE
+  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_w_addr, {bus_prefix}_w_addr_n;
+  logic [7:0] {bus_prefix}_w_len, {bus_prefix}_w_len_n;
+  logic [7:0] {bus_prefix}_w_count, {bus_prefix}_w_count_n;
+  logic [2:0] {bus_prefix}_w_size, {bus_prefix}_w_size_n;
+  logic [1:0] {bus_prefix}_w_burst, {bus_prefix}_w_burst_n;
+  logic [{bus_prefix}_ID_W_WIDTH-1:0] {bus_prefix}_w_id, {bus_prefix}_w_id_n;
+  logic {bus_prefix}_w_beat, {bus_prefix}_w_last_beat, {bus_prefix}_w_load;
+  // Signals that interface with control units outside of the AXI.py script:
+  logic {bus_prefix}_usr_w_en, {bus_prefix}_usr_w_en_n;
+  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_usr_wADDR, {bus_prefix}_usr_wADDR_n;
+  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_usr_wDATA, {bus_prefix}_usr_wDATA_n;
+  logic [{bus_prefix}_DATA_WIDTH/8-1:0] {bus_prefix}_usr_wSTRB, {bus_prefix}_usr_wSTRB_n;
+
+  // Read burst
+  `include "FSM_{bus_prefix}_r_signals.vs" // VS_NO_GENERATE
+  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_r_addr, {bus_prefix}_r_addr_n;
+  logic [7:0] {bus_prefix}_r_len, {bus_prefix}_r_len_n;
+  logic [7:0] {bus_prefix}_r_count, {bus_prefix}_r_count_n;
+  logic [2:0] {bus_prefix}_r_size, {bus_prefix}_r_size_n;
+  logic [1:0] {bus_prefix}_r_burst, {bus_prefix}_r_burst_n;
+  logic [{bus_prefix}_ID_R_WIDTH-1:0] {bus_prefix}_r_id, {bus_prefix}_r_id_n;
+  logic {bus_prefix}_r_issue, {bus_prefix}_r_last_issue, {bus_prefix}_r_load;
+  logic [{bus_prefix}_R_PTR_WIDTH-1:0] {bus_prefix}_r_inflight, {bus_prefix}_r_inflight_n;
+"""
+    for stage in range(read_latency + 1):
+        code += f"""  logic {bus_prefix}_r_pipe{stage}_valid, {bus_prefix}_r_pipe{stage}_valid_n;
+  logic {bus_prefix}_r_pipe{stage}_last, {bus_prefix}_r_pipe{stage}_last_n;
+  logic [{bus_prefix}_ID_R_WIDTH-1:0] {bus_prefix}_r_pipe{stage}_id, {bus_prefix}_r_pipe{stage}_id_n;
+"""
+    code += f"""  // Signals that interface with control units outside of the AXI.py script:
+  logic {bus_prefix}_usr_r_en, {bus_prefix}_usr_r_en_n;
+  logic [{bus_prefix}_ADDR_WIDTH-1:0] {bus_prefix}_usr_rADDR, {bus_prefix}_usr_rADDR_n;
+  logic [{bus_prefix}_DATA_WIDTH-1:0] {bus_prefix}_usr_rDATA;
+
+"""
+    code += get_fifo_signals(bus_prefix, "aw", full_s_fifo_fields(bus_prefix, "aw"))
+    code += get_fifo_signals(bus_prefix, "b", [(f"{bus_prefix}_ID_W_WIDTH", "id", None)])
+    code += get_fifo_signals(bus_prefix, "ar", full_s_fifo_fields(bus_prefix, "ar"))
+    code += get_fifo_signals(
+        bus_prefix,
+        "r",
+        full_s_r_fields(bus_prefix, read_latency),
+        f"{bus_prefix}_R_DEPTH",
+        f"{bus_prefix}_R_PTR_WIDTH",
+    )
+    return code
+
+def full_s_burst_load(bus_prefix, fifo, channel):
+    # Burst registers: load from the FIFO head, otherwise advance on every beat.
+    load = "".join(
+        f"      {bus_prefix}_{channel}_{field}_n = {fifo_head(bus_prefix, fifo, field)};\n"
+        for field in ("addr", "len", "size", "burst", "id")
+    )
+    return load + f"      {bus_prefix}_{channel}_count_n = {fifo_head(bus_prefix, fifo, 'len')};\n"
+
+def get_full_s_logic(bus_prefix, read_latency, interface_name=None):
+    p = bus_prefix
+    code = f"""  // Generated logic for AXI-Full Subordinate
+  // AW/AR are queued in FIFOs. Each burst is then walked one beat per cycle, generating the
+  // FIXED/INCR/WRAP beat addresses. Responses are returned in order, so per-ID ordering holds.
+"""
+    code += get_fifo_logic(p, "aw", full_s_fifo_fields(p, "aw"), f"{p}_awVALID_i", f"{p}_awREADY_o")
+    code += get_fifo_logic(p, "b", [(f"{p}_ID_W_WIDTH", "id", f"{p}_w_id")])
+    code += get_fifo_logic(p, "ar", full_s_fifo_fields(p, "ar"), f"{p}_arVALID_i", f"{p}_arREADY_o")
+    code += get_fifo_logic(
+        p, "r", full_s_r_fields(p, read_latency), ptr_width=f"{p}_R_PTR_WIDTH"
+    )
+    code += f"""  // Write: W beats are accepted while a burst is active; the last one needs room in the B FIFO.
+  assign {p}_wREADY_o = ({p}_w_state == {p}_w_Burst) & ~(({p}_w_count == 8'h00) & {p}_b_full);
+  assign {p}_w_beat = {p}_wVALID_i & {p}_wREADY_o;
+  assign {p}_w_last_beat = {p}_w_beat & ({p}_w_count == 8'h00);
+  assign {p}_w_load = ~{p}_aw_empty & (({p}_w_state == {p}_w_Idle) | {p}_w_last_beat);
+  assign {p}_aw_pop = {p}_w_load;
+  assign {p}_b_push = {p}_w_last_beat;
+  assign {p}_b_pop = {p}_bVALID_o & {p}_bREADY_i;
+  assign {p}_bVALID_o = ~{p}_b_empty;
+  assign {p}_bID_o = {fifo_head(p, "b", "id")};
+  assign {p}_bRESP_o = '0;
+
+  `include "FSM_{p}_w.vs"  /* reset = sync_reset, clock = clk_i
+      Idle  -> Burst: ~{p}_aw_empty
+      Burst -> Idle: {p}_w_last_beat & {p}_aw_empty
+      */
+
+  always_comb begin
+    {p}_w_addr_n  = {p}_w_addr;
+    {p}_w_len_n   = {p}_w_len;
+    {p}_w_count_n = {p}_w_count;
+    {p}_w_size_n  = {p}_w_size;
+    {p}_w_burst_n = {p}_w_burst;
+    {p}_w_id_n    = {p}_w_id;
+    if ({p}_w_load) begin
+{full_s_burst_load(p, "aw", "w")}    end else if ({p}_w_beat) begin
+      {p}_w_addr_n  = {p}_next_addr({p}_w_addr, {p}_w_len, {p}_w_size, {p}_w_burst);
+      {p}_w_count_n = {p}_w_count - 8'h01;
+    end
+  end
+
+  // User write port (registered): {p}_usr_wSTRB is zero when there is no write.
+  assign {p}_usr_w_en_n = {p}_w_beat;
+  assign {p}_usr_wADDR_n = {p}_w_beat ? {p}_w_addr : {p}_usr_wADDR;
+  assign {p}_usr_wDATA_n = {p}_w_beat ? {p}_wDATA_i : {p}_usr_wDATA;
+  assign {p}_usr_wSTRB_n = {p}_w_beat ? {p}_wSTRB_i : '0;
+
+  // Read: a beat is issued to the user port per cycle while the R FIFO has a free credit.
+  // {p}_usr_rDATA must hold the data of {p}_usr_rADDR {p}_USR_READ_LATENCY cycles after {p}_usr_r_en.
+  assign {p}_r_issue = ({p}_r_state == {p}_r_Burst) & ({p}_r_inflight != {p}_R_PTR_WIDTH'({p}_R_DEPTH));
+  assign {p}_r_last_issue = {p}_r_issue & ({p}_r_count == 8'h00);
+  assign {p}_r_load = ~{p}_ar_empty & (({p}_r_state == {p}_r_Idle) | {p}_r_last_issue);
+  assign {p}_ar_pop = {p}_r_load;
+  assign {p}_r_inflight_n = {p}_r_inflight + {p}_R_PTR_WIDTH'({p}_r_issue) - {p}_R_PTR_WIDTH'({p}_r_pop);
+
+  `include "FSM_{p}_r.vs"  /* reset = sync_reset, clock = clk_i
+      Idle  -> Burst: ~{p}_ar_empty
+      Burst -> Idle: {p}_r_last_issue & {p}_ar_empty
+      */
+
+  always_comb begin
+    {p}_r_addr_n  = {p}_r_addr;
+    {p}_r_len_n   = {p}_r_len;
+    {p}_r_count_n = {p}_r_count;
+    {p}_r_size_n  = {p}_r_size;
+    {p}_r_burst_n = {p}_r_burst;
+    {p}_r_id_n    = {p}_r_id;
+    if ({p}_r_load) begin
+{full_s_burst_load(p, "ar", "r")}    end else if ({p}_r_issue) begin
+      {p}_r_addr_n  = {p}_next_addr({p}_r_addr, {p}_r_len, {p}_r_size, {p}_r_burst);
+      {p}_r_count_n = {p}_r_count - 8'h01;
+    end
+  end
+
+  // User read port (registered) and the pipeline that follows its latency
+  assign {p}_usr_r_en_n = {p}_r_issue;
+  assign {p}_usr_rADDR_n = {p}_r_issue ? {p}_r_addr : {p}_usr_rADDR;
+  assign {p}_r_pipe0_valid_n = {p}_r_issue;
+  assign {p}_r_pipe0_last_n = {p}_r_count == 8'h00;
+  assign {p}_r_pipe0_id_n = {p}_r_id;
+"""
+    for stage in range(1, read_latency + 1):
+        for field in ("valid", "last", "id"):
+            code += f"  assign {p}_r_pipe{stage}_{field}_n = {p}_r_pipe{stage - 1}_{field};\n"
+    code += f"""  assign {p}_r_push = {p}_r_pipe{read_latency}_valid;
+  assign {p}_r_pop = {p}_rVALID_o & {p}_rREADY_i;
+  assign {p}_rVALID_o = ~{p}_r_empty;
+  assign {p}_rDATA_o = {fifo_head(p, "r", "data", f"{p}_R_PTR_WIDTH")};
+  assign {p}_rID_o = {fifo_head(p, "r", "id", f"{p}_R_PTR_WIDTH")};
+  assign {p}_rLAST_o = {fifo_head(p, "r", "last", f"{p}_R_PTR_WIDTH")};
+  assign {p}_rRESP_o = '0;
+
+  `include "reg_{p}_registers_{interface_name}.vs"  /*
+    {p}_aw_wptr    , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_aw_rptr    , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_b_wptr     , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_b_rptr     , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_ar_wptr    , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_ar_rptr    , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_r_wptr     , {p}_R_PTR_WIDTH , 0, sync_reset, , _n
+    {p}_r_rptr     , {p}_R_PTR_WIDTH , 0, sync_reset, , _n
+    {p}_r_inflight , {p}_R_PTR_WIDTH , 0, sync_reset, , _n
+    {p}_w_addr     , {p}_ADDR_WIDTH  , 0, sync_reset, , _n
+    {p}_w_len      , 8               , 0, sync_reset, , _n
+    {p}_w_count    , 8               , 0, sync_reset, , _n
+    {p}_w_size     , 3               , 0, sync_reset, , _n
+    {p}_w_burst    , 2               , 0, sync_reset, , _n
+    {p}_w_id       , {p}_ID_W_WIDTH  , 0, sync_reset, , _n
+    {p}_r_addr     , {p}_ADDR_WIDTH  , 0, sync_reset, , _n
+    {p}_r_len      , 8               , 0, sync_reset, , _n
+    {p}_r_count    , 8               , 0, sync_reset, , _n
+    {p}_r_size     , 3               , 0, sync_reset, , _n
+    {p}_r_burst    , 2               , 0, sync_reset, , _n
+    {p}_r_id       , {p}_ID_R_WIDTH  , 0, sync_reset, , _n
+    {p}_usr_w_en   , 1               , 0, sync_reset, , _n
+    {p}_usr_wADDR  , {p}_ADDR_WIDTH  , 0, sync_reset, , _n
+    {p}_usr_wDATA  , {p}_DATA_WIDTH  , 0, sync_reset, , _n
+    {p}_usr_wSTRB  , {p}_DATA_WIDTH/8, 0, sync_reset, , _n
+    {p}_usr_r_en   , 1               , 0, sync_reset, , _n
+    {p}_usr_rADDR  , {p}_ADDR_WIDTH  , 0, sync_reset, , _n
+"""
+    for stage in range(read_latency + 1):
+        code += f"""    {p}_r_pipe{stage}_valid, 1             , 0, sync_reset, , _n
+    {p}_r_pipe{stage}_last , 1             , 0, sync_reset, , _n
+    {p}_r_pipe{stage}_id   , {p}_ID_R_WIDTH, 0, sync_reset, , _n
+"""
+    code += "    */\n"
+    return code
+
+def get_full_m_pipelined_signals(bus_prefix, outstanding, rob_beats):
+    p = bus_prefix
+    code = f"""  // Generated signals for AXI-Full Manager ({outstanding} outstanding bursts per direction)
+  localparam integer {p}_OUTSTANDING = {outstanding};
+  localparam integer {p}_PTR_WIDTH = $clog2({outstanding}) + 1;
+  localparam integer {p}_SLOT_WIDTH = $clog2({outstanding});
+  localparam integer {p}_ROB_BEATS = {rob_beats};
+  localparam integer {p}_ROB_BEAT_WIDTH = $clog2({rob_beats});
+  localparam logic [2:0] {p}_SIZE = 3'($clog2({p}_DATA_WIDTH/8));
+
+  // Read: ID allocator (one ID per slot, allocated in order) and reorder buffer keyed on rID
+  logic {p}_arVALID_n;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_arADDR_n;
+  logic [7:0] {p}_arLEN_n;
+  logic [{p}_ID_R_WIDTH-1:0] {p}_arID_n;
+  logic [{p}_OUTSTANDING-1:0] {p}_r_busy, {p}_r_busy_n;
+  logic [{p}_SLOT_WIDTH-1:0] {p}_r_alloc, {p}_r_alloc_n;
+  logic [{p}_SLOT_WIDTH-1:0] {p}_r_head, {p}_r_head_n;
+  logic [7:0] {p}_r_rd_idx, {p}_r_rd_idx_n;
+  logic [{p}_SLOT_WIDTH-1:0] {p}_r_slot;
+  logic {p}_r_beat, {p}_r_deliver;
+  logic [7:0] {p}_rob_len [{p}_OUTSTANDING];
+  logic [8:0] {p}_rob_count [{p}_OUTSTANDING];
+  logic [{p}_DATA_WIDTH+1:0] {p}_rob_data [{p}_OUTSTANDING*{p}_ROB_BEATS];
+  logic [{p}_DATA_WIDTH+1:0] {p}_rob_head;
+  // Signals that interface with control units outside of the AXI.py script:
+  logic {p}_usr_rTRANSFER;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_usr_rADDR;
+  logic [7:0] {p}_usr_rLEN;
+  logic {p}_usr_r_accept;
+  logic {p}_usr_r_valid;
+  logic {p}_usr_r_ready;
+  logic [{p}_DATA_WIDTH-1:0] {p}_usr_rDATA;
+  logic {p}_usr_rLAST;
+  logic {p}_usr_r_error;
+
+  // Write: ID allocator (lowest free slot), W burst length queue and B response tracker
+  logic {p}_awVALID_n;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_awADDR_n;
+  logic [7:0] {p}_awLEN_n;
+  logic [{p}_ID_W_WIDTH-1:0] {p}_awID_n;
+  logic [{p}_OUTSTANDING-1:0] {p}_w_busy, {p}_w_busy_n;
+  logic [{p}_SLOT_WIDTH-1:0] {p}_w_free_slot;
+  logic {p}_w_any_free;
+  logic [7:0] {p}_w_beat_idx, {p}_w_beat_idx_n;
+  logic {p}_w_beat;
+  // Signals that interface with control units outside of the AXI.py script:
+  logic {p}_usr_wTRANSFER;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_usr_wADDR;
+  logic [7:0] {p}_usr_wLEN;
+  logic {p}_usr_w_accept;
+  logic {p}_usr_w_en;
+  logic {p}_usr_w_ready;
+  logic [{p}_DATA_WIDTH-1:0] {p}_usr_wDATA;
+  logic [{p}_DATA_WIDTH/8-1:0] {p}_usr_wSTRB;
+  logic {p}_w_done;
+  logic {p}_w_error;
+"""
+    code += get_fifo_signals(p, "wq", [("8", "len", None)])
+    return code
+
+def get_full_m_pipelined_logic(bus_prefix, interface_name=None):
+    p = bus_prefix
+    return f"""  // Generated logic for AXI-Full Manager with {p}_OUTSTANDING outstanding bursts per direction
+  // A request is accepted ({p}_usr_*_accept) whenever an ID is free and the address channel
+  // register is empty or being emptied, so new bursts are issued while others are in flight.
+
+  // Read address channel: slot r_alloc is used as the arID of the next burst
+  assign {p}_usr_r_accept = {p}_usr_rTRANSFER & ~{p}_r_busy[{p}_r_alloc] & (~{p}_arVALID_o | {p}_arREADY_i);
+  assign {p}_arVALID_n = {p}_usr_r_accept | ({p}_arVALID_o & ~{p}_arREADY_i);
+  assign {p}_arADDR_n = {p}_usr_r_accept ? {p}_usr_rADDR : {p}_arADDR_o;
+  assign {p}_arLEN_n = {p}_usr_r_accept ? {p}_usr_rLEN : {p}_arLEN_o;
+  assign {p}_arID_n = {p}_usr_r_accept ? {p}_ID_R_WIDTH'({p}_r_alloc) : {p}_arID_o;
+  assign {p}_arSIZE_o  = {p}_SIZE;
+  assign {p}_arBURST_o = 2'b01;
+  assign {p}_arLOCK_o  = 1'b0;
+  assign {p}_arCACHE_o = 4'b0011;
+  assign {p}_arPROT_o  = 3'b000;
+  assign {p}_arQOS_o   = 4'b0000;
+  assign {p}_r_alloc_n = {p}_r_alloc + {p}_SLOT_WIDTH'({p}_usr_r_accept);
+
+  // Read data: every beat is stored at (rID, beat count) so bursts may complete in any order
+  // and interleave. Space is reserved at allocation, so rREADY is always high.
+  assign {p}_rREADY_o = 1'b1;
+  assign {p}_r_beat = {p}_rVALID_i & {p}_rREADY_o;
+  assign {p}_r_slot = {p}_rID_i[{p}_SLOT_WIDTH-1:0];
+  always_ff @(posedge clk_i) begin
+    if ({p}_usr_r_accept) begin
+      {p}_rob_len[{p}_r_alloc] <= {p}_usr_rLEN;
+      {p}_rob_count[{p}_r_alloc] <= 9'h000;
+    end
+    if ({p}_r_beat) begin
+      {p}_rob_data[{{{p}_r_slot, {p}_rob_count[{p}_r_slot][{p}_ROB_BEAT_WIDTH-1:0]}}] <= {{{p}_rRESP_i, {p}_rDATA_i}};
+      {p}_rob_count[{p}_r_slot] <= {p}_rob_count[{p}_r_slot] + 9'h001;
+    end
+  end
+
+  // Read delivery: bursts are handed to the user in request order
+  assign {p}_rob_head = {p}_rob_data[{{{p}_r_head, {p}_r_rd_idx[{p}_ROB_BEAT_WIDTH-1:0]}}];
+  assign {p}_usr_r_valid = {p}_r_busy[{p}_r_head] & ({p}_rob_count[{p}_r_head] > {{1'b0, {p}_r_rd_idx}});
+  assign {p}_usr_rDATA = {p}_rob_head[{p}_DATA_WIDTH-1:0];
+  assign {p}_usr_r_error = {p}_rob_head[{p}_DATA_WIDTH+1:{p}_DATA_WIDTH] != 2'b00;
+  assign {p}_usr_rLAST = {p}_r_rd_idx == {p}_rob_len[{p}_r_head];
+  assign {p}_r_deliver = {p}_usr_r_valid & {p}_usr_r_ready;
+  assign {p}_r_rd_idx_n = {p}_r_deliver ? ({p}_usr_rLAST ? 8'h00 : {p}_r_rd_idx + 8'h01) : {p}_r_rd_idx;
+  assign {p}_r_head_n = {p}_r_head + {p}_SLOT_WIDTH'({p}_r_deliver & {p}_usr_rLAST);
+  assign {p}_r_busy_n = ({p}_r_busy | ({p}_OUTSTANDING'({p}_usr_r_accept) << {p}_r_alloc)) &
+                        ~({p}_OUTSTANDING'({p}_r_deliver & {p}_usr_rLAST) << {p}_r_head);
+
+  // Write address channel: the lowest free slot is used as the awID of the next burst
+  always_comb begin
+    {p}_w_free_slot = '0;
+    for (int i = {p}_OUTSTANDING - 1; i >= 0; i--) begin
+      if (~{p}_w_busy[i]) {p}_w_free_slot = {p}_SLOT_WIDTH'(i);
+    end
+  end
+  assign {p}_w_any_free = ~&{p}_w_busy;
+  assign {p}_usr_w_accept = {p}_usr_wTRANSFER & {p}_w_any_free & ~{p}_wq_full & (~{p}_awVALID_o | {p}_awREADY_i);
+  assign {p}_awVALID_n = {p}_usr_w_accept | ({p}_awVALID_o & ~{p}_awREADY_i);
+  assign {p}_awADDR_n = {p}_usr_w_accept ? {p}_usr_wADDR : {p}_awADDR_o;
+  assign {p}_awLEN_n = {p}_usr_w_accept ? {p}_usr_wLEN : {p}_awLEN_o;
+  assign {p}_awID_n = {p}_usr_w_accept ? {p}_ID_W_WIDTH'({p}_w_free_slot) : {p}_awID_o;
+  assign {p}_awSIZE_o  = {p}_SIZE;
+  assign {p}_awBURST_o = 2'b01;
+  assign {p}_awLOCK_o  = 1'b0;
+  assign {p}_awCACHE_o = 4'b0011;
+  assign {p}_awPROT_o  = 3'b000;
+  assign {p}_awQOS_o   = 4'b0000;
+
+{get_fifo_logic(p, "wq", [("8", "len", f"{p}_usr_wLEN")])}  // Write data: bursts follow the AW order, their lengths are taken from the WQ FIFO
+  assign {p}_wq_push = {p}_usr_w_accept;
+  assign {p}_wq_pop = {p}_w_beat & {p}_wLAST_o;
+  assign {p}_wVALID_o = ~{p}_wq_empty & {p}_usr_w_en;
+  assign {p}_usr_w_ready = ~{p}_wq_empty & {p}_wREADY_i;
+  assign {p}_wDATA_o = {p}_usr_wDATA;
+  assign {p}_wSTRB_o = {p}_usr_wSTRB;
+  assign {p}_wLAST_o = {p}_w_beat_idx == {fifo_head(p, "wq", "len")};
+  assign {p}_w_beat = {p}_wVALID_o & {p}_wREADY_i;
+  assign {p}_w_beat_idx_n = {p}_w_beat ? ({p}_wLAST_o ? 8'h00 : {p}_w_beat_idx + 8'h01) : {p}_w_beat_idx;
+
+  // Write responses: bID frees its slot
+  assign {p}_bREADY_o = 1'b1;
+  assign {p}_w_done = {p}_bVALID_i;
+  assign {p}_w_error = {p}_bVALID_i & ({p}_bRESP_i != '0);
+  assign {p}_w_busy_n = ({p}_w_busy | ({p}_OUTSTANDING'({p}_usr_w_accept) << {p}_w_free_slot)) &
+                        ~({p}_OUTSTANDING'({p}_bVALID_i) << {p}_bID_i[{p}_SLOT_WIDTH-1:0]);
+
+  `include "reg_{p}_registers_{interface_name}.vs"  /*
+    {p}_arVALID_o  , 1               , 0, sync_reset, , _n
+    {p}_arADDR_o   , {p}_ADDR_WIDTH  , 0, sync_reset, , _n
+    {p}_arLEN_o    , 8               , 0, sync_reset, , _n
+    {p}_arID_o     , {p}_ID_R_WIDTH  , 0, sync_reset, , _n
+    {p}_r_busy     , {p}_OUTSTANDING , 0, sync_reset, , _n
+    {p}_r_alloc    , {p}_SLOT_WIDTH  , 0, sync_reset, , _n
+    {p}_r_head     , {p}_SLOT_WIDTH  , 0, sync_reset, , _n
+    {p}_r_rd_idx   , 8               , 0, sync_reset, , _n
+    {p}_awVALID_o  , 1               , 0, sync_reset, , _n
+    {p}_awADDR_o   , {p}_ADDR_WIDTH  , 0, sync_reset, , _n
+    {p}_awLEN_o    , 8               , 0, sync_reset, , _n
+    {p}_awID_o     , {p}_ID_W_WIDTH  , 0, sync_reset, , _n
+    {p}_w_busy     , {p}_OUTSTANDING , 0, sync_reset, , _n
+    {p}_w_beat_idx , 8               , 0, sync_reset, , _n
+    {p}_wq_wptr    , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    {p}_wq_rptr    , {p}_PTR_WIDTH   , 0, sync_reset, , _n
+    */
+"""
+
+def get_full_m_splitter_signals(bus_prefix, max_burst):
+    p = bus_prefix
+    code = f"""  // Generated signals for the AXI-Full Manager transfer splitter
+  localparam integer {p}_BEAT_SHIFT = $clog2({p}_DATA_WIDTH/8);
+  localparam integer {p}_MAX_BURST = {max_burst};
+"""
+    for d in ("r", "w"):
+        code += f"""  logic {p}_{d}s_active, {p}_{d}s_active_n;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_{d}s_addr, {p}_{d}s_addr_n;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_{d}s_beats, {p}_{d}s_beats_n;
+  logic [12:0] {p}_{d}s_to_4k, {p}_{d}s_chunk, {p}_{d}s_burst;
+  logic {p}_{d}s_accept;
+  // Signals that interface with control units outside of the AXI.py script:
+  logic {p}_usr_{d}XFER;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_usr_{d}XFER_ADDR;
+  logic [{p}_ADDR_WIDTH-1:0] {p}_usr_{d}XFER_BYTES;
+  logic {p}_usr_{d}XFER_READY;
+"""
+    return code
+
+def full_m_splitter_accept(bus_prefix, outstanding):
+    # Cycle in which the manager takes usr_{r,w}ADDR/usr_{r,w}LEN of the current burst
+    p = bus_prefix
+    if outstanding > 1:
+        return {"r": f"{p}_usr_r_accept", "w": f"{p}_usr_w_accept"}
+    return {
+        "r": f"{p}_usr_rTRANSFER & (({p}_r_state == {p}_r_Idle) | {p}_r_done)",
+        "w": f"{p}_usr_wTRANSFER & (({p}_w_state == {p}_w_Idle) | (({p}_w_state == {p}_w_WaitResp) & {p}_bVALID_i))",
+    }
+
+def get_full_m_splitter_logic(bus_prefix, outstanding, interface_name=None):
+    p = bus_prefix
+    accept = full_m_splitter_accept(p, outstanding)
+    code = f"""  // Generated logic for the AXI-Full Manager transfer splitter
+  // A transfer of {p}_usr_[r,w]XFER_BYTES bytes at the bus-aligned {p}_usr_[r,w]XFER_ADDR is issued
+  // as back-to-back INCR bursts of the largest length that stays within {p}_MAX_BURST beats and
+  // does not cross a 4KB boundary. {p}_usr_[r,w]XFER_READY is high while no transfer is running.
+"""
+    for d in ("r", "w"):
+        code += f"""  assign {p}_{d}s_to_4k = (13'h1000 - 13'({p}_{d}s_addr[11:0])) >> {p}_BEAT_SHIFT;
+  assign {p}_{d}s_chunk = ({p}_{d}s_to_4k < 13'({p}_MAX_BURST)) ? {p}_{d}s_to_4k : 13'({p}_MAX_BURST);
+  assign {p}_{d}s_burst = ({p}_{d}s_beats < {p}_ADDR_WIDTH'({p}_{d}s_chunk)) ? 13'({p}_{d}s_beats) : {p}_{d}s_chunk;
+  assign {p}_usr_{d}TRANSFER = {p}_{d}s_active;
+  assign {p}_usr_{d}ADDR = {p}_{d}s_addr;
+  assign {p}_usr_{d}LEN = 8'({p}_{d}s_burst - 13'h001);
+  assign {p}_{d}s_accept = {accept[d]};
+  assign {p}_usr_{d}XFER_READY = ~{p}_{d}s_active;
+  always_comb begin
+    {p}_{d}s_active_n = {p}_{d}s_active;
+    {p}_{d}s_addr_n   = {p}_{d}s_addr;
+    {p}_{d}s_beats_n  = {p}_{d}s_beats;
+    if (~{p}_{d}s_active) begin
+      if ({p}_usr_{d}XFER & ({p}_usr_{d}XFER_BYTES != '0)) begin
+        {p}_{d}s_active_n = 1'b1;
+        {p}_{d}s_addr_n   = {p}_usr_{d}XFER_ADDR;
+        {p}_{d}s_beats_n  = ({p}_usr_{d}XFER_BYTES + {p}_ADDR_WIDTH'({p}_DATA_WIDTH/8 - 1)) >> {p}_BEAT_SHIFT;
+      end
+    end else if ({p}_{d}s_accept) begin
+      {p}_{d}s_active_n = {p}_{d}s_beats != {p}_ADDR_WIDTH'({p}_{d}s_burst);
+      {p}_{d}s_addr_n   = {p}_{d}s_addr + ({p}_ADDR_WIDTH'({p}_{d}s_burst) << {p}_BEAT_SHIFT);
+      {p}_{d}s_beats_n  = {p}_{d}s_beats - {p}_ADDR_WIDTH'({p}_{d}s_burst);
+    end
+  end
+
+"""
+    code += f"""  `include "reg_{p}_splitter_{interface_name}.vs"  /*
+"""
+    for d in ("r", "w"):
+        code += f"""    {p}_{d}s_active , 1             , 0, sync_reset, , _n
+    {p}_{d}s_addr   , {p}_ADDR_WIDTH, 0, sync_reset, , _n
+    {p}_{d}s_beats  , {p}_ADDR_WIDTH, 0, sync_reset, , _n
+"""
+    code += "    */\n"
+    return code
+
+# AXI-Stream payload fields: option name, port suffix, width and default presence
+# Performance counters (perf=1): every counter is a register of an MMIO.py block, so software reads
+# them over the register interface and clears the R/W ones by writing 0.
+def perf_directions(bus_type, bus_prefix, node):
+    """(direction, address handshake, response handshake of the last beat) of an endpoint."""
+    port = lambda channel, signal: channel_port(bus_type, bus_prefix, channel, signal, node)
+    valid, ready = HANDSHAKE[bus_type]
+    last = f" & {port('r', 'LAST')}" if bus_type == "AXI-Full" else ""
+    return (
+        ("w", f"{port('aw', valid)} & {port('aw', ready)}", f"{port('b', valid)} & {port('b', ready)}"),
+        ("r", f"{port('ar', valid)} & {port('ar', ready)}", f"{port('r', valid)} & {port('r', ready)}{last}"),
+    )
+
+def perf_fifo_fields(bus_prefix):
+    # Request timestamps, taken from the cycle counter
+    return [(f"{bus_prefix}_PERF_WIDTH", "cycle", f"{bus_prefix}_perf_cycles")]
+
+def perf_bit(bus_prefix, bit):
+    # A 1-bit term zero-extended by concatenation: a size cast would widen the operands of bit
+    # before evaluating it and Verilator reports WIDTHEXPAND for them
+    return f"{{{{({bus_prefix}_PERF_WIDTH-1){{1'b0}}}}, {bit}}}"
+
+def perf_registers(bus_type, bus_prefix, node, buckets):
+    """MMIO records (name, access, next value) of the performance counters, in address order."""
+    p = f"{bus_prefix}_perf"
+    inc = lambda name, condition: f"{name} + {perf_bit(bus_prefix, f'({condition})')}"
+    valid, ready = HANDSHAKE[bus_type]
+    registers = [(f"{p}_cycles", "R/W", f"{p}_cycles + {bus_prefix}_PERF_WIDTH'(1)")]
+    for channel in AXI_CHANNELS[bus_type]:
+        v = channel_port(bus_type, bus_prefix, channel, valid, node)
+        r = channel_port(bus_type, bus_prefix, channel, ready, node)
+        registers.append((f"{p}_{channel}_beats", "R/W", inc(f"{p}_{channel}_beats", f"{v} & {r}")))
+        registers.append((f"{p}_{channel}_stalls", "R/W", inc(f"{p}_{channel}_stalls", f"{v} & ~{r}")))
+    for d, _, _ in perf_directions(bus_type, bus_prefix, node):
+        q = f"{p}_{d}"
+        registers += [
+            (f"{q}_outstanding", "R",
+             f"{q}_outstanding + {perf_bit(bus_prefix, f'{q}_start')} - {perf_bit(bus_prefix, f'{q}_done')}"),
+            (f"{q}_occupancy", "R/W", f"{q}_occupancy + {q}_outstanding"),
+            (f"{q}_lat_count", "R/W", inc(f"{q}_lat_count", f"{q}_measure")),
+            (f"{q}_lat_sum", "R/W", f"{q}_lat_sum + ({q}_measure ? {q}_latency : '0)"),
+            (f"{q}_lat_min", "R/W", f"({q}_measure & ({q}_latency < {q}_lat_min)) ? {q}_latency : {q}_lat_min"),
+            (f"{q}_lat_max", "R/W", f"({q}_measure & ({q}_latency > {q}_lat_max)) ? {q}_latency : {q}_lat_max"),
+        ]
+        registers += [
+            (f"{q}_bucket{k}", "R/W", inc(f"{q}_bucket{k}", f"{q}_measure & {q}_bucket_hit[{k}]"))
+            for k in range(buckets)
+        ]
+    return registers
+
+def get_perf_signals(bus_type, bus_prefix, node, buckets, depth, base):
+    p = f"{bus_prefix}_perf"
+    # Enough address bits for the highest register address
+    end = base + 4 * len(perf_registers(bus_type, bus_prefix, node, buckets))
+    code = f"""  // Generated performance counter signals for {bus_prefix}
+  localparam integer {bus_prefix}_PERF_WIDTH = 32;
+  localparam integer {bus_prefix}_PERF_ADDR_WIDTH = {max((end - 1).bit_length(), 1)};
+  localparam integer {bus_prefix}_PERF_DEPTH = {depth};
+  localparam integer {bus_prefix}_PERF_PTR_WIDTH = $clog2({depth}) + 1;
+  `include "MMIO_{p}_signals.vs" // VS_NO_GENERATE
+"""
+    for d, _, _ in perf_directions(bus_type, bus_prefix, node):
+        q = f"{p}_{d}"
+        code += f"""  logic {q}_start, {q}_done, {q}_measure;
+  logic [{bus_prefix}_PERF_WIDTH-1:0] {q}_latency, {q}_untimed, {q}_untimed_n;
+  logic [{buckets}-1:0] {q}_bucket_hit;
+"""
+        code += get_fifo_signals(
+            bus_prefix, f"perf_{d}ts", perf_fifo_fields(bus_prefix),
+            f"{bus_prefix}_PERF_DEPTH", f"{bus_prefix}_PERF_PTR_WIDTH",
+        )
+    return code
+
+def get_perf_logic(bus_type, bus_prefix, node, buckets, base):
+    p = f"{bus_prefix}_perf"
+    ptr_width = f"{bus_prefix}_PERF_PTR_WIDTH"
+    code = f"""  // Generated performance counters for {bus_prefix}: beats and stall cycles per channel, outstanding
+  // transactions (occupancy accumulates them every cycle) and request-to-last-response latency.
+  // Requests are timestamped in order in a FIFO; while it is full they are counted as untimed and
+  // their responses are not measured, so latencies of reordered responses are approximate.
+"""
+    for d, start, done in perf_directions(bus_type, bus_prefix, node):
+        q = f"{p}_{d}"
+        fifo = f"perf_{d}ts"
+        code += f"""  assign {q}_start = {start};
+  assign {q}_done = {done};
+  assign {bus_prefix}_{fifo}_push = {q}_start & ~{bus_prefix}_{fifo}_full & ({q}_untimed == '0);
+  assign {bus_prefix}_{fifo}_pop = {q}_done & ~{bus_prefix}_{fifo}_empty;
+  assign {q}_measure = {bus_prefix}_{fifo}_pop;
+  assign {q}_untimed_n = {q}_untimed + {perf_bit(bus_prefix, f"({q}_start & ~{bus_prefix}_{fifo}_push)")}
+                                          - {perf_bit(bus_prefix, f"({q}_done & {bus_prefix}_{fifo}_empty)")};
+  assign {q}_latency = {p}_cycles - {fifo_head(bus_prefix, fifo, 'cycle', ptr_width)};
+"""
+        for k in range(buckets):
+            low = f"({q}_latency >= {bus_prefix}_PERF_WIDTH'({1 << k}))" if k else ""
+            high = f"({q}_latency < {bus_prefix}_PERF_WIDTH'({1 << (k + 1)}))" if k < buckets - 1 else ""
+            code += f"  assign {q}_bucket_hit[{k}] = {' & '.join(bound for bound in (low, high) if bound)};\n"
+        code += get_fifo_logic(bus_prefix, fifo, perf_fifo_fields(bus_prefix), ptr_width=ptr_width)
+    code += f'  `include "reg_{p}_registers.vs"  /*\n'
+    for d in ("w", "r"):
+        code += f"    {bus_prefix}_perf_{d}ts_wptr, {ptr_width}, 0, sync_reset, , _n\n"
+        code += f"    {bus_prefix}_perf_{d}ts_rptr, {ptr_width}, 0, sync_reset, , _n\n"
+        code += f"    {p}_{d}_untimed, {bus_prefix}_PERF_WIDTH, 0, sync_reset, , _n\n"
+    code += "    */\n"
+    code += f'  `include "MMIO_{p}.vs"  /*\n'
+    code += f"    prefix = {p}, data_width = {bus_prefix}_PERF_WIDTH, addr_width = {bus_prefix}_PERF_ADDR_WIDTH\n"
+    for index, (name, access, next_value) in enumerate(perf_registers(bus_type, bus_prefix, node, buckets)):
+        reset = "'1" if name.endswith("_lat_min") else "0"
+        code += f"    {name}, {bus_prefix}_PERF_WIDTH, {reset}, sync_reset, , _n, 0x{base + 4 * index:x}, {access}, {next_value}\n"
+    return code + "    */\n"
+
+# Protocol checkers (sva=1): a simulation-only module per bus, instantiated under `ifndef SYNTHESIS
+CHECKER_ENDPOINTS = {
+    ("AXI-Lite", "Subordinate"): "m",
+    ("AXI-Full", "Manager"): "s",
+    ("AXI-Full", "Subordinate"): "m",
+    ("AXI-Stream", "Manager"): "s",
+    ("AXI-Stream", "Subordinate"): "m",
+}
+
+
+class AXIChecker:
+    """SVA protocol checker of one bus: every handshake channel is checked for X on valid, a
+    stable payload while valid waits for ready and a bounded wait; AXI-Lite/Full responses must
+    match an outstanding request ID, AXI-Full LAST must close each burst at its LEN and every
+    direction with outstanding requests must respond within the timeout."""
+
+    def __init__(self, bus, prefix, parameters):
+        self.type = bus.type
+        self.prefix = prefix
+        self.module = f"{prefix}_checker"
+        self.timeout = bus.int_option("sva_timeout", 1024)
+        self.parameters = re.findall(r"parameter integer (\w+) = (\w+)", parameters)
+        node = CHECKER_ENDPOINTS[(bus.type, bus.node)]
+        # {channel: (valid, ready, [(checker port, bus port, width)] of the payload)}
+        self.channels = {}
+        if bus.type == "AXI-Stream":
+            io_out, io_in = ("o", "i") if bus.node == "Manager" else ("i", "o")
+            fields = stream_fields(bus, prefix)
+            self.channels["t"] = (
+                ("tVALID", f"{prefix}_tVALID_{io_out}", "1"),
+                ("tREADY", f"{prefix}_tREADY_{io_in}", "1"),
+                [(port, f"{prefix}_{port}_{io_out}", width) for port, width in fields],
+            )
+            return
+        valid, ready = HANDSHAKE[bus.type]
+        for channel, (_, fields) in channel_fields(bus.type, prefix, f"{prefix}_DATA_WIDTH").items():
+            port = lambda signal, width: (f"{channel}{signal}", channel_port(bus.type, prefix, channel, signal, node), width)
+            self.channels[channel] = (port(valid, "1"), port(ready, "1"), [port(field, width) for field, width in fields])
+
+    def ports(self):
+        for valid, ready, payload in self.channels.values():
+            yield from [valid, ready] + payload
+
+    def module_text(self):
+        parameters = "".join(f"    parameter integer {name} = {default},\n" for name, default in self.parameters)
+        ports = "".join(f"    input logic {vector_range(width)}{port},\n" for port, _, width in self.ports())
+        code = f"""// Generated by AXI.py: simulation-only protocol checker for {self.type} {self.prefix}
+module {self.module} #(
+{parameters}    parameter integer MAX_WAIT = {self.timeout}
+) (
+{ports}    input logic clk_i,
+    input logic rst_i
+);
+"""
+        for channel, ((valid, _, _), (ready, _, _), payload) in self.channels.items():
+            fields = ", ".join(port for port, _, _ in payload)
+            stable = f" && $stable({{{fields}}})" if fields else ""
+            code += f"""
+  // {channel.upper()} channel
+  integer {channel}_wait;
+  always_ff @(posedge clk_i) {channel}_wait <= (rst_i || !{valid} || {ready}) ? 0 : {channel}_wait + 1;
+  {channel}_valid_known: assert property (@(posedge clk_i) disable iff (rst_i) !$isunknown({valid}))
+    else $error("{self.prefix}: {valid} is X.");
+  {channel}_stable: assert property (@(posedge clk_i) disable iff (rst_i) {valid} && !{ready} |=> {valid}{stable})
+    else $error("{self.prefix}: {channel.upper()} valid dropped or payload changed before ready.");
+  {channel}_bounded_wait: assert property (@(posedge clk_i) disable iff (rst_i) {channel}_wait < MAX_WAIT)
+    else $error("{self.prefix}: {valid} waited %0d cycles for ready.", {channel}_wait);
+"""
+        if self.type != "AXI-Stream":
+            code += self.transaction_checks()
+        return code + "endmodule\n"
+
+    def transaction_checks(self):
+        full = self.type == "AXI-Full"
+        hs = lambda channel: " && ".join(port for port, _, _ in self.channels[channel][:2])
+        field = lambda channel, name: f"{channel}{name.upper() if full else name}"
+        # Scoreboard keys are int: IDs are cast to it and LENs are pushed as 32 bits
+        key = lambda channel: f"int'({field(channel, 'id')})"
+        length = lambda channel: f"32'({field(channel, 'len')})"
+        count = lambda handshake: f"({handshake} ? 1 : 0)"
+        code = """
+  // Outstanding requests per ID, burst lengths (AXI-Full) and response timeouts
+  int unsigned w_ids[int], r_ids[int];
+  int unsigned aw_lens[$], w_lens[$], ar_lens[int][$], r_beats[int];
+  int unsigned w_beat, w_outstanding, r_outstanding, w_idle, r_idle;
+  always @(posedge clk_i) begin
+    if (rst_i) begin
+      w_ids.delete(); r_ids.delete(); aw_lens.delete(); w_lens.delete(); ar_lens.delete(); r_beats.delete();
+      w_beat <= 0; w_outstanding <= 0; r_outstanding <= 0; w_idle <= 0; r_idle <= 0;
+    end else begin
+"""
+        r_last = f"{field('r', 'last')}" if full else "1'b1"
+        for request, response, ids, kind, last in (("aw", "b", "w_ids", "write", ""), ("ar", "r", "r_ids", "read", r_last)):
+            matched = f"{ids}.exists({key(response)}) && {ids}[{key(response)}] > 0"
+            closes = f"{last} && {matched}" if full and last else matched
+            # Nonblocking updates: a request and a response of the same ID in one cycle are one update
+            code += f"""      if ({hs(response)}) assert ({matched})
+        else $error("{self.prefix}: {response.upper()} with ID %0d matches no outstanding {kind}.", {field(response, 'id')});
+      if ({hs(request)} && {hs(response)} && ({key(request)} == {key(response)})) begin
+        if (!({closes})) {ids}[{key(request)}] <= {ids}[{key(request)}] + 1;
+      end else begin
+        if ({hs(request)}) {ids}[{key(request)}] <= {ids}[{key(request)}] + 1;
+        if ({hs(response)} && {closes}) {ids}[{key(response)}] <= {ids}[{key(response)}] - 1;
+      end
+"""
+        if full:
+            code += f"""      // W bursts may start before their AW: lengths are compared in order once both are known
+      if ({hs('aw')}) aw_lens.push_back({length('aw')});
+      if ({hs('w')}) begin
+        if ({field('w', 'last')}) w_lens.push_back(w_beat);
+        w_beat <= {field('w', 'last')} ? 0 : w_beat + 1;
+      end
+      if (aw_lens.size() > 0 && w_lens.size() > 0) begin
+        assert (aw_lens[0] == w_lens[0])
+          else $error("{self.prefix}: WLAST after %0d beats, AWLEN+1 is %0d.", w_lens[0] + 1, aw_lens[0] + 1);
+        void'(aw_lens.pop_front());
+        void'(w_lens.pop_front());
+      end
+      if ({hs('ar')}) ar_lens[{key('ar')}].push_back({length('ar')});
+      if ({hs('r')} && ar_lens.exists({key('r')}) && ar_lens[{key('r')}].size() > 0) begin
+        assert ({field('r', 'last')} == (r_beats[{key('r')}] == ar_lens[{key('r')}][0]))
+          else $error("{self.prefix}: RLAST %0d at beat %0d of a %0d-beat burst.", {field('r', 'last')},
+                      r_beats[{key('r')}] + 1, ar_lens[{key('r')}][0] + 1);
+        r_beats[{key('r')}] <= {field('r', 'last')} ? 0 : r_beats[{key('r')}] + 1;
+        if ({field('r', 'last')}) void'(ar_lens[{key('r')}].pop_front());
+      end
+"""
+        code += f"""      w_idle <= (w_outstanding == 0 || ({hs('b')})) ? 0 : w_idle + 1;
+      r_idle <= (r_outstanding == 0 || ({hs('r')})) ? 0 : r_idle + 1;
+      w_outstanding <= w_outstanding + {count(hs('aw'))} - {count(hs('b'))};
+      r_outstanding <= r_outstanding + {count(hs('ar'))} - {count(f"{hs('r')} && {r_last}")};
+      assert (w_idle < MAX_WAIT) else $error("{self.prefix}: no B for %0d cycles with writes outstanding.", w_idle);
+      assert (r_idle < MAX_WAIT) else $error("{self.prefix}: no R for %0d cycles with reads outstanding.", r_idle);
+    end
+  end
+"""
+        return code
+
+    def instance(self):
+        parameters = ",\n".join(f"      .{name}({name})" for name, _ in self.parameters)
+        ports = "".join(f"      .{port}({bus_port}),\n" for port, bus_port, _ in self.ports())
+        return f"""  // Protocol checker ({self.module}.sv, simulation only)
+`ifndef SYNTHESIS
+  {self.module} #(
+{parameters}
+  ) {self.module}_i (
+{ports}      .clk_i(clk_i),
+      .rst_i(sync_reset)
+  );
+`endif
+"""
+
+STREAM_FIELDS = (
+    ("data", "tDATA", "{p}_DATA_WIDTH", 1),
+    ("keep", "tKEEP", "{p}_DATA_WIDTH/8", 0),
+    ("last", "tLAST", "1", 1),
+    ("user", "tUSER", "{p}_USER_WIDTH", 0),
+    ("id", "tID", "{p}_ID_WIDTH", 0),
+    ("dest", "tDEST", "{p}_DEST_WIDTH", 0),
+)
+
+def stream_fields(bus, bus_prefix):
+    return [
+        (port, width.format(p=bus_prefix))
+        for option, port, width, default in STREAM_FIELDS
+        if bus.int_option(option, default)
+    ]
+
+def vector_range(width):
+    if width.isdigit():
+        return "" if width == "1" else f"[{int(width) - 1}:0] "
+    return f"[{width}-1:0] "
+
+def get_stream_parameters(bus_prefix, node, fields):
+    ports = [port for port, _ in fields]
+    code = f"    // Generated Parameters for AXI-Stream {node}\n"
+    if "tDATA" in ports or "tKEEP" in ports:
+        code += f"    parameter integer {bus_prefix}_DATA_WIDTH = 32,\n"
+    for port, parameter in (("tUSER", "USER_WIDTH"), ("tID", "ID_WIDTH"), ("tDEST", "DEST_WIDTH")):
+        if port in ports:
+            code += f"    parameter integer {bus_prefix}_{parameter} = 1,\n"
+    return code
+
+def get_stream_ios(bus_prefix, node, fields):
+    out, inp = ("output", "input ") if node == "Manager" else ("input ", "output")
+    io_out, io_in = ("o", "i") if node == "Manager" else ("i", "o")
+    code = f"""    // Generated IOs for AXI-Stream {node}
+    {out} logic {bus_prefix}_tVALID_{io_out},
+    {inp} logic {bus_prefix}_tREADY_{io_in},
+"""
+    for port, width in fields:
+        code += f"    {out} logic {vector_range(width)}{bus_prefix}_{port}_{io_out},\n"
+    return code
+
+def stream_payload(bus_prefix, fields, template):
+    # Concatenation of the payload fields, e.g. template "{p}_{port}_o" or "{p}_usr_{port}"
+    return "{" + ", ".join(template.format(p=bus_prefix, port=port) for port, _ in fields) + "}"
+
+def get_stream_signals(bus_prefix, node, fields, slices):
+    width = " + ".join(f"({width})" for _, width in fields)
+    code = f"""  // Generated signals for AXI-Stream {node} ({slices} register slices)
+  localparam integer {bus_prefix}_PAYLOAD_WIDTH = {width};
+  // Signals that interface with control units outside of the AXI.py script:
+  logic {bus_prefix}_usr_tVALID;
+  logic {bus_prefix}_usr_tREADY;
+"""
+    for port, port_width in fields:
+        code += f"  logic {vector_range(port_width)}{bus_prefix}_usr_{port};\n"
+    for stage in range(slices):
+        s = f"{bus_prefix}_slice{stage}"
+        code += f"""  logic {s}_ready;
+  logic {s}_valid, {s}_valid_n;
+  logic [{bus_prefix}_PAYLOAD_WIDTH-1:0] {s}_data, {s}_data_n;
+  logic {s}_skid_valid, {s}_skid_valid_n;
+  logic [{bus_prefix}_PAYLOAD_WIDTH-1:0] {s}_skid_data, {s}_skid_data_n;
+"""
+    return code
+
+def get_stream_slice(bus_prefix, stage, in_valid, in_data, out_ready):
+    # Full-throughput register slice: the skid register catches the beat accepted in the
+    # cycle the output stalls, so the upstream ready is a register output.
+    s = f"{bus_prefix}_slice{stage}"
+    return f"""  // Register slice {stage}
+  assign {s}_ready = ~{s}_skid_valid;
+  always_comb begin
+    {s}_valid_n      = {s}_valid;
+    {s}_data_n       = {s}_data;
+    {s}_skid_valid_n = {s}_skid_valid;
+    {s}_skid_data_n  = {s}_skid_data;
+    if (~{s}_valid | {out_ready}) begin
+      if ({s}_skid_valid) begin
+        {s}_valid_n      = 1'b1;
+        {s}_data_n       = {s}_skid_data;
+        {s}_skid_valid_n = 1'b0;
+      end else begin
+        {s}_valid_n = {in_valid};
+        {s}_data_n  = {in_data};
+      end
+    end else if ({in_valid} & ~{s}_skid_valid) begin
+      {s}_skid_valid_n = 1'b1;
+      {s}_skid_data_n  = {in_data};
+    end
+  end
+
+"""
+
+def get_stream_logic(bus_prefix, node, fields, slices, interface_name=None):
+    user = ("{p}_usr_tVALID", "{p}_usr_tREADY", "{p}_usr_{port}")
+    if node == "Manager":
+        # User side -> slices -> T channel outputs
+        (src_valid, src_ready, src_data) = user
+        (dst_valid, dst_ready, dst_data) = ("{p}_tVALID_o", "{p}_tREADY_i", "{p}_{port}_o")
+    else:
+        # T channel inputs -> slices -> user side
+        (src_valid, src_ready, src_data) = ("{p}_tVALID_i", "{p}_tREADY_o", "{p}_{port}_i")
+        (dst_valid, dst_ready, dst_data) = user
+    src_valid, src_ready, dst_valid, dst_ready = (
+        name.format(p=bus_prefix) for name in (src_valid, src_ready, dst_valid, dst_ready)
+    )
+    src_data = stream_payload(bus_prefix, fields, src_data)
+    dst_data = stream_payload(bus_prefix, fields, dst_data)
+
+    code = f"  // Generated logic for AXI-Stream {node}\n"
+    if slices == 0:
+        return code + f"""  assign {dst_valid} = {src_valid};
+  assign {src_ready} = {dst_ready};
+  assign {dst_data} = {src_data};
+"""
+    in_valid, in_data = src_valid, src_data
+    for stage in range(slices):
+        s = f"{bus_prefix}_slice{stage}"
+        out_ready = f"{bus_prefix}_slice{stage + 1}_ready" if stage + 1 < slices else dst_ready
+        code += get_stream_slice(bus_prefix, stage, in_valid, in_data, out_ready)
+        in_valid, in_data = f"{s}_valid", f"{s}_data"
+    code += f"""  assign {src_ready} = {bus_prefix}_slice0_ready;
+  assign {dst_valid} = {in_valid};
+  assign {dst_data} = {in_data};
+
+  `include "reg_{bus_prefix}_slices_{interface_name}.vs"  /*
+"""
+    for stage in range(slices):
+        s = f"{bus_prefix}_slice{stage}"
+        code += f"""    {s}_valid      , 1                        , 0, sync_reset, , _n
+    {s}_data       , {bus_prefix}_PAYLOAD_WIDTH , 0, sync_reset, , _n
+    {s}_skid_valid , 1                        , 0, sync_reset, , _n
+    {s}_skid_data  , {bus_prefix}_PAYLOAD_WIDTH , 0, sync_reset, , _n
+"""
+    code += "    */\n"
+    return code
+
+class AXIPorts:
+    """Naming of the channel ports of blocks that sit between AXI managers and subordinates."""
+
+    def __init__(self, bus, prefix):
+        self.type = bus.type
+        self.name = bus.name
+        self.full = self.type == "AXI-Full"
+        self.prefix = prefix
+        self.valid, self.ready = HANDSHAKE[self.type]
+
+    def channel_fields(self, data):
+        return channel_fields(self.type, self.prefix, data)
+
+    def port(self, name, channel, signal, node):
+        return channel_port(self.type, f"{self.prefix}_{name}", channel, signal, node)
+
+    def port_ios(self, name, node, data):
+        return channel_ios(self.type, f"{self.prefix}_{name}", node, data, self.prefix)
+
+
+class AXICrossbar(AXIPorts):
+    """N managers and M subordinates of the same AXI type joined by a crossbar.
+
+    Every subordinate has a write and a read engine with a round-robin arbiter; an engine
+    serves one transaction at a time, so transfers between different manager/subordinate
+    pairs run concurrently. Unmapped addresses go to an internal error subordinate.
+    """
+
+    def __init__(self, crossbar, managers, subordinates):
+        prefix = "AXI_X_" if crossbar.type == "AXI-Full" else "AXIL_X_"
+        super().__init__(crossbar, prefix + crossbar.name)
+        self.channels = self.channel_fields(f"{self.prefix}_DATA_WIDTH")
+        self.managers = [bus.name for bus in managers]
+        self.subordinates = [bus.name for bus in subordinates]
+        self.ranges = [crossbar_range(bus) for bus in subordinates]
+        self.error_slot = len(subordinates)
+        self.check()
+
+    def check(self):
+        names = self.managers + self.subordinates
+        if not self.managers or not self.subordinates:
+            vs_print(ERROR, f"{self.type} Crossbar {self.name} needs at least one manager and one subordinate.")
+            exit(1)
+        if len(set(names)) != len(names) or "" in names:
+            vs_print(ERROR, f"{self.type} Crossbar {self.name}: every port needs a unique name.")
+            exit(1)
+        ranges = sorted(zip(self.ranges, self.subordinates))
+        for ((_, end), name), ((base, _), next_name) in zip(ranges, ranges[1:]):
+            if base < end:
+                vs_print(ERROR, f"{self.type} Crossbar {self.name}: {name} and {next_name} address ranges overlap.")
+                exit(1)
+
+    def slot(self, j, channel, signal):
+        return f"{self.prefix}_s{j}_{channel}{signal}"
+
+    def parameters(self):
+        x = self.prefix
+        code = f"""    // Generated Parameters for {self.type} Crossbar
+    parameter integer {x}_ID_W_WIDTH = 1,
+    parameter integer {x}_ADDR_WIDTH = 32,
+    parameter integer {x}_DATA_WIDTH = 32,
+"""
+        if self.full:
+            code += f"    parameter integer {x}_BRESP_WIDTH = 2,\n"
+        return code + f"    parameter integer {x}_ID_R_WIDTH = 1,\n"
+
+    def ios(self):
+        code = f"    // Generated IOs for {self.type} Crossbar\n"
+        for node, names in (("m", self.managers), ("s", self.subordinates)):
+            for name in names:
+                code += self.port_ios(name, node, f"{self.prefix}_DATA_WIDTH")
+        return code
+
+    def signals(self):
+        x = self.prefix
+        slots = self.error_slot + 1
+        code = f"""  // Generated signals for {self.type} Crossbar ({len(self.managers)} managers, {len(self.subordinates)} subordinates)
+  localparam integer {x}_MANAGERS = {len(self.managers)};
+  localparam integer {x}_MGR_WIDTH = {max(1, (len(self.managers) - 1).bit_length())};
+  localparam integer {x}_SLOT_WIDTH = {max(1, self.error_slot.bit_length())};
+"""
+        for i in range(len(self.managers)):
+            code += f"  logic [{x}_SLOT_WIDTH-1:0] {x}_m{i}_aw_sel, {x}_m{i}_ar_sel;\n"
+            code += f"  logic {x}_m{i}_w_busy, {x}_m{i}_r_busy;\n"
+        for j in range(slots):
+            for channel, (_, fields) in self.channels.items():
+                code += f"  logic {self.slot(j, channel, self.valid)}, {self.slot(j, channel, self.ready)};\n"
+                for field, width in fields:
+                    code += f"  logic {vector_range(width)}{self.slot(j, channel, field)};\n"
+            for d in ("w", "r"):
+                code += f"""  logic {x}_{d}{j}_busy, {x}_{d}{j}_busy_n;
+  logic [{x}_MGR_WIDTH-1:0] {x}_{d}{j}_owner, {x}_{d}{j}_owner_n;
+  logic [{x}_MGR_WIDTH-1:0] {x}_{d}{j}_last, {x}_{d}{j}_last_n;
+  logic [{x}_MGR_WIDTH-1:0] {x}_{d}{j}_grant;
+  logic [{x}_MANAGERS-1:0] {x}_{d}{j}_req;
+  logic {x}_{d}{j}_grant_valid;
+  logic {x}_{d}{j}_a_done, {x}_{d}{j}_a_done_n;
+"""
+            code += f"  logic {x}_w{j}_d_done, {x}_w{j}_d_done_n;\n"
+        code += f"""  logic [{x}_ID_W_WIDTH-1:0] {x}_err_bid, {x}_err_bid_n;
+  logic [{x}_ID_R_WIDTH-1:0] {x}_err_rid, {x}_err_rid_n;
+"""
+        if self.full:
+            code += f"  logic [7:0] {x}_err_rlen, {x}_err_rlen_n, {x}_err_rcnt, {x}_err_rcnt_n;\n"
+        return code
+
+    def decoder(self, i, channel, address):
+        x = self.prefix
+        sel = f"{x}_m{i}_{channel}_sel"
+        code = f"""  always_comb begin
+    {sel} = {x}_SLOT_WIDTH'({self.error_slot});
+"""
+        keyword = "if"
+        for j, (base, end) in enumerate(self.ranges):
+            # An address is never below 0: comparing against it only earns an UNSIGNED warning
+            match = f"{address} <= 'h{end - 1:x}"
+            if base:
+                match = f"({address} >= 'h{base:x}) && ({match})"
+            code += f"    {keyword} ({match}) {sel} = {x}_SLOT_WIDTH'({j});\n"
+            keyword = "else if"
+        return code + "  end\n"
+
+    def arbiter(self, d, j):
+        x = self.prefix
+        return f"""  always_comb begin
+    {x}_{d}{j}_grant_valid = 1'b0;
+    {x}_{d}{j}_grant = {x}_{d}{j}_last;
+    for (int k = 1; k <= {x}_MANAGERS; k++) begin
+      automatic int idx = (int'({x}_{d}{j}_last) + k) % {x}_MANAGERS;
+      if (~{x}_{d}{j}_grant_valid & {x}_{d}{j}_req[idx]) begin
+        {x}_{d}{j}_grant_valid = 1'b1;
+        {x}_{d}{j}_grant = {x}_MGR_WIDTH'(idx);
+      end
+    end
+  end
+"""
+
+    def engine(self, d, j):
+        # d = "w": address (aw), data (w) and response (b); d = "r": address (ar) and data (r)
+        x = self.prefix
+        a, rsp = ("aw", "b") if d == "w" else ("ar", "r")
+        a_fire = f"{self.slot(j, a, self.valid)} & {self.slot(j, a, self.ready)}"
+        rsp_fire = f"{self.slot(j, rsp, self.valid)} & {self.slot(j, rsp, self.ready)}"
+        if d == "r" and self.full:
+            rsp_fire += f" & {self.slot(j, 'r', 'LAST')}"
+        code = f"""  always_comb begin
+    {x}_{d}{j}_busy_n   = {x}_{d}{j}_busy;
+    {x}_{d}{j}_owner_n  = {x}_{d}{j}_owner;
+    {x}_{d}{j}_last_n   = {x}_{d}{j}_last;
+    {x}_{d}{j}_a_done_n = {x}_{d}{j}_a_done;
+"""
+        if d == "w":
+            code += f"    {x}_w{j}_d_done_n = {x}_w{j}_d_done;\n"
+        code += f"""    if (~{x}_{d}{j}_busy) begin
+      if ({x}_{d}{j}_grant_valid) begin
+        {x}_{d}{j}_busy_n   = 1'b1;
+        {x}_{d}{j}_owner_n  = {x}_{d}{j}_grant;
+        {x}_{d}{j}_last_n   = {x}_{d}{j}_grant;
+        {x}_{d}{j}_a_done_n = 1'b0;
+"""
+        if d == "w":
+            code += f"        {x}_w{j}_d_done_n = 1'b0;\n"
+        code += f"""      end
+    end else begin
+      if ({a_fire}) {x}_{d}{j}_a_done_n = 1'b1;
+"""
+        if d == "w":
+            w_fire = f"{self.slot(j, 'w', self.valid)} & {self.slot(j, 'w', self.ready)}"
+            if self.full:
+                w_fire += f" & {self.slot(j, 'w', 'LAST')}"
+            code += f"      if ({w_fire}) {x}_w{j}_d_done_n = 1'b1;\n"
+        code += f"""      if ({rsp_fire}) {x}_{d}{j}_busy_n = 1'b0;
+    end
+  end
+"""
+        return code
+
+    def slot_requests(self, d, j):
+        # Drive the slot's request channels from the owning manager
+        x = self.prefix
+        channels = ("aw", "w") if d == "w" else ("ar",)
+        rsp = "b" if d == "w" else "r"
+        done = {"aw": f"{x}_w{j}_a_done", "w": f"{x}_w{j}_d_done", "ar": f"{x}_r{j}_a_done"}
+        rsp_ready = f"{x}_w{j}_a_done & {x}_w{j}_d_done" if d == "w" else f"{x}_r{j}_a_done"
+        code = "  always_comb begin\n"
+        for channel in channels:
+            code += f"    {self.slot(j, channel, self.valid)} = 1'b0;\n"
+            for field, _ in self.channels[channel][1]:
+                code += f"    {self.slot(j, channel, field)} = '0;\n"
+        code += f"    {self.slot(j, rsp, self.ready)} = 1'b0;\n"
+        code += f"    case ({x}_{d}{j}_owner)\n"
+        for i, name in enumerate(self.managers):
+            code += f"      {x}_MGR_WIDTH'({i}): begin\n"
+            for channel in channels:
+                code += f"        {self.slot(j, channel, self.valid)} = {x}_{d}{j}_busy & ~{done[channel]} & {self.port(name, channel, self.valid, 'm')};\n"
+                for field, _ in self.channels[channel][1]:
+                    code += f"        {self.slot(j, channel, field)} = {self.port(name, channel, field, 'm')};\n"
+            code += f"        {self.slot(j, rsp, self.ready)} = {x}_{d}{j}_busy & {rsp_ready} & {self.port(name, rsp, self.ready, 'm')};\n"
+            code += "      end\n"
+        code += "      default: ;\n    endcase\n  end\n"
+        return code
+
+    def manager_responses(self, i, name, d):
+        # Ready of the request channels and the response channel of manager i
+        x = self.prefix
+        channels = ("aw", "w") if d == "w" else ("ar",)
+        rsp = "b" if d == "w" else "r"
+        done = {"aw": "a_done", "w": "d_done", "ar": "a_done"}
+        rsp_ready = f"{x}_w{{j}}_a_done & {x}_w{{j}}_d_done" if d == "w" else f"{x}_r{{j}}_a_done"
+        code = "  always_comb begin\n"
+        for channel in channels:
+            code += f"    {self.port(name, channel, self.ready, 'm')} = 1'b0;\n"
+        code += f"    {self.port(name, rsp, self.valid, 'm')} = 1'b0;\n"
+        for field, _ in self.channels[rsp][1]:
+            code += f"    {self.port(name, rsp, field, 'm')} = '0;\n"
+        for j in range(self.error_slot + 1):
+            code += f"    if ({x}_{d}{j}_busy & ({x}_{d}{j}_owner == {x}_MGR_WIDTH'({i}))) begin\n"
+            for channel in channels:
+                code += f"      {self.port(name, channel, self.ready, 'm')} = ~{x}_{d}{j}_{done[channel]} & {self.slot(j, channel, self.ready)};\n"
+            code += f"      {self.port(name, rsp, self.valid, 'm')} = {rsp_ready.format(j=j)} & {self.slot(j, rsp, self.valid)};\n"
+            for field, _ in self.channels[rsp][1]:
+                code += f"      {self.port(name, rsp, field, 'm')} = {self.slot(j, rsp, field)};\n"
+            code += "    end\n"
+        code += "  end\n"
+        return code
+
+    def error_subordinate(self):
+        x = self.prefix
+        e = self.error_slot
+        id_w, id_r = ("ID", "ID") if self.full else ("id", "id")
+        code = f"""  // Error subordinate: accepts every transaction to an unmapped address
+  assign {self.slot(e, 'aw', self.ready)} = 1'b1;
+  assign {self.slot(e, 'w', self.ready)} = 1'b1;
+  assign {self.slot(e, 'ar', self.ready)} = 1'b1;
+  assign {self.slot(e, 'b', self.valid)} = {x}_w{e}_busy & {x}_w{e}_a_done & {x}_w{e}_d_done;
+  assign {self.slot(e, 'b', id_w)} = {x}_err_bid;
+  assign {self.slot(e, 'r', self.valid)} = {x}_r{e}_busy & {x}_r{e}_a_done;
+  assign {self.slot(e, 'r', id_r)} = {x}_err_rid;
+  assign {x}_err_bid_n = {self.slot(e, 'aw', self.valid)} ? {self.slot(e, 'aw', id_w)} : {x}_err_bid;
+  assign {x}_err_rid_n = {self.slot(e, 'ar', self.valid)} ? {self.slot(e, 'ar', id_r)} : {x}_err_rid;
+"""
+        if self.full:
+            code += f"""  assign {self.slot(e, 'b', 'RESP')} = {x}_BRESP_WIDTH'(2'b11);
+  assign {self.slot(e, 'r', 'DATA')} = '0;
+  assign {self.slot(e, 'r', 'RESP')} = 2'b11;
+  assign {self.slot(e, 'r', 'LAST')} = {x}_err_rcnt == {x}_err_rlen;
+  assign {x}_err_rlen_n = {self.slot(e, 'ar', self.valid)} ? {self.slot(e, 'ar', 'LEN')} : {x}_err_rlen;
+  assign {x}_err_rcnt_n = {self.slot(e, 'ar', self.valid)} ? 8'h00 :
+                          ({self.slot(e, 'r', self.valid)} & {self.slot(e, 'r', self.ready)}) ? {x}_err_rcnt + 8'h01 : {x}_err_rcnt;
+"""
+        else:
+            code += f"  assign {self.slot(e, 'r', 'data')} = '0;\n"
+        return code + "\n"
+
+    def logic(self):
+        x = self.prefix
+        code = f"""  // Generated logic for {self.type} Crossbar
+  // Address decoders: one per manager and address channel
+"""
+        addr = "ADDR" if self.full else "addr"
+        for i, name in enumerate(self.managers):
+            code += self.decoder(i, "aw", self.port(name, "aw", addr, "m"))
+            code += self.decoder(i, "ar", self.port(name, "ar", addr, "m"))
+            for d in ("w", "r"):
+                busy = " |\n      ".join(
+                    f"({x}_{d}{j}_busy & ({x}_{d}{j}_owner == {x}_MGR_WIDTH'({i})))"
+                    for j in range(self.error_slot + 1)
+                )
+                code += f"  assign {x}_m{i}_{d}_busy = {busy};\n"
+        code += "\n"
+
+        for j in range(self.error_slot + 1):
+            target = self.subordinates[j] if j < self.error_slot else "error subordinate"
+            code += f"  // Slot {j}: {target}\n"
+            for d, a in (("w", "aw"), ("r", "ar")):
+                requests = ", ".join(
+                    f"{self.port(name, a, self.valid, 'm')} & ({x}_m{i}_{a}_sel == {x}_SLOT_WIDTH'({j})) & ~{x}_m{i}_{d}_busy"
+                    for i, name in reversed(list(enumerate(self.managers)))
+                )
+                code += f"  assign {x}_{d}{j}_req = {{{requests}}};\n"
+                code += self.arbiter(d, j)
+                code += self.engine(d, j)
+                code += self.slot_requests(d, j)
+            code += "\n"
+
+        for i, name in enumerate(self.managers):
+            code += f"  // Responses to manager {name}\n"
+            code += self.manager_responses(i, name, "w")
+            code += self.manager_responses(i, name, "r")
+        code += "\n"
+
+        for j, name in enumerate(self.subordinates):
+            code += f"  // Subordinate port {name}\n"
+            for channel, (kind, fields) in self.channels.items():
+                forward = [self.valid] + [field for field, _ in fields]
+                backward = [self.ready]
+                if kind == "rsp":
+                    forward, backward = backward, forward
+                for signal in forward:
+                    code += f"  assign {self.port(name, channel, signal, 's')} = {self.slot(j, channel, signal)};\n"
+                for signal in backward:
+                    code += f"  assign {self.slot(j, channel, signal)} = {self.port(name, channel, signal, 's')};\n"
+        code += "\n" + self.error_subordinate()
+
+        code += f'  `include "reg_{x}_registers.vs"  /*\n'
+        for j in range(self.error_slot + 1):
+            for d in ("w", "r"):
+                code += f"""    {x}_{d}{j}_busy   , 1             , 0, sync_reset, , _n
+    {x}_{d}{j}_owner  , {x}_MGR_WIDTH, 0, sync_reset, , _n
+    {x}_{d}{j}_last   , {x}_MGR_WIDTH, 0, sync_reset, , _n
+    {x}_{d}{j}_a_done , 1             , 0, sync_reset, , _n
+"""
+            code += f"    {x}_w{j}_d_done , 1             , 0, sync_reset, , _n\n"
+        code += f"""    {x}_err_bid    , {x}_ID_W_WIDTH, 0, sync_reset, , _n
+    {x}_err_rid    , {x}_ID_R_WIDTH, 0, sync_reset, , _n
+"""
+        if self.full:
+            code += f"""    {x}_err_rlen   , 8             , 0, sync_reset, , _n
+    {x}_err_rcnt   , 8             , 0, sync_reset, , _n
+"""
+        return code + "    */\n"
+
+
+class AXIWidthConverter(AXIPorts):
+    """AXI-Lite or AXI-Full upsizer (narrow manager, wide subordinate) or downsizer.
+
+    The s port connects the manager and the m port the subordinate. AXI-Full bursts are
+    re-sized: an upsizer packs INCR bursts of full narrow beats into wide beats (shorter
+    burst), a downsizer splits every wide beat into narrow beats (longer INCR burst).
+    Other bursts keep their size and length and only move between byte lanes.
+    Read IDs are serialised to 0 on the m port, so read data returns in order, and the
+    original ID is restored from the read info FIFO.
+    """
+
+    def __init__(self, bus):
+        self.up = bus.node == "Upsizer"
+        kind = "UP" if self.up else "DN"
+        prefix = "AXI_" if bus.type == "AXI-Full" else "AXIL_"
+        super().__init__(bus, f"{prefix}{kind}_{bus.name}" if bus.name else f"{prefix}{kind}")
+        self.outstanding = bus.int_option("outstanding", 4)
+        if self.outstanding < 1 or self.outstanding & (self.outstanding - 1):
+            vs_print(ERROR, f"{self.type} {bus.node} {bus.name}: outstanding must be a power of two.")
+            exit(1)
+        # The AXI-Lite upsizer forwards AW and W together and needs no write info FIFO
+        self.fifos = ("ri",) if self.up and not self.full else ("wi", "ri")
+        # Narrow beat counters: read beats of a burst (upsizer), narrow beats of a wide beat (downsizer)
+        self.counters = ("r",) if self.up else ("w", "r")
+
+    def s(self, channel, signal):
+        return self.port("s", channel, signal, "m")
+
+    def m(self, channel, signal):
+        return self.port("m", channel, signal, "s")
+
+    def parameters(self):
+        x = self.prefix
+        narrow, wide = (32, 128) if self.up else (128, 32)
+        code = f"""    // Generated Parameters for {self.type} {'Upsizer' if self.up else 'Downsizer'}
+    parameter integer {x}_ID_W_WIDTH = 1,
+    parameter integer {x}_ADDR_WIDTH = 32,
+    parameter integer {x}_S_DATA_WIDTH = {narrow},
+    parameter integer {x}_M_DATA_WIDTH = {wide},
+"""
+        if self.full:
+            code += f"    parameter integer {x}_BRESP_WIDTH = 2,\n"
+        return code + f"    parameter integer {x}_ID_R_WIDTH = 1,\n"
+
+    def ios(self):
+        x = self.prefix
+        return (
+            f"    // Generated IOs for {self.type} {'Upsizer' if self.up else 'Downsizer'}\n"
+            + self.port_ios("s", "m", f"{x}_S_DATA_WIDTH")
+            + self.port_ios("m", "s", f"{x}_M_DATA_WIDTH")
+        )
+
+    def info_fields(self, d):
+        """Fields of the write (wi) or read (ri) info FIFO: the narrow side of every burst."""
+        x = self.prefix
+        a = "aw" if d == "w" else "ar"
+        if not self.full:
+            fields = [(f"{x}_LANE_WIDTH", "lane", f"{self.s(a, 'addr')}[{x}_WSIZE-1:{x}_NSIZE]")] if self.up else []
+            id_width = f"{x}_ID_W_WIDTH" if d == "w" else f"{x}_ID_R_WIDTH"
+            return fields + [(id_width, "id", self.s(a, "id"))]
+        side = self.s if self.up else self.m
+        fields = [
+            (width.format(p=x), field, side(a, port))
+            for width, field, port in FULL_S_ADDRESS_FIELDS
+        ]
+        if self.up:
+            fields.append(("1", "packed", f"{x}_{a}_packed"))
+        else:
+            fields.append(("3", "shift", f"{x}_{a}_shift"))
+        if d == "r":
+            fields.append((f"{x}_ID_R_WIDTH", "id", self.s("ar", "ID")))
+        return fields
+
+    def signals(self):
+        x = self.prefix
+        narrow, wide = ("S", "M") if self.up else ("M", "S")
+        code = f"""  // Generated signals for {self.type} {'Upsizer' if self.up else 'Downsizer'}
+  localparam integer {x}_OUTSTANDING = {self.outstanding};
+  localparam integer {x}_PTR_WIDTH = $clog2({self.outstanding}) + 1;
+  localparam integer {x}_N_DATA_WIDTH = {x}_{narrow}_DATA_WIDTH;
+  localparam integer {x}_W_DATA_WIDTH = {x}_{wide}_DATA_WIDTH;
+  localparam integer {x}_RATIO = {x}_W_DATA_WIDTH / {x}_N_DATA_WIDTH;
+  localparam integer {x}_NSIZE = $clog2({x}_N_DATA_WIDTH/8);
+  localparam integer {x}_WSIZE = $clog2({x}_W_DATA_WIDTH/8);
+  localparam integer {x}_LANE_WIDTH = {x}_WSIZE - {x}_NSIZE;
+"""
+        if self.full:
+            code += get_next_addr_function(x)
+            for a in ("aw", "ar"):
+                if self.up:
+                    code += f"  logic [{x}_LANE_WIDTH-1:0] {x}_{a}_lane;\n  logic {x}_{a}_packed;\n"
+                else:
+                    code += f"  logic [2:0] {x}_{a}_shift;\n"
+            for d in ("w", "r"):
+                code += f"""  logic [{x}_ADDR_WIDTH-1:0] {x}_{d}_addr, {x}_{d}_addr_n, {x}_{d}_cur;
+  logic {x}_{d}_started, {x}_{d}_started_n;
+  logic [{x}_LANE_WIDTH-1:0] {x}_{d}_lane;
+  logic {x}_{d}_beat, {x}_{d}_wide, {x}_{d}_last;
+"""
+            for d in self.counters:
+                code += f"  logic [7:0] {x}_{d}_count, {x}_{d}_count_n;\n"
+            if self.up:
+                code += f"""  logic [{x}_W_DATA_WIDTH-1:0] {x}_w_acc, {x}_w_acc_n, {x}_w_data;
+  logic [{x}_W_DATA_WIDTH/8-1:0] {x}_w_strb, {x}_w_strb_acc, {x}_w_strb_acc_n;
+"""
+            else:
+                code += f"""  logic [{x}_W_DATA_WIDTH-1:0] {x}_r_acc, {x}_r_acc_n, {x}_r_data;
+  logic [1:0] {x}_r_resp, {x}_r_resp_acc, {x}_r_resp_acc_n;
+  logic [7:0] {x}_w_kmax, {x}_r_kmax;
+"""
+        elif self.up:
+            code += f"""  logic [{x}_LANE_WIDTH-1:0] {x}_w_lane;
+  logic {x}_aw_done, {x}_aw_done_n, {x}_w_done, {x}_w_done_n;
+  logic {x}_aw_fire, {x}_w_fire, {x}_wr_done;
+"""
+        else:
+            code += f"""  logic [{x}_LANE_WIDTH-1:0] {x}_aw_idx, {x}_aw_idx_n, {x}_w_idx, {x}_w_idx_n, {x}_b_idx, {x}_b_idx_n;
+  logic [{x}_LANE_WIDTH-1:0] {x}_ar_idx, {x}_ar_idx_n, {x}_r_idx, {x}_r_idx_n;
+  logic {x}_aw_done, {x}_aw_done_n, {x}_w_done, {x}_w_done_n;
+  logic {x}_aw_fire, {x}_w_fire, {x}_wr_go, {x}_wr_done;
+  logic [{x}_ADDR_WIDTH-1:0] {x}_aw_base, {x}_ar_base;
+  logic [{x}_W_DATA_WIDTH-1:0] {x}_r_acc, {x}_r_acc_n, {x}_r_data;
+"""
+        for fifo in self.fifos:
+            code += get_fifo_signals(x, fifo, self.info_fields(fifo[0]))
+        return code
+
+    def full_address(self, a):
+        """AW/AR conversion, info FIFO push and the pass-through fields."""
+        x = self.prefix
+        s, m = self.s, self.m
+        fifo = "wi" if a == "aw" else "ri"
+        code = ""
+        if self.up:
+            code += f"""  assign {x}_{a}_lane = {s(a, 'ADDR')}[{x}_WSIZE-1:{x}_NSIZE];
+  assign {x}_{a}_packed = ({s(a, 'BURST')} == 2'b01) & ({s(a, 'SIZE')} == 3'({x}_NSIZE)) & ({s(a, 'LEN')} != 8'h00);
+  assign {m(a, 'SIZE')} = {x}_{a}_packed ? 3'({x}_WSIZE) : {s(a, 'SIZE')};
+  assign {m(a, 'LEN')} = {x}_{a}_packed ? 8'((9'({x}_{a}_lane) + 9'({s(a, 'LEN')})) >> {x}_LANE_WIDTH) : {s(a, 'LEN')};
+  assign {m(a, 'BURST')} = {s(a, 'BURST')};
+"""
+        else:
+            code += f"""  assign {x}_{a}_shift = ({s(a, 'SIZE')} > 3'({x}_NSIZE)) ? {s(a, 'SIZE')} - 3'({x}_NSIZE) : 3'd0;
+  assign {m(a, 'SIZE')} = ({x}_{a}_shift != 3'd0) ? 3'({x}_NSIZE) : {s(a, 'SIZE')};
+  assign {m(a, 'LEN')} = 8'(((16'({s(a, 'LEN')}) + 16'd1) << {x}_{a}_shift) - 16'd1);
+  assign {m(a, 'BURST')} = ({x}_{a}_shift != 3'd0) ? 2'b01 : {s(a, 'BURST')};
+"""
+        new_id = s(a, "ID") if a == "aw" else "'0"
+        code += f"""  assign {m(a, self.valid)} = {s(a, self.valid)} & ~{x}_{fifo}_full;
+  assign {s(a, self.ready)} = {m(a, self.ready)} & ~{x}_{fifo}_full;
+  assign {x}_{fifo}_push = {s(a, self.valid)} & {s(a, self.ready)};
+  assign {m(a, 'ID')} = {new_id};
+"""
+        for field in ("ADDR", "LOCK", "CACHE", "PROT", "QOS"):
+            code += f"  assign {m(a, field)} = {s(a, field)};\n"
+        return code
+
+    def beat_tracking(self, d, last):
+        # Narrow beat address of the current burst, from the info FIFO head for its first beat
+        x = self.prefix
+        fifo = f"{d}i"
+        head = {field: fifo_head(x, fifo, field) for field in ("addr", "len", "size", "burst")}
+        return f"""  assign {x}_{d}_cur = {x}_{d}_started ? {x}_{d}_addr : {head['addr']};
+  assign {x}_{d}_lane = {x}_{d}_cur[{x}_WSIZE-1:{x}_NSIZE];
+  assign {x}_{d}_addr_n = {x}_{d}_beat ? {x}_next_addr({x}_{d}_cur, {head['len']}, {head['size']}, {head['burst']}) : {x}_{d}_addr;
+  assign {x}_{d}_started_n = {x}_{d}_beat ? ~{last} : {x}_{d}_started;
+  assign {x}_{fifo}_pop = {x}_{d}_beat & {last};
+"""
+
+    def full_logic(self):
+        x = self.prefix
+        s, m = self.s, self.m
+        v, r = self.valid, self.ready
+        code = self.full_address("aw") + "\n"
+        if self.up:
+            # W: narrow beats are packed into the wide beat until its last lane or wLAST
+            packed = fifo_head(x, "wi", "packed")
+            code += f"""  // W: narrow beats are packed into one wide beat until its last lane or wLAST
+  assign {x}_w_last = {s('w', 'LAST')};
+  assign {x}_w_wide = ~{packed} | ({x}_w_lane == '1) | {x}_w_last;
+  assign {m('w', v)} = {s('w', v)} & ~{x}_wi_empty & {x}_w_wide;
+  assign {s('w', r)} = ~{x}_wi_empty & (~{x}_w_wide | {m('w', r)});
+  assign {x}_w_beat = {s('w', v)} & {s('w', r)};
+  always_comb begin
+    {x}_w_data = {x}_w_acc;
+    {x}_w_strb = {x}_w_strb_acc;
+    {x}_w_data[{x}_w_lane*{x}_N_DATA_WIDTH +: {x}_N_DATA_WIDTH] = {s('w', 'DATA')};
+    {x}_w_strb[{x}_w_lane*({x}_N_DATA_WIDTH/8) +: {x}_N_DATA_WIDTH/8] = {s('w', 'STRB')};
+  end
+  assign {m('w', 'DATA')} = {x}_w_data;
+  assign {m('w', 'STRB')} = {x}_w_strb;
+  assign {m('w', 'LAST')} = {x}_w_last;
+  assign {x}_w_acc_n = ({x}_w_beat & ~{x}_w_wide) ? {x}_w_data : ({x}_w_beat ? '0 : {x}_w_acc);
+  assign {x}_w_strb_acc_n = ({x}_w_beat & ~{x}_w_wide) ? {x}_w_strb : ({x}_w_beat ? '0 : {x}_w_strb_acc);
+"""
+        else:
+            shift = fifo_head(x, "wi", "shift")
+            code += f"""  // W: every wide beat is sent as 2**shift narrow beats
+  assign {x}_w_kmax = 8'((9'd1 << {shift}) - 9'd1);
+  assign {x}_w_wide = {x}_w_count == {x}_w_kmax;
+  assign {x}_w_last = {s('w', 'LAST')} & {x}_w_wide;
+  assign {m('w', v)} = {s('w', v)} & ~{x}_wi_empty;
+  assign {s('w', r)} = ~{x}_wi_empty & {m('w', r)} & {x}_w_wide;
+  assign {x}_w_beat = {m('w', v)} & {m('w', r)};
+  assign {m('w', 'DATA')} = {s('w', 'DATA')}[{x}_w_lane*{x}_N_DATA_WIDTH +: {x}_N_DATA_WIDTH];
+  assign {m('w', 'STRB')} = {s('w', 'STRB')}[{x}_w_lane*({x}_N_DATA_WIDTH/8) +: {x}_N_DATA_WIDTH/8];
+  assign {m('w', 'LAST')} = {x}_w_last;
+  assign {x}_w_count_n = {x}_w_beat ? ({x}_w_wide ? 8'h00 : {x}_w_count + 8'h01) : {x}_w_count;
+"""
+        code += self.beat_tracking("w", f"{x}_w_last")
+        code += f"""
+  // B: one response per burst
+  assign {s('b', v)} = {m('b', v)};
+  assign {m('b', r)} = {s('b', r)};
+  assign {s('b', 'ID')} = {m('b', 'ID')};
+  assign {s('b', 'RESP')} = {m('b', 'RESP')};
+
+{self.full_address("ar")}
+"""
+        if self.up:
+            packed = fifo_head(x, "ri", "packed")
+            code += f"""  // R: every wide beat is returned as narrow beats until its last lane or the last narrow beat
+  assign {x}_r_last = {x}_r_count == {fifo_head(x, 'ri', 'len')};
+  assign {x}_r_wide = ~{packed} | ({x}_r_lane == '1) | {x}_r_last;
+  assign {s('r', v)} = {m('r', v)} & ~{x}_ri_empty;
+  assign {m('r', r)} = ~{x}_ri_empty & {s('r', r)} & {x}_r_wide;
+  assign {x}_r_beat = {s('r', v)} & {s('r', r)};
+  assign {s('r', 'DATA')} = {m('r', 'DATA')}[{x}_r_lane*{x}_N_DATA_WIDTH +: {x}_N_DATA_WIDTH];
+  assign {s('r', 'RESP')} = {m('r', 'RESP')};
+  assign {s('r', 'LAST')} = {x}_r_last;
+  assign {x}_r_count_n = {x}_r_beat ? ({x}_r_last ? 8'h00 : {x}_r_count + 8'h01) : {x}_r_count;
+"""
+        else:
+            shift = fifo_head(x, "ri", "shift")
+            code += f"""  // R: 2**shift narrow beats are packed into every wide beat
+  assign {x}_r_kmax = 8'((9'd1 << {shift}) - 9'd1);
+  assign {x}_r_last = {m('r', 'LAST')};
+  assign {x}_r_wide = ({x}_r_count == {x}_r_kmax) | {x}_r_last;
+  assign {s('r', v)} = {m('r', v)} & ~{x}_ri_empty & {x}_r_wide;
+  assign {m('r', r)} = ~{x}_ri_empty & (~{x}_r_wide | {s('r', r)});
+  assign {x}_r_beat = {m('r', v)} & {m('r', r)};
+  always_comb begin
+    {x}_r_data = {x}_r_acc;
+    {x}_r_data[{x}_r_lane*{x}_N_DATA_WIDTH +: {x}_N_DATA_WIDTH] = {m('r', 'DATA')};
+  end
+  assign {x}_r_resp = {x}_r_resp_acc | {m('r', 'RESP')};
+  assign {s('r', 'DATA')} = {x}_r_data;
+  assign {s('r', 'RESP')} = {x}_r_resp;
+  assign {s('r', 'LAST')} = {x}_r_last;
+  assign {x}_r_acc_n = ({x}_r_beat & ~{x}_r_wide) ? {x}_r_data : ({x}_r_beat ? '0 : {x}_r_acc);
+  assign {x}_r_resp_acc_n = ({x}_r_beat & ~{x}_r_wide) ? {x}_r_resp : ({x}_r_beat ? '0 : {x}_r_resp_acc);
+  assign {x}_r_count_n = {x}_r_beat ? ({x}_r_wide ? 8'h00 : {x}_r_count + 8'h01) : {x}_r_count;
+"""
+        code += f"  assign {s('r', 'ID')} = {fifo_head(x, 'ri', 'id')};\n"
+        code += self.beat_tracking("r", f"{x}_r_last")
+        return code
+
+    def lite_logic(self):
+        x = self.prefix
+        s, m = self.s, self.m
+        if self.up:
+            return f"""  // AW and W are forwarded together, so the write strobes can be placed on the address lane
+  assign {x}_w_lane = {s('aw', 'addr')}[{x}_WSIZE-1:{x}_NSIZE];
+  assign {m('aw', 'valid')} = {s('aw', 'valid')} & {s('w', 'valid')} & ~{x}_aw_done;
+  assign {m('aw', 'id')} = {s('aw', 'id')};
+  assign {m('aw', 'addr')} = {s('aw', 'addr')};
+  assign {m('w', 'valid')} = {s('aw', 'valid')} & {s('w', 'valid')} & ~{x}_w_done;
+  assign {m('w', 'data')} = {{{x}_RATIO{{{s('w', 'data')}}}}};
+  assign {m('w', 'strb')} = ({x}_M_DATA_WIDTH/8)'({s('w', 'strb')}) << ({x}_w_lane*({x}_S_DATA_WIDTH/8));
+  assign {x}_aw_fire = {m('aw', 'valid')} & {m('aw', 'ready')};
+  assign {x}_w_fire = {m('w', 'valid')} & {m('w', 'ready')};
+  assign {x}_wr_done = ({x}_aw_done | {x}_aw_fire) & ({x}_w_done | {x}_w_fire);
+  assign {s('aw', 'ready')} = {x}_wr_done;
+  assign {s('w', 'ready')} = {x}_wr_done;
+  assign {x}_aw_done_n = ~{x}_wr_done & ({x}_aw_done | {x}_aw_fire);
+  assign {x}_w_done_n = ~{x}_wr_done & ({x}_w_done | {x}_w_fire);
+
+  assign {s('b', 'valid')} = {m('b', 'valid')};
+  assign {m('b', 'ready')} = {s('b', 'ready')};
+  assign {s('b', 'id')} = {m('b', 'id')};
+
+  // AR: the lane and ID of every read are queued to select and tag the read data
+  assign {m('ar', 'valid')} = {s('ar', 'valid')} & ~{x}_ri_full;
+  assign {s('ar', 'ready')} = {m('ar', 'ready')} & ~{x}_ri_full;
+  assign {m('ar', 'id')} = '0;
+  assign {m('ar', 'addr')} = {s('ar', 'addr')};
+  assign {x}_ri_push = {s('ar', 'valid')} & {s('ar', 'ready')};
+  assign {s('r', 'valid')} = {m('r', 'valid')};
+  assign {m('r', 'ready')} = {s('r', 'ready')};
+  assign {s('r', 'data')} = {m('r', 'data')}[{fifo_head(x, 'ri', 'lane')}*{x}_S_DATA_WIDTH +: {x}_S_DATA_WIDTH];
+  assign {s('r', 'id')} = {fifo_head(x, 'ri', 'id')};
+  assign {x}_ri_pop = {s('r', 'valid')} & {s('r', 'ready')};
+"""
+        return f"""  // Every wide write is sent as {x}_RATIO narrow writes (one per lane), answered by one B
+  assign {x}_wr_go = {s('aw', 'valid')} & {s('w', 'valid')} & ~{x}_wi_full;
+  assign {x}_aw_base = ({s('aw', 'addr')} >> {x}_WSIZE) << {x}_WSIZE;
+  assign {m('aw', 'valid')} = {x}_wr_go & ~{x}_aw_done;
+  assign {m('aw', 'id')} = '0;
+  assign {m('aw', 'addr')} = {x}_aw_base + ({x}_ADDR_WIDTH'({x}_aw_idx) << {x}_NSIZE);
+  assign {m('w', 'valid')} = {x}_wr_go & ~{x}_w_done;
+  assign {m('w', 'data')} = {s('w', 'data')}[{x}_w_idx*{x}_M_DATA_WIDTH +: {x}_M_DATA_WIDTH];
+  assign {m('w', 'strb')} = {s('w', 'strb')}[{x}_w_idx*({x}_M_DATA_WIDTH/8) +: {x}_M_DATA_WIDTH/8];
+  assign {x}_aw_fire = {m('aw', 'valid')} & {m('aw', 'ready')};
+  assign {x}_w_fire = {m('w', 'valid')} & {m('w', 'ready')};
+  assign {x}_aw_idx_n = {x}_aw_idx + {x}_LANE_WIDTH'({x}_aw_fire);
+  assign {x}_w_idx_n = {x}_w_idx + {x}_LANE_WIDTH'({x}_w_fire);
+  assign {x}_wr_done = ({x}_aw_done | ({x}_aw_fire & ({x}_aw_idx == '1))) & ({x}_w_done | ({x}_w_fire & ({x}_w_idx == '1)));
+  assign {x}_aw_done_n = ~{x}_wr_done & ({x}_aw_done | ({x}_aw_fire & ({x}_aw_idx == '1)));
+  assign {x}_w_done_n = ~{x}_wr_done & ({x}_w_done | ({x}_w_fire & ({x}_w_idx == '1)));
+  assign {s('aw', 'ready')} = {x}_wr_done;
+  assign {s('w', 'ready')} = {x}_wr_done;
+  assign {x}_wi_push = {x}_wr_done;
+
+  assign {s('b', 'valid')} = {m('b', 'valid')} & ({x}_b_idx == '1);
+  assign {m('b', 'ready')} = ({x}_b_idx != '1) | {s('b', 'ready')};
+  assign {s('b', 'id')} = {fifo_head(x, 'wi', 'id')};
+  assign {x}_b_idx_n = {x}_b_idx + {x}_LANE_WIDTH'({m('b', 'valid')} & {m('b', 'ready')});
+  assign {x}_wi_pop = {s('b', 'valid')} & {s('b', 'ready')};
+
+  // Every wide read is sent as {x}_RATIO narrow reads whose data is packed into one R
+  assign {x}_ar_base = ({s('ar', 'addr')} >> {x}_WSIZE) << {x}_WSIZE;
+  assign {m('ar', 'valid')} = {s('ar', 'valid')} & ~{x}_ri_full;
+  assign {m('ar', 'id')} = '0;
+  assign {m('ar', 'addr')} = {x}_ar_base + ({x}_ADDR_WIDTH'({x}_ar_idx) << {x}_NSIZE);
+  assign {s('ar', 'ready')} = {m('ar', 'ready')} & ~{x}_ri_full & ({x}_ar_idx == '1);
+  assign {x}_ar_idx_n = {x}_ar_idx + {x}_LANE_WIDTH'({m('ar', 'valid')} & {m('ar', 'ready')});
+  assign {x}_ri_push = {s('ar', 'valid')} & {s('ar', 'ready')};
+  always_comb begin
+    {x}_r_data = {x}_r_acc;
+    {x}_r_data[{x}_r_idx*{x}_M_DATA_WIDTH +: {x}_M_DATA_WIDTH] = {m('r', 'data')};
+  end
+  assign {s('r', 'valid')} = {m('r', 'valid')} & ({x}_r_idx == '1);
+  assign {m('r', 'ready')} = ({x}_r_idx != '1) | {s('r', 'ready')};
+  assign {s('r', 'data')} = {x}_r_data;
+  assign {s('r', 'id')} = {fifo_head(x, 'ri', 'id')};
+  assign {x}_r_idx_n = {x}_r_idx + {x}_LANE_WIDTH'({m('r', 'valid')} & {m('r', 'ready')});
+  assign {x}_r_acc_n = ({m('r', 'valid')} & {m('r', 'ready')}) ? {x}_r_data : {x}_r_acc;
+  assign {x}_ri_pop = {s('r', 'valid')} & {s('r', 'ready')};
+"""
+
+    def logic(self):
+        x = self.prefix
+        code = f"  // Generated logic for {self.type} {'Upsizer' if self.up else 'Downsizer'}\n"
+        for fifo in self.fifos:
+            code += get_fifo_logic(x, fifo, self.info_fields(fifo[0]))
+        code += self.full_logic() if self.full else self.lite_logic()
+        registers = [(f"{x}_{fifo}_{ptr}", f"{x}_PTR_WIDTH") for fifo in self.fifos for ptr in ("wptr", "rptr")]
+        if self.full:
+            for d in ("w", "r"):
+                registers += [(f"{x}_{d}_addr", f"{x}_ADDR_WIDTH"), (f"{x}_{d}_started", "1")]
+            registers += [(f"{x}_{d}_count", "8") for d in self.counters]
+            if self.up:
+                registers += [(f"{x}_w_acc", f"{x}_W_DATA_WIDTH"), (f"{x}_w_strb_acc", f"{x}_W_DATA_WIDTH/8")]
+            else:
+                registers += [(f"{x}_r_acc", f"{x}_W_DATA_WIDTH"), (f"{x}_r_resp_acc", "2")]
+        else:
+            registers += [(f"{x}_aw_done", "1"), (f"{x}_w_done", "1")]
+            if not self.up:
+                registers += [(f"{x}_{c}_idx", f"{x}_LANE_WIDTH") for c in ("aw", "w", "b", "ar", "r")]
+                registers.append((f"{x}_r_acc", f"{x}_W_DATA_WIDTH"))
+        code += f'\n  `include "reg_{x}_registers.vs"  /*\n'
+        for name, width in registers:
+            code += f"    {name}, {width}, 0, sync_reset, , _n\n"
+        return code + "    */\n"
+
+
+class AXIClockBridge(AXIPorts):
+    """AXI-Lite or AXI-Full clock-domain crossing bridge with one asynchronous FIFO per channel.
+
+    The s port (manager side) runs on {prefix}_s_clk_i and the m port (subordinate side) on
+    {prefix}_m_clk_i. Pointers cross the domains in Gray code through `stages` flops, so a
+    channel moves one beat per cycle once the FIFO holds more than the round-trip latency.
+    """
+
+    def __init__(self, bus):
+        prefix = "AXI_CDC_" if bus.type == "AXI-Full" else "AXIL_CDC_"
+        super().__init__(bus, prefix + bus.name if bus.name else prefix.rstrip("_"))
+        self.depth = bus.int_option("depth", 8)
+        self.stages = bus.int_option("stages", 2)
+        if self.depth < 4 or self.depth & (self.depth - 1) or self.stages < 2:
+            vs_print(ERROR, f"{self.type} CDC {bus.name}: depth must be a power of two >= 4 and stages >= 2.")
+            exit(1)
+        self.channels = self.channel_fields(f"{self.prefix}_DATA_WIDTH")
+
+    def domains(self, channel):
+        """(write side, read side) of a channel FIFO."""
+        return ("s", "m") if self.channels[channel][0] == "req" else ("m", "s")
+
+    def parameters(self):
+        x = self.prefix
+        code = f"""    // Generated Parameters for {self.type} CDC bridge
+    parameter integer {x}_ID_W_WIDTH = 1,
+    parameter integer {x}_ADDR_WIDTH = 32,
+    parameter integer {x}_DATA_WIDTH = 32,
+"""
+        if self.full:
+            code += f"    parameter integer {x}_BRESP_WIDTH = 2,\n"
+        return code + f"    parameter integer {x}_ID_R_WIDTH = 1,\n"
+
+    def ios(self):
+        x = self.prefix
+        return f"""    // Generated IOs for {self.type} CDC bridge
+    input  logic {x}_s_clk_i,
+    input  logic {x}_s_rst_i,
+    input  logic {x}_m_clk_i,
+    input  logic {x}_m_rst_i,
+""" + self.port_ios("s", "m", f"{x}_DATA_WIDTH") + self.port_ios("m", "s", f"{x}_DATA_WIDTH")
+
+    def signals(self):
+        x = self.prefix
+        code = f"""  // Generated signals for {self.type} CDC bridge
+  localparam integer {x}_DEPTH = {self.depth};
+  localparam integer {x}_PTR_WIDTH = $clog2({self.depth}) + 1;
+"""
+        for channel, (_, fields) in self.channels.items():
+            f = f"{x}_{channel}"
+            width = " + ".join(f"({w})" for _, w in fields)
+            code += f"""  localparam integer {f}_WIDTH = {width};
+  logic [{f}_WIDTH-1:0] {f}_mem [{x}_DEPTH];
+  logic [{x}_PTR_WIDTH-1:0] {f}_wbin, {f}_wbin_n, {f}_wgray, {f}_wgray_n;
+  logic [{x}_PTR_WIDTH-1:0] {f}_rbin, {f}_rbin_n, {f}_rgray, {f}_rgray_n;
+  logic {f}_full, {f}_empty, {f}_push, {f}_pop;
+"""
+            for stage in range(self.stages):
+                code += f"  logic [{x}_PTR_WIDTH-1:0] {f}_wgray_sync{stage}, {f}_rgray_sync{stage};\n"
+        return code
+
+    def logic(self):
+        x = self.prefix
+        last = self.stages - 1
+        code = f"  // Generated logic for {self.type} CDC bridge\n"
+        registers = []
+        for channel, (_, fields) in self.channels.items():
+            f = f"{x}_{channel}"
+            wr, rd = self.domains(channel)
+            w_node, r_node = ("m", "s") if wr == "s" else ("s", "m")
+            src = lambda signal: self.port(wr, channel, signal, w_node)
+            dst = lambda signal: self.port(rd, channel, signal, r_node)
+            payload_in = "{" + ", ".join(src(field) for field, _ in fields) + "}"
+            payload_out = "{" + ", ".join(dst(field) for field, _ in fields) + "}"
+            code += f"""  // {channel.upper()} channel: written in the {wr} domain, read in the {rd} domain
+  assign {src(self.ready)} = ~{f}_full;
+  assign {f}_push = {src(self.valid)} & ~{f}_full;
+  assign {f}_wbin_n = {f}_wbin + {x}_PTR_WIDTH'({f}_push);
+  assign {f}_wgray_n = {f}_wbin_n ^ ({f}_wbin_n >> 1);
+  assign {f}_full = {f}_wgray == {{~{f}_rgray_sync{last}[{x}_PTR_WIDTH-1:{x}_PTR_WIDTH-2], {f}_rgray_sync{last}[{x}_PTR_WIDTH-3:0]}};
+  always_ff @(posedge {x}_{wr}_clk_i) begin
+    if ({f}_push) {f}_mem[{f}_wbin[{x}_PTR_WIDTH-2:0]] <= {payload_in};
+  end
+  assign {dst(self.valid)} = ~{f}_empty;
+  assign {f}_pop = {dst(self.valid)} & {dst(self.ready)};
+  assign {f}_rbin_n = {f}_rbin + {x}_PTR_WIDTH'({f}_pop);
+  assign {f}_rgray_n = {f}_rbin_n ^ ({f}_rbin_n >> 1);
+  assign {f}_empty = {f}_rgray == {f}_wgray_sync{last};
+  assign {payload_out} = {f}_mem[{f}_rbin[{x}_PTR_WIDTH-2:0]];
+
+"""
+            for name, domain in ((f"{f}_wbin", wr), (f"{f}_wgray", wr), (f"{f}_rbin", rd), (f"{f}_rgray", rd)):
+                registers.append((name, f"{name}_n", domain))
+            for stage in range(self.stages):
+                previous = (f"{f}_wgray", f"{f}_rgray") if stage == 0 else (
+                    f"{f}_wgray_sync{stage - 1}", f"{f}_rgray_sync{stage - 1}")
+                registers.append((f"{f}_wgray_sync{stage}", previous[0], rd))
+                registers.append((f"{f}_rgray_sync{stage}", previous[1], wr))
+        code += f'  `include "reg_{x}_registers.vs"  /*\n'
+        for name, next_value, domain in registers:
+            code += f"    {name}, {x}_PTR_WIDTH, 0, {x}_{domain}_rst_i, , {next_value}, {x}_{domain}_clk_i\n"
+        return code + "    */\n"
+
+
+def mmio_address_range(path):
+    """Address range covered by the first MMIO include block of a Verilog file.
+
+    The range ends after the last byte of the highest register: registers are data_width bits wide,
+    taken from a numeric data_width header of the block or DATA_WIDTH's default of 32 otherwise.
+    """
+    from MMIO import parse_verilog_address, split_header
+
+    try:
+        with open(path) as file:
+            source = file.read()
+    except OSError as error:
+        vs_print(ERROR, f"Cannot read MMIO map {path}: {error.strerror}.")
+        exit(1)
+    match = re.search(r'`include\s+"MMIO_[^"]*"\s*/\*(.*?)\*/', source, re.S)
+    if not match:
+        vs_print(ERROR, f"No MMIO include block found in {path}.")
+        exit(1)
+    options, records = split_header(tokenize(match.group(1)))
+    addresses = [parse_verilog_address(record.get(6, "address")) for record in records]
+    data_width = options.get("data_width", "")
+    data_bytes = int(data_width) // 8 if data_width.isdigit() else 4
+    return min(addresses), max(addresses) + data_bytes
+
+
+def crossbar_range(bus):
+    """[base, end) of a crossbar subordinate from base=/size= or mmio=<file> (plus base offset)."""
+    base = int(bus.option("base", "0"), 0)
+    if bus.option("mmio"):
+        low, high = mmio_address_range(bus.option("mmio"))
+        return base + low, base + high
+    if bus.option("size") is None:
+        vs_print(ERROR, f"Crossbar subordinate {bus.name} needs size= or mmio=.")
+        exit(1)
+    return base, base + int(bus.option("size"), 0)
 
 
 def parse_arguments():
@@ -629,9 +2684,10 @@ def parse_arguments():
         vs_print(INFO, "Example: python AXI.py lite_s")
         exit(1)
     
-    vs_name_suffix = sys.argv[1]
-    for token in ("ios", "logic", "signals"):
-        vs_name_suffix = vs_name_suffix.replace(token, "")
+    # AXI_[parameters,ios,signals,logic][_{interface_name}].vs: every include names the same interface
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    match = re.fullmatch(r"(?:(?:parameters|ios|signals|logic)(?:_|$))?(.*)", vs_name_suffix)
+    vs_name_suffix = match.group(1)
     config_line = sys.argv[2].strip()
     configurations = config_line.replace(",", "").replace("//", "").replace("/*", "").replace("*/", "").strip()
     interface = AXIInterface(vs_name_suffix, configurations)
@@ -640,5 +2696,9 @@ def parse_arguments():
 
 # Check if this script is called directly
 if __name__ == "__main__":
-    axi_if = parse_arguments()
-    axi_if.generate()
+    track_dependencies()
+    with phase("parse"):
+        axi_if = parse_arguments()
+    with phase("generate"):
+        axi_if.generate()
+    write_dependencies()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+
+# CDC.py script creates a clock-domain crossing.
+# To call this script in a Verilog file it should follow the following pattern:
+#   `include "CDC_{name}.vs" // Type, Width, src_clock=clk_a, dst_clock=clk_b
+# where Type can be:
+#   pulse      toggle synchronizer: every {name}_src_pulse becomes one {name}_dst_pulse.
+#              Pulses must be at least stages+1 destination cycles apart.
+#   mux        MUX recirculation: {name}_src_valid registers {name}_src_data and toggles an
+#              enable that is synchronized; the destination loads {name}_dst_data from the
+#              held source register and pulses {name}_dst_valid for the cycle in which
+#              {name}_dst_data holds the new word. No acknowledge: transfers must be at least
+#              stages+2 destination cycles apart.
+#   handshake  two-phase req/ack: {name}_src_valid & {name}_src_ready start a transfer, and
+#              {name}_src_ready returns once the destination has acknowledged it. Safe at any
+#              rate, at the cost of a round trip through both synchronizers. {name}_dst_valid
+#              and {name}_dst_data behave as for mux.
+# Width (data bits of mux and handshake crossings) defaults to 1.
+# Signals are written to CDC_{name}_signals.vs (include with VS_NO_GENERATE).
+#
+# Optional keyword fields:
+#   src_clock=C    source clock (default clk_i)
+#   dst_clock=C    destination clock (default clk_i)
+#   src_rst=R      source reset, in reg.py format (default rst_i)
+#   dst_rst=R      destination reset, in reg.py format (default rst_i)
+#   stages=N       synchronizer flip-flops (default 2)
+#   max_delay=T    datapath delay allowed across the crossing, in ns (default: the period of the
+#                  destination clock)
+# Timing constraints are written to CDC_{name}.xdc: ASYNC_REG on the synchronizers and
+# set_max_delay -datapath_only on every path that crosses, so the crossing is not timed as a
+# synchronous path and its skew stays bounded.
+#
+# Dependencies: reg.py
+
+import sys
+
+from VeriSnip.vs_colours import *
+from vs_arguments import comment_text, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
+
+CDC_TYPES = ("pulse", "mux", "handshake")
+CDC_FIELDS = ("type", "width", "src_clock", "dst_clock", "src_rst", "dst_rst", "stages", "max_delay")
+
+
+class Crossing:
+    def __init__(self, cdc_properties, name):
+        self.name = name
+        self.type = cdc_properties.get(0, "type").lower()
+        self.width = cdc_properties.get(1, "width") or "1"
+        self.src_clock = cdc_properties.get(None, "src_clock", "clk_i")
+        self.dst_clock = cdc_properties.get(None, "dst_clock", "clk_i")
+        self.src_rst = cdc_properties.get(None, "src_rst", "rst_i")
+        self.dst_rst = cdc_properties.get(None, "dst_rst", "rst_i")
+        self.stages = cdc_properties.get(None, "stages", "2")
+        self.max_delay = cdc_properties.get(None, "max_delay")
+        self.validate()
+        self.stages = int(self.stages)
+
+    def validate(self):
+        if self.type not in CDC_TYPES:
+            vs_print(ERROR, f"Invalid crossing type for {self.name}: {self.type or 'none'}. Use {', '.join(CDC_TYPES)}.")
+            exit(1)
+        if not self.stages.isdigit() or int(self.stages) < 2:
+            vs_print(ERROR, f"Crossing {self.name}: stages must be a number of at least 2, got {self.stages}.")
+            exit(1)
+        if self.max_delay:
+            try:
+                float(self.max_delay)
+            except ValueError:
+                vs_print(ERROR, f"Crossing {self.name}: max_delay must be a number of ns, got {self.max_delay}.")
+                exit(1)
+        if self.src_clock == self.dst_clock:
+            vs_print(WARNING, f"Crossing {self.name} has the same source and destination clock {self.src_clock}.")
+
+    @property
+    def carries_data(self):
+        return self.type != "pulse"
+
+    def chain(self, signal):
+        return [f"{signal}{stage}" for stage in range(1, self.stages + 1)]
+
+    def generate_verilog(self):
+        write_vs(cdc_signals(self), f"CDC_{self.name}_signals.vs")
+        write_vs(cdc_logic(self), f"CDC_{self.name}.vs")
+        write_vs(cdc_constraints(self), f"CDC_{self.name}.xdc")
+
+
+def cdc_signals(cdc):
+    n = cdc.name
+    yield f"  // Automatically generated signals for {n} {cdc.type} crossing\n"
+    if cdc.type == "pulse":
+        yield f"  logic {n}_src_pulse, {n}_dst_pulse;\n"
+    else:
+        yield f"""  logic {n}_src_valid, {n}_src_load, {n}_dst_load, {n}_dst_valid;
+  logic [{cdc.width}-1:0] {n}_src_data, {n}_src_data_q, {n}_dst_data;
+"""
+    yield f"""  logic {n}_src_toggle, {n}_src_toggle_n;
+  (* ASYNC_REG = "TRUE" *) logic {", ".join(cdc.chain(f"{n}_sync"))};
+  logic {n}_sync_q;
+"""
+    if cdc.type == "handshake":
+        yield f"""  logic {n}_src_ready;
+  (* ASYNC_REG = "TRUE" *) logic {", ".join(cdc.chain(f"{n}_ack_sync"))};
+"""
+
+
+def registers(cdc):
+    """reg.py records of both domains."""
+    n = cdc.name
+    src, dst = f"{cdc.src_rst}, ", f"{cdc.dst_rst}, "
+    load = f"{n}_src_pulse" if cdc.type == "pulse" else f"{n}_src_load"
+    yield f"{n}_src_toggle, 1, 0, {src}{load}, _n, {cdc.src_clock}"
+    if cdc.carries_data:
+        yield f"{n}_src_data_q, {cdc.width}, 0, None, {n}_src_load, {n}_src_data, {cdc.src_clock}"
+    if cdc.type == "handshake":
+        source = f"{n}_sync_q"
+        for stage in cdc.chain(f"{n}_ack_sync"):
+            yield f"{stage}, 1, 0, {src}, {source}, {cdc.src_clock}"
+            source = stage
+    source = f"{n}_src_toggle"
+    for stage in cdc.chain(f"{n}_sync"):
+        yield f"{stage}, 1, 0, {dst}, {source}, {cdc.dst_clock}"
+        source = stage
+    yield f"{n}_sync_q, 1, 0, {dst}, {source}, {cdc.dst_clock}"
+    if cdc.carries_data:
+        # dst_valid is registered with the data it qualifies
+        yield f"{n}_dst_data, {cdc.width}, 0, None, {n}_dst_load, {n}_src_data_q, {cdc.dst_clock}"
+        yield f"{n}_dst_valid, 1, 0, {dst}, {n}_dst_load, {cdc.dst_clock}"
+
+
+def cdc_logic(cdc):
+    n = cdc.name
+    last = cdc.chain(f"{n}_sync")[-1]
+    yield f"  // Automatically generated logic for {n} {cdc.type} crossing ({cdc.src_clock} -> {cdc.dst_clock})\n"
+    yield f"  assign {n}_src_toggle_n = ~{n}_src_toggle;\n"
+    if cdc.type == "mux":
+        yield f"  assign {n}_src_load = {n}_src_valid;\n"
+    elif cdc.type == "handshake":
+        ack = cdc.chain(f"{n}_ack_sync")[-1]
+        # The destination acknowledges by echoing the request toggle once it has loaded the data.
+        yield f"""  assign {n}_src_ready = ({ack} == {n}_src_toggle);
+  assign {n}_src_load = {n}_src_valid & {n}_src_ready;
+"""
+    output = f"{n}_dst_pulse" if cdc.type == "pulse" else f"{n}_dst_load"
+    yield f"  assign {output} = {last} ^ {n}_sync_q;\n\n"
+    yield f'  `include "reg_{n}_cdc.vs" /*\n'
+    for record in registers(cdc):
+        yield f"    {record}\n"
+    yield "    */\n\n"
+
+
+def cdc_constraints(cdc):
+    n = cdc.name
+    cells = lambda *signals: "[get_cells -hier -filter {%s}]" % " || ".join(
+        f"NAME =~ *{signal}_reg*" for signal in signals
+    )
+    first = cdc.chain(f"{n}_sync")[0]
+    yield f"# Automatically generated constraints for {n} {cdc.type} crossing ({cdc.src_clock} -> {cdc.dst_clock})\n"
+    if cdc.max_delay:
+        yield f"set {n}_max_delay {cdc.max_delay}\n"
+    else:
+        yield f"set {n}_max_delay [get_property PERIOD [get_clocks -of_objects [get_pins -hier -filter {{NAME =~ *{first}_reg*/C}}]]]\n"
+    yield f"set_property ASYNC_REG TRUE {cells(*cdc.chain(f'{n}_sync'))}\n"
+    yield f"set_max_delay -datapath_only -from {cells(f'{n}_src_toggle')} -to {cells(first)} ${n}_max_delay\n"
+    if cdc.carries_data:
+        yield f"set_max_delay -datapath_only -from {cells(f'{n}_src_data_q')} -to {cells(f'{n}_dst_data')} ${n}_max_delay\n"
+    if cdc.type == "handshake":
+        yield f"set_property ASYNC_REG TRUE {cells(*cdc.chain(f'{n}_ack_sync'))}\n"
+        yield f"set_max_delay -datapath_only -from {cells(f'{n}_sync_q')} -to {cells(f'{n}_ack_sync1')} ${n}_max_delay\n"
+
+
+def parse_arguments(name):
+    if len(sys.argv) < 3:
+        vs_print(ERROR, "Not enough arguments.")
+        exit(1)
+
+    try:
+        records = tokenize(comment_text(sys.argv[2]), allowed=CDC_FIELDS)
+    except ValueError as error:
+        vs_print(ERROR, f"Malformed crossing description for {name}: {error}.")
+        exit(1)
+    if not records:
+        vs_print(ERROR, f"You must provide the crossing type of {name}: {', '.join(CDC_TYPES)}.")
+        exit(1)
+
+    return records[0]
+
+
+# Check if this script is called directly
+if __name__ == "__main__":
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    track_dependencies()
+    with phase("parse"):
+        cdc = Crossing(parse_arguments(vs_name_suffix), vs_name_suffix)
+    with phase("generate"):
+        cdc.generate_verilog()
+    write_dependencies()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python
+
+# FIFO.py script creates a synchronous or a dual-clock (asynchronous) FIFO.
+# To call this script in a Verilog file it should follow the following pattern:
+#   `include "FIFO_{FIFO_name}.vs" // Depth, Width
+# Signals are written to FIFO_{FIFO_name}_signals.vs (include with VS_NO_GENERATE).
+# The module drives {FIFO_name}_wr_en, _wr_data and _rd_en; the snippet drives _rd_data,
+# _full, _empty and _count (occupancy, 0 to Depth).
+#
+# Optional keyword fields:
+#   read=fwft        first-word-fall-through (default): _rd_data is valid while _empty is low,
+#                    _rd_en pops it
+#   read=sync        registered read: _rd_en pops and _rd_data is valid {FIFO_name}_READ_LATENCY
+#                    cycles later, flagged by _rd_valid
+#   output_reg=1     extra register after the memory read (block RAM output register)
+#   almost_full=N    adds _almost_full, set while _count >= N
+#   almost_empty=N   adds _almost_empty, set while _count <= N
+#                    N may be a number or a signal, for thresholds programmed at run time
+#   ram_style=S      ram_style attribute of the storage (block, distributed, registers, ultra);
+#                    defaults to block when Depth * Width is at least BLOCK_RAM_BITS
+#   rst=R            reset of the control registers, in reg.py format (default rst_i)
+#   clock=C          clock (default clk_i)
+# Depth does not need to be a power of two. Writes are accepted while _full is low and every
+# flag is registered; producers that watch _almost_full can throttle before the FIFO fills.
+# The storage is only read and written under enables, so deep FIFOs infer block RAM.
+#
+# Dual-clock FIFO keyword fields:
+#   rd_clock=C       read clock; when it differs from clock (the write clock) the FIFO is
+#                    asynchronous
+#   sync_stages=N    synchronizer flip-flops per crossing pointer (default 2)
+#   arst=R           asynchronous reset of both sides (default arst_i (active-low)), synchronized
+#                    into each clock domain with synchronize_reset.py
+# Pointers cross the clock domains in Gray code. A Depth that is not a power of two uses a
+# window of the reflected Gray sequence centred on its midpoint, so the wrap still changes
+# a single bit. _count is replaced by _wr_count (write side, for _full and _almost_full) and
+# _rd_count (read side, words still in the storage, for _almost_empty); both are conservative.
+#
+# Dependencies: reg.py (control registers), synchronize_reset.py (dual-clock FIFOs)
+
+import sys
+
+from VeriSnip.vs_colours import *
+from vs_arguments import comment_text, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
+from FSM import format_gray
+
+BLOCK_RAM_BITS = 4096
+RAM_STYLES = ("block", "distributed", "registers", "ultra")
+FIFO_FIELDS = (
+    "depth", "width", "read", "output_reg", "almost_full", "almost_empty", "ram_style", "rst", "clock",
+    "rd_clock", "sync_stages", "arst",
+)
+
+
+class FIFO:
+    def __init__(self, fifo_properties, name):
+        self.name = name
+        self.depth = fifo_properties.get(0, "depth")
+        self.width = fifo_properties.get(1, "width")
+        self.read_mode = fifo_properties.get(None, "read", "fwft").lower()
+        self.fwft = self.read_mode == "fwft"
+        self.output_reg = fifo_properties.get(None, "output_reg", "0").lower() in ("1", "true", "yes")
+        self.almost_full = fifo_properties.get(None, "almost_full")
+        self.almost_empty = fifo_properties.get(None, "almost_empty")
+        self.ram_style = fifo_properties.get(None, "ram_style").lower()
+        self.rst = fifo_properties.get(None, "rst", "rst_i")
+        self.clock = fifo_properties.get(None, "clock", "clk_i")
+        self.rd_clock = fifo_properties.get(None, "rd_clock") or self.clock
+        self.dual_clock = self.rd_clock != self.clock
+        self.sync_stages = fifo_properties.get(None, "sync_stages", "2")
+        self.arst = fifo_properties.get(None, "arst", "arst_i (active-low)")
+        self.latency = 1 + int(self.output_reg)
+        self.validate()
+        self.sync_stages = int(self.sync_stages)
+        if self.ram_style == "" and self.depth.isdigit() and self.width.isdigit():
+            if int(self.depth) * int(self.width) >= BLOCK_RAM_BITS:
+                self.ram_style = "block"
+
+    def validate(self):
+        if self.depth == "":
+            vs_print(ERROR, f"You must provide the depth of FIFO {self.name}.")
+            exit(1)
+        if self.width == "":
+            vs_print(ERROR, f"You must provide the width of FIFO {self.name}.")
+            exit(1)
+        if self.depth.isdigit() and int(self.depth) < 1:
+            vs_print(ERROR, f"FIFO {self.name} needs a depth of at least 1.")
+            exit(1)
+        if self.read_mode not in ("fwft", "sync"):
+            vs_print(ERROR, f"FIFO {self.name}: invalid read mode {self.read_mode}. Use fwft or sync.")
+            exit(1)
+        if self.ram_style not in ("",) + RAM_STYLES:
+            vs_print(ERROR, f"FIFO {self.name}: invalid ram_style {self.ram_style}. Use {', '.join(RAM_STYLES)}.")
+            exit(1)
+        if not self.sync_stages.isdigit() or int(self.sync_stages) < 2:
+            vs_print(ERROR, f"FIFO {self.name}: sync_stages must be a number of at least 2, got {self.sync_stages}.")
+            exit(1)
+        for field in ("almost_full", "almost_empty"):
+            threshold = getattr(self, field)
+            if threshold.isdigit() and self.depth.isdigit() and int(threshold) > int(self.depth):
+                vs_print(ERROR, f"FIFO {self.name}: {field} threshold {threshold} is above the depth {self.depth}.")
+                exit(1)
+
+    @property
+    def stages(self):
+        """Read pipeline registers, from the memory read to {name}_rd_data."""
+        n = self.name
+        return [f"{n}_mem_q", f"{n}_rd_data"] if self.output_reg else [f"{n}_rd_data"]
+
+    @property
+    def stored(self):
+        """Condition for a word waiting in the storage, as seen by the read side."""
+        return f"~{self.name}_rempty" if self.dual_clock else f"({self.name}_level != 0)"
+
+    @property
+    def gray_reset(self):
+        """Gray code of the pointers after reset: the first code of the Gray window."""
+        n = self.name
+        if not self.depth.isdigit():
+            return f"{n}_GRAY_OFFSET ^ ({n}_GRAY_OFFSET >> 1)"
+        depth = int(self.depth)
+        pointer_bits = (depth - 1).bit_length() + 1
+        return format_gray((1 << (pointer_bits - 1)) - depth, pointer_bits)
+
+    def generate_verilog(self):
+        write_vs(fifo_signals(self), f"FIFO_{self.name}_signals.vs")
+        write_vs(fifo_logic(self), f"FIFO_{self.name}.vs")
+
+
+def fifo_signals(fifo):
+    n = fifo.name
+    w = fifo.width
+    read_latency = 0 if fifo.fwft else fifo.latency
+    attribute = f'(* ram_style = "{fifo.ram_style}" *) ' if fifo.ram_style else ""
+    yield f"""  // Automatically generated signals for {n} FIFO
+  localparam integer {n}_DEPTH = {fifo.depth};
+  localparam integer AddrMSB{n} = (({n}_DEPTH==1) ? 0 : $clog2({n}_DEPTH)-1);
+  localparam integer CountMSB{n} = $clog2({n}_DEPTH+1)-1;
+  localparam integer {n}_READ_LATENCY = {read_latency};
+  {attribute}logic [{w}-1:0] {n}_mem [{n}_DEPTH];
+  logic {n}_wr_en, {n}_rd_en;
+  logic [{w}-1:0] {n}_wr_data;
+"""
+    for stage in fifo.stages:
+        yield f"  logic [{w}-1:0] {stage};\n"
+    yield f"""  logic {n}_full, {n}_full_n;
+  logic {n}_empty;
+  logic [AddrMSB{n}:0] {n}_wptr, {n}_rptr;
+  logic {n}_wr_accept, {n}_rd_accept, {n}_mem_rd;
+"""
+    if fifo.dual_clock:
+        yield from dual_clock_signals(fifo)
+    else:
+        yield f"""  logic [CountMSB{n}:0] {n}_count, {n}_count_n;
+  logic [AddrMSB{n}:0] {n}_wptr_n, {n}_rptr_n;
+"""
+    for stage in range(1, fifo.latency + 1):
+        yield f"  logic {n}_valid_q{stage}, {n}_valid_q{stage}_n;\n"
+    if fifo.fwft:
+        if not fifo.dual_clock:
+            yield f"  logic [CountMSB{n}:0] {n}_level, {n}_level_n;\n"
+        for stage in range(1, fifo.latency + 1):
+            yield f"  logic {n}_ready{stage};\n"
+    else:
+        if not fifo.dual_clock:
+            yield f"  logic {n}_empty_n;\n"
+        yield f"  logic {n}_rd_valid;\n"
+    if fifo.almost_full:
+        yield f"  logic {n}_almost_full, {n}_almost_full_n;\n"
+    if fifo.almost_empty:
+        yield f"  logic {n}_almost_empty, {n}_almost_empty_n;\n"
+
+
+def dual_clock_signals(fifo):
+    n = fifo.name
+    stages = fifo.sync_stages
+    rgray_w = ", ".join(f"{n}_rgray_w{stage}" for stage in range(1, stages + 1))
+    wgray_r = ", ".join(f"{n}_wgray_r{stage}" for stage in range(1, stages + 1))
+    yield f"""  // Pointers count to 2*{n}_DEPTH; their Gray codes are taken {n}_GRAY_OFFSET codes into the
+  // Gray sequence so that the window wraps with a single bit change.
+  localparam integer PtrMSB{n} = $clog2({n}_DEPTH);
+  localparam integer {n}_GRAY_OFFSET = (1 << PtrMSB{n}) - {n}_DEPTH;
+  localparam logic [PtrMSB{n}:0] {n}_GRAY_RESET = {fifo.gray_reset};
+  logic {n}_wr_rst, {n}_rd_rst;
+  logic [PtrMSB{n}:0] {n}_wbin, {n}_wbin_n, {n}_wofs, {n}_wgray, {n}_wgray_n;
+  logic [PtrMSB{n}:0] {n}_rbin, {n}_rbin_n, {n}_rofs, {n}_rgray, {n}_rgray_n;
+  (* ASYNC_REG = "TRUE" *) logic [PtrMSB{n}:0] {rgray_w};
+  (* ASYNC_REG = "TRUE" *) logic [PtrMSB{n}:0] {wgray_r};
+  logic [PtrMSB{n}:0] {n}_rofs_w, {n}_rbin_w, {n}_wofs_r, {n}_wbin_r;
+  logic [CountMSB{n}:0] {n}_wr_count, {n}_wr_count_n;
+  logic [CountMSB{n}:0] {n}_rd_count, {n}_rd_count_n;
+  logic {n}_rempty, {n}_rempty_n;
+"""
+
+
+def control_registers(fifo):
+    """reg.py records of the pointers, counters and flags."""
+    n = fifo.name
+    rst, clock = fifo.rst, fifo.clock
+    yield f"{n}_wptr, (AddrMSB{n}+1), 0, {rst}, {n}_wr_accept, _n, {clock}"
+    yield f"{n}_rptr, (AddrMSB{n}+1), 0, {rst}, {n}_mem_rd, _n, {clock}"
+    yield f"{n}_count, (CountMSB{n}+1), 0, {rst}, , _n, {clock}"
+    yield f"{n}_full, 1, 0, {rst}, , _n, {clock}"
+    if fifo.fwft:
+        yield f"{n}_level, (CountMSB{n}+1), 0, {rst}, , _n, {clock}"
+    else:
+        yield f"{n}_empty, 1, 1, {rst}, , _n, {clock}"
+    for stage in range(1, fifo.latency + 1):
+        yield f"{n}_valid_q{stage}, 1, 0, {rst}, , _n, {clock}"
+    if fifo.almost_full:
+        yield f"{n}_almost_full, 1, 0, {rst}, , _n, {clock}"
+    if fifo.almost_empty:
+        yield f"{n}_almost_empty, 1, 1, {rst}, , _n, {clock}"
+
+
+def dual_clock_registers(fifo):
+    """reg.py records of both clock domains, each reset by its synchronized reset."""
+    n = fifo.name
+    size = f"(PtrMSB{n}+1)"
+    count = f"(CountMSB{n}+1)"
+    wr_rst, wr_clock = f"{n}_wr_rst", fifo.clock
+    rd_rst, rd_clock = f"{n}_rd_rst", fifo.rd_clock
+    yield f"{n}_wbin, {size}, 0, {wr_rst}, , _n, {wr_clock}"
+    yield f"{n}_wgray, {size}, {n}_GRAY_RESET, {wr_rst}, , _n, {wr_clock}"
+    yield f"{n}_wr_count, {count}, 0, {wr_rst}, , _n, {wr_clock}"
+    yield f"{n}_full, 1, 0, {wr_rst}, , _n, {wr_clock}"
+    if fifo.almost_full:
+        yield f"{n}_almost_full, 1, 0, {wr_rst}, , _n, {wr_clock}"
+    source = f"{n}_rgray"
+    for stage in range(1, fifo.sync_stages + 1):
+        yield f"{n}_rgray_w{stage}, {size}, {n}_GRAY_RESET, {wr_rst}, , {source}, {wr_clock}"
+        source = f"{n}_rgray_w{stage}"
+
+    yield f"{n}_rbin, {size}, 0, {rd_rst}, , _n, {rd_clock}"
+    yield f"{n}_rgray, {size}, {n}_GRAY_RESET, {rd_rst}, , _n, {rd_clock}"
+    yield f"{n}_rd_count, {count}, 0, {rd_rst}, , _n, {rd_clock}"
+    yield f"{n}_rempty, 1, 1, {rd_rst}, , _n, {rd_clock}"
+    if fifo.almost_empty:
+        yield f"{n}_almost_empty, 1, 1, {rd_rst}, , _n, {rd_clock}"
+    for stage in range(1, fifo.latency + 1):
+        yield f"{n}_valid_q{stage}, 1, 0, {rd_rst}, , _n, {rd_clock}"
+    source = f"{n}_wgray"
+    for stage in range(1, fifo.sync_stages + 1):
+        yield f"{n}_wgray_r{stage}, {size}, {n}_GRAY_RESET, {rd_rst}, , {source}, {rd_clock}"
+        source = f"{n}_wgray_r{stage}"
+
+
+def pipeline_logic(fifo):
+    """Read pipeline: prefetching stages for FWFT, a delay line of valids for sync reads."""
+    n = fifo.name
+    stages = fifo.stages
+    last = fifo.latency
+    if fifo.fwft:
+        # A stage loads when it is empty or the next stage takes its word.
+        yield f"  assign {n}_ready{last} = ~{n}_valid_q{last} | {n}_rd_en;\n"
+        for stage in range(last - 1, 0, -1):
+            yield f"  assign {n}_ready{stage} = ~{n}_valid_q{stage} | {n}_ready{stage + 1};\n"
+        yield f"""  assign {n}_mem_rd = {fifo.stored} & {n}_ready1;
+  assign {n}_rd_accept = {n}_rd_en & {n}_valid_q{last};
+  assign {n}_empty = ~{n}_valid_q{last};
+  assign {n}_valid_q1_n = {n}_ready1 ? {n}_mem_rd : {n}_valid_q1;
+"""
+        for stage in range(2, last + 1):
+            yield f"  assign {n}_valid_q{stage}_n = {n}_ready{stage} ? {n}_valid_q{stage - 1} : {n}_valid_q{stage};\n"
+        if not fifo.dual_clock:
+            yield f"  assign {n}_level_n = {n}_level + {n}_wr_accept - {n}_mem_rd;\n"
+        enables = [f"{n}_mem_rd"] + [f"{n}_ready{stage}" for stage in range(2, last + 1)]
+    else:
+        if fifo.dual_clock:
+            yield f"  assign {n}_empty = {n}_rempty;\n"
+        yield f"""  assign {n}_rd_accept = {n}_rd_en & ~{n}_empty;
+  assign {n}_mem_rd = {n}_rd_accept;
+"""
+        if not fifo.dual_clock:
+            yield f"  assign {n}_empty_n = ({n}_count_n == 0);\n"
+        yield f"  assign {n}_valid_q1_n = {n}_mem_rd;\n"
+        for stage in range(2, last + 1):
+            yield f"  assign {n}_valid_q{stage}_n = {n}_valid_q{stage - 1};\n"
+        yield f"  assign {n}_rd_valid = {n}_valid_q{last};\n"
+        enables = [f"{n}_mem_rd"] + [f"{n}_valid_q{stage - 1}" for stage in range(2, last + 1)]
+
+    sources = [f"{n}_mem[{n}_rptr]"] + stages[:-1]
+    yield f"\n  always_ff @(posedge {fifo.rd_clock}) begin\n"
+    for stage, source, enable in zip(stages, sources, enables):
+        yield f"""    if ({enable}) begin
+      {stage} <= {source};
+    end
+"""
+    yield "  end\n"
+
+
+def dual_clock_logic(fifo):
+    """Gray pointers, their synchronized copies and the flags of both clock domains."""
+    n = fifo.name
+    offset = f"(PtrMSB{n}+1)'({n}_GRAY_OFFSET)"
+    wrap = f"2*{n}_DEPTH-1"
+    yield f"""  `include "synchronize_reset_{n}_wr.vs" // {fifo.arst}, {n}_wr_rst (active-high), clock = {fifo.clock}
+  `include "synchronize_reset_{n}_rd.vs" // {fifo.arst}, {n}_rd_rst (active-high), clock = {fifo.rd_clock}
+
+  // Write side, clocked by {fifo.clock}
+  assign {n}_wr_accept = {n}_wr_en & ~{n}_full;
+  assign {n}_wbin_n = ~{n}_wr_accept ? {n}_wbin : ({n}_wbin == {wrap}) ? '0 : {n}_wbin + 1'b1;
+  assign {n}_wofs = {n}_wbin_n + {offset};
+  assign {n}_wgray_n = {n}_wofs ^ ({n}_wofs >> 1);
+  assign {n}_wptr = (AddrMSB{n}+1)'(({n}_wbin >= {n}_DEPTH) ? {n}_wbin - {n}_DEPTH : {n}_wbin);
+  always_comb begin
+    for (int {n}_i = 0; {n}_i <= PtrMSB{n}; {n}_i = {n}_i + 1) begin
+      {n}_rofs_w[{n}_i] = ^({n}_rgray_w{fifo.sync_stages} >> {n}_i);
+    end
+  end
+  assign {n}_rbin_w = {n}_rofs_w - {offset};
+  assign {n}_wr_count_n = (CountMSB{n}+1)'(({n}_wbin_n >= {n}_rbin_w) ? {n}_wbin_n - {n}_rbin_w
+                                          : {n}_wbin_n + 2*{n}_DEPTH - {n}_rbin_w);
+  assign {n}_full_n = ({n}_wr_count_n == {n}_DEPTH);
+"""
+    if fifo.almost_full:
+        yield f"  assign {n}_almost_full_n = ({n}_wr_count_n >= {fifo.almost_full});\n"
+    yield f"""
+  // Read side, clocked by {fifo.rd_clock}
+  assign {n}_rbin_n = ~{n}_mem_rd ? {n}_rbin : ({n}_rbin == {wrap}) ? '0 : {n}_rbin + 1'b1;
+  assign {n}_rofs = {n}_rbin_n + {offset};
+  assign {n}_rgray_n = {n}_rofs ^ ({n}_rofs >> 1);
+  assign {n}_rptr = (AddrMSB{n}+1)'(({n}_rbin >= {n}_DEPTH) ? {n}_rbin - {n}_DEPTH : {n}_rbin);
+  always_comb begin
+    for (int {n}_j = 0; {n}_j <= PtrMSB{n}; {n}_j = {n}_j + 1) begin
+      {n}_wofs_r[{n}_j] = ^({n}_wgray_r{fifo.sync_stages} >> {n}_j);
+    end
+  end
+  assign {n}_wbin_r = {n}_wofs_r - {offset};
+  assign {n}_rd_count_n = (CountMSB{n}+1)'(({n}_wbin_r >= {n}_rbin_n) ? {n}_wbin_r - {n}_rbin_n
+                                          : {n}_wbin_r + 2*{n}_DEPTH - {n}_rbin_n);
+  assign {n}_rempty_n = ({n}_rd_count_n == 0);
+"""
+    if fifo.almost_empty:
+        yield f"  assign {n}_almost_empty_n = ({n}_rd_count_n <= {fifo.almost_empty});\n"
+
+
+def fifo_logic(fifo):
+    n = fifo.name
+    yield f"  // Automatically generated logic for {n} FIFO\n"
+    if fifo.dual_clock:
+        yield from dual_clock_logic(fifo)
+    else:
+        yield f"""  assign {n}_wr_accept = {n}_wr_en & ~{n}_full;
+  assign {n}_wptr_n = ({n}_wptr == {n}_DEPTH - 1) ? '0 : {n}_wptr + 1'b1;
+  assign {n}_rptr_n = ({n}_rptr == {n}_DEPTH - 1) ? '0 : {n}_rptr + 1'b1;
+  assign {n}_count_n = {n}_count + {n}_wr_accept - {n}_rd_accept;
+  assign {n}_full_n = ({n}_count_n == {n}_DEPTH);
+"""
+        if fifo.almost_full:
+            yield f"  assign {n}_almost_full_n = ({n}_count_n >= {fifo.almost_full});\n"
+        if fifo.almost_empty:
+            yield f"  assign {n}_almost_empty_n = ({n}_count_n <= {fifo.almost_empty});\n"
+    yield "\n"
+    yield from pipeline_logic(fifo)
+    yield f"""
+  always_ff @(posedge {fifo.clock}) begin
+    if ({n}_wr_accept) begin
+      {n}_mem[{n}_wptr] <= {n}_wr_data;
+    end
+  end
+
+  `include "reg_{n}_fifo.vs" /*
+"""
+    records = dual_clock_registers(fifo) if fifo.dual_clock else control_registers(fifo)
+    for record in records:
+        yield f"    {record}\n"
+    yield "    */\n\n"
+
+
+def parse_arguments(name):
+    if len(sys.argv) < 3:
+        vs_print(ERROR, "Not enough arguments.")
+        exit(1)
+
+    try:
+        records = tokenize(comment_text(sys.argv[2]), allowed=FIFO_FIELDS)
+    except ValueError as error:
+        vs_print(ERROR, f"Malformed FIFO description for {name}: {error}.")
+        exit(1)
+    if not records:
+        vs_print(ERROR, f"You must provide the depth and width of FIFO {name}.")
+        exit(1)
+
+    return records[0]
+
+
+# Check if this script is called directly
+if __name__ == "__main__":
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    track_dependencies()
+    with phase("parse"):
+        fifo = FIFO(parse_arguments(vs_name_suffix), vs_name_suffix)
+    with phase("generate"):
+        fifo.generate_verilog()
+    write_dependencies()
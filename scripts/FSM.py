@@ -13,13 +13,12 @@
 
 import re
 import sys
-from typing import Any
 
 from VeriSnip.vs_colours import *
-
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
-vs_logic_name = f"FSM_{vs_name_suffix}.vs"
-vs_signals_name = f"FSM_{vs_name_suffix}_signals.vs"
+from vs_arguments import HEADER_KEYS, parse_header, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
 
 
 class Transition:
@@ -28,12 +27,6 @@ class Transition:
         self.dst = dst
         self.condition = condition.strip() if condition and condition.strip() else None
 
-    @property
-    def cond_signal(self):
-        if self.condition is None:
-            return None
-        return f"{vs_name_suffix}_{self.src}_{self.dst}"
-
 
 class FSM:
     def __init__(
@@ -51,13 +44,21 @@ class FSM:
         self.state = f"{name}_state"
         self.state_n = f"{name}_state_n"
         self.reset_state = f"{name}_{states[0]}"
+        self.arcs = {state: [] for state in states}
+        for t in transitions:
+            self.arcs[t.src].append(t)
 
     def transitions_from(self, state):
-        return [t for t in self.transitions if t.src == state]
+        return self.arcs.get(state, [])
 
     def conditional_transitions(self):
         return [t for t in self.transitions if t.condition is not None]
 
+    def cond_signal(self, transition):
+        if transition.condition is None:
+            return None
+        return f"{self.name}_{transition.src}_{transition.dst}"
+
     def check_health(self):
         # 1. Unreachable states
         reachable = {self.states[0]}
@@ -69,7 +70,7 @@ class FSM:
                     reachable.add(t.dst)
                     queue.append(t.dst)
 
-        unreachable = set[Any](self.states) - reachable
+        unreachable = set(self.states) - reachable
         if unreachable:
             vs_print(
                 ERROR,
@@ -104,52 +105,6 @@ def format_gray(index, width):
     return f"{width}'b{gray_code(index):0{width}b}"
 
 
-def write_vs(string, file_name):
-    with open(file_name, "w") as file:
-        file.write(string)
-
-
-def parse_header(line):
-    """Parse 'asynchronous reset = ..., clock = ...' (or defaults)."""
-    async_reset = True
-    active_low = False
-    reset = "arst_i"
-    clock = "clk_i"
-
-    if not line or "->" in line:
-        return reset, clock, async_reset, active_low, False
-
-    lower = line.lower()
-    if "reset" not in lower and "clock" not in lower and "clk" not in lower:
-        return reset, clock, async_reset, active_low, False
-
-    # Split on commas that separate key=value pairs (not inside parentheses).
-    parts = re.split(r",(?![^(]*\))", line)
-    for part in parts:
-        part = part.strip()
-        if "=" not in part:
-            continue
-        key, value = part.split("=", 1)
-        key = key.strip().lower()
-        value = value.strip()
-        if "reset" in key:
-            async_reset = "asynchronous" in key
-
-            # Check for active-low or active-high
-            if "(active-low)" in value.lower():
-                active_low = True
-                value = re.sub(r"(?i)\(active-low\)", "", value).strip()
-            elif "(active-high)" in value.lower():
-                active_low = False
-                value = re.sub(r"(?i)\(active-high\)", "", value).strip()
-
-            reset = value
-        elif key in ("clock", "clk"):
-            clock = value
-
-    return reset, clock, async_reset, active_low, True
-
-
 def parse_transition_line(line, current_state):
     """Parse 'State -> Next, cond' or '-> Next[, cond]'."""
     match = re.match(
@@ -172,7 +127,7 @@ def parse_transition_line(line, current_state):
     return Transition(current_state, dst, condition), current_state
 
 
-def parse_arguments():
+def parse_arguments(name):
     if len(sys.argv) < 3:
         vs_print(ERROR, "Not enough arguments for FSM generator.")
         exit(1)
@@ -182,8 +137,13 @@ def parse_arguments():
 
     reset, clock, async_reset, active_low = "arst_i", "clk_i", True, False
     start = 0
-    if lines:
-        reset, clock, async_reset, active_low, is_header = parse_header(lines[0])
+    if lines and "->" not in lines[0]:
+        try:
+            header = tokenize(lines[0], allowed=HEADER_KEYS)
+        except ValueError as error:
+            vs_print(ERROR, f"Malformed FSM header '{lines[0]}': {error}.")
+            exit(1)
+        reset, clock, async_reset, active_low, is_header = parse_header(header[0], reset, clock, async_reset)
         if is_header:
             start = 1
 
@@ -202,101 +162,111 @@ def parse_arguments():
         transitions.append(transition)
 
     if not states:
-        vs_print(ERROR, f"No states found for FSM {vs_name_suffix}.")
+        vs_print(ERROR, f"No states found for FSM {name}.")
         exit(1)
 
     return FSM(
-        vs_name_suffix, states, transitions, reset, clock, async_reset, active_low
+        name, states, transitions, reset, clock, async_reset, active_low
     )
 
 
-def generate_signals(fsm):
-    code = f"  // Automatically generated signals for {fsm.name} FSM\n"
-    code += f"  typedef enum logic [{fsm.width - 1}:0] {{\n"
-    enum_lines = []
-    for i, state in enumerate[Any](fsm.states):
-        enum_lines.append(f"    {fsm.name}_{state} = {format_gray(i, fsm.width)}")
-    code += ",\n".join(enum_lines) + "\n"
-    code += f"  }} {fsm.enum_t};\n"
-    code += f"  {fsm.enum_t} {fsm.state}, {fsm.state_n};\n"
+def signals_lines(fsm):
+    yield f"  // Automatically generated signals for {fsm.name} FSM\n"
+    yield f"  typedef enum logic [{fsm.width - 1}:0] {{\n"
+    last = len(fsm.states) - 1
+    for i, state in enumerate(fsm.states):
+        separator = "\n" if i == last else ",\n"
+        yield f"    {fsm.name}_{state} = {format_gray(i, fsm.width)}{separator}"
+    yield f"  }} {fsm.enum_t};\n"
+    yield f"  {fsm.enum_t} {fsm.state}, {fsm.state_n};\n"
 
     conds = fsm.conditional_transitions()
     if conds:
-        names = ",\n        ".join(t.cond_signal for t in conds)
-        code += f"  logic {names};\n"
-
-    write_vs(code, vs_signals_name)
+        names = ",\n        ".join(fsm.cond_signal(t) for t in conds)
+        yield f"  logic {names};\n"
 
 
-def generate_logic(fsm):
-    code = f"  // Automatically generated logic for {fsm.name} FSM\n"
+def logic_lines(fsm):
+    yield f"  // Automatically generated logic for {fsm.name} FSM\n"
 
-    for t in fsm.conditional_transitions():
-        code += f"  assign {t.cond_signal} = {t.condition};\n"
+    conds = fsm.conditional_transitions()
+    for t in conds:
+        yield f"  assign {fsm.cond_signal(t)} = {t.condition};\n"
 
-    if fsm.conditional_transitions():
-        code += "\n"
+    if conds:
+        yield "\n"
 
-    code += "  always_comb begin\n"
-    code += f"    {fsm.state_n} = {fsm.state};\n"
-    code += f"    case ({fsm.state})\n"
+    yield "  always_comb begin\n"
+    yield f"    {fsm.state_n} = {fsm.state};\n"
+    yield f"    case ({fsm.state})\n"
 
     for state in fsm.states:
         arcs = fsm.transitions_from(state)
-        code += f"      {fsm.name}_{state}: begin\n"
+        yield f"      {fsm.name}_{state}: begin\n"
         if not arcs:
-            code += "      end\n"
+            yield "      end\n"
             continue
 
         conditional = [t for t in arcs if t.condition is not None]
         unconditional = [t for t in arcs if t.condition is None]
 
-        for i, t in enumerate[Any](conditional):
+        for i, t in enumerate(conditional):
             keyword = "if" if i == 0 else "end else if"
-            code += f"        {keyword} ({t.cond_signal}) begin\n"
-            code += f"          {fsm.state_n} = {fsm.name}_{t.dst};\n"
+            yield f"        {keyword} ({fsm.cond_signal(t)}) begin\n"
+            yield f"          {fsm.state_n} = {fsm.name}_{t.dst};\n"
 
         if unconditional:
             t = unconditional[0]
             if conditional:
-                code += "        end else begin\n"
-                code += f"          {fsm.state_n} = {fsm.name}_{t.dst};\n"
-                code += "        end\n"
+                yield "        end else begin\n"
+                yield f"          {fsm.state_n} = {fsm.name}_{t.dst};\n"
+                yield "        end\n"
             else:
-                code += f"        {fsm.state_n} = {fsm.name}_{t.dst};\n"
+                yield f"        {fsm.state_n} = {fsm.name}_{t.dst};\n"
         elif conditional:
-            code += "        end\n"
+            yield "        end\n"
 
-        code += "      end\n"
+        yield "      end\n"
 
-    code += f"      default: {fsm.state_n} = {fsm.reset_state};\n"
-    code += "    endcase\n"
-    code += "  end\n\n"
+    yield f"      default: {fsm.state_n} = {fsm.reset_state};\n"
+    yield "    endcase\n"
+    yield "  end\n\n"
 
     if fsm.async_reset:
         if fsm.active_low:
-            code += f"  always_ff @(posedge {fsm.clock} or negedge {fsm.reset}) begin\n"
+            yield f"  always_ff @(posedge {fsm.clock} or negedge {fsm.reset}) begin\n"
         else:
-            code += f"  always_ff @(posedge {fsm.clock} or posedge {fsm.reset}) begin\n"
+            yield f"  always_ff @(posedge {fsm.clock} or posedge {fsm.reset}) begin\n"
     else:
-        code += f"  always_ff @(posedge {fsm.clock}) begin\n"
+        yield f"  always_ff @(posedge {fsm.clock}) begin\n"
 
     reset_cond = f"!{fsm.reset}" if fsm.active_low else f"{fsm.reset}"
-    code += f"    if ({reset_cond}) begin\n"
-    code += f"      {fsm.state} <= {fsm.reset_state};\n"
-    code += "    end else begin\n"
-    code += f"      {fsm.state} <= {fsm.state_n};\n"
-    code += "    end\n"
-    code += "  end\n"
+    yield f"    if ({reset_cond}) begin\n"
+    yield f"      {fsm.state} <= {fsm.reset_state};\n"
+    yield "    end else begin\n"
+    yield f"      {fsm.state} <= {fsm.state_n};\n"
+    yield "    end\n"
+    yield "  end\n"
+
+
+def generate_signals(fsm, file_name=None):
+    write_vs(signals_lines(fsm), file_name or f"FSM_{fsm.name}_signals.vs")
+
 
-    write_vs(code, vs_logic_name)
+def generate_logic(fsm, file_name=None):
+    write_vs(logic_lines(fsm), file_name or f"FSM_{fsm.name}.vs")
 
 
 if __name__ == "__main__":
-    fsm = parse_arguments()
-    fsm.check_health()
-    generate_signals(fsm)
-    generate_logic(fsm)
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    track_dependencies()
+    with phase("parse"):
+        fsm = parse_arguments(vs_name_suffix)
+        fsm.check_health()
+    with phase("generate"):
+        generate_signals(fsm)
+        generate_logic(fsm)
+    write_dependencies()
     rst_kind = "asynchronous" if fsm.async_reset else "synchronous"
     vs_print(
         OK,
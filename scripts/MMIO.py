@@ -9,13 +9,23 @@
 #   ...
 #   */
 # Default values are: Size = 1 bit; Reset Value = 0; Reg_reset = None; Reg_enable = None; Reg_next = {Reg_name}_n; Access Type = "R/W"; Default Value = Reg_name.
+# Reg_reset is written as for reg.py ("[asynchronous] <rst> [(active-low)]") and a clock=C keyword field
+# sets the register clock (default clk_i); both are passed on to the reg.py snippet of the registers.
+# The block may start with a header line naming its register interface:
+#   prefix = <p>, data_width = <W>, addr_width = <A>
+# The interface nets are then {p}_r_data, {p}_w_data, {p}_r_address, {p}_w_address, {p}_r_enable and
+# {p}_w_enable (r_data, ... without a prefix), DATA_WIDTH and ADDR_WIDTH bits wide by default, so
+# several MMIO blocks can live in one module.
 
-import subprocess
 import sys
 from VeriSnip.vs_colours import *
-from reg import register
+from reg import REGISTER_FIELDS, register
+from vs_arguments import comment_text, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
 
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
+MMIO_OPTIONS = ("prefix", "data_width", "addr_width")
 
 assigns = ""
 read_always = ""
@@ -23,26 +33,14 @@ write_always = ""
 
 
 class memory_mapped_register:
-    def __init__(self, description) -> None:
-        properties = custom_split(description)
-        properties = [prop.strip() for prop in properties]
-        try:
-            self.reg = register(
-                [
-                    properties[0],
-                    properties[1],
-                    properties[2],
-                    properties[3],
-                    properties[4],
-                    properties[5],
-                ]
-            )
-            self.set_address(properties[6])
-            self.set_access_type(properties[7])
-            self.set_default_value(properties[8])
-        except:
-            vs_print(ERROR, f"MMIO register is malformed, expected 8 values.")
-            exit()
+    def __init__(self, properties) -> None:
+        if len(properties) < 9:
+            vs_print(ERROR, f"MMIO register is malformed, expected 9 values.")
+            exit(1)
+        self.reg = register(properties.fields(0, 6), clock=properties.get(None, "clock", "clk_i"))
+        self.set_address(properties.get(6, "address"))
+        self.set_access_type(properties.get(7, "access"))
+        self.set_default_value(properties.get(8, "default"))
         self.set_sel()
 
     def set_address(self, mm_reg_address):
@@ -69,53 +67,44 @@ class memory_mapped_register:
         self.w_sel = f"w_{self.reg.name}_sel"
 
 
-def custom_split(description):
-    result = []
-    stack = []
-    current_token = ""
+class mmio_block:
+    """Registers of the MMIO block MMIO_{name} and the names and widths of its register interface."""
 
-    for char in description:
-        if char == "," and not stack:
-            # Split on comma when not inside nested brackets
-            result.append(current_token.strip())
-            current_token = ""
-        else:
-            current_token += char
-            if char in "{[(":
-                # Push opening brackets onto the stack
-                stack.append(char)
-            elif char in "}])":
-                # Pop closing brackets from the stack
-                if not stack:
-                    raise ValueError("Unbalanced brackets")
-                opening_bracket = stack.pop()
-                if (
-                    char == "}"
-                    and opening_bracket != "{"
-                    or char == "]"
-                    and opening_bracket != "["
-                    or char == ")"
-                    and opening_bracket != "("
-                ):
-                    raise ValueError("Mismatched brackets")
-
-    if stack:
-        raise ValueError("Unbalanced brackets")
-
-    result.append(current_token.strip())
-
-    return result
-
-
-def parse_arguments():
-    reg_list = []
-    if (len(sys.argv) < 2) or (sys.argv[2].strip() == ""):
+    def __init__(self, name, registers, prefix="", data_width="DATA_WIDTH", addr_width="ADDR_WIDTH"):
+        self.name = name
+        self.registers = registers
+        self.data_width = data_width or "DATA_WIDTH"
+        self.addr_width = addr_width or "ADDR_WIDTH"
+        p = f"{prefix}_" if prefix else ""
+        self.r_data = f"{p}r_data"
+        self.w_data = f"{p}w_data"
+        self.r_address = f"{p}r_address"
+        self.w_address = f"{p}w_address"
+        self.r_enable = f"{p}r_enable"
+        self.w_enable = f"{p}w_enable"
+
+
+def split_header(records):
+    """Options of a 'prefix = ..., data_width = ..., addr_width = ...' header and the register records."""
+    if records and records[0].keys[0] in MMIO_OPTIONS:
+        header = records[0]
+        return {key: value for key, value in zip(header.keys, header) if key is not None}, records[1:]
+    return {}, records
+
+
+def parse_arguments(name):
+    if (len(sys.argv) < 3) or (sys.argv[2].strip() == ""):
         vs_print(ERROR, "Not enough arguments")
         exit(1)
-    list_of_regs = sys.argv[2].split("\n")
-    for reg in list_of_regs:
-        reg_list.append(memory_mapped_register(reg))
-    return reg_list
+    try:
+        records = tokenize(
+            comment_text(sys.argv[2]), allowed=REGISTER_FIELDS + ("address", "access", "default") + MMIO_OPTIONS
+        )
+    except ValueError as error:
+        vs_print(ERROR, f"Malformed MMIO description for {name}: {error}.")
+        exit(1)
+    options, records = split_header(records)
+    return mmio_block(name, [memory_mapped_register(properties) for properties in records], **options)
 
 
 def parse_verilog_address(address):
@@ -151,8 +140,9 @@ def format_address_ranges(mm_reg_list):
     return ", ".join(ranges)
 
 
-def print_mmio_info(mm_reg_list):
+def print_mmio_info(block):
     """Print an INFO summary of the generated MMIO register map."""
+    mm_reg_list = block.registers
     reg_count = len(mm_reg_list)
     reg_label = "register" if reg_count == 1 else "registers"
     try:
@@ -161,108 +151,110 @@ def print_mmio_info(mm_reg_list):
         address_ranges = ", ".join(mm_reg.address for mm_reg in mm_reg_list)
     vs_print(
         INFO,
-        f"Generated {reg_count} memory mapped IO {reg_label} for {vs_name_suffix} "
+        f"Generated {reg_count} memory mapped IO {reg_label} for {block.name} "
         f"at address range(s): {address_ranges}.",
     )
 
 
-def registers_description(mm_reg_list):
-    reg_desc = f'  `include "reg_MMIO_{vs_name_suffix}.vs" /*\n'
-    for mm_reg in mm_reg_list:
-        reg_desc += f"    {mm_reg.reg.signal}, {mm_reg.reg.size}, {mm_reg.reg.rst_val}, {mm_reg.reg.rst}, , {mm_reg.reg.next}\n"
-    reg_desc += "  */\n"
-    return reg_desc
+def registers_description(block):
+    yield f'  `include "reg_MMIO_{block.name}.vs" /*\n'
+    for mm_reg in block.registers:
+        reg = mm_reg.reg
+        yield f"    {reg.signal}, {reg.size}, {reg.rst_val}, {reg.rst_field}, , {reg.next}, {reg.clock}\n"
+    yield "  */\n"
 
 
 def find_script():
     return ""
 
 
-def sel_registers_desc(mm_reg_list):
-    sel_reg_desc = ""
-    for mm_reg in mm_reg_list:
+def sel_registers_desc(block):
+    for mm_reg in block.registers:
+        enable = f" & ({mm_reg.reg.en})" if mm_reg.reg.en != None else ""
         if "W" in mm_reg.access_type:
-            sel_reg_desc += f"  assign {mm_reg.w_sel} = (w_address == {mm_reg.address}){f' & ({mm_reg.reg.en})' if mm_reg.reg.en != None else ''};\n"
+            yield f"  assign {mm_reg.w_sel} = ({block.w_address} == {mm_reg.address}){enable};\n"
         if "R" in mm_reg.access_type:
-            sel_reg_desc += f"  assign {mm_reg.r_sel} = (r_address == {mm_reg.address}){f' & ({mm_reg.reg.en})' if mm_reg.reg.en != None else ''};\n"
-    return sel_reg_desc
+            yield f"  assign {mm_reg.r_sel} = ({block.r_address} == {mm_reg.address}){enable};\n"
 
 
-def write_registers_desc(mm_reg_list):
-    w_desc = "  // Write memory mapped register always block\n"
-    w_desc += "  always_comb begin\n"
-    for mm_reg in mm_reg_list:
-        w_desc += f"    {mm_reg.reg.next} = {mm_reg.default_value};\n"
-    w_desc += f"    if (w_enable) begin\n"
-    for mm_reg in mm_reg_list:
+def write_registers_desc(block):
+    yield "  // Write memory mapped register always block\n"
+    yield "  always_comb begin\n"
+    for mm_reg in block.registers:
+        yield f"    {mm_reg.reg.next} = {mm_reg.default_value};\n"
+    yield f"    if ({block.w_enable}) begin\n"
+    for mm_reg in block.registers:
         if "W" in mm_reg.access_type:
-            w_desc += f"      if ({mm_reg.w_sel}) begin\n"
-            w_desc += f"        {mm_reg.reg.next} = w_data[{mm_reg.reg.size}-1:0];\n"
-            w_desc += "      end\n"
-    w_desc += "    end\n"
-    w_desc += "  end\n"
-    return w_desc
-
-
-def read_registers_desc(mm_reg_list):
-    r_desc = "  // Read memory mapped register always block\n"
-    r_desc += "  always_comb begin\n"
-    r_desc += "    r_data = 0;\n"
-    r_desc += f"    if (r_enable) begin\n"
-    for mm_reg in mm_reg_list:
+            yield (
+                f"      if ({mm_reg.w_sel}) begin\n"
+                f"        {mm_reg.reg.next} = {block.w_data}[{mm_reg.reg.size}-1:0];\n"
+                "      end\n"
+            )
+    yield "    end\n"
+    yield "  end\n"
+
+
+def read_registers_desc(block):
+    yield "  // Read memory mapped register always block\n"
+    yield "  always_comb begin\n"
+    yield f"    {block.r_data} = 0;\n"
+    yield f"    if ({block.r_enable}) begin\n"
+    for mm_reg in block.registers:
         if "R" in mm_reg.access_type:
-            r_desc += f"      if ({mm_reg.r_sel}) begin\n"
-            r_desc += (
-                "        r_data = {{(DATA_WIDTH-"
-                + f"{mm_reg.reg.size}"
-                + "){1'b0}}, "
-                + f"{mm_reg.reg.signal}"
-                + "};\n"
+            yield (
+                f"      if ({mm_reg.r_sel}) begin\n"
+                f"        {block.r_data} = {{{{({block.data_width}-{mm_reg.reg.size}){{1'b0}}}}, {mm_reg.reg.signal}}};\n"
+                "      end\n"
             )
-            r_desc += "      end\n"
-    r_desc += "    end\n"
-    r_desc += "  end\n"
-    return r_desc
-
-
-def generate_MMIO_signals(mm_reg_list):
-    signal_content = "  // Additional signals for memory mapped registers\n"
-    signal_content += "  logic [DATA_WIDTH-1:0] r_data;\n"
-    signal_content += "  logic [DATA_WIDTH-1:0] w_data;\n"
-    signal_content += "  logic [ADDR_WIDTH-1:0] r_address;\n"
-    signal_content += "  logic [ADDR_WIDTH-1:0] w_address;\n"
-    signal_content += "  logic r_enable;\n"
-    signal_content += "  logic w_enable;\n"
-    for mm_reg in mm_reg_list:
+    yield "    end\n"
+    yield "  end\n"
+
+
+def MMIO_signals(block):
+    yield "  // Additional signals for memory mapped registers\n"
+    yield f"  logic [{block.data_width}-1:0] {block.r_data};\n"
+    yield f"  logic [{block.data_width}-1:0] {block.w_data};\n"
+    yield f"  logic [{block.addr_width}-1:0] {block.r_address};\n"
+    yield f"  logic [{block.addr_width}-1:0] {block.w_address};\n"
+    yield f"  logic {block.r_enable};\n"
+    yield f"  logic {block.w_enable};\n"
+    for mm_reg in block.registers:
         if "W" in mm_reg.access_type:
-            signal_content += f"  logic {mm_reg.w_sel};\n"
+            yield f"  logic {mm_reg.w_sel};\n"
         if "R" in mm_reg.access_type:
-            signal_content += f"  logic {mm_reg.r_sel};\n"
-        signal_content += f"  logic [{mm_reg.reg.size}-1:0] {mm_reg.reg.signal};\n"
-        signal_content += f"  logic [{mm_reg.reg.size}-1:0] {mm_reg.reg.next};\n"
-    signal_content += "\n"
-    generated_signals_file = f"MMIO_{vs_name_suffix}_signals.vs"
-    with open(generated_signals_file, "a") as file:
-        file.write(signal_content)
+            yield f"  logic {mm_reg.r_sel};\n"
+        yield f"  logic [{mm_reg.reg.size}-1:0] {mm_reg.reg.signal};\n"
+        yield f"  logic [{mm_reg.reg.size}-1:0] {mm_reg.reg.next};\n"
+    yield "\n"
+
+
+def generate_MMIO_signals(block, file_name=None):
+    if file_name is None:
+        file_name = f"MMIO_{block.name}_signals.vs"
+    write_vs(MMIO_signals(block), file_name, "a")
+
 
-def create_vs(reg_list):
-    vs_content = f"  // Automatically generated memory mapped registers interface for {vs_name_suffix}\n"
-    generate_MMIO_signals(reg_list)
-    vs_content += sel_registers_desc(reg_list)
-    vs_content += write_registers_desc(reg_list)
-    vs_content += read_registers_desc(reg_list)
-    vs_content += registers_description(reg_list)
-    write_vs(vs_content, f"MMIO_{vs_name_suffix}.vs")
+def MMIO_lines(block):
+    yield f"  // Automatically generated memory mapped registers interface for {block.name}\n"
+    yield from sel_registers_desc(block)
+    yield from write_registers_desc(block)
+    yield from read_registers_desc(block)
+    yield from registers_description(block)
 
 
-def write_vs(string="", file_name="reg.vs"):
-    with open(file_name, "w") as file:
-        file.write(string)
+def create_vs(block, file_name=None, signals_file_name=None):
+    generate_MMIO_signals(block, signals_file_name)
+    write_vs(MMIO_lines(block), file_name or f"MMIO_{block.name}.vs")
 
 
 # Check if this script is called directly
 if __name__ == "__main__":
-    reg_list = parse_arguments()
-    print_mmio_info(reg_list)
-    create_vs(reg_list)
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    track_dependencies()
+    with phase("parse"):
+        block = parse_arguments(vs_name_suffix)
+    with phase("generate"):
+        print_mmio_info(block)
+        create_vs(block)
+    write_dependencies()
     vs_print(OK, f"Generated MMIOs for {vs_name_suffix}.")
@@ -5,30 +5,103 @@
 #   `include "Mem_{Memory_name}.vs" // Type, Depth, Width, Init_file (optional)
 # where Type can be: RAM or ROM. The Init_file is optional, unless you are using a ROM.
 # Default values are: Type = None; Depth = None; Width = None; Init_file = None.
+#
+# Optional keyword fields:
+#   read_ports=N   number of read ports (default 1)
+#   write_ports=N  number of byte-enable write ports, RAM only (default 1)
+#   read=sync      registered (synchronous) read instead of the default asynchronous read
+#   output_reg=1   extra output register after the read, for block RAM output registers
+#   banks=N        address-interleaved banks (N a power of two): bank = addr % N, row = addr / N
+# With more than one port the port signals become arrays ({Memory_name}_r_addr[N], ...).
+# Every memory declares {Memory_name}_READ_LATENCY, the cycles from r_addr to data_out.
+# Banked memories serve one read and one write per bank and cycle: they add {Memory_name}_r_en,
+# and {Memory_name}_r_grant/_w_grant flag the ports served this cycle (lowest port index wins).
+#   init_format=F  hex ($readmemh text), bin, ihex or elf; detected from the file when omitted
+#   init_base=A    byte address loaded into word 0 for ihex/elf images (default: lowest address)
+# The Init_file is read and validated against Depth and Width when the snippet is generated.
+# bin, ihex and elf images, and the images of banked memories, are converted to
+# Mem_{Memory_name}_init.hex (in generated/ when it exists); see vs_mem_init.py.
 
-
+import os
 import sys
 
 from VeriSnip.vs_colours import *
+from vs_arguments import comment_text, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
 
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
+MEMORY_FIELDS = (
+    "type", "depth", "width", "init_file", "read_ports", "write_ports", "read", "output_reg", "banks",
+    "init_format", "init_base",
+)
 
 
 class Memory:
     def __init__(self, mem_properties, name):
-        self.type = mem_properties[0].strip().upper()
-        self.depth = mem_properties[1].strip()
-        self.width = mem_properties[2].strip()
-        if len(mem_properties) > 3:
-            self.init_file = mem_properties[3].strip()
-        else:
-            self.init_file = ""
+        self.type = mem_properties.get(0, "type").upper()
+        self.depth = mem_properties.get(1, "depth")
+        self.width = mem_properties.get(2, "width")
+        self.init_file = mem_properties.get(3, "init_file").strip('"')
         self.name = name
+        self.read_ports = self.count(mem_properties.get(None, "read_ports"), "read_ports", 1)
+        default_write_ports = 1 if self.type == "RAM" else 0
+        self.write_ports = self.count(
+            mem_properties.get(None, "write_ports"), "write_ports", default_write_ports
+        )
+        self.sync_read = mem_properties.get(None, "read", "async").lower() == "sync"
+        self.output_reg = mem_properties.get(None, "output_reg", "0").lower() in ("1", "true", "yes")
+        self.banks = self.count(mem_properties.get(None, "banks"), "banks", 1)
+        self.read_latency = int(self.sync_read) + int(self.output_reg)
+        self.init_format = mem_properties.get(None, "init_format")
+        self.init_base = mem_properties.get(None, "init_base")
+        self.init_files = [self.init_file] if self.init_file else []
         self.validate()
 
+    def count(self, value, field, default):
+        if value == "":
+            return default
+        if not value.isdigit():
+            vs_print(ERROR, f"Memory {self.name}: {field} must be a number, got {value}.")
+            exit(1)
+        return int(value)
+
+    def prepare_init_files(self):
+        """Validate (and convert) the init file into the $readmemh file to load."""
+        if self.init_file == "":
+            return
+        if not os.path.exists(self.init_file) or not (self.depth.isdigit() and self.width.isdigit()):
+            if self.banked:
+                vs_print(
+                    ERROR,
+                    f"Memory {self.name}: banked memories need an existing init file and numeric depth and width.",
+                )
+                exit(1)
+            vs_print(WARNING, f"Init file {self.init_file} not checked at generation time.")
+            return
+        # Only memories with an init file pay for importing the init file processing.
+        from vs_mem_init import InitFileError, InitImage
+
+        try:
+            base = int(self.init_base, 0) if self.init_base else None
+            image = InitImage(
+                self.init_file,
+                int(self.depth),
+                int(self.width),
+                self.banks,
+                self.init_format,
+                base,
+                os.path.join("generated" if os.path.isdir("generated") else "", f"Mem_{self.name}_init"),
+            )
+            self.init_files = image.process()
+        except (InitFileError, ValueError, OSError) as error:
+            vs_print(ERROR, f"Init file {self.init_file} for memory {self.name}: {error}.")
+            exit(1)
+
     def generate_verilog(self):
-        memory_signals(self)
-        memory_logic(self)
+        self.prepare_init_files()
+        write_vs(memory_signals(self), f"Mem_{self.name}_signals.vs")
+        write_vs(memory_logic(self), f"Mem_{self.name}.vs")
         return
 
     def validate(self):
@@ -47,72 +120,267 @@ class Memory:
         if self.type == "ROM" and self.init_file == "":
             vs_print(ERROR, "You must provide an init file for ROM.")
             exit(1)
+        if self.read_ports < 1:
+            vs_print(ERROR, f"Memory {self.name} needs at least one read port.")
+            exit(1)
+        if self.type == "RAM" and self.write_ports < 1:
+            vs_print(ERROR, f"RAM {self.name} needs at least one write port.")
+            exit(1)
+        if self.type == "ROM" and self.write_ports > 0:
+            vs_print(ERROR, f"ROM {self.name} cannot have write ports.")
+            exit(1)
+        if self.banks < 1 or self.banks & (self.banks - 1):
+            vs_print(ERROR, f"Memory {self.name}: banks must be a power of two.")
+            exit(1)
+        if self.banks > 1 and self.depth.isdigit() and int(self.depth) % self.banks:
+            vs_print(ERROR, f"Memory {self.name}: depth {self.depth} is not a multiple of {self.banks} banks.")
+            exit(1)
+
+    @property
+    def banked(self):
+        return self.banks > 1
+
+
+def dim(count):
+    """Unpacked dimension of a port signal, none for a single port."""
+    return f" [{count}]" if count > 1 else ""
+
+
+def idx(port, count):
+    """Index of a port signal, none for a single port."""
+    return f"[{port}]" if count > 1 else ""
 
 
 def memory_signals(mem):
-    verilog_code = f"""  // Automatically generated signals for {mem.name} {mem.type} memory
-  localparam integer AddrMSB{mem.name} = (({mem.depth}==1) ? 0 : $clog2({mem.depth})-1);
-  logic [{mem.width}-1:0] {mem.name} [{mem.depth}];
+    n = mem.name
+    yield f"""  // Automatically generated signals for {n} {mem.type} memory
+  localparam integer AddrMSB{n} = (({mem.depth}==1) ? 0 : $clog2({mem.depth})-1);
+  localparam integer {n}_READ_LATENCY = {mem.read_latency};
 """
-    if mem.type == "RAM":
-        verilog_code += f"  logic [AddrMSB{mem.name}:0] {mem.name}_w_addr;\n"
-    verilog_code += f"  logic [AddrMSB{mem.name}:0] {mem.name}_r_addr;\n"
-    verilog_code += f"  logic [{mem.width}-1:0] {mem.name}_data_out;\n"
-    if mem.type == "RAM":
-        verilog_code += f"  logic [{mem.width}-1:0] {mem.name}_data_in;\n"
-        verilog_code += f"  logic [{mem.width}/8-1:0] {mem.name}_w_en;\n"
+    if mem.banked:
+        yield f"""  localparam integer {n}_BANKS = {mem.banks};
+  localparam integer BankMSB{n} = $clog2({mem.banks})-1;
+  localparam integer RowMSB{n} = ((({mem.depth})/{mem.banks}==1) ? 0 : $clog2(({mem.depth})/{mem.banks})-1);
+  logic [{mem.width}-1:0] {n} [{mem.banks}][({mem.depth})/{mem.banks}];
+"""
+    else:
+        yield f"  logic [{mem.width}-1:0] {n} [{mem.depth}];\n"
 
-    with open(f"Mem_{vs_name_suffix}_signals.vs", "w") as file:
-        file.write(verilog_code)
-    return
+    if mem.write_ports:
+        yield f"  logic [AddrMSB{n}:0] {n}_w_addr{dim(mem.write_ports)};\n"
+    yield f"  logic [AddrMSB{n}:0] {n}_r_addr{dim(mem.read_ports)};\n"
+    yield f"  logic [{mem.width}-1:0] {n}_data_out{dim(mem.read_ports)};\n"
+    if mem.write_ports:
+        yield f"  logic [{mem.width}-1:0] {n}_data_in{dim(mem.write_ports)};\n"
+        yield f"  logic [{mem.width}/8-1:0] {n}_w_en{dim(mem.write_ports)};\n"
 
+    if mem.banked:
+        yield f"  logic [{mem.read_ports}-1:0] {n}_r_en;\n"
+        yield f"  logic [{mem.read_ports}-1:0] {n}_r_grant;\n"
+        yield f"  logic [RowMSB{n}:0] {n}_bank_r_row [{mem.banks}];\n"
+        yield f"  logic [{mem.width}-1:0] {n}_bank_data_out [{mem.banks}];\n"
+        if mem.output_reg:
+            yield f"  logic [{mem.width}-1:0] {n}_bank_data_q [{mem.banks}];\n"
+        for stage in range(1, mem.read_latency + 1):
+            yield f"  logic [BankMSB{n}:0] {n}_r_bank_q{stage} [{mem.read_ports}];\n"
+        if mem.write_ports:
+            yield f"  logic [{mem.write_ports}-1:0] {n}_w_grant;\n"
+            yield f"  logic [RowMSB{n}:0] {n}_bank_w_row [{mem.banks}];\n"
+            yield f"  logic [{mem.width}-1:0] {n}_bank_data_in [{mem.banks}];\n"
+            yield f"  logic [{mem.width}/8-1:0] {n}_bank_w_en [{mem.banks}];\n"
+    elif mem.read_latency:
+        yield f"  logic [{mem.width}-1:0] {n}_data_q{dim(mem.read_ports)};\n"
 
-def memory_logic(mem):
-    verilog_code = f"  // Automatically generated logic for {mem.name} {mem.type} memory\n"
-    if mem.type == "ROM":
-        verilog_code += f"  initial begin\n"
-        verilog_code += f'    $readmemh("{mem.init_file}", {mem.name});\n'
-        verilog_code += f"  end\n\n"
-        verilog_code += (
-            f"  assign {mem.name}_data_out = {mem.name}[{mem.name}_r_addr];\n\n"
-        )
-    elif mem.type == "RAM":
-        if mem.init_file != "":
-            verilog_code += f"""
+
+def init_logic(mem):
+    if mem.init_files:
+        yield f"""
   initial begin
-    $readmemh("{mem.init_file}", {mem.name});
+    $readmemh("{mem.init_files[0]}", {mem.name});
   end
 """
-        verilog_code += f"""
-  integer {mem.name}_b;
-  always_ff @(posedge clk_i) begin
-    for ({mem.name}_b = 0; {mem.name}_b < {mem.width} / 8; {mem.name}_b = {mem.name}_b + 1) begin
-      if ({mem.name}_w_en[{mem.name}_b]) begin
-        {mem.name}[{mem.name}_w_addr][8*{mem.name}_b+:8] <= {mem.name}_data_in[8*{mem.name}_b+:8];
+
+
+def write_port_logic(mem, port):
+    n = mem.name
+    i = idx(port, mem.write_ports)
+    counter = f"{n}_b" if mem.write_ports == 1 else f"{n}_b{port}"
+    # Several write ports follow the true-dual-port block RAM template: one process per port.
+    process = "always_ff" if mem.write_ports == 1 else "always"
+    yield f"""
+  integer {counter};
+  {process} @(posedge clk_i) begin
+    for ({counter} = 0; {counter} < {mem.width} / 8; {counter} = {counter} + 1) begin
+      if ({n}_w_en{i}[{counter}]) begin
+        {n}[{n}_w_addr{i}][8*{counter}+:8] <= {n}_data_in{i}[8*{counter}+:8];
       end
     end
   end
-  assign {mem.name}_data_out = {mem.name}[{mem.name}_r_addr];\n
+"""
+
+
+def read_port_logic(mem, port):
+    n = mem.name
+    i = idx(port, mem.read_ports)
+    if mem.read_latency == 0:
+        yield f"  assign {n}_data_out{i} = {n}[{n}_r_addr{i}];\n"
+        return
+    if mem.sync_read:
+        first_stage = f"{n}_data_q{i}" if mem.output_reg else f"{n}_data_out{i}"
+        yield f"""  always_ff @(posedge clk_i) begin
+    {first_stage} <= {n}[{n}_r_addr{i}];
+  end
 """
     else:
-        vs_print(ERROR, "Invalid memory type.")
+        # Asynchronous read: only the output register is clocked.
+        yield f"  assign {n}_data_q{i} = {n}[{n}_r_addr{i}];\n"
+    if mem.output_reg:
+        yield f"""  always_ff @(posedge clk_i) begin
+    {n}_data_out{i} <= {n}_data_q{i};
+  end
+"""
+
+
+def banked_logic(mem):
+    n = mem.name
+    bank_of = lambda signal: f"{signal}[BankMSB{n}:0]"
+    row_of = lambda signal: f"{signal}[AddrMSB{n}:BankMSB{n}+1]"
+
+    yield f"""
+  // Bank arbitration: bank = address[BankMSB{n}:0], the lowest port index wins a bank
+  always_comb begin
+    {n}_r_grant = '0;
+"""
+    if mem.write_ports:
+        yield f"    {n}_w_grant = '0;\n"
+    for bank in range(mem.banks):
+        yield f"    {n}_bank_r_row[{bank}] = '0;\n"
+        for port in range(mem.read_ports):
+            i = idx(port, mem.read_ports)
+            keyword = "if" if port == 0 else "end else if"
+            yield (
+                f"    {keyword} ({n}_r_en[{port}] & ({bank_of(f'{n}_r_addr{i}')} == {bank})) begin\n"
+                f"      {n}_bank_r_row[{bank}] = {row_of(f'{n}_r_addr{i}')};\n"
+                f"      {n}_r_grant[{port}] = 1'b1;\n"
+            )
+        yield "    end\n"
+        if not mem.write_ports:
+            continue
+        yield (
+            f"    {n}_bank_w_row[{bank}] = '0;\n"
+            f"    {n}_bank_data_in[{bank}] = '0;\n"
+            f"    {n}_bank_w_en[{bank}] = '0;\n"
+        )
+        for port in range(mem.write_ports):
+            i = idx(port, mem.write_ports)
+            keyword = "if" if port == 0 else "end else if"
+            yield (
+                f"    {keyword} ((|{n}_w_en{i}) & ({bank_of(f'{n}_w_addr{i}')} == {bank})) begin\n"
+                f"      {n}_bank_w_row[{bank}] = {row_of(f'{n}_w_addr{i}')};\n"
+                f"      {n}_bank_data_in[{bank}] = {n}_data_in{i};\n"
+                f"      {n}_bank_w_en[{bank}] = {n}_w_en{i};\n"
+                f"      {n}_w_grant[{port}] = 1'b1;\n"
+            )
+        yield "    end\n"
+    yield "  end\n"
+
+    if mem.init_files:
+        # One bank-major file for the whole [banks][rows] array
+        yield f"""
+  initial begin
+    $readmemh("{mem.init_files[0]}", {n});
+  end
+"""
+
+    # One simple dual port memory per bank
+    yield f"""
+  for (genvar {n}_k = 0; {n}_k < {mem.banks}; {n}_k = {n}_k + 1) begin : gen_{n}_bank
+"""
+    if mem.write_ports:
+        yield f"""    always_ff @(posedge clk_i) begin
+      for (int {n}_b = 0; {n}_b < {mem.width} / 8; {n}_b = {n}_b + 1) begin
+        if ({n}_bank_w_en[{n}_k][{n}_b]) begin
+          {n}[{n}_k][{n}_bank_w_row[{n}_k]][8*{n}_b+:8] <= {n}_bank_data_in[{n}_k][8*{n}_b+:8];
+        end
+      end
+    end
+"""
+    bank_read = f"{n}[{n}_k][{n}_bank_r_row[{n}_k]]"
+    if mem.read_latency == 0:
+        yield f"    assign {n}_bank_data_out[{n}_k] = {bank_read};\n"
+    elif mem.sync_read and mem.output_reg:
+        yield f"""    always_ff @(posedge clk_i) begin
+      {n}_bank_data_q[{n}_k] <= {bank_read};
+      {n}_bank_data_out[{n}_k] <= {n}_bank_data_q[{n}_k];
+    end
+"""
+    else:
+        yield f"""    always_ff @(posedge clk_i) begin
+      {n}_bank_data_out[{n}_k] <= {bank_read};
+    end
+"""
+    yield "  end\n"
 
-    with open(f"Mem_{vs_name_suffix}.vs", "w") as file:
-        file.write(verilog_code)
-    return
+    # Route bank outputs back to the ports, delaying the bank index by the read latency
+    if mem.read_latency:
+        yield "\n  always_ff @(posedge clk_i) begin\n"
+        for port in range(mem.read_ports):
+            i = idx(port, mem.read_ports)
+            yield f"    {n}_r_bank_q1[{port}] <= {bank_of(f'{n}_r_addr{i}')};\n"
+            for stage in range(2, mem.read_latency + 1):
+                yield f"    {n}_r_bank_q{stage}[{port}] <= {n}_r_bank_q{stage - 1}[{port}];\n"
+        yield "  end\n"
+    for port in range(mem.read_ports):
+        i = idx(port, mem.read_ports)
+        if mem.read_latency:
+            bank = f"{n}_r_bank_q{mem.read_latency}[{port}]"
+        else:
+            bank = bank_of(f"{n}_r_addr{i}")
+        yield f"  assign {n}_data_out{i} = {n}_bank_data_out[{bank}];\n"
 
 
-def parse_arguments():
-    if len(sys.argv) < 2:
+def memory_logic(mem):
+    yield f"  // Automatically generated logic for {mem.name} {mem.type} memory\n"
+    if mem.banked:
+        yield from banked_logic(mem)
+        yield "\n"
+        return
+    if mem.type == "ROM":
+        yield f"  initial begin\n"
+        yield f'    $readmemh("{mem.init_files[0]}", {mem.name});\n'
+        yield f"  end\n\n"
+    else:
+        yield from init_logic(mem)
+        for port in range(mem.write_ports):
+            yield from write_port_logic(mem, port)
+    for port in range(mem.read_ports):
+        yield from read_port_logic(mem, port)
+    yield "\n"
+
+
+def parse_arguments(name):
+    if len(sys.argv) < 3:
         vs_print(ERROR, "Not enough arguments.")
         exit(1)
 
-    memory_config = sys.argv[2].replace("//", "").strip().split(",")
+    try:
+        records = tokenize(comment_text(sys.argv[2]), allowed=MEMORY_FIELDS)
+    except ValueError as error:
+        vs_print(ERROR, f"Malformed memory description for {name}: {error}.")
+        exit(1)
+    if not records:
+        vs_print(ERROR, "You must provide the memory type: RAM or ROM.")
+        exit(1)
 
-    return memory_config
+    return records[0]
 
 
 # Check if this script is called directly
 if __name__ == "__main__":
-    mem = Memory(parse_arguments(), vs_name_suffix)
-    mem.generate_verilog()
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    track_dependencies()
+    with phase("parse"):
+        mem = Memory(parse_arguments(vs_name_suffix), vs_name_suffix)
+    with phase("generate"):
+        mem.generate_verilog()
+    write_dependencies()
@@ -5,28 +5,244 @@
 #   `include "counter_{name}.vs" // Counter Width, Enable, Reset
 
 # Default values are: Counter Width = 8 bits; Enable = 1'b1; Reset = 1'b0.
+#
+# Optional keyword fields:
+#   direction=D    up (default), down, or a signal that counts up when high and down when low
+#   load=L         signal that loads load_value=V (default {name}_load_value) instead of counting
+#   max=M          terminal count: counting up wraps from M to 0, counting down from 0 to M
+#   saturate=1     stop at the terminal count (M, or all ones, counting up; 0 counting down)
+#   tc=1           {name}_tc pulses in the enabled cycle the counter wraps or saturates
+#   prescale=N     count once every N enabled cycles; N*M*... cascades prescaler stages,
+#                  {name}_tick is the enable the prescalers give to the counter
+#   segment=S      split the counter into S-bit segments. The carry into a segment comes from
+#                  registered "all ones"/"all zeros" flags of the segments below, so the
+#                  longest adder is S bits wide (Counter Width must be a number)
+# {name} and {name}_next are declared by the caller; other signals are declared by the snippet.
 
-import sys, re
+import sys
 
 from VeriSnip.vs_colours import *
+from vs_arguments import comment_text, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
 
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
-vs_name = f"counter_{vs_name_suffix}.vs"
+OPTIONS = ("direction", "load", "load_value", "max", "saturate", "tc", "prescale", "segment")
 
 
-def write_vs(string="", file_name=None):
-    with open(file_name, "w") as file:
-        file.write(string)
+def verilog_string(name, counter_width, enable, reset):
+    verilog_code = f"  // Automatically generated {name}\n"
+    verilog_code += f'  `include "reg_{name}.vs" // {counter_width}, 0, {reset}, {enable}, {name}_next\n'
+    verilog_code += f'  assign {name}_next = {name} + 1;\n'
+    return verilog_code
+
+
+class Counter:
+    def __init__(self, args, name):
+        self.name = name
+        self.width = args.get(0, "width") or "8"
+        self.enable = args.get(1, "enable") or "1'b1"
+        self.reset = args.get(2, "reset") or "1'b0"
+        self.direction = args.get(None, "direction", "up")
+        self.load = args.get(None, "load")
+        self.load_value = args.get(None, "load_value") or f"{name}_load_value"
+        self.max = args.get(None, "max")
+        self.saturate = args.get(None, "saturate", "0").lower() in ("1", "true", "yes")
+        self.tc = args.get(None, "tc", "0").lower() in ("1", "true", "yes")
+        self.prescale = self.numbers(args.get(None, "prescale"), "prescale", 2)
+        segment = self.numbers(args.get(None, "segment"), "segment", 1)
+        self.segment = segment[0] if segment else 0
+        if self.segment and not self.width.isdigit():
+            vs_print(ERROR, f"Counter {name}: segment needs a numeric width, got {self.width}.")
+            exit(1)
+        if self.segment >= int(self.width or 0):
+            self.segment = 0
+
+    def numbers(self, value, field, minimum):
+        if value == "":
+            return []
+        factors = [factor.strip() for factor in value.split("*")]
+        if not all(factor.isdigit() and int(factor) >= minimum for factor in factors):
+            vs_print(ERROR, f"Counter {self.name}: {field} must be numbers of at least {minimum}, got {value}.")
+            exit(1)
+        return [int(factor) for factor in factors]
+
+    @property
+    def counts_up(self):
+        return self.direction != "down"
+
+    @property
+    def counts_down(self):
+        return self.direction != "up"
+
+    @property
+    def up(self):
+        """Condition selecting the up count, for counters given a direction signal."""
+        return {"up": "1'b1", "down": "1'b0"}.get(self.direction, self.direction)
+
+    @property
+    def terminal(self):
+        return self.max or "'1"
+
+    @property
+    def needs_flags(self):
+        return bool(self.max) or self.saturate or self.tc
+
+    @property
+    def segments(self):
+        """(msb, lsb) of every segment, least significant first."""
+        width = int(self.width)
+        return [
+            (min(width, lsb + self.segment) - 1, lsb) for lsb in range(0, width, self.segment)
+        ]
+
+
+def declarations(counter):
+    n = counter.name
+    code = f"  logic {n}_en;\n"
+    for stage, factor in enumerate(counter.prescale):
+        code += f"  logic [{max(1, (factor - 1).bit_length()) - 1}:0] {n}_pre{stage}, {n}_pre{stage}_next;\n"
+        code += f"  logic {n}_tick{stage};\n"
+    if counter.prescale:
+        code += f"  logic {n}_tick;\n"
+    if counter.segment:
+        flags = len(counter.segments) - 1
+        if counter.counts_up:
+            code += f"  logic [{counter.width}-1:0] {n}_inc;\n"
+            code += f"  logic [{flags - 1}:0] {n}_ones, {n}_ones_next;\n"
+        if counter.counts_down:
+            code += f"  logic [{counter.width}-1:0] {n}_dec;\n"
+            code += f"  logic [{flags - 1}:0] {n}_zeros, {n}_zeros_next;\n"
+    if counter.needs_flags:
+        if counter.counts_up:
+            code += f"  logic {n}_at_max, {n}_at_max_next;\n"
+        if counter.counts_down:
+            code += f"  logic {n}_at_zero, {n}_at_zero_next;\n"
+    if counter.tc:
+        code += f"  logic {n}_tc;\n"
+    return code
+
+
+def prescaler(counter):
+    n = counter.name
+    code = ""
+    enable = counter.enable
+    for stage, factor in enumerate(counter.prescale):
+        width = max(1, (factor - 1).bit_length())
+        code += f"  assign {n}_tick{stage} = {enable} & ({n}_pre{stage} == {width}'d{factor - 1});\n"
+        code += f"  assign {n}_pre{stage}_next = {n}_tick{stage} ? '0 : {n}_pre{stage} + 1'b1;\n"
+        code += f'  `include "reg_{n}_pre{stage}.vs" // {width}, 0, {counter.reset}, {enable}, {n}_pre{stage}_next\n'
+        enable = f"{n}_tick{stage}"
+    code += f"  assign {n}_tick = {enable};\n"
+    return code
 
 
-def verilog_string(counter_width, enable, reset):
-    verilog_code = f"  // Automatically generated {vs_name_suffix}\n"
-    verilog_code += f'  `include "reg_{vs_name_suffix}.vs" // {counter_width}, 0, {reset}, {enable}, {vs_name_suffix}_next\n'
-    verilog_code += f'  assign {vs_name_suffix}_next = {vs_name_suffix} + 1;\n'
+def segmented_steps(counter):
+    """Increment and decrement of every segment, carried by the flags of the segments below."""
+    n = counter.name
+    code = ""
+    for index, (msb, lsb) in enumerate(counter.segments):
+        if counter.counts_up:
+            carry = "1'b1" if index == 0 else f"(&{n}_ones[{index - 1}:0])"
+            code += f"  assign {n}_inc[{msb}:{lsb}] = {n}[{msb}:{lsb}] + {carry};\n"
+        if counter.counts_down:
+            borrow = "1'b1" if index == 0 else f"(&{n}_zeros[{index - 1}:0])"
+            code += f"  assign {n}_dec[{msb}:{lsb}] = {n}[{msb}:{lsb}] - {borrow};\n"
+    for index, (msb, lsb) in enumerate(counter.segments[:-1]):
+        if counter.counts_up:
+            code += f"  assign {n}_ones_next[{index}] = &{n}_next[{msb}:{lsb}];\n"
+        if counter.counts_down:
+            code += f"  assign {n}_zeros_next[{index}] = ~|{n}_next[{msb}:{lsb}];\n"
+    return code
+
+
+def next_value(counter):
+    n = counter.name
+    if counter.segment:
+        increment, decrement = f"{n}_inc", f"{n}_dec"
+    else:
+        increment, decrement = f"{n} + 1'b1", f"{n} - 1'b1"
+    if counter.needs_flags:
+        wrap_up = n if counter.saturate else "'0"
+        wrap_down = n if counter.saturate else counter.terminal
+        increment = f"{n}_at_max ? {wrap_up} : {increment}"
+        decrement = f"{n}_at_zero ? {wrap_down} : {decrement}"
+
+    # Load has priority over counting; a direction signal selects the increment or decrement.
+    choices = []
+    if counter.load:
+        choices.append((counter.load, counter.load_value))
+    if counter.direction == "up":
+        default = increment
+    elif counter.direction == "down":
+        default = decrement
+    else:
+        choices.append((counter.up, increment))
+        default = decrement
+
+    code = "  always_comb begin\n"
+    if not choices:
+        return code + f"    {n}_next = {default};\n  end\n"
+    for index, (condition, value) in enumerate(choices):
+        keyword = "if" if index == 0 else "end else if"
+        code += f"    {keyword} ({condition}) begin\n      {n}_next = {value};\n"
+    code += f"    end else begin\n      {n}_next = {default};\n    end\n  end\n"
+    return code
+
+
+def flag_registers(counter, enable):
+    """Registered flags computed from {name}_next, so no wide compare sits on the count path."""
+    n = counter.name
+    records = []
+    code = ""
+    if counter.segment:
+        flags = len(counter.segments) - 1
+        if counter.counts_up:
+            records.append(f"{n}_ones, {flags}, 0, {counter.reset}, {enable}, {n}_ones_next")
+        if counter.counts_down:
+            records.append(f"{n}_zeros, {flags}, '1, {counter.reset}, {enable}, {n}_zeros_next")
+    if counter.needs_flags:
+        if counter.counts_up:
+            code += f"  assign {n}_at_max_next = ({n}_next == {counter.terminal});\n"
+            records.append(f"{n}_at_max, 1, 0, {counter.reset}, {enable}, {n}_at_max_next")
+        if counter.counts_down:
+            code += f"  assign {n}_at_zero_next = ({n}_next == '0);\n"
+            records.append(f"{n}_at_zero, 1, 1, {counter.reset}, {enable}, {n}_at_zero_next")
+    if records:
+        code += f'  `include "reg_{n}_flags.vs" /*\n'
+        code += "".join(f"    {record}\n" for record in records)
+        code += "    */\n"
+    return code
+
+
+def extended_verilog_string(counter):
+    n = counter.name
+    verilog_code = f"  // Automatically generated {n}\n"
+    verilog_code += declarations(counter)
+    if counter.prescale:
+        verilog_code += prescaler(counter)
+        verilog_code += f"  assign {n}_en = {n}_tick;\n"
+    else:
+        verilog_code += f"  assign {n}_en = {counter.enable};\n"
+    enable = f"{n}_en | {counter.load}" if counter.load else f"{n}_en"
+    if counter.segment:
+        verilog_code += segmented_steps(counter)
+    verilog_code += next_value(counter)
+    verilog_code += f'  `include "reg_{n}.vs" // {counter.width}, 0, {counter.reset}, {enable}, {n}_next\n'
+    verilog_code += flag_registers(counter, enable)
+    if counter.tc:
+        if counter.direction == "up":
+            terminal = f"{n}_at_max"
+        elif counter.direction == "down":
+            terminal = f"{n}_at_zero"
+        else:
+            terminal = f"({counter.up} ? {n}_at_max : {n}_at_zero)"
+        no_load = f" & ~{counter.load}" if counter.load else ""
+        verilog_code += f"  assign {n}_tc = {n}_en{no_load} & {terminal};\n"
     return verilog_code
 
 
-def parse_arguments():
+def parse_arguments(name):
     if len(sys.argv) < 2:
         vs_print(ERROR, "Not enough arguments.")
         exit(1)
@@ -34,31 +250,36 @@ def parse_arguments():
     # Check if any argument contains "//"
     has_double_slash = any("//" in arg for arg in sys.argv[1:])
     if has_double_slash:
-        args = sys.argv[2][sys.argv[2].index("//")+2:].split(',')
-        if len(args) == 3:
-            counter_width = args[0].strip()
-            enable = args[1].strip()
-            reset = args[2].strip()
-        elif len(args) == 2:
-            counter_width = args[0].strip()
-            enable = args[1].strip()
-            reset = "1'b0"
-        elif len(args) == 1:
-            counter_width = args[0].strip()
-            enable = "1'b1"
-            reset = "1'b0"
-        else:
+        try:
+            records = tokenize(comment_text(sys.argv[2]), allowed=("width", "enable", "reset") + OPTIONS)
+        except ValueError as error:
+            vs_print(ERROR, f"Malformed counter description for {name}: {error}.")
+            exit(1)
+        if len(records) != 1 or records[0].keys.count(None) > 3:
             vs_print(ERROR, "Invalid number of arguments.")
             exit(1)
+        args = records[0]
     else:
         vs_print(ERROR, "Unsuported argument format.")
         exit(1)
 
-    return counter_width, enable, reset
+    return args
 
 
 # Check if this script is called directly
 if __name__ == "__main__":
-    counter_width, enable, reset = parse_arguments()
-    vs_content = verilog_string(counter_width, enable, reset)
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    vs_name = f"counter_{vs_name_suffix}.vs"
+    track_dependencies()
+    with phase("parse"):
+        args = parse_arguments(vs_name_suffix)
+    with phase("generate"):
+        if any(args.has(option) for option in OPTIONS):
+            vs_content = extended_verilog_string(Counter(args, vs_name_suffix))
+        else:
+            counter_width = args.get(0, "width")
+            enable = args.get(1, "enable") or "1'b1"
+            reset = args.get(2, "reset") or "1'b0"
+            vs_content = verilog_string(vs_name_suffix, counter_width, enable, reset)
     write_vs(vs_content, vs_name)
+    write_dependencies()
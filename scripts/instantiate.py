@@ -6,17 +6,10 @@
 # Default values are: prefix = "{module_name}_"; suffix = ""; {port_name} = "{prefix}{port_name}{suffix}".
 
 import sys, os, re
-import subprocess
-from VeriSnip.vs_build import (
-    find_verilog_and_scripts,
-    find_or_generate,
-    find_filename_in_list,
-    substitute_vs_file,
-)
 from VeriSnip.vs_colours import *
-
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
-vs_name = f"instantiate_{vs_name_suffix}.vs"
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
 
 callee_module = ""
 module = ""
@@ -30,7 +23,7 @@ custom_ports = {}
 PROGRAM = "instantiate.py"
 
 
-def update_module_text(module_text, prefix):
+def update_module_text(module_text, prefix, name):
     global parameters, ports_text
     module_parameters = []
     module_ports = []
@@ -71,11 +64,11 @@ def update_module_text(module_text, prefix):
         module_ports[-1] = module_ports[-1].replace(",", "")
         ports_text = "\n".join(module_ports)
 
-    generate_io_signals(module_new_ports)
+    generate_io_signals(module_new_ports, name)
 
 
-def generate_io_signals(io_dictionary):
-    generated_signals = f"  // Automatically generated signals for {vs_name_suffix} instantiation\n"
+def generate_io_signals(io_dictionary, name):
+    generated_signals = f"  // Automatically generated signals for {name} instantiation\n"
     for io_name in io_dictionary:
         match = re.search(r".*?\[(.*?):.*?\].*?", io_dictionary[io_name])
         if match:
@@ -102,13 +95,8 @@ def extract_comment(line):
         return line.strip(), ""
 
 
-def write_vs(string="", file_name="reg.vs"):
-    with open(file_name, "w") as file:
-        file.write(string)
-
-
-def create_vs(content):
-    update_module_text(content, prefix)
+def create_vs(content, name):
+    update_module_text(content, prefix, name)
     if parameters != "":
         parameters_text = f"#(\n{parameters}\n  ) "
     else:
@@ -119,16 +107,16 @@ def create_vs(content):
 {ports_text}
   );
 """
-    write_vs(instantiation, vs_name)
+    write_vs(instantiation, f"instantiate_{name}.vs")
 
 
-def parse_arguments():
+def parse_arguments(name):
     global module, module_name, prefix, suffix, callee_module
 
     if len(sys.argv) < 2:
         exit(1)
 
-    module, module_name = get_module()
+    module, module_name = get_module(name)
 
     # vs_print(DEBUG, ' '.join(sys.argv))
     arguments = re.split(r" (?![^\"\"]*[\"])", sys.argv[2])
@@ -153,9 +141,9 @@ def parse_arguments():
         callee_module, _ = os.path.splitext(sys.argv[3])
 
 
-def get_module(start_path=os.getcwd()):
+def get_module(name, start_path=None):
     file_list = []
-    for root, dirs, files in os.walk(start_path):
+    for root, dirs, files in os.walk(start_path or os.getcwd()):
         filtered_dirs = []
         for directory in dirs:
             if directory not in [".git", "build", "generated", "__pycache__"]:
@@ -164,8 +152,8 @@ def get_module(start_path=os.getcwd()):
         for file in files:
             file_list.append(file)
 
-    module = find_most_similar_name(vs_name_suffix, file_list)
-    module_name = vs_name_suffix.removeprefix(module + "_")
+    module = find_most_similar_name(name, file_list)
+    module_name = name.removeprefix(module + "_")
 
     return module, module_name
 
@@ -190,6 +178,14 @@ def find_most_similar_name(input_name, file_names):
 
 
 def module_definition_content(current_directory):
+    # VeriSnip.vs_build is only needed here, to find or generate the instantiated module.
+    from VeriSnip.vs_build import (
+        find_verilog_and_scripts,
+        find_or_generate,
+        find_filename_in_list,
+        substitute_vs_file,
+    )
+
     sources_list = []
 
     script_files, verilog_files = find_verilog_and_scripts(current_directory)
@@ -243,7 +239,12 @@ def module_definition_content(current_directory):
 
 # Check if this script is called directly
 if __name__ == "__main__":
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    track_dependencies()
     current_directory = os.getcwd()
-    parse_arguments()
-    content = module_definition_content(current_directory)
-    create_vs(content)
+    with phase("parse"):
+        parse_arguments(vs_name_suffix)
+    with phase("generate"):
+        content = module_definition_content(current_directory)
+        create_vs(content, vs_name_suffix)
+    write_dependencies()
@@ -11,17 +11,37 @@
 #             ...
 #             */
 # Default values are: Size = 1 bit; Reset Value = 0; Reg_reset = None; Reg_enable = None; Reg_next = {Reg_name}_n.
+#
+# An optional Clock field (default clk_i) may follow Reg_next. Reg_reset may carry the same
+# annotations as FSM.py headers: "asynchronous arst_i (active-low)" or "synchronous rst_i (active-high)".
+# A Reg_reset without them is synchronous and active-high.
+# A register list may start with a header line that sets the defaults for every register in the list:
+#   `include "reg_{list_name}.vs" /* [asynchronous] reset = <rst> [(active-low)], clock = <clk>
+#             Reg_name0, Size, Reset Value, Reg_reset, Reg_enable, Reg_next
+#             */
+# Registers with an empty Reg_reset inherit the header reset and its kind ("None" disables it).
+# Registers sharing a clock and an asynchronous reset are described in the same always block.
 
-import sys, re
+import sys
 
 from VeriSnip.vs_colours import *
+from vs_arguments import HEADER_KEYS, Record, comment_text, parse_header, reset_kind, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
 
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
-vs_name = f"reg_{vs_name_suffix}.vs"
+REGISTER_FIELDS = ("name", "size", "rst_val", "rst", "en", "next", "clock")
 
 
 class register:
-    def __init__(self, reg_properties):
+    def __init__(
+        self,
+        reg_properties,
+        clock="clk_i",
+        reset=None,
+        async_reset=False,
+        active_low=False,
+    ):
         self.name = ""
         self.signal = ""
         self.size = ""
@@ -29,23 +49,25 @@ class register:
         self.rst = ""
         self.en = ""
         self.next = ""
-
-        reg_properties = [reg_property.strip() for reg_property in reg_properties]
-        # TO DO: function that parses reg_properties and is able to organize its values in a list
-        try:
-            self.set_reg_name(reg_properties[0])
-            self.set_reg_size(reg_properties[1])
-            self.set_reg_rst_val(reg_properties[2])
-            self.set_reg_rst(reg_properties[3])
-            self.set_reg_en(reg_properties[4])
-            self.set_reg_next(reg_properties[5])
-        except IndexError:
-            vs_print(ERROR, f"Not enough arguments for register {reg_properties[0]}.")
+        self.clock = clock
+        self.async_reset = async_reset
+        self.active_low = active_low
+        self.default_rst = reset
+
+        if not isinstance(reg_properties, Record):
+            reg_properties = Record([prop.strip() for prop in reg_properties])
+        if len(reg_properties) < 6 and not reg_properties.has("next"):
+            vs_print(ERROR, f"Not enough arguments for register {reg_properties.get(0, 'name')}.")
             exit(1)
+        self.set_reg_name(reg_properties.get(0, "name"))
+        self.set_reg_size(reg_properties.get(1, "size"))
+        self.set_reg_rst_val(reg_properties.get(2, "rst_val"))
+        self.set_reg_rst(reg_properties.get(3, "rst"))
+        self.set_reg_en(reg_properties.get(4, "en"))
+        self.set_reg_next(reg_properties.get(5, "next"))
+        self.set_reg_clock(reg_properties.get(6, "clock"))
 
     def set_reg_name(self, reg_name):
-        if "name=" in reg_name:
-            reg_name = reg_name.split("name=")[1]
         if reg_name == "":
             vs_print(ERROR, "You should give a name to the register.")
             exit(1)
@@ -58,16 +80,12 @@ class register:
                 break
 
     def set_reg_size(self, reg_size):
-        if "size=" in reg_size:
-            reg_size = reg_size.split("=")[1]
         if reg_size == "":
             self.size = "1"
         else:
             self.size = reg_size
 
     def set_reg_rst_val(self, reg_rst_val):
-        if "rst_val=" in reg_rst_val:
-            reg_rst_val = reg_rst_val.split("=")[1]
         if reg_rst_val == "" or reg_rst_val == "0":
             if self.size != "1":
                 self.rst_val = "{" + self.size + "{1'b0}}"
@@ -79,8 +97,13 @@ class register:
             self.rst_val = reg_rst_val
 
     def set_reg_rst(self, reg_rst):
-        if "rst=" in reg_rst:
-            reg_rst = reg_rst.split("=")[1]
+        if reg_rst == "":
+            # Only an empty field inherits the header reset and its kind.
+            reg_rst = self.default_rst if self.default_rst is not None else ""
+        else:
+            reg_rst, asynchronous, active_low = reset_kind(reg_rst)
+            self.async_reset = bool(asynchronous)
+            self.active_low = bool(active_low)
         if (reg_rst == "") or (reg_rst == "None") or (reg_rst == "1'b0"):
             self.rst = None
         elif reg_rst.startswith("_"):
@@ -89,8 +112,6 @@ class register:
             self.rst = reg_rst
 
     def set_reg_en(self, reg_en):
-        if "en=" in reg_en:
-            reg_en = reg_en.split("=")[1]
         if (reg_en == "") or (reg_en == "None") or (reg_en == "1'b1"):
             self.en = None
         elif reg_en.startswith("_"):
@@ -99,8 +120,6 @@ class register:
             self.en = reg_en
 
     def set_reg_next(self, reg_next):
-        if "next=" in reg_next:
-            reg_next = reg_next.split("=")[1]
         if reg_next == "":
             self.next = f"{self.name}_n"
         elif reg_next.startswith("_"):
@@ -108,66 +127,123 @@ class register:
         else:
             self.next = reg_next
 
-
-def write_vs(string="", file_name="reg.vs"):
-    with open(file_name, "w") as file:
-        file.write(string)
-
-
-def reg_description(reg_list):
-    verilog_code = f"  // Automatically generated register {vs_name_suffix}\n"
-    verilog_code += "  always @(posedge clk_i) begin\n"
+    def set_reg_clock(self, reg_clock):
+        if reg_clock != "":
+            self.clock = reg_clock
+
+    @property
+    def rst_field(self):
+        """Reset as written in a register record, so that the register can be passed on to reg.py."""
+        if self.rst is None:
+            return "None"
+        kind = "asynchronous " if self.async_reset else ""
+        polarity = " (active-low)" if self.active_low else ""
+        return f"{kind}{self.rst}{polarity}"
+
+    @property
+    def rst_cond(self):
+        return f"!{self.rst}" if self.active_low else self.rst
+
+    @property
+    def domain(self):
+        """Registers with the same domain can be described in one always block."""
+        if self.rst is not None and self.async_reset:
+            return (self.clock, self.rst, self.active_low)
+        return (self.clock, None, False)
+
+
+def group_by_domain(reg_list):
+    domains = {}
     for reg in reg_list:
-        verilog_code += f"      // Register {reg.signal}\n"
-        if (reg.rst is not None) and (reg.en is not None):
-            verilog_code += f"    if ({reg.rst}) begin\n"
-            verilog_code += f"      {reg.signal} <= {reg.rst_val};\n"
-            verilog_code += f"    end else if ({reg.en}) begin\n"
-            verilog_code += f"      {reg.signal} <= {reg.next};\n"
-            verilog_code += f"    end\n"
-        elif reg.rst is not None:
-            verilog_code += f"    if ({reg.rst}) begin\n"
-            verilog_code += f"      {reg.signal} <= {reg.rst_val};\n"
-            verilog_code += f"    end else begin\n"
-            verilog_code += f"      {reg.signal} <= {reg.next};\n"
-            verilog_code += f"    end\n"
-        elif reg.en is not None:
-            verilog_code += f"    if ({reg.en}) begin\n"
-            verilog_code += f"      {reg.signal} <= {reg.next};\n"
-            verilog_code += f"    end\n"
-        else:
-            verilog_code += f"    {reg.signal} <= {reg.next};\n"
-    verilog_code += "  end\n"
-
-    return verilog_code
+        domains.setdefault(reg.domain, []).append(reg)
+    return domains
+
+
+def sensitivity_list(domain):
+    clock, arst, active_low = domain
+    if arst is None:
+        return f"posedge {clock}"
+    return f"posedge {clock} or {'negedge' if active_low else 'posedge'} {arst}"
+
+
+def reg_description(reg_list, name):
+    """Yield the register snippet reg_{name}.vs one register at a time."""
+    yield f"  // Automatically generated register {name}\n"
+    for domain, domain_regs in group_by_domain(reg_list).items():
+        yield f"  always @({sensitivity_list(domain)}) begin\n"
+        for reg in domain_regs:
+            if (reg.rst is not None) and (reg.en is not None):
+                yield (
+                    f"      // Register {reg.signal}\n"
+                    f"    if ({reg.rst_cond}) begin\n"
+                    f"      {reg.signal} <= {reg.rst_val};\n"
+                    f"    end else if ({reg.en}) begin\n"
+                    f"      {reg.signal} <= {reg.next};\n"
+                    f"    end\n"
+                )
+            elif reg.rst is not None:
+                yield (
+                    f"      // Register {reg.signal}\n"
+                    f"    if ({reg.rst_cond}) begin\n"
+                    f"      {reg.signal} <= {reg.rst_val};\n"
+                    f"    end else begin\n"
+                    f"      {reg.signal} <= {reg.next};\n"
+                    f"    end\n"
+                )
+            elif reg.en is not None:
+                yield (
+                    f"      // Register {reg.signal}\n"
+                    f"    if ({reg.en}) begin\n"
+                    f"      {reg.signal} <= {reg.next};\n"
+                    f"    end\n"
+                )
+            else:
+                yield (
+                    f"      // Register {reg.signal}\n"
+                    f"    {reg.signal} <= {reg.next};\n"
+                )
+        yield "  end\n"
 
 
-def parse_arguments():
+def parse_arguments(name):
     register_list = []
-    registers_description = []
 
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 3:
         vs_print(ERROR, "Not enough arguments.")
         exit(1)
 
-    # Check if any argument contains "//"
-    has_double_slash = any("//" in arg for arg in sys.argv[1:])
-    if has_double_slash:
-        joined_args = f'{vs_name_suffix}, {sys.argv[2][sys.argv[2].index("//")+2:]}'
-        registers_description = [joined_args]
-    else:
-        registers_description = sys.argv[2].split("\n")
+    try:
+        records = tokenize(comment_text(sys.argv[2]), allowed=REGISTER_FIELDS + HEADER_KEYS)
+    except ValueError as error:
+        vs_print(ERROR, f"Malformed register description for {name}: {error}.")
+        exit(1)
+
+    # Check if the register is described inline ("//"): its name is the snippet name
+    if "//" in sys.argv[2] and "/*" not in sys.argv[2]:
+        single = records[0] if records else Record([""])
+        records = [Record([name] + single, [None] + single.keys)]
+
+    reset, clock, async_reset, active_low = None, "clk_i", False, False
+    if records:
+        reset, clock, async_reset, active_low, is_header = parse_header(records[0])
+        if is_header:
+            records = records[1:]
 
-    for description in registers_description:
-        # Split the string by commas outside of any type of braces
-        reg_properties = re.split(r",(?![^{}[\]()]*[}\])])", description)
-        register_list.append(register(reg_properties))
+    for reg_properties in records:
+        register_list.append(
+            register(reg_properties, clock, reset, async_reset, active_low)
+        )
 
     return register_list
 
 
 # Check if this script is called directly
 if __name__ == "__main__":
-    reg_list = parse_arguments()
-    vs_content = reg_description(reg_list)
-    write_vs(vs_content, vs_name)
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    vs_name = f"reg_{vs_name_suffix}.vs"
+    track_dependencies()
+    with phase("parse"):
+        reg_list = parse_arguments(vs_name_suffix)
+    with phase("generate"):
+        write_vs(reg_description(reg_list, vs_name_suffix), vs_name)
+    write_dependencies()
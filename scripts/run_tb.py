@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+# run_tb.py runs the testbenches in modules/tb in parallel and caches their results.
+# It is not a snippet generator. Call it from anywhere in the repository:
+#   python scripts/run_tb.py [FIFO_tb Reg_tb ...] --simulator {icarus|verilator} --jobs N --force
+# Every {DUT}_tb.[s]v in modules/tb is tested against modules/{DUT}.[s]v (all of them by default).
+# The snippets they include are generated in-process by the scripts in this directory, in
+# build/tb/{testbench}, the same way VeriSnip would call them. Snippets kept outside the
+# repository (e.g. in Util-Tool) are found with --include DIR.
+# A result is reused while the DUT, the testbench, every module and snippet they use (generated
+# or not), the simulator and the plusargs are unchanged (build/tb/results.json); --force reruns.
+# Plusargs after "--" are given to every simulation, e.g. "-- +golden=100000".
+# A test fails when the simulator exits with an error or its log reports FAIL, ERROR or TIMEOUT.
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import runpy
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from VeriSnip.vs_colours import *
+
+SCRIPTS = Path(__file__).resolve().parent
+ROOT = SCRIPTS.parent
+MODULES = ROOT / "modules"
+TESTBENCHES = MODULES / "tb"
+BUILD = ROOT / "build" / "tb"
+RESULTS = BUILD / "results.json"
+
+HDL_SUFFIXES = (".v", ".sv")
+SKIPPED_DIRECTORIES = {".git", "build", "generated", "__pycache__"}
+INCLUDE = re.compile(r'`include\s+"([^"]+)"(\s*/\*.*?\*/|[^\n]*)', re.S)
+INSTANCE = re.compile(r"^\s*(\w+)\s*(?:#\s*\(|\w+\s*\()", re.M)
+FAILURE = re.compile(r"\bFAIL|\bERROR\b|%Error|\bTIMEOUT\b")
+
+
+class GenerationError(Exception):
+    pass
+
+
+def find_files(suffixes, include_directories):
+    """{file name: path} of the files with the given suffixes in the repository and the include
+    directories, outside build directories."""
+    found = {}
+    for directory in [ROOT, *include_directories]:
+        for root, directories, files in os.walk(directory):
+            directories[:] = [name for name in directories if name not in SKIPPED_DIRECTORIES]
+            for file in files:
+                if file.endswith(suffixes):
+                    found.setdefault(file, Path(root) / file)
+    return found
+
+
+def discover_testbenches(names):
+    modules = {path.stem: path for path in MODULES.glob("*") if path.suffix in HDL_SUFFIXES}
+    testbenches = {}
+    for path in sorted(TESTBENCHES.glob("*_tb.*")):
+        if path.suffix not in HDL_SUFFIXES:
+            continue
+        dut = path.stem.removesuffix("_tb")
+        if dut not in modules:
+            vs_print(WARNING, f"Skipping {path.name}: modules/{dut}.v or .sv not found.")
+            continue
+        testbenches[path.stem] = (path, modules[dut])
+    unknown = [name for name in names if name not in testbenches]
+    if unknown:
+        vs_print(ERROR, f"Unknown testbench(es): {', '.join(unknown)}. Found: {', '.join(testbenches)}.")
+        exit(1)
+    return {name: testbenches[name] for name in names or testbenches}
+
+
+def find_script(snippet):
+    """Generator script of a snippet and its suffix: the longest "_" prefix naming a script."""
+    words = snippet.removesuffix(".vs").split("_")
+    for length in range(len(words), 0, -1):
+        script = SCRIPTS / ("_".join(words[:length]) + ".py")
+        if script.exists():
+            return script, "_".join(words[length:])
+    return None, ""
+
+
+def generate(snippet, comment):
+    """Run the generator of a snippet in this process, in the current directory."""
+    script, suffix = find_script(snippet)
+    if script is None:
+        raise GenerationError(f"no script generates {snippet}")
+    # Scripts keep module-level state set up by the run that imported them, so sibling scripts
+    # imported by a previous run are dropped; the vs_* helpers only hold functions and are kept,
+    # and so is this runner.
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file and Path(file).parent == SCRIPTS and not name.startswith(("vs_", "__main__", "run_tb")):
+            del sys.modules[name]
+    argv = sys.argv
+    sys.argv = [str(script), suffix, comment]
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as error:
+        if error.code not in (None, 0):
+            raise GenerationError(f"{script.name} failed to generate {snippet}") from None
+    finally:
+        sys.argv = argv
+
+
+def include_comment(text):
+    """Comment of an include as VeriSnip passes it: "// ..." or the inside of "/* ... */"."""
+    text = text.strip()
+    if text.startswith("/*"):
+        return text[2:-2]
+    return text
+
+
+def resolve_sources(testbench, dut, work, include_directories):
+    """Modules and snippets used by the testbench, generating missing snippets into work."""
+    modules = {path.stem: path for path in MODULES.glob("*") if path.suffix in HDL_SUFFIXES}
+    snippets = find_files((".vs",), include_directories)
+    hdl = [testbench, dut]
+    used = []
+    pending = [testbench, dut]
+    deferred = set()
+    while pending:
+        source = pending.pop(0)
+        text = source.read_text()
+        for name, comment in INCLUDE.findall(text):
+            comment = include_comment(comment)
+            path = work / name
+            if not path.exists() and name in snippets:
+                path = snippets[name]
+            elif not path.exists():
+                if "VS_NO_GENERATE" in comment:
+                    # Written by another include of the same generator (e.g. AXI_parameters.vs).
+                    deferred.add(name)
+                    continue
+                generate(name, comment)
+                if not path.exists():
+                    raise GenerationError(f"{name} was not generated")
+            if path not in used:
+                used.append(path)
+                pending.append(path)
+        for name in INSTANCE.findall(text):
+            if name in modules and modules[name] not in hdl:
+                hdl.append(modules[name])
+                pending.append(modules[name])
+    missing = sorted(name for name in deferred if not (work / name).exists() and name not in snippets)
+    if missing:
+        raise GenerationError(f"not found and marked VS_NO_GENERATE: {', '.join(missing)}")
+    # Generators may write files that are only included by other generated files.
+    return hdl, used + sorted(set(work.glob("*.vs")) - set(used))
+
+
+def cache_key(simulator, plusargs, hdl, snippets):
+    digest = hashlib.sha256()
+    digest.update(f"{simulator} {' '.join(plusargs)}".encode())
+    for path in list(hdl) + sorted(snippets, key=lambda path: path.name):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def simulate(name, simulator, plusargs, hdl, snippets, work):
+    # Snippets are included by file name from wherever they were found.
+    directories = dict.fromkeys([work, *(path.parent for path in snippets)])
+    include_directories = [f"-I{directory}" for directory in directories]
+    if simulator == "icarus":
+        commands = [
+            ["iverilog", "-g2012", "-s", name, "-o", f"{name}.vvp", *include_directories, *map(str, hdl)],
+            ["vvp", "-n", f"{name}.vvp", *plusargs],
+        ]
+    else:
+        commands = [
+            ["verilator", "--binary", "--timing", "-Wno-fatal", "--top-module", name, "-Mdir", "obj_dir",
+             *include_directories, *map(str, hdl)],
+            [f"obj_dir/V{name}", *plusargs],
+        ]
+    log = []
+    for command in commands:
+        process = subprocess.run(command, cwd=work, capture_output=True, text=True)
+        log.append(f"$ {' '.join(command)}\n{process.stdout}{process.stderr}")
+        if process.returncode != 0:
+            return False, "".join(log)
+    return not FAILURE.search(log[-1]), "".join(log)
+
+
+def run_testbench(name, testbench, dut, args, cached_key):
+    """Generate, hash and (unless cached) simulate one testbench; runs in a worker process."""
+    work = BUILD / name
+    work.mkdir(parents=True, exist_ok=True)
+    # Snippets are always regenerated; the log is kept for cached failures.
+    for file in work.iterdir():
+        if file.is_file() and file.suffix != ".log":
+            file.unlink()
+    os.chdir(work)
+    if str(SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS))
+    result = {"name": name, "key": None, "cached": False, "passed": False, "error": ""}
+    try:
+        hdl, snippets = resolve_sources(testbench, dut, work, args.include)
+    except GenerationError as error:
+        result["error"] = str(error)
+        return result
+    result["key"] = cache_key(args.simulator, args.plusargs, hdl, snippets)
+    if result["key"] == cached_key:
+        result["cached"] = True
+        return result
+    result["passed"], log = simulate(name, args.simulator, args.plusargs, hdl, snippets, work)
+    (work / f"{name}.log").write_text(log)
+    return result
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Run the modules/tb testbenches in parallel with cached results.")
+    parser.add_argument("testbenches", nargs="*", help="testbench names (default: all)")
+    parser.add_argument("--simulator", choices=("icarus", "verilator"), default="icarus")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="ignore cached results")
+    parser.add_argument("--include", action="append", type=Path, default=[], metavar="DIR",
+                        help="directory with snippets that are not generated")
+    arguments = sys.argv[1:]
+    split = arguments.index("--") if "--" in arguments else len(arguments)
+    args = parser.parse_args(arguments[:split])
+    args.plusargs = arguments[split + 1 :]
+    args.include = [directory.resolve() for directory in args.include]
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    tools = ("iverilog", "vvp") if args.simulator == "icarus" else ("verilator",)
+    missing = [tool for tool in tools if shutil.which(tool) is None]
+    if missing:
+        vs_print(ERROR, f"{', '.join(missing)} not found in PATH.")
+        exit(1)
+
+    testbenches = discover_testbenches(args.testbenches)
+    BUILD.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(RESULTS) as file:
+            results = json.load(file)
+    except (OSError, ValueError):
+        results = {}
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [
+            pool.submit(run_testbench, name, testbench, dut, args, None if args.force else results.get(name, {}).get("key"))
+            for name, (testbench, dut) in testbenches.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            name = result["name"]
+            if result["cached"]:
+                result["passed"] = results[name]["passed"]
+            elif result["key"]:
+                results[name] = {"key": result["key"], "passed": result["passed"]}
+            else:
+                results.pop(name, None)
+            cached = " (cached)" if result["cached"] else ""
+            if result["passed"]:
+                vs_print(OK, f"{name} passed{cached}.")
+            else:
+                failed += 1
+                reason = result["error"] or f"see {(BUILD / name / f'{name}.log').relative_to(ROOT)}"
+                vs_print(ERROR, f"{name} failed{cached}: {reason}.")
+
+    with open(RESULTS, "w") as file:
+        json.dump(results, file, indent=2)
+    if failed:
+        vs_print(ERROR, f"{failed} of {len(testbenches)} testbenches failed.")
+        exit(1)
+    vs_print(OK, f"All {len(testbenches)} testbenches passed.")
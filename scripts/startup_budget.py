@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+# startup_budget.py checks how long every snippet script takes to start. It is not a snippet generator.
+#   python scripts/startup_budget.py [AXI FIFO ...] [--runs N] [--scale F]
+# VeriSnip starts a new interpreter for every include, so the import of a script (its own code
+# and every module it pulls in beyond the interpreter start-up) is paid once per snippet.
+# Each script is imported --runs times in a fresh "python -X importtime" and its best cumulative
+# import time is compared with its budget in BUDGET_MS (times --scale, for slower machines).
+# The report lists the largest imports of every script. The check fails when a script is over
+# budget or cannot be imported without arguments: scripts only read sys.argv in "__main__" and
+# import what a single option needs (hashlib, json, vs_mem_init, VeriSnip.vs_build) where it is used.
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from VeriSnip.vs_colours import *
+
+SCRIPTS = Path(__file__).resolve().parent
+
+# Milliseconds with a warm bytecode cache. Every script needs re (vs_arguments.tokenize), about
+# half of the budget; the rest leaves room for the script itself and noisy machines.
+DEFAULT_BUDGET_MS = 20
+BUDGET_MS = {
+    "AXI": 25,
+}
+
+GENERATOR = re.compile(r"^from vs_dependencies import .*track_dependencies", re.M)
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def discover_scripts(names):
+    """Snippet scripts of this directory: those that track their dependencies."""
+    scripts = sorted(
+        path.stem
+        for path in SCRIPTS.glob("*.py")
+        if not path.stem.startswith("vs_") and GENERATOR.search(path.read_text())
+    )
+    unknown = [name for name in names if name not in scripts]
+    if unknown:
+        vs_print(ERROR, f"Unknown script(s): {', '.join(unknown)}. Found: {', '.join(scripts)}.")
+        exit(1)
+    return names or scripts
+
+
+def import_time(script):
+    """Cumulative import time of a script in microseconds and {module: microseconds} of its direct
+    imports, or None and the error output when it cannot be imported."""
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SCRIPTS), os.environ.get("PYTHONPATH")])))
+    # The first run writes the bytecode cache, as a normal VeriSnip run would.
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {script}"],
+        cwd=SCRIPTS,
+        env=environment,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        return None, process.stderr.strip().splitlines()[-1:]
+    # Imports are reported after the modules they import, indented one level deeper.
+    children = {}
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match[2]), len(match[3]), match[4]
+        if indent == 1 and name == script:
+            return cumulative, children
+        if indent == 1:
+            children = {}
+        elif indent == 3:
+            children[name] = cumulative
+    return None, [f"{script} not found in the -X importtime report"]
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Check the start-up time of the snippet scripts.")
+    parser.add_argument("scripts", nargs="*", help="script names without .py (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="imports per script, the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    scripts = discover_scripts(args.scripts)
+
+    failed = 0
+    print(f"  {'best_ms':>8} {'budget_ms':>9}  script (largest imports)")
+    for script in scripts:
+        best, children = None, {}
+        for _ in range(max(args.runs, 1)):
+            cumulative, result = import_time(script)
+            if cumulative is None:
+                best, children = None, result
+                break
+            if best is None or cumulative < best:
+                best, children = cumulative, result
+        if best is None:
+            failed += 1
+            vs_print(ERROR, f"{script} cannot be imported without arguments: {' '.join(children)}")
+            continue
+        budget = BUDGET_MS.get(script, DEFAULT_BUDGET_MS) * args.scale
+        largest = sorted(children.items(), key=lambda item: item[1], reverse=True)[:3]
+        details = ", ".join(f"{name} {time / 1000:.1f}" for name, time in largest)
+        over = " OVER BUDGET" if best / 1000 > budget else ""
+        print(f"  {best / 1000:8.1f} {budget:9.1f}  {script} ({details}){over}")
+        failed += bool(over)
+
+    if failed:
+        vs_print(ERROR, f"{failed} of {len(scripts)} scripts are over their start-up budget or do not import.")
+        exit(1)
+    vs_print(OK, f"All {len(scripts)} scripts start within budget.")
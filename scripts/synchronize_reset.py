@@ -8,6 +8,16 @@
 #   arst_i (active-low) for the asynchronous reset
 #   sync_reset (active-low) for the synchronous reset
 #   clock = clk_i
+#
+# Optional keyword fields:
+#   stages=N       synchronizer flip-flops (default 2)
+#   leaves=N       replicate the synchronized reset into N leaf registers, {sync_reset}_0 to
+#                  {sync_reset}_{N-1}, each marked keep so that synthesis does not merge them
+#   names={a, b}   name the leaves per region instead: {sync_reset}_a, {sync_reset}_b
+# Leaves assert together with the asynchronous reset and de-assert one cycle after the
+# synchronizer, so each region's reset net drives only its own flops. The reg.py/FSM.py header
+# line of every leaf ("reset = {sync_reset}_a (...), clock = ..."), preceded by a "// a" comment
+# line, is listed in synchronize_reset_{prefix}_resets.txt.
 
 import sys, re
 
@@ -19,14 +29,15 @@ except ImportError:
     def vs_print(color, msg):
         print(f"{color}{msg}\033[0m")
 
-vs_name_suffix = sys.argv[1].removesuffix(".vs")
-vs_name = f"synchronize_reset_{vs_name_suffix}.vs"
+from vs_arguments import comment_text, tokenize
+from vs_dependencies import track_dependencies, write_dependencies
+from vs_output import write_vs
+from vs_trace import phase
+
+RESET_PATTERN = re.compile(r"(\w+)(?:\s*\((active-low|active-high)\))?")
 
-def write_vs(string="", file_name=None):
-    with open(file_name, "w") as file:
-        file.write(string)
 
-def verilog_string(prefix, arst, arst_type, sync_reset, sync_reset_type, clock):
+def verilog_string(prefix, arst, arst_type, sync_reset, sync_reset_type, clock, stages=2, leaves=()):
     if arst_type == "active-low":
         arst_edge = "negedge"
         arst_cond = f"!{arst}"
@@ -41,30 +52,75 @@ def verilog_string(prefix, arst, arst_type, sync_reset, sync_reset_type, clock):
         sync_assert_val = "1'b1"
         sync_deassert_val = "1'b0"
 
-    reg1 = f"{prefix}_rst_reg1"
-    reg2 = f"{prefix}_rst_reg2"
+    regs = [f"{prefix}_rst_reg{stage}" for stage in range(1, stages + 1)]
+    assert_regs = "".join(f"      {reg} <= {sync_assert_val};\n" for reg in regs)
+    shift_regs = "".join(f"      {reg} <= {prev};\n" for prev, reg in zip(regs, regs[1:]))
 
     code = f"""
   // Generated by synchronize_reset.py: {arst_type.upper()} Asynchronous Reset to {sync_reset_type.upper()} Synchronous Reset
-  logic {reg1}, {reg2};
+  logic {", ".join(regs)};
   always_ff @(posedge {clock} or {arst_edge} {arst}) begin
     if ({arst_cond}) begin
       // Asynchronous Assert:
-      // When {arst} asserts, both registers are immediately set to the asserted value.
-      {reg1} <= {sync_assert_val};
-      {reg2} <= {sync_assert_val};
-    end else begin
+      // When {arst} asserts, {"both registers are" if stages == 2 else "all registers are"} immediately set to the asserted value.
+{assert_regs}    end else begin
       // Synchronous De-assert:
       // When {arst} de-asserts, the de-asserted value shifts through the pipeline.
-      {reg1} <= {sync_deassert_val};
-      {reg2} <= {reg1};
-    end
+      {regs[0]} <= {sync_deassert_val};
+{shift_regs}    end
   end\n
-  assign {sync_reset} = {reg2};
+  assign {sync_reset} = {regs[-1]};
+"""
+    if leaves:
+        code += """
+  // Reset distribution: one register per leaf, kept apart so that each drives its own region
+"""
+        code += "".join(f'  (* keep = "true" *) logic {leaf_name(sync_reset, leaf)};\n' for leaf in leaves)
+        code += f"""  always_ff @(posedge {clock} or {arst_edge} {arst}) begin
+    if ({arst_cond}) begin
 """
+        code += "".join(f"      {leaf_name(sync_reset, leaf)} <= {sync_assert_val};\n" for leaf in leaves)
+        code += "    end else begin\n"
+        code += "".join(f"      {leaf_name(sync_reset, leaf)} <= {sync_reset};\n" for leaf in leaves)
+        code += "    end\n  end\n"
     return code
 
-def parse_arguments():
+def leaf_name(sync_reset, leaf):
+    return f"{sync_reset}_{leaf}"
+
+def reset_headers(sync_reset, sync_reset_type, clock, leaves):
+    """reg.py/FSM.py header line of every leaf reset, after a comment naming its region."""
+    return "".join(
+        f"// {leaf}\nreset = {leaf_name(sync_reset, leaf)} ({sync_reset_type}), clock = {clock}\n"
+        for leaf in leaves
+    )
+
+def parse_leaves(args, prefix):
+    names = args.get(None, "names") if args else ""
+    if names:
+        leaves = [name for name in re.split(r"[\s,{}]+", names) if name]
+        if not all(re.fullmatch(r"\w+", name) for name in leaves) or len(set(leaves)) != len(leaves):
+            vs_print(ERROR, f"Invalid reset leaf names for {prefix}: {names}.")
+            exit(1)
+        return leaves
+    count = args.get(None, "leaves") if args else ""
+    if count == "":
+        return []
+    if not count.isdigit() or int(count) < 1:
+        vs_print(ERROR, f"leaves must be a positive number for {prefix}, got {count}.")
+        exit(1)
+    return [str(leaf) for leaf in range(int(count))]
+
+def parse_stages(args, prefix):
+    stages = args.get(None, "stages") if args else ""
+    if stages == "":
+        return 2
+    if not stages.isdigit() or int(stages) < 2:
+        vs_print(ERROR, f"stages must be a number of at least 2 for {prefix}, got {stages}.")
+        exit(1)
+    return int(stages)
+
+def parse_arguments(prefix):
     if len(sys.argv) < 2:
         vs_print(ERROR, "Not enough arguments.")
         exit(1)
@@ -74,6 +130,8 @@ def parse_arguments():
     sync_reset = "sync_reset"
     sync_reset_type = "active-low"
     clock = "clk_i"
+    stages = 2
+    leaves = []
 
     # Check if any argument contains "//"
     has_double_slash = any("//" in arg for arg in sys.argv[1:])
@@ -82,38 +140,53 @@ def parse_arguments():
         # Find the argument with "//"
         for _, arg in enumerate(sys.argv):
             if "//" in arg:
-                args_str = arg[arg.index("//")+2:]
+                args_str = comment_text(arg)
                 break
-                
-        args = [a.strip() for a in args_str.split(',')]
-        
-        if len(args) > 0 and args[0]:
-            m = re.match(r'(\w+)(?:\s*\((active-low|active-high)\))?', args[0])
+
+        try:
+            records = tokenize(args_str, allowed=("arst", "sync_reset", "clock", "names", "leaves", "stages"))
+        except ValueError as error:
+            vs_print(ERROR, f"Malformed reset description for {prefix}: {error}.")
+            exit(1)
+        args = records[0] if records else []
+
+        arst_str = args.get(0, "arst") if args else ""
+        if arst_str:
+            m = RESET_PATTERN.match(arst_str)
             if m:
                 arst = m.group(1)
                 if m.group(2):
                     arst_type = m.group(2)
 
-        if len(args) > 1 and args[1]:
-            m = re.match(r'(\w+)(?:\s*\((active-low|active-high)\))?', args[1])
+        sync_str = args.get(1, "sync_reset") if args else ""
+        if sync_str:
+            m = RESET_PATTERN.match(sync_str)
             if m:
                 sync_reset = m.group(1)
                 if m.group(2):
                     sync_reset_type = m.group(2)
 
-        if len(args) > 2 and args[2]:
-            clk_str = args[2]
-            if "=" in clk_str:
-                clock = clk_str.split("=")[1].strip()
-            else:
-                clock = clk_str.strip()
+        clk_str = args.get(2, "clock") if args else ""
+        if clk_str:
+            clock = clk_str
+
+        stages = parse_stages(args, prefix)
+        leaves = parse_leaves(args, prefix)
     else:
         # If no // is found, just use defaults
         pass
 
-    return arst, arst_type, sync_reset, sync_reset_type, clock
+    return arst, arst_type, sync_reset, sync_reset_type, clock, stages, leaves
 
 if __name__ == "__main__":
-    arst, arst_type, sync_reset, sync_reset_type, clock = parse_arguments()
-    vs_content = verilog_string(vs_name_suffix, arst, arst_type, sync_reset, sync_reset_type, clock)
+    vs_name_suffix = sys.argv[1].removesuffix(".vs")
+    vs_name = f"synchronize_reset_{vs_name_suffix}.vs"
+    track_dependencies()
+    with phase("parse"):
+        arst, arst_type, sync_reset, sync_reset_type, clock, stages, leaves = parse_arguments(vs_name_suffix)
+    with phase("generate"):
+        vs_content = verilog_string(vs_name_suffix, arst, arst_type, sync_reset, sync_reset_type, clock, stages, leaves)
     write_vs(vs_content, vs_name)
+    if leaves:
+        write_vs(reset_headers(sync_reset, sync_reset_type, clock, leaves), f"synchronize_reset_{vs_name_suffix}_resets.txt")
+    write_dependencies()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+
+# tb_models.py writes random stimulus and expected responses for the testbenches in modules/tb.
+# It is not a snippet generator. Run it in the simulation directory, then pass +golden=N:
+#   python tb_models.py FIFO --vectors 1000000 [--seed S] [--out DIR]
+#   vvp FIFO_tb.vvp +golden=1000000
+# Models (with the parameters of their testbench):
+#   FIFO      modules/FIFO.sv, WIDTH=8, DEPTH=16 (--width/--depth to change them)
+#   Reg       modules/Reg.v, DATA_W=8
+#   AXIL_mem  modules/AXIL_mem.v, 32-bit data, 1024 words
+# Every model is computed with NumPy array operations over the whole run, so millions of
+# vectors take seconds, and the testbench only compares the DUT against the expected file.
+# The files {Module}_stimulus.hex and {Module}_expected.hex hold one packed word per line
+# (fields listed most significant first in each model) and are loaded with $readmemh.
+
+import argparse
+import os
+
+import numpy as np
+
+from VeriSnip.vs_colours import *
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def write_hex(file_name, words, bits):
+    """Write one zero-padded hex word per line, formatted with array operations."""
+    digits = (bits + 3) // 4
+    words = np.asarray(words, dtype=np.uint64)
+    shifts = np.arange(digits - 1, -1, -1, dtype=np.uint64) * np.uint64(4)
+    text = np.empty((len(words), digits + 1), dtype=np.uint8)
+    text[:, :digits] = HEX_DIGITS[(words[:, None] >> shifts) & np.uint64(0xF)]
+    text[:, digits] = ord("\n")
+    text.tofile(file_name)
+
+
+def pack(*fields):
+    """Pack (values, bits) fields, most significant first, into one uint64 per vector."""
+    word = np.zeros(len(fields[0][0]), dtype=np.uint64)
+    for values, bits in fields:
+        mask = np.uint64((1 << bits) - 1)
+        word = (word << np.uint64(bits)) | (np.asarray(values).astype(np.uint64) & mask)
+    return word
+
+
+def hold_last(event, value, initial=0):
+    """Value after every cycle of a register that loads value[t] in the cycles where event[t]."""
+    index = np.where(event, np.arange(len(event)), -1)
+    last = np.maximum.accumulate(index)
+    return np.where(last >= 0, value[np.maximum(last, 0)], initial)
+
+
+def bounded_walk(delta, high):
+    """Level before and after every step of x -> min(max(x + delta, 0), high), from x = 0.
+
+    One step is the function clamp(x + a, lo, hi), and composing two of them gives another one,
+    so the prefix of all the steps is an associative scan done in log2(N) array operations.
+    """
+    a = delta.astype(np.int64)
+    lo = np.zeros_like(a)
+    hi = np.full_like(a, high)
+    shift = 1
+    while shift < len(a):
+        # Apply the prefix ending at t - shift first, then the one ending at t.
+        earlier = slice(None, -shift)
+        later = slice(shift, None)
+        new_lo = np.clip(lo[earlier] + a[later], lo[later], hi[later])
+        new_hi = np.clip(hi[earlier] + a[later], lo[later], hi[later])
+        a[later] = a[earlier] + a[later]
+        lo[later] = new_lo
+        hi[later] = new_hi
+        shift *= 2
+    after = np.clip(a, lo, hi)
+    before = np.concatenate(([0], after[:-1]))
+    return before, after
+
+
+def fifo_model(rng, vectors, width=8, depth=16):
+    """modules/FIFO.sv after reset.
+
+    stimulus: wr_en, rd_en, wr_data[WIDTH]
+    expected: check_data, empty, full, rd_data[WIDTH] (rd_data is only checked when check_data)
+    """
+    # Bias towards writes or reads in long phases so that the FIFO also runs full and empty.
+    phase = rng.random(vectors // 64 + 1).repeat(64)[:vectors]
+    wr_en = rng.random(vectors) < phase
+    rd_en = rng.random(vectors) < 1.0 - phase
+    wr_data = rng.integers(0, 1 << width, vectors, dtype=np.uint64)
+
+    before, after = bounded_walk(wr_en.astype(np.int64) - rd_en, depth)
+    tunnel = wr_en & rd_en & (before == 0)
+    pushed = wr_en & ((before < depth) | rd_en) & ~tunnel
+    popped = rd_en & (before > 0)
+
+    # Words leave in the order they entered; a tunnelled word goes straight to rd_data.
+    order = np.maximum(np.cumsum(popped) - 1, 0)
+    queue = wr_data[pushed]
+    rd_data = np.zeros(vectors, dtype=np.uint64)
+    rd_data[popped] = queue[order[popped]]
+    rd_data[tunnel] = wr_data[tunnel]
+    check = popped | tunnel
+
+    stimulus = pack((wr_en, 1), (rd_en, 1), (wr_data, width))
+    expected = pack((check, 1), (after == 0, 1), (after == depth, 1), (rd_data, width))
+    return (stimulus, width + 2), (expected, width + 3)
+
+
+def reg_model(rng, vectors, width=8):
+    """modules/Reg.v after reset.
+
+    stimulus: data_e, data_r, data_n[8], count_en, count_r, count_n[8], valid_r, valid_n
+    expected: data_q[8], count_q[8], valid_q, free_q toggled since the first vector
+    """
+    data_e = rng.random(vectors) < 0.5
+    data_r = rng.random(vectors) < 1 / 16
+    data_n = rng.integers(0, 1 << width, vectors, dtype=np.uint64)
+    count_en = rng.random(vectors) < 0.5
+    count_r = rng.random(vectors) < 1 / 16
+    count_n = rng.integers(0, 256, vectors, dtype=np.uint64)
+    valid_r = rng.random(vectors) < 1 / 16
+    valid_n = rng.random(vectors) < 0.5
+
+    data_q = hold_last(data_r | data_e, np.where(data_r, 0, data_n))
+    count_q = hold_last(count_r | count_en, np.where(count_r, 0, count_n))
+    valid_q = valid_n & ~valid_r
+    free_toggled = (np.arange(vectors) & 1) == 0
+
+    stimulus = pack(
+        (data_e, 1), (data_r, 1), (data_n, width),
+        (count_en, 1), (count_r, 1), (count_n, 8),
+        (valid_r, 1), (valid_n, 1),
+    )
+    expected = pack((data_q, width), (count_q, 8), (valid_q, 1), (free_toggled, 1))
+    return (stimulus, 2 * width + 6), (expected, width + 10)
+
+
+def axil_mem_model(rng, vectors, words=1024, id_width=2):
+    """modules/AXIL_mem.v, one complete transaction per vector.
+
+    stimulus: is_write, id[2], wstrb[4], word[10], wdata[32]
+    expected: known_bytes[4], id[2], rdata[32] (bytes never written since reset are not known)
+    """
+    is_write = rng.random(vectors) < 0.5
+    ids = rng.integers(0, 1 << id_width, vectors, dtype=np.uint64)
+    strb = np.where(is_write, rng.integers(1, 16, vectors, dtype=np.uint64), 0)
+    word = rng.integers(0, words, vectors, dtype=np.uint64)
+    wdata = np.where(is_write, rng.integers(0, 1 << 32, vectors, dtype=np.uint64), 0)
+
+    # Group the transactions by word (time order is kept inside a group) and find, for every
+    # byte lane, the latest earlier write to the same word that enabled the lane.
+    order = np.argsort(word, kind="stable")
+    sorted_word = word[order]
+    group_start = np.searchsorted(sorted_word, sorted_word, side="left")
+    position = np.arange(vectors)
+    rdata = np.zeros(vectors, dtype=np.uint64)
+    known = np.zeros(vectors, dtype=np.uint64)
+    for lane in range(4):
+        lane_write = (is_write & ((strb >> np.uint64(lane)) & np.uint64(1)).astype(bool))[order]
+        last = np.maximum.accumulate(np.where(lane_write, position, -1))
+        valid = (last >= group_start) & ~is_write[order]
+        lane_data = (wdata[order][np.maximum(last, 0)] >> np.uint64(8 * lane)) & np.uint64(0xFF)
+        rdata[order] |= np.where(valid, lane_data << np.uint64(8 * lane), 0).astype(np.uint64)
+        known[order] |= valid.astype(np.uint64) << np.uint64(lane)
+
+    word_bits = (words - 1).bit_length()
+    stimulus = pack((is_write, 1), (ids, id_width), (strb, 4), (word, word_bits), (wdata, 32))
+    expected = pack((known, 4), (ids, id_width), (rdata, 32))
+    return (stimulus, 1 + id_width + 4 + word_bits + 32), (expected, 4 + id_width + 32)
+
+
+MODELS = {"FIFO": fifo_model, "Reg": reg_model, "AXIL_mem": axil_mem_model}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Write golden stimulus and expected files for modules/tb.")
+    parser.add_argument("module", choices=sorted(MODELS))
+    parser.add_argument("--vectors", type=int, default=1 << 20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=".")
+    parser.add_argument("--width", type=int, default=8, help="FIFO WIDTH")
+    parser.add_argument("--depth", type=int, default=16, help="FIFO DEPTH")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    rng = np.random.default_rng(args.seed)
+    if args.module == "FIFO":
+        files = fifo_model(rng, args.vectors, args.width, args.depth)
+    else:
+        files = MODELS[args.module](rng, args.vectors)
+    for kind, (words, bits) in zip(("stimulus", "expected"), files):
+        write_hex(os.path.join(args.out, f"{args.module}_{kind}.hex"), words, bits)
+    vs_print(OK, f"Wrote {args.vectors} {args.module} vectors to {args.out}.")
@@ -0,0 +1,8 @@
+# Tests of the snippet scripts. Run from the repository root with:
+#   python -m pytest scripts/tests
+# The scripts are imported as modules (VeriSnip must be installed for VeriSnip.vs_colours).
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
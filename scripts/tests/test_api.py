@@ -0,0 +1,92 @@
+# Every generator can be used from an import: the snippet name is an argument and nothing is read
+# from sys.argv or from globals that only the command line sets.
+
+import io
+
+import pytest
+
+import AXI
+import CDC
+import FIFO
+import FSM
+import Mem
+import MMIO
+import counter
+import reg
+import synchronize_reset
+from vs_arguments import tokenize
+from vs_output import write_vs
+
+
+@pytest.fixture(autouse=True)
+def no_command_line(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["pytest"])
+
+
+def record(description):
+    return tokenize(description)[0]
+
+
+def render(lines):
+    text = io.StringIO()
+    write_vs(lines, text)
+    return text.getvalue()
+
+
+def test_reg():
+    registers = [reg.register(record("q, 8, 0, rst_i, , d"))]
+    assert "// Automatically generated register q_reg" in render(reg.reg_description(registers, "q_reg"))
+
+
+def test_mmio():
+    registers = [MMIO.memory_mapped_register(record("ctrl, 8, 0, , , ctrl_n, 0x0, R/W, ctrl"))]
+    block = MMIO.mmio_block("m", registers)
+    logic, signals = io.StringIO(), io.StringIO()
+    MMIO.create_vs(block, logic, signals)
+    MMIO.print_mmio_info(block)
+    assert '`include "reg_MMIO_m.vs"' in logic.getvalue()
+    assert "logic w_ctrl_sel;" in signals.getvalue()
+
+
+def test_mem(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Mem.Memory(record("RAM, 16, 8"), "m").generate_verilog()
+    assert (tmp_path / "Mem_m.vs").exists() and (tmp_path / "Mem_m_signals.vs").exists()
+
+
+def test_fifo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    FIFO.FIFO(record("16, 8"), "f").generate_verilog()
+    assert "f_rd_data" in (tmp_path / "FIFO_f.vs").read_text()
+
+
+def test_cdc(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    CDC.Crossing(record("mux, 8, src_clock=clk_a, dst_clock=clk_b"), "x").generate_verilog()
+    assert '`include "reg_x_cdc.vs"' in (tmp_path / "CDC_x.vs").read_text()
+    assert (tmp_path / "CDC_x.xdc").exists()
+
+
+def test_fsm():
+    transitions = [FSM.Transition("IDLE", "RUN", "go"), FSM.Transition("RUN", "IDLE")]
+    fsm = FSM.FSM("s", ["IDLE", "RUN"], transitions, "arst_i", "clk_i", True, True)
+    logic, signals = io.StringIO(), io.StringIO()
+    FSM.generate_signals(fsm, signals)
+    FSM.generate_logic(fsm, logic)
+    assert "logic s_IDLE_RUN;" in signals.getvalue()
+    assert "assign s_IDLE_RUN = go;" in logic.getvalue()
+
+
+def test_counter():
+    assert "assign c_next = c + 1;" in counter.verilog_string("c", "8", "en", "rst")
+    assert "c_tc" in counter.extended_verilog_string(counter.Counter(record("8, en, rst, tc=1"), "c"))
+
+
+def test_synchronize_reset():
+    code = synchronize_reset.verilog_string("s", "arst_i", "active-low", "rst", "active-high", "clk_i", 2, ["core"])
+    assert "rst_core" in code
+
+
+def test_axi():
+    content = AXI.AXIInterface("a", "AXI-Lite Subordinate a").render()
+    assert content["ios"]
@@ -0,0 +1,15 @@
+import re
+
+import AXI
+
+
+def checker(description):
+    return dict(AXI.AXIInterface("a", description).render()["checkers"])
+
+
+def test_checker_sizes_ids_and_uses_nonblocking_assignments():
+    text = checker("AXI-Full Subordinate a sva=1")["AXI_S_a_checker.sv"]
+    scoreboard = text[text.index("always @(posedge clk_i)"):]
+    assert not re.search(r"^\s*(?:if \(.*\) )?[\w\[\]'()]+ = ", scoreboard, re.M)
+    assert not re.search(r"\[(?:aw|b|ar|r)ID\]", scoreboard)
+    assert "aw_lens.push_back(32'(awLEN));" in scoreboard
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+
+
+def run_reg(tmp_path, **environment):
+    subprocess.run(
+        [sys.executable, str(SCRIPTS / "reg.py"), "q", "// 8, 0, rst, , d"],
+        cwd=tmp_path,
+        env=dict(os.environ, **environment),
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_no_dependency_files_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("VS_DEPS", raising=False)
+    run_reg(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ["reg_q.vs"]
+
+
+def test_dependency_files_go_to_vs_deps(tmp_path):
+    (tmp_path / "generated").mkdir()
+    run_reg(tmp_path, VS_DEPS="deps")
+    assert sorted(os.listdir(tmp_path / "deps")) == ["reg_q.args", "reg_q.d"]
+    targets, prerequisites = (tmp_path / "deps" / "reg_q.d").read_text().split(":", 1)
+    assert targets == os.path.join("generated", "reg_q.vs")
+    assert os.path.join("deps", "reg_q.args") in prerequisites
@@ -0,0 +1,32 @@
+import re
+
+import Mem
+from vs_arguments import tokenize
+
+
+def logic(description, name="m"):
+    return "".join(Mem.memory_logic(Mem.Memory(tokenize(description)[0], name)))
+
+
+def drivers(text, signal):
+    """Continuous and non-blocking assignments to signal."""
+    return re.findall(rf"assign {signal} =|^\s*{signal} <=", text, re.M)
+
+
+def test_async_read_with_output_reg_drives_data_q_once():
+    text = logic("RAM, 16, 8, output_reg=1")
+    assert drivers(text, "m_data_q") == ["assign m_data_q ="]
+    assert drivers(text, "m_data_out") == ["    m_data_out <="]
+
+
+def test_sync_read_with_output_reg_registers_twice():
+    text = logic("RAM, 16, 8, read=sync, output_reg=1")
+    assert drivers(text, "m_data_q") == ["    m_data_q <="]
+    assert drivers(text, "m_data_out") == ["    m_data_out <="]
+
+
+def test_async_read_with_output_reg_per_port():
+    text = logic("RAM, 16, 8, read_ports=2, output_reg=1")
+    for port in range(2):
+        assert len(drivers(text, rf"m_data_q\[{port}\]")) == 1
+        assert len(drivers(text, rf"m_data_out\[{port}\]")) == 1
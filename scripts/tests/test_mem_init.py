@@ -0,0 +1,67 @@
+import os
+import struct
+
+import pytest
+
+from vs_mem_init import InitFileError, InitImage, elf_segments
+
+
+def image(path, **options):
+    return InitImage(str(path), 4, 8, output_prefix="Mem_m_init", **options)
+
+
+def test_hex_file_is_loaded_by_the_name_written(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "rom.hex").write_text("00\n01\n")
+    assert image("rom.hex").process() == ["rom.hex"]
+
+
+def test_converted_file_is_relative(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "rom.bin").write_bytes(bytes([0, 1, 2, 3]))
+    assert image("rom.bin").process() == ["Mem_m_init.hex"]
+    assert (tmp_path / "Mem_m_init.hex").read_text() == "00\n01\n02\n03\n"
+
+
+def test_cache_is_not_reused_for_another_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first, second = tmp_path / "a.bin", tmp_path / "b.bin"
+    first.write_bytes(bytes([1, 1, 1, 1]))
+    second.write_bytes(bytes([2, 2, 2, 2]))
+    stat = first.stat()
+    os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    image("a.bin").process()
+    image("b.bin").process()
+    assert (tmp_path / "Mem_m_init.hex").read_text() == "02\n02\n02\n02\n"
+
+
+def test_truncated_elf_is_an_init_file_error():
+    header = bytearray(b"\x7fELF\x01\x01" + bytes(46))
+    struct.pack_into("<I", header, 28, 52)  # program headers past the end of the file
+    struct.pack_into("<HH", header, 42, 32, 1)
+    with pytest.raises(InitFileError):
+        elf_segments(bytes(header))
+
+
+def test_banked_image_is_one_bank_major_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "rom.bin").write_bytes(bytes([0, 1, 2, 3]))
+    assert image("rom.bin", banks=2).process() == ["Mem_m_init.hex"]
+    # bank 0 holds words 0 and 2, bank 1 words 1 and 3
+    assert (tmp_path / "Mem_m_init.hex").read_text() == "00\n02\n01\n03\n"
+
+
+def test_banked_memory_loads_the_whole_array(tmp_path, monkeypatch):
+    import Mem
+    from vs_arguments import tokenize
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "generated").mkdir()
+    (tmp_path / "init.bin").write_bytes(bytes(range(64)))
+    memory = Mem.Memory(tokenize("ROM, 16, 32, init.bin, banks=2")[0], "x")
+    memory.prepare_init_files()
+    assert memory.init_files == [os.path.join("generated", "Mem_x_init.hex")]
+    assert sorted(os.listdir(tmp_path)) == ["generated", "init.bin"]
+    text = "".join(Mem.memory_logic(memory))
+    assert text.count("$readmemh") == 1
+    assert f'$readmemh("{memory.init_files[0]}", x);' in text
@@ -0,0 +1,84 @@
+import re
+
+import AXI
+import MMIO
+import reg
+from vs_arguments import tokenize
+
+REGISTERS = """
+ctrl, 8, 0, , , ctrl_n, 0x0, R/W, ctrl
+status, 8, 0, , , status_n, 0x4, R, status
+"""
+
+
+def block(description):
+    options, records = MMIO.split_header(tokenize(description))
+    return MMIO.mmio_block("m", [MMIO.memory_mapped_register(record) for record in records], **options)
+
+
+def declared(text):
+    return re.findall(r"^\s*logic (?:\[[^\]]*\] )?(\w+);", text, re.M)
+
+
+def test_default_interface_is_unprefixed():
+    text = "".join(MMIO.MMIO_signals(block(REGISTERS)))
+    assert "logic [DATA_WIDTH-1:0] r_data;" in text
+    assert "logic [ADDR_WIDTH-1:0] w_address;" in text
+
+
+def test_header_prefixes_the_interface():
+    mmio = block("prefix = p, data_width = PW, addr_width = PA\n" + REGISTERS)
+    signals = "".join(MMIO.MMIO_signals(mmio))
+    assert "logic [PW-1:0] p_r_data;" in signals
+    assert "logic [PA-1:0] p_r_address;" in signals
+    body = "".join(MMIO.sel_registers_desc(mmio)) + "".join(MMIO.read_registers_desc(mmio))
+    assert "(p_r_address == 'h4)" in body
+    assert "p_r_data = {{(PW-8){1'b0}}, status};" in body
+    assert not re.search(r"(?<!p_)\b[rw]_(data|address|enable)\b", body)
+
+
+def test_perf_blocks_of_two_buses_do_not_share_nets():
+    nets = []
+    for bus_prefix, base in (("AXIL_a", 0), ("AXIL_b", 0x100)):
+        signals = AXI.get_perf_signals("AXI-Lite", bus_prefix, "s", 8, 8, base)
+        assert f"localparam integer {bus_prefix}_PERF_ADDR_WIDTH = {8 if base == 0 else 9};" in signals
+        logic = AXI.get_perf_logic("AXI-Lite", bus_prefix, "s", 8, base)
+        description = re.search(r'`include "MMIO_[^"]*"\s*/\*(.*?)\*/', logic, re.S).group(1)
+        names = declared("".join(MMIO.MMIO_signals(block(description))))
+        assert f"{bus_prefix}_perf_r_data" in names
+        nets.append(set(names))
+    assert not nets[0] & nets[1]
+
+
+def test_perf_counters_zero_extend_one_bit_terms():
+    logic = AXI.get_perf_logic("AXI-Lite", "AXIL_a", "s", 4, 0)
+    # Size casts are left only on constants
+    assert all(cast.isdigit() for cast in re.findall(r"PERF_WIDTH'\((\w*)", logic))
+    assert "AXIL_a_perf_w_outstanding + {{(AXIL_a_PERF_WIDTH-1){1'b0}}, AXIL_a_perf_w_start}" in logic
+
+
+def test_register_reset_and_clock_reach_reg():
+    mmio = block("""
+ctrl, 8, 0, asynchronous arst_i (active-low), , ctrl_n, 0x0, R/W, ctrl
+stat, 8, 0, rst, , stat_n, 0x4, R, stat, clock=clk_b
+""")
+    description = re.search(r"/\*(.*?)\*/", "".join(MMIO.registers_description(mmio)), re.S).group(1)
+    registers = [reg.register(record) for record in tokenize(description, allowed=reg.REGISTER_FIELDS)]
+    text = "".join(reg.reg_description(registers, "MMIO_m"))
+    assert "always @(posedge clk_i or negedge arst_i) begin" in text
+    assert "if (!arst_i) begin" in text
+    assert "always @(posedge clk_b) begin" in text
+    assert "if (rst) begin" in text
+
+
+def test_crossbar_decodes_every_byte_of_the_last_register(tmp_path):
+    regs = tmp_path / "regs.sv"
+    regs.write_text('`include "MMIO_r.vs" /*\n' + REGISTERS + "*/\n")
+    description = f"""AXI-Lite Crossbar x
+AXI-Lite Manager cpu
+AXI-Lite Subordinate ram base=0 size=0x1000
+AXI-Lite Subordinate regs mmio={regs} base=0x2000"""
+    logic = "".join(AXI.AXIInterface("x", description).render()["logic"])
+    assert "if (AXIL_X_x_cpu_awaddr_i <= 'hfff) " in logic
+    assert ">= 'h0)" not in logic
+    assert "((AXIL_X_x_cpu_awaddr_i >= 'h2000) && (AXIL_X_x_cpu_awaddr_i <= 'h2007))" in logic
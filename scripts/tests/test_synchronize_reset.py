@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+
+
+def run(tmp_path, script, *args):
+    subprocess.run([sys.executable, str(SCRIPTS / script), *args], cwd=tmp_path, check=True, capture_output=True)
+
+
+def test_leaf_headers_are_reg_headers(tmp_path):
+    run(tmp_path, "synchronize_reset.py", "s", "// arst_i (active-low), rst (active-high), clock = clk, names={core, mem}")
+    lines = (tmp_path / "synchronize_reset_s_resets.txt").read_text().splitlines()
+    assert lines[0::2] == ["// core", "// mem"]
+    for leaf, header in zip(("core", "mem"), lines[1::2]):
+        run(tmp_path, "reg.py", f"r_{leaf}", f"/* {header}\n  q_{leaf}, 8, 0, , , d\n */")
+        text = (tmp_path / f"reg_r_{leaf}.vs").read_text()
+        assert "always @(posedge clk) begin" in text
+        assert f"if (rst_{leaf}) begin" in text
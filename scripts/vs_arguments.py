@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+# vs_arguments.py is a helper shared by the snippet scripts. It is not a snippet generator.
+# It tokenizes the text passed after an `include (the "// ..." line or the "/* ... */" block)
+# into records, one per non-empty line, in a single pass:
+#   Reg_name0, Size, {A, B}, rst=sync_reset, , _n
+# becomes a record with the values ["Reg_name0", "Size", "{A, B}", "sync_reset", "", "_n"],
+# where the fourth field also carries the keyword "rst".
+# Commas and newlines inside (), [], {} or "" do not split fields.
+# A field is a keyword field when it starts with "key =" (key may contain spaces, e.g.
+# "asynchronous reset = arst_i"); comparisons such as "a == b" or "a <= b" are kept as values.
+# Callers pass the keys they understand as allowed=, so a misspelled keyword field is an error
+# instead of being ignored.
+# Resets are written "[asynchronous|synchronous] <rst> [(active-low|active-high)]" everywhere, and
+# reg.py and FSM.py lists may start with a "[asynchronous] reset = <rst>, clock = <clk>" header.
+
+import re
+
+_SPECIAL = re.compile(r'[,\n(){}\[\]"]')
+_KEYWORD = re.compile(r"([A-Za-z_][\w ]*?)\s*=(?!=)\s*(.*)", re.S)
+_CLOSING = {")": "(", "]": "[", "}": "{"}
+HEADER_KEYS = ("reset", "asynchronous reset", "synchronous reset", "clock", "clk")
+_POLARITY = re.compile(r"\((active-low|active-high)\)", re.I)
+
+
+class Record(list):
+    """Field values of one argument line, with the keyword (or None) of every field."""
+
+    def __init__(self, values=(), keys=()):
+        super().__init__(values)
+        self.keys = list(keys) if keys else [None] * len(self)
+
+    def get(self, index, key=None, default=""):
+        """Value given as key=value anywhere in the record, or as the index-th field."""
+        if key is not None and key in self.keys:
+            return self[self.keys.index(key)]
+        if index is not None and index < len(self) and self.keys[index] is None:
+            return self[index]
+        return default
+
+    def has(self, key):
+        return key in self.keys
+
+    def fields(self, start=0, stop=None):
+        """Sub-record with the fields start..stop-1."""
+        return Record(self[start:stop], self.keys[start:stop])
+
+
+def _make_field(text):
+    text = text.strip()
+    match = _KEYWORD.fullmatch(text)
+    if match:
+        return " ".join(match.group(1).lower().split()), match.group(2).strip()
+    return None, text
+
+
+def tokenize(text, allowed=None):
+    """Split text into a list of records.
+
+    Raises ValueError on unbalanced or mismatched brackets, unterminated strings and, when allowed
+    is given, keyword fields whose key is not in allowed.
+    """
+    records = []
+    values, keys = [], []
+    stack = []
+    in_string = False
+    start = 0
+
+    def end_field(stop):
+        key, value = _make_field(text[start:stop])
+        keys.append(key)
+        values.append(value)
+
+    for match in _SPECIAL.finditer(text):
+        char = match.group()
+        if in_string:
+            in_string = char != '"'
+        elif char == '"':
+            in_string = True
+        elif char in "([{":
+            stack.append(char)
+        elif char in _CLOSING:
+            if not stack:
+                raise ValueError("Unbalanced brackets")
+            if stack.pop() != _CLOSING[char]:
+                raise ValueError("Mismatched brackets")
+        elif stack:
+            continue
+        elif char == ",":
+            end_field(match.start())
+            start = match.end()
+        else:  # newline
+            end_field(match.start())
+            start = match.end()
+            if len(values) > 1 or values[0]:
+                records.append(Record(values, keys))
+            values, keys = [], []
+
+    if stack:
+        raise ValueError("Unbalanced brackets")
+    if in_string:
+        raise ValueError("Unterminated string")
+
+    end_field(len(text))
+    if len(values) > 1 or values[0]:
+        records.append(Record(values, keys))
+
+    if allowed is not None:
+        unknown = [key for record in records for key in record.keys if key is not None and key not in allowed]
+        if unknown:
+            raise ValueError(f"unknown option(s) {', '.join(dict.fromkeys(unknown))}")
+    return records
+
+
+def reset_kind(value):
+    """Split "[asynchronous|synchronous] <rst> [(active-low|active-high)]" into the reset name,
+    whether it is asynchronous and whether it is active-low (None for what is not written)."""
+    asynchronous = None
+    for keyword in ("asynchronous", "synchronous"):
+        if value.lower().startswith(keyword + " "):
+            asynchronous = keyword == "asynchronous"
+            value = value[len(keyword) :].strip()
+            break
+    active_low = None
+    match = _POLARITY.search(value)
+    if match:
+        active_low = match.group(1).lower() == "active-low"
+        value = _POLARITY.sub("", value).strip()
+    return value, asynchronous, active_low
+
+
+def parse_header(record, reset=None, clock="clk_i", async_reset=False):
+    """Parse a '[asynchronous] reset = <rst> [(active-low)], clock = <clk>' header record.
+
+    Returns (reset, clock, async_reset, active_low, is_header); a record that is not a header
+    returns the given defaults.
+    """
+    active_low = False
+    first_key = record.keys[0] if record else None
+    if first_key is None or not (first_key.endswith("reset") or first_key in ("clock", "clk")):
+        return reset, clock, async_reset, active_low, False
+
+    for key, value in zip(record.keys, record):
+        if key is None:
+            continue
+        if key.endswith("reset"):
+            reset, _, active_low = reset_kind(value)
+            async_reset = "asynchronous" in key
+            active_low = bool(active_low)
+        elif key in ("clock", "clk"):
+            clock = value
+    return reset, clock, async_reset, active_low, True
+
+
+def comment_text(argument):
+    """Text of a '// ...' or '/* ... */' include comment, without the comment markers."""
+    if "//" in argument and "/*" not in argument:
+        return argument[argument.index("//") + 2 :]
+    return argument.replace("/*", "").replace("*/", "")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# vs_dependencies.py is a helper shared by the snippet scripts. It is not a snippet generator.
+# A script calls track_dependencies() when it starts generating and write_dependencies() once it
+# has written everything. In between, every file the script opens is recorded through an audit
+# hook: files opened for writing are outputs, files only read are inputs.
+# Dependency files are off unless the VS_DEPS environment variable names a directory. Then the
+# result is a Makefile/Ninja dependency file VS_DEPS/{script}_{suffix}.d:
+#   reg_data_q.vs: /path/scripts/reg.py /path/scripts/vs_arguments.py deps/reg_data_q.args
+# Targets are relative to the directory the script ran in; when it has a generated/ directory
+# (vs_build creates it and moves the Verilog and .vs files written there into it) those outputs
+# are listed in generated/. Inputs are the script, the sibling
+# scripts it imported, the files it read and VS_DEPS/{script}_{suffix}.args, which holds a hash
+# of the arguments and is only rewritten when they change. Results a script takes from its own cache (*.cache) are declared with add_inputs() and
+# add_outputs(), because the files behind them are not opened again.
+# The same two calls start and end the VS_TRACE record of the run (see vs_trace.py).
+
+import os
+import sys
+
+from vs_trace import end_trace, start_trace
+
+DEPS_VARIABLE = "VS_DEPS"
+# Outputs vs_build moves from the directory it runs the generators in to generated/
+MOVED_SUFFIXES = (".v", ".vh", ".sv", ".svh", ".vs")
+_state = {"hooked": False, "recording": False, "inputs": {}, "outputs": {}}
+
+
+def _audit(event, args):
+    if event != "open" or not _state["recording"]:
+        return
+    path, mode, flags = args
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        return
+    path = os.fsdecode(path)
+    if path.endswith((".py", ".pyc", ".cache")) or path.startswith(("/proc/", "/dev/", sys.base_prefix, sys.prefix)):
+        return
+    if (mode and any(letter in mode for letter in "wax+")) or (flags or 0) & (os.O_WRONLY | os.O_RDWR | os.O_CREAT):
+        add_outputs([path])
+    else:
+        add_inputs([path])
+
+
+def _relative(path):
+    path = os.path.abspath(path)
+    relative = os.path.relpath(path)
+    return path if relative.startswith("..") else relative
+
+
+def _target(path):
+    """Path of an output once the build has moved it."""
+    if not os.path.dirname(path) and path.endswith(MOVED_SUFFIXES) and os.path.isdir("generated"):
+        return os.path.join("generated", path)
+    return path
+
+
+def _escape(path):
+    return path.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+def base_name():
+    """{script}_{suffix} (or {script} without a suffix) of the running generator."""
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    suffix = sys.argv[1].removesuffix(".vs") if len(sys.argv) > 1 else ""
+    return f"{script}_{suffix}" if suffix else script
+
+
+def add_inputs(paths):
+    for path in paths:
+        _state["inputs"].setdefault(_relative(path), None)
+
+
+def add_outputs(paths):
+    for path in paths:
+        _state["outputs"].setdefault(_relative(path), None)
+
+
+def track_dependencies():
+    """Start recording the files opened by this generator run."""
+    if not _state["hooked"]:
+        sys.addaudithook(_audit)
+        _state["hooked"] = True
+    _state["inputs"] = {}
+    _state["outputs"] = {}
+    _state["recording"] = True
+    start_trace()
+
+
+def write_dependencies():
+    """Write VS_DEPS/{script}_{suffix}.d, and VS_DEPS/{script}_{suffix}.args when the arguments
+    changed, if VS_DEPS is set."""
+    _state["recording"] = False
+    name = base_name()
+    directory = os.environ.get(DEPS_VARIABLE)
+    if directory:
+        _write_dependency_file(directory, name)
+    end_trace(name, list(_state["outputs"]))
+
+
+def _write_dependency_file(directory, name):
+    import hashlib
+
+    os.makedirs(directory, exist_ok=True)
+    args_file = _relative(os.path.join(directory, f"{name}.args"))
+    digest = hashlib.sha256("\0".join(sys.argv[1:]).encode()).hexdigest() + "\n"
+    try:
+        with open(args_file) as file:
+            changed = file.read() != digest
+    except OSError:
+        changed = True
+    if changed:
+        with open(args_file, "w") as file:
+            file.write(digest)
+
+    script = os.path.abspath(sys.argv[0])
+    scripts = [script] + sorted(
+        module.__file__
+        for module in list(sys.modules.values())
+        if getattr(module, "__file__", None)
+        and os.path.dirname(os.path.abspath(module.__file__)) == os.path.dirname(script)
+        and os.path.abspath(module.__file__) != script
+    )
+    outputs = list(_state["outputs"])
+    inputs = [_relative(path) for path in scripts] + list(_state["inputs"]) + [args_file]
+    inputs = [path for path in dict.fromkeys(inputs) if path not in _state["outputs"]]
+    if outputs:
+        with open(os.path.join(directory, f"{name}.d"), "w") as file:
+            file.write(" ".join(_escape(_target(path)) for path in outputs) + ": \\\n  ")
+            file.write(" \\\n  ".join(map(_escape, inputs)) + "\n")
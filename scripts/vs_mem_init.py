@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+
+# vs_mem_init.py is a helper used by Mem.py to process memory init files at generation time.
+# It is not a snippet generator.
+# The init file is read through mmap and checked against the memory Depth and Width:
+#   - hex:  $readmemh text (words, @address, // and /* */ comments)
+#   - bin:  raw little-endian binary image, word 0 at file offset 0
+#   - ihex: Intel HEX records
+#   - elf:  PT_LOAD segments of an ELF32/ELF64 executable (placed by physical address)
+# Binary, Intel HEX and ELF images are converted into a compact $readmemh file (one word per
+# line, "@address" only where the image has gaps). Banked memories get one dense bank-major file
+# (every row of bank 0, then of bank 1, ...; gaps are zeros) that $readmemh loads into the whole
+# [banks][rows] array.
+# The result is cached in {output}.cache: unchanged images (same file, same size and modification
+# time or content hash, and same memory geometry) are not processed again. The files to load are
+# given by relative name: the init file as written, or the converted file, which is written with
+# the cache to generated/ when that directory exists (vs_build creates it and only moves Verilog
+# files there), else to the current directory.
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+
+from VeriSnip.vs_colours import *
+from vs_dependencies import add_inputs, add_outputs
+from vs_trace import cache_hit
+
+CHUNK_WORDS = 1 << 16
+
+_HEX_TOKEN = re.compile(
+    rb"//[^\n]*|/\*.*?\*/|@([0-9A-Fa-f_]+)|([0-9A-Fa-fxXzZ_]+)(?=\s|/|$)|(\S+)", re.S
+)
+
+
+class InitFileError(Exception):
+    pass
+
+
+def detect_format(path, data):
+    if data[:4] == b"\x7fELF":
+        return "elf"
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".ihex", ".ihx"):
+        return "ihex"
+    if extension == ".bin":
+        return "bin"
+    stripped = data[:64].lstrip()
+    if stripped.startswith(b":"):
+        return "ihex"
+    return "hex"
+
+
+def words_from_bytes(data, start, word_bytes):
+    """Yield (word_address, [hex words]) chunks for a little-endian byte image at word start."""
+    size = len(data)
+    step = CHUNK_WORDS * word_bytes
+    digits = 2 * word_bytes
+    for offset in range(0, size, step):
+        chunk = bytes(data[offset : offset + step])
+        if len(chunk) % word_bytes:
+            chunk += bytes(word_bytes - len(chunk) % word_bytes)
+        # Reversing the chunk makes every little-endian word read most significant byte first,
+        # with the words themselves in reverse order.
+        reversed_hex = chunk[::-1].hex()
+        words = [reversed_hex[i : i + digits] for i in range(0, len(reversed_hex), digits)]
+        words.reverse()
+        yield start + offset // word_bytes, words
+
+
+def hex_words(data, depth, width):
+    """Validate a $readmemh image and yield (word_address, [hex words]) chunks."""
+    max_digits = (width + 3) // 4
+    address = 0
+    start = 0
+    words = []
+    for match in _HEX_TOKEN.finditer(data):
+        new_address, word, garbage = match.groups()
+        if garbage is not None:
+            line = bytes(data[: match.start()]).count(b"\n") + 1
+            raise InitFileError(f"invalid token {garbage[:16].decode(errors='replace')!r} at line {line}")
+        if new_address is not None:
+            if words:
+                yield start, words
+                words = []
+            address = int(new_address.replace(b"_", b""), 16)
+            start = address
+            continue
+        if word is None:
+            continue
+        digits = word.replace(b"_", b"")
+        if address >= depth:
+            raise InitFileError(f"image has more than {depth} words (word at address {address})")
+        unknown = re.search(rb"[xXzZ]", digits) is not None
+        if len(digits) > max_digits or (not unknown and int(digits, 16) >> width):
+            line = bytes(data[: match.start()]).count(b"\n") + 1
+            raise InitFileError(f"word {digits.decode()} at line {line} is wider than {width} bits")
+        words.append(digits.decode())
+        address += 1
+        if len(words) == CHUNK_WORDS:
+            yield start, words
+            start, words = address, []
+    if words:
+        yield start, words
+
+
+def ihex_segments(data):
+    """Byte segments (address, bytearray) of an Intel HEX file."""
+    segments = []
+    upper = 0
+    for number, line in enumerate(bytes(data).splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(b":"):
+            raise InitFileError(f"line {number} is not an Intel HEX record")
+        try:
+            record = bytes.fromhex(line[1:].decode())
+        except ValueError:
+            raise InitFileError(f"line {number} is not an Intel HEX record")
+        if len(record) < 5 or len(record) != record[0] + 5 or sum(record) & 0xFF:
+            raise InitFileError(f"bad length or checksum in Intel HEX line {number}")
+        count, address, kind = record[0], (record[1] << 8) | record[2], record[3]
+        payload = record[4 : 4 + count]
+        if kind == 0x00:
+            address += upper
+            if segments and segments[-1][0] + len(segments[-1][1]) == address:
+                segments[-1][1].extend(payload)
+            else:
+                segments.append((address, bytearray(payload)))
+        elif kind == 0x01:
+            break
+        elif kind == 0x02:
+            upper = int.from_bytes(payload, "big") << 4
+        elif kind == 0x04:
+            upper = int.from_bytes(payload, "big") << 16
+    return segments
+
+
+def elf_segments(data):
+    """Byte segments (address, bytes) of the PT_LOAD program headers of an ELF file."""
+    try:
+        return _elf_segments(data)
+    except struct.error:
+        raise InitFileError("truncated ELF file") from None
+
+
+def _elf_segments(data):
+    if len(data) < 52 or data[4] not in (1, 2) or data[5] not in (1, 2):
+        raise InitFileError("unsupported ELF header")
+    is_64 = data[4] == 2
+    endian = "<" if data[5] == 1 else ">"
+    if is_64:
+        phoff, = struct.unpack_from(endian + "Q", data, 32)
+        phentsize, phnum = struct.unpack_from(endian + "HH", data, 54)
+        header, fields = endian + "IIQQQQQ", (2, 4, 5, 6)
+    else:
+        phoff, = struct.unpack_from(endian + "I", data, 28)
+        phentsize, phnum = struct.unpack_from(endian + "HH", data, 42)
+        header, fields = endian + "IIIIII", (1, 3, 4, 5)
+
+    segments = []
+    for index in range(phnum):
+        entry = struct.unpack_from(header, data, phoff + index * phentsize)
+        if entry[0] != 1:  # PT_LOAD
+            continue
+        offset, paddr, filesz, memsz = (entry[i] for i in fields)
+        if memsz == 0:
+            continue
+        if offset + filesz > len(data):
+            raise InitFileError("truncated ELF file")
+        content = bytes(data[offset : offset + filesz]) + bytes(memsz - filesz)
+        segments.append((paddr, content))
+    return segments
+
+
+def segment_words(segments, base, word_bytes):
+    """Word chunks of byte segments placed relative to base."""
+    segments = sorted(segments, key=lambda segment: segment[0])
+    if base is None:
+        base = segments[0][0] if segments else 0
+    end = base
+    for address, content in segments:
+        if address < end:
+            raise InitFileError(f"segment at 0x{address:x} overlaps the previous one or the base address")
+        if (address - base) % word_bytes:
+            raise InitFileError(f"segment at 0x{address:x} is not aligned to {word_bytes}-byte words")
+        end = address + len(content)
+        yield from words_from_bytes(content, (address - base) // word_bytes, word_bytes)
+
+
+def write_hex(chunks, file_name, depth):
+    """Write word chunks as a $readmemh file."""
+    expected = 0
+    words_written = 0
+    with open(file_name, "w") as file:
+        for address, words in chunks:
+            if address + len(words) > depth:
+                raise InitFileError(f"image has more than {depth} words")
+            words_written += len(words)
+            if address != expected:
+                file.write(f"@{address:x}\n")
+            file.write("\n".join(words))
+            file.write("\n")
+            expected = address + len(words)
+    return words_written
+
+
+def write_bank_major_hex(chunks, file_name, depth, banks, width):
+    """Write word chunks of an address-interleaved memory as one dense bank-major $readmemh file:
+    word address a is row a // banks of bank a % banks, and the rows of bank 0 come first."""
+    image = ["0" * ((width + 3) // 4)] * depth
+    words_written = 0
+    for address, words in chunks:
+        if address + len(words) > depth:
+            raise InitFileError(f"image has more than {depth} words")
+        image[address : address + len(words)] = words
+        words_written += len(words)
+    with open(file_name, "w") as file:
+        for bank in range(banks):
+            file.write("\n".join(image[bank::banks]))
+            file.write("\n")
+    return words_written
+
+
+class InitImage:
+    def __init__(self, path, depth, width, banks=1, fmt="", base=None, output_prefix=""):
+        self.path = path
+        self.depth = depth
+        self.width = width
+        self.banks = banks
+        self.fmt = fmt.lower()
+        self.base = base
+        self.output_prefix = output_prefix
+        self.cache_file = f"{output_prefix}.cache"
+
+    def geometry(self):
+        return [self.depth, self.width, self.banks, self.fmt, self.base]
+
+    def load_cache(self):
+        try:
+            with open(self.cache_file) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return None
+        # A cache written for another init file is never reused, even with the same size and mtime.
+        if cache.get("source") != os.path.abspath(self.path) or cache.get("geometry") != self.geometry():
+            return None
+        if not all(os.path.exists(name) for name in cache.get("outputs", [])):
+            return None
+        return cache
+
+    def save_cache(self, stat, content_hash, outputs):
+        cache = {
+            "source": os.path.abspath(self.path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": content_hash,
+            "geometry": self.geometry(),
+            "outputs": outputs,
+        }
+        with open(self.cache_file, "w") as file:
+            json.dump(cache, file)
+
+    def process(self):
+        """Return the list with the $readmemh file to load."""
+        stat = os.stat(self.path)
+        cache = self.load_cache()
+        if cache and (cache.get("size"), cache.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+            vs_print(INFO, f"Init file {self.path} unchanged, reusing cached result.")
+            add_inputs([self.path])
+            cache_hit()
+            add_outputs(output for output in cache["outputs"] if output != self.path)
+            return cache["outputs"]
+
+        with open(self.path, "rb") as file:
+            if stat.st_size == 0:
+                vs_print(WARNING, f"Init file {self.path} is empty.")
+                data = b""
+                return self.convert(data, stat, hashlib.sha256(data).hexdigest(), cache)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                content_hash = hashlib.sha256(data).hexdigest()
+                if cache and cache.get("sha256") == content_hash:
+                    vs_print(INFO, f"Init file {self.path} content unchanged, reusing cached result.")
+                    add_outputs(output for output in cache["outputs"] if output != self.path)
+                    cache_hit()
+                    self.save_cache(stat, content_hash, cache["outputs"])
+                    return cache["outputs"]
+                return self.convert(data, stat, content_hash, cache)
+
+    def convert(self, data, stat, content_hash, cache):
+        fmt = self.fmt or detect_format(self.path, data)
+        word_bytes = (self.width + 7) // 8
+        if fmt != "hex" and self.width % 8:
+            raise InitFileError(f"{fmt} images need a width that is a multiple of 8 bits")
+
+        if fmt == "hex":
+            chunks = hex_words(data, self.depth, self.width)
+        elif fmt == "bin":
+            chunks = words_from_bytes(data, 0, word_bytes)
+        elif fmt == "ihex":
+            chunks = segment_words(ihex_segments(data), self.base, word_bytes)
+        elif fmt == "elf":
+            chunks = segment_words(elf_segments(data), self.base, word_bytes)
+        else:
+            raise InitFileError(f"unknown init file format {fmt}")
+
+        if fmt == "hex" and self.banks == 1:
+            # Already in $readmemh format: validate only and load the original file.
+            for address, words in chunks:
+                if address + len(words) > self.depth:
+                    raise InitFileError(f"image has more than {self.depth} words")
+            outputs = [self.path]
+        else:
+            # Converted images are loaded by a relative name.
+            outputs = [f"{self.output_prefix}.hex"]
+            if self.banks == 1:
+                words = write_hex(chunks, outputs[0], self.depth)
+            else:
+                words = write_bank_major_hex(chunks, outputs[0], self.depth, self.banks, self.width)
+            vs_print(INFO, f"Converted {fmt} init file {self.path} ({words} words).")
+
+        self.save_cache(stat, content_hash, outputs)
+        return outputs
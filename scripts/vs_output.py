@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+
+# vs_output.py is a helper shared by the snippet scripts. It is not a snippet generator.
+# write_vs() writes a snippet given as a string or as an iterable of lines (e.g. a generator that
+# yields the snippet while it is rendered) to a file name or to an open text file such as a
+# StringIO, so that other scripts can reuse a generator without touching the disk.
+# The time spent writing counts as the "write" phase of the VS_TRACE record (see vs_trace.py).
+
+from vs_trace import phase
+
+
+def write_vs(lines, file_name, mode="w"):
+    """Write a string or an iterable of lines to a path (opened with mode) or an open text file."""
+    with phase("write"):
+        if isinstance(lines, str):
+            lines = (lines,)
+        if hasattr(file_name, "write"):
+            file_name.writelines(lines)
+            return
+        with open(file_name, mode) as file:
+            file.writelines(lines)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+# vs_trace.py is a helper shared by the snippet scripts. It is not a snippet generator.
+# Tracing is off unless the VS_TRACE environment variable names a file. Then every generator run
+# appends one JSON line to it:
+#   {"script": "reg.py", "snippet": "reg_data_q", "parse_s": ..., "generate_s": ..., "write_s": ...,
+#    "total_s": ..., "bytes": ..., "lines": ..., "outputs": ..., "cache_hits": ..., ...}
+# Phases are timed with "with phase(name):" and nested phases are not counted twice, so the
+# generate time excludes the write_vs calls inside it. Snippets streamed line by line into
+# write_vs are rendered while they are written, so that rendering counts as write time.
+# vs_dependencies.py starts and ends the record of every run.
+# Summary of a trace, with the top N slowest snippets and the total time of every script:
+#   python vs_trace.py trace.jsonl [--top N]
+
+import os
+import sys
+import time
+
+TRACE_VARIABLE = "VS_TRACE"
+PHASES = ("parse", "generate", "write")
+
+_run = None
+_stack = []
+
+
+class phase:
+    """Context manager adding its duration, minus nested phases, to the named phase."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if _run is not None:
+            self.start = time.perf_counter()
+            _stack.append(0.0)
+        return self
+
+    def __exit__(self, *exception):
+        if _run is not None and _stack:
+            elapsed = time.perf_counter() - self.start
+            nested = _stack.pop()
+            _run[f"{self.name}_s"] += elapsed - nested
+            if _stack:
+                _stack[-1] += elapsed
+        return False
+
+
+def cache_hit():
+    if _run is not None:
+        _run["cache_hits"] += 1
+
+
+def start_trace():
+    """Start the record of a generator run, if tracing is enabled."""
+    global _run
+    path = os.environ.get(TRACE_VARIABLE)
+    if not path:
+        _run = None
+        return
+    _stack.clear()
+    _run = {f"{name}_s": 0.0 for name in PHASES}
+    _run.update(cache_hits=0, path=os.path.abspath(path), start=time.time(), clock=time.perf_counter())
+
+
+def end_trace(snippet, outputs):
+    """Append the record of the run to the trace file."""
+    global _run
+    if _run is None:
+        return
+    import json
+
+    run, _run = _run, None
+    total = time.perf_counter() - run.pop("clock")
+    sizes = lines = 0
+    for output in outputs:
+        try:
+            with open(output, "rb") as file:
+                content = file.read()
+        except OSError:
+            continue
+        sizes += len(content)
+        lines += content.count(b"\n")
+    record = {
+        "script": os.path.basename(sys.argv[0]),
+        "snippet": snippet,
+        "cwd": os.getcwd(),
+        "start": run.pop("start"),
+        **{key: round(value, 6) for key, value in run.items() if key.endswith("_s")},
+        "total_s": round(total, 6),
+        "bytes": sizes,
+        "lines": lines,
+        "outputs": len(outputs),
+        "cache_hits": run["cache_hits"],
+    }
+    # One write per record, so runs appending in parallel do not interleave.
+    with open(run["path"], "a") as file:
+        file.write(json.dumps(record) + "\n")
+
+
+def summarize(path, top):
+    import json
+
+    with open(path) as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    if not records:
+        print(f"{path} has no records.")
+        return
+
+    print(f"Top {min(top, len(records))} slowest snippets of {len(records)} runs:")
+    print(f"  {'total_s':>9} {'parse_s':>9} {'generate_s':>10} {'write_s':>9} {'lines':>8}  snippet")
+    for record in sorted(records, key=lambda record: record["total_s"], reverse=True)[:top]:
+        print(
+            f"  {record['total_s']:9.4f} {record['parse_s']:9.4f} {record['generate_s']:10.4f} "
+            f"{record['write_s']:9.4f} {record['lines']:8}  {record['snippet']} ({record['script']})"
+        )
+
+    scripts = {}
+    for record in records:
+        runs, total, hits = scripts.get(record["script"], (0, 0.0, 0))
+        scripts[record["script"]] = (runs + 1, total + record["total_s"], hits + record["cache_hits"])
+    print("\nTotal time per script:")
+    print(f"  {'total_s':>9} {'runs':>6} {'mean_s':>9} {'cache_hits':>10}  script")
+    for script, (runs, total, hits) in sorted(scripts.items(), key=lambda item: item[1][1], reverse=True):
+        print(f"  {total:9.4f} {runs:6} {total / runs:9.4f} {hits:10}  {script}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a VS_TRACE file.")
+    parser.add_argument("trace")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    summarize(args.trace, args.top)